@@ -14,6 +14,9 @@
 #./JSON_to_MODS.py -c 11   --json jussi.json --trita "TRITA-EECS-EX-2021:219" --testing
 # ./JSON_to_MODS.py -c 11   --json test12.json --trita "TRITA-EECS-EX-2021:219" --testing
 #
+# Batch mode - convert a directory of JSON files (or a JSON lines file, one record per line) into a single MODS collection:
+# ./JSON_to_MODS.py --batch fordiva_files/ --output theses.xml [--processes 8] [--split output_directory]
+#
 #
 # The dates from Canvas are in ISO 8601 format.
 # 
@@ -34,6 +37,9 @@ import os			# to make OS calls, here to get time zone info
 #import time
 import pprint
 
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 # for dealing with XML
 from eulxml import xmlmap
 from eulxml.xmlmap import load_xmlobject_from_file, mods
@@ -47,6 +53,11 @@ from xml.dom import minidom
 import datetime
 import isodate                  # for parsing ISO 8601 dates and times
 import pytz                     # for time zones
+
+from kth_organization_tables import schools_info, departments_info, subject_area_codes_diva
+from kth_organization_tables import schools_acronym, diva_codes_for_schools_KTH_L1, diva_codes_for_schools_KTH_L1_acronym
+from kth_organization_tables import departments_acronym, diva_codes_for_departments_KTH_L2_acronyms, lookup_subject_area_eng
+import diva_organization_snapshot
 #from dateutil.tz import tzlocal
 
 def utc_to_local(utc_dt):
@@ -66,744 +77,10 @@ def datetime_to_local_string(canvas_time):
     else:
         return t1.strftime("%Y-%m-%d %H:%M")
 
-schools_info={'ABE': {'L1': "5850",
-                      'swe': 'Skolan för Arkitektur och samhällsbyggnad',
-                      'eng': 'School of Architecture and the Built Environment'},
-              'ITM': {'L1': "6023",
-                      'swe': 'Skolan för Industriell teknik och management',
-                      'eng': 'School of Industrial Engineering and Management'},
-              'SCI': {'L1': "6091",
-                      'swe': 'Skolan för Teknikvetenskap',
-                      'eng': 'School of Engineering Sciences'},
-              'CBH': {'L1': "879224",
-                      'swe': 'Skolan för Kemi, bioteknologi och hälsa',
-                      'eng': 'School of Engineering Sciences in Chemistry, Biotechnology and Health'},
-              'EECS': {'L1': "879223",
-                       'swe': 'Skolan för Elektroteknik och datavetenskap',
-                      'eng': 'School of Electrical Engineering and Computer Science'}
-              }
-
-def schools_acronym(s1):
-    for s in schools_info:
-        if s1 == schools_info[s]['swe'] or s1 == schools_info[s]['eng']:
-            return s
-    return None
+# The tables of schools, departments, and subject areas and the lookups in them are in kth_organization_tables.py
+# The school and department names and codes that are not in these tables are looked up in the snapshot of the DiVA
+# organisations made by DiVA_organization_info.py (see diva_organization_snapshot.py), if there is one.
 
-def diva_codes_for_schools_KTH_L1(s1):
-    for s in schools_info:
-        if s1 == schools_info[s]['swe'] or s1 == schools_info[s]['eng']:
-            return schools_info[s]['L1']
-    return None
-
-def diva_codes_for_schools_KTH_L1_acronym(s1):
-    for s in schools_info:
-        if s1 == s:
-            return schools_info[s]['L1']
-    return None
-        
-# Here departments are a level L2
-# departments_info={
-#     'ABE': {
-#         'ARCH': {'swe': 'Arkitektur',
-#                  'eng': 'Architecture'},
-#         'BYV': {'swe': 'Byggvetenskap',
-#              'eng': 'Civil and Architectural Engineering'},
-#         'PHILHIST': {'swe': 'Filosofi och historia',
-#                      'eng': 'Philosophy and History'},
-#         'FOB': {'swe': 'Fastigheter och byggande',
-#                 'eng': 'Real Estate and Construction Management'},
-#         'SEED': {'swe': 'Hållbar utveckling, miljövetenskap och teknik',
-#                  'eng': 'Sustainable development, environmental science and engineering'},
-#         'SOM': {'swe': 'Samhällsplanering och miljö',
-#              'eng': 'Urban Planning and Environment'}
-#     },
-#     'ITM': {
-#         'EGI': {'swe': 'Energiteknik',
-#                 'eng': 'Energy Technology'},
-#         'INDEK': {'swe': 'Industriell ekonomi och organisation',
-#                   'eng': 'Industrial Economics and Management'},
-#         'Learning': {'swe': 'Lärande', # could not find an acronym for this department
-#                      'eng': 'Learning'},
-#         'MMK': {'swe': 'Maskinkonstruktion',
-#                 'eng': 'Machine Design'},
-#         'MSE': {'swe': 'Materialvetenskap',
-#                 'eng': 'Materials Science and Engineering'},
-#         'IIP': {'swe': 'Industriell produktion',
-#                 'eng': 'Production Engineering'},
-#         'HPU': {'swe': 'Hållbar produktionsutveckling',
-#                 'eng': 'Sustainable Production Development'}
-#     },
-#     'SCI': {
-#         #  could not find an acronym
-#         'Fysikinstitutionen': {'swe': 'Fysik',
-#                                'eng': 'Physics'},
-#         'MATH': {'swe': 'Matematik',
-#                  'eng': 'Mathematics'},
-#         'TEKMEK': {'swe': 'Teknisk mekanik',
-#                    'eng': 'Engineering Mechanics'},
-#         'APHYS': {'swe': 'Tillämpad fysik',
-#                   'eng': 'Applied physics'}
-#     },
-#     'CBH': {
-#         'MTH': {'swe': 'Medicinsk teknik och hälsosystem',
-#                 'eng': 'Biomedical Engineering and Health Systems'},
-#         'CHE': {'swe': 'Chemistry',
-#                 'eng': 'Kemi'},
-#         'KET': {'swe': 'Kemiteknik',
-#                 'eng': 'Chemical Engineering'},
-#         'FPT': {'swe': 'Fiber- och polymerteknologi',
-#                 'eng': 'Fibre and Polymer Technology'},
-#         'GTE': {'swe': 'Genteknologi',
-#                 'eng': 'Gene Technology'},
-#         'DIB': {'swe': 'Industriell bioteknologi',
-#                 'eng': 'Industrial Biotechnology'},
-#         'IIP': {'swe': 'Ingenjörspedagogik',
-#                 'eng': 'Engineering Pedagogics'},
-#         'PRO': {'swe': 'Proteinvetenskap',
-#                 'eng': 'Protein Science'},
-#         'TCB': {'swe': 'Teoretisk kemi och biologi',
-#                 'eng': 'Theoretical Chemistry and Biology'}
-#         },
-#         'EECS': {
-#             'CS': {'swe': 'Datavetenskap',
-#                    'eng': 'Computer Science'},
-#             'EE': {'swe': 'Elektroteknik',
-#                    'eng': 'Electrical Engineering'},
-#             'HCT': {'swe': 'Människocentrerad teknologi',
-#                     'eng': 'Human Centered Technology'},
-#             'IS':  {'swe': 'Intelligenta system',
-#                     'eng': 'Intelligent Systems'}
-#         }
-# }
-
-departments_info={
-    'ABE': {
-        'ARCH': {'L2': "5851",
-                 'swe': 'Arkitektur',
-                 'eng': 'Architecture',
-                 'divisions': {'Q1a': {'L3': '5852',
-                                       'swe': 'Arkitekturens historia och teori',
-                                       'eng': 'History and Theory of Architecture'
-                                       },
-                               'Q1b': {'L3': '5853',
-                                       'swe': 'Arkitektonisk gestaltning',
-                                       'eng': 'Architectural Design'
-                                       },
-                               'Q1c': {'L3': '5854',
-                                       'swe': 'Arkitekturteknik',
-                                       'eng': 'Architectural Technologies'
-                                       },
-                               'Q1d': {'L3': '5855',
-                                       'swe': 'Kritiska studier i arkitektur',
-                                       'eng': 'Critical Studies in Architecture'
-                                       },
-                               'Q1e': {'L3': '5856',
-                                       'swe': 'Stadsbyggnad',
-                                       'eng': 'Urban Design'
-                                       },
-                               'Q1f': {'L3': '876913',
-                                       'swe': 'Ljusdesign',
-                                       'eng': 'Lighting Design'
-                                       },
-                               },
-                 },
-        'BYV':  {'L2': "5857",
-                 'swe': 'Byggvetenskap',
-                 'eng': 'Civil and Architectural Engineering',
-                 'divisions': {'betong': {'L3': '5861',
-                                          'swe': 'Betongbyggnad',
-                                          'eng': 'Concrete Structures'
-                                          },
-                               'bro-och-stalbyggnad': {'L3': '10153',
-                                                       'swe': 'Bro- och stålbyggnad',
-                                                       'eng': 'Structural Engineering and Bridges'
-                                                       },
-                               'byggteknik-och-design': {'L3': '5867',
-                                                         'swe': 'Byggteknik och design',
-                                                         'eng': 'Building Technology and Design'
-                                                         },
-                               'byggtnadseknik-och-design': {'L3': '5859',
-                                                             'swe': 'Byggnadsteknik',
-                                                             'eng': 'Building Technology'
-                                                             },
-                               'byggnadsmaterial': {'L3': '5860',
-                                                    'swe': 'Byggnadsmaterial',
-                                                    'eng': 'Building Materials'
-                                                    },
-                               'hallbara-byggnader': {'L3': '881151',
-                                                      'swe': 'Hållbara byggnader',
-                                                      'eng': 'Sustainable Buildings'
-                                                      },
-                               'jord-o-bergmekanik': {'L3': '5864',
-                                                      'swe': 'Jord- och bergmekanik',
-                                                      'eng': 'Soil and Rock Mechanics'},
-
-                                   'transportvetenskap': {'L3': '881700',
-                                                          'swe': 'Transportplanering',
-                                                          'eng': 'Transport planning'},
-                               'Q1g': {'L3': '5862',
-                                       'swe': 'Miljö- och resursinformation',
-                                       'eng': 'Environmental and Natural Resources Information System'},
-                               'Q1h': {'L3': '5865',
-                                       'swe': 'Stålbyggnad',
-                                       'eng': 'Steel Structures'},
-                               },
-                 },
-        'PHILHIST': { 'phil': {'L2': '5874',
-                               'swe': 'Filosofi',
-                               'eng': 'Philosophy'
-                               },
-                      'historia': {'L2': '14702',
-                                   'swe': 'Historiska studier av teknik, vetenskap och miljö',
-                                   'eng': 'History of Science, Technology and Environment'},
-                     },
-        'FOB': {'L2': "5869",
-                'swe': 'Fastigheter och byggande',
-                'eng': 'Real Estate and Construction Management',
-                'divisions': {'fastighetsvetenskap': {'L3': '5871',
-                                                      'swe': 'Fastighetsvetenskap',
-                                                      'eng': 'Real Estate Planning and Land Law'},
-                              'geo': {'L3': '879656',
-                                      'swe': 'Geodesi och satellitpositionering',
-                                      'eng': 'Geodesy and Satellite Positioning'},
-                              'fastighetsekonomi-och-finans': {'L3': '882950',
-                                                               'swe': 'Fastighetsekonomi och finans',
-                                                               'eng': 'Real Estate Economics and Finance'},
-                              'fastighetsforetagande-och-finansiella-system': {'L3': '882951',
-                                                                               'swe': 'Fastighetsföretagande och finansiella system',
-                                                                               'eng': 'Real Estate Business and Financial Systems'},
-                              'ledning-och-organisering-i-byggande-och-forvaltning': {'L3': '882952',
-                                                                                      'swe': 'Ledning och organisering i byggande och förvaltning',
-                                                                                      'eng': 'Construction and Facilities Management'},
-                              }
-                },
-        'SEED': { 'L2': "13604",
-                  'swe': 'Hållbar utveckling, miljövetenskap och teknik',
-                  'eng': 'Sustainable development, Environmental science and Engineering',
-                  'divisions': {
-                      'Q1ö': {'L3': '878258',
-                              'swe': 'Hållbarhet och miljöteknik',
-                              'eng': 'Sustainability and Environmental Engineering'},
-                      'hallbarhet-utvardering-och-styrning': {'L3': '878259',
-                                                              'swe': 'Hållbarhet, utvärdering och styrning',
-                                                              'eng': 'Sustainability Assessment and Management'},
-                      'strategiska-hallbarhetsstudier': {'L3': '878260',
-                                                         'swe': 'Strategiska hållbarhetsstudier',
-                                                         'eng': 'Strategic Sustainability Studies'},
-                      'vatten-och-miljoteknik': {'L3': '878261',
-                                                 'swe': 'Vatten- och miljöteknik',
-                                                 'eng': 'Water and Environmental Engineering'},
-                      'resurser-energi-och-infrastruktur': {'L3': '878262',
-                                                            'swe': 'Resurser, energi och infrastruktur',
-                                                            'eng': 'Resources, Energy and Infrastructure'},
-                  }
-                 },
-        'SOM': {'L2': "5884",
-                'swe': 'Samhällsplanering och miljö',
-                'eng': 'Urban Planning and Environment',
-                'divisions': {'urbana-studier': {'L3': '5885',
-                                                 'swe': 'Urbana och regionala studier',
-                                                 'eng': 'Urban and Regional Studies'},
-                              'gis': {'L3': '872751',
-                                      'swe': 'Geoinformatik',
-                                      'eng': 'Geoinformatics'},
-                              'sek': {'L3': '885102',
-                                      'swe': 'Transport och systemanalys',
-                                      'eng': 'Transport and Systems Analysis'},
-                              }
-                }
-    },
-    'ITM': {
-        'EGI': {'L2': "6024",
-                'swe': 'Energiteknik',
-                'eng': 'Energy Technology',
-                'divisions': {'Energisystem': {'L3': '883952',
-                                               'swe': 'Energisystem',
-                                               'eng': 'Energy Systems'},
-                              'heat-and-power-technology': {'L3': '6026',
-                                                            'swe': 'Kraft- och värmeteknologi',
-                                                            'eng': 'Heat and Power Technology'},
-                              'applied-thermodynamics': {'L3': '6025',
-                                                         'swe': 'Tillämpad termodynamik och kylteknik',
-                                                         'eng': 'Applied Thermodynamics and Refrigeration'},
-                              }
-                },
-        'INDEK': {'L2': "6030",
-                  'swe': 'Industriell ekonomi och organisation (Inst.)',
-                  'eng': 'Industrial Economics and Management (Dept.)',
-                  'divisions': {
-                      'MT': {'L3': '883956',
-                             'swe': 'Management & Teknologi',
-                             'eng': 'Management & Technology'},
-                      'SIDE': {'L3': '883957',
-                               'swe': 'Hållbarhet, Industriell dynamik & entreprenörskap',
-                               'eng': 'Sustainability, Industrial Dynamics & Entrepreneurship'},
-                      'AFC': {'L3': '883958',
-                              'swe': 'Redovisning, Finansiering & Förändring',
-                              'eng': 'Accounting, Finance & Changes'},
-                  }
-                  },
-        'Learning': {'L2': "879306",
-                     'swe': 'Lärande',
-                     'eng': 'Learning',
-                     'divisions': {'DL': {'L3': '883959',
-                                          'swe': 'Digitalt lärande"',
-                                          'eng': 'Digital Learning'},
-                                   'STEM': {'L3': '883960',
-                                            'swe': 'Lärande i Stem',
-                                            'eng': 'Learning in Stem'},
-                                   'sprak': {'L3': '883961',
-                                             'swe': 'Språk och kommunikation',
-                                             'eng': 'Language and communication'},
-                                   'VH': {'L3': '883962', # # this is a center
-                                          'swe': 'Vetenskapens hus',
-                                          'eng': 'House of Science'},
-                                   }
-                     },
-        'MMK': {'L2': "6038",
-                'swe': 'Maskinkonstruktion (Inst.)',
-                'eng': 'Machine Design (Dept.)',
-                'divisions': {'Q1i': {'L3': '6039',
-                                      'swe': 'Integrerad produktutveckling',
-                                      'eng': 'Integrated Product Development'},
-                              'Förbränningsmotorteknik': {'L3': '6040',
-                                                          'swe': 'Förbränningsmotorteknik',
-                                                          'eng': 'Internal Combustion Engines'},
-                              'mechatronics': {'L3': '6041',
-                                               'swe': 'Mekatronik',
-                                               'eng': 'Mechatronics'},
-                              'SKD': {'L3': '-1', # does not have a LADOK code 
-                                      'swe': 'System- och komponentdesign',
-                                      'eng': 'Systems and Component Design'},
-                              'Tribologi': {'L3': '6047',
-                                            'swe': 'Tribologi',
-                                            'eng': 'Tribologi'},
-                              'machine-elements': {'L3': '6043',
-                                                   'swe': 'Maskinelement',
-                                                   'eng': 'Machine Elements'},
-                              'Q1j': {'L3': '6042',
-                                      'swe': 'Inbyggda styrsystem',
-                                      'eng': 'Embedded Control Systems'},
-
-                                   'Q1k': {'L3': '6044',
-                                           'swe': 'Maskinkonstruktion (Avd.)',
-                                           'eng': 'Machine Design (Div.)'},
-                              'Q1l': {'L3': '6045',
-                                      'swe': 'Produktinnovationsteknik',
-                                      'eng': 'Product Innovation Technology'},
-                              'Q1m': {'L3': '6046',
-                                      'swe': 'Produkt- och tjänstedesign',
-                                      'eng': 'Product and Service Design'},
-                              }
-                },
-        'MSE': {'L2': '6048',
-                'swe': 'Materialvetenskap',
-                'eng': 'Materials Science and Engineering',
-                'divisions': {'process': {'L3': '883963',
-                                          'swe': 'Processer',
-                                          'eng': 'Process'},
-                              'structures': {'L3': '883964',
-                                             'swe': 'Strukturer',
-                                             'eng': 'Structures'},
-                              'properties': {'L3': '883965',
-                                             'swe': 'Egenskaper',
-                                             'eng': 'Properties'},
-                              }
-                },
-        'IIP': {'L2': '6061',
-                'swe': 'Industriell produktion',
-                'eng': 'Production Engineering',
-                'divisions': {'Q1n': {'L3': '883600',
-                                      'swe': 'Tillverkning och mätsystem',
-                                      'eng': 'Manufacturing and Metrology Systems'},
-                              'Q1o': {'L3': '883601',
-                                      'swe': 'Hållbara produktionssystem',
-                                      'eng': 'Sustainable Production Systems'},
-                              'Q1p': {'L3': '883608',
-                                      'swe': 'Digital smart produktion',
-                                      'eng': 'Digital Smart Production'},
-                              }
-                },
-        'HPU': {'L2': '880900',
-                'swe': 'Hållbar produktionsutveckling (ML)',
-                'eng': 'Sustainable production development',
-                'divisions': {'Production Management': {'L3': '883953',
-                                                        'swe': 'Processledning och hållbar produktion',
-                                                        'eng': 'Process management and sustainable production'},
-                              'Production Logistics': {'L3': '883955',
-                                                       'swe': 'Avancerad underhållsteknik och produktionslogistik',
-                                                       'eng': 'Advanced maintenance technology and production logistics'},
-                              # Industrial Dependability
-                        }
-                }
-    },
-    'SCI': {
-        'Fysik': {'L2': '6128',
-                  'swe': 'Fysik',
-                  'eng': 'Physics',
-                  'divisions': {'Q1q': {'L3': '6129',
-                                        'swe': 'Atom- och molekylfysik',
-                                        'eng': 'Atomic and Molecular Physics'},
-                                'MI': {'L3': '6130',
-                                       'swe': 'Medicinsk bildfysik',
-                                       'eng': 'Physics of Medical Imaging'},
-                                'nuclear': {'L3': '6131',
-                                            'swe': 'Kärnfysik',
-                                            'eng': 'Nuclear Physics'},
-                                'NPS': {'L3': '6132',
-                                        'swe': 'Kärnkraftssäkerhet',
-                                        'eng': 'Nuclear Power Safety'},
-                                'particle': {'L3': '6133',
-                                             'swe': 'Partikel- och astropartikelfysik',
-                                             'eng': 'Particle and Astroparticle Physics'},
-                                'condensed': {'L3': '876906',
-                                              'swe': 'Kondenserade materiens teori',
-                                              'eng': 'Condensed Matter Theory'},
-                                'Q1r': {'L3': '876907',
-                                        'swe': 'Matematisk fysik',
-                                        'eng': 'Mathematical Physics'},
-                                'Q1s': {'L3': '876908',
-                                        'swe': 'Materialteori',
-                                        'eng': 'Theory of Materials'},
-                                'Q1t': {'L3': '876909',
-                                        'swe': 'Statistisk fysik',
-                                        'eng': 'Statistical Physics'},
-                                'Q1u': {'L3': '876910',
-                                        'swe': 'Teoretisk biologisk fysik',
-                                        'eng': 'Theoretical Biological Physics'},
-                                'Q1v': {'L3': '876911',
-                                        'swe': 'Teoretisk partikelfysik',
-                                        'eng': 'Theoretical Particle Physics'},
-                                'NE': {'L3': '880050',
-                                       'swe': 'Kärnenergiteknik',
-                                       'eng': 'Nuclear Engineering'},
-                                'Q1w': {'L3': '880100',
-                                        'swe': 'Reaktorfysik och teknologi',
-                                        'eng': 'Reactor physics and technology'},
-                                }
-                  },
-        'MATH': {'L2': "6115",
-                 'swe': 'Matematik (Inst.)',
-                 'eng': 'Mathematics (Dept.)',
-                 'divisions': {'math': {'L3': '6116',
-                                        'swe': 'Matematik (Avd.)',
-                                        'eng': 'Mathematics (Div.)'},
-                               'mathstat': {'L3': '6117',
-                                            'swe': 'Matematisk statistik',
-                                            'eng': 'Mathematical Statistics'},
-                               'optsys': {'L3': '6118',
-                                          'swe': 'Optimeringslära och systemteori',
-                                          'eng': 'Optimization and Systems Theory'},
-                               'NA': {'L3': '11800',
-                                      'swe': 'Numerisk analys',
-                                      'eng': 'Numerical Analysis'},
-                               }
-                 },
-        'Mekanik': {'L2': '6119',
-                    'swe': 'Mekanik',
-                    'eng': 'Mechanics'
-                    },
-        'TEKMEK': { 'L2': "882656",
-                    'swe': 'Teknisk mekanik',
-                    'eng': 'Engineering Mechanics',
-                    'divisions': {'Farkostteknik och Solidmekanik': {'L3': "882657",
-                                                                     'swe': 'Farkostteknik och Solidmekanik',
-                                                                     'eng': 'Vehicle Engineering and Solid Mechanics'},
-                                  'Strömningsmekanik och Teknisk Akustik': {'L3': '882658',
-                                                                            'swe': 'Strömningsmekanik och Teknisk Akustik',
-                                                                            'eng': 'Fluid Mechanics and Engineering Acoustics'},
-                                  }
-                   },
-        'APHYS': {'L2': '6108',
-                  'swe': 'Tillämpad fysik',
-                  'eng': 'Applied Physics',
-                  'divisions': {'biox': {'L3': '6109',
-                                         'swe': 'Biomedicinsk fysik och röntgenfysik',
-                                         'eng': 'Biomedical and X-ray Physics'},
-                                'laserphysics': {'L3': '6112',
-                                                 'swe': 'Laserfysik',
-                                                 'eng': 'Laser Physics'},
-                                'nanophysics': {'L3': '6113',
-                                                'swe': 'Nanostrukturfysik',
-                                                'eng': 'Nanostructure Physics'},
-                                'qeo': {'L3': '880051',
-                                        'swe': 'Kvant- och biofotonik',
-                                        'eng': 'Quantum and Biophotonics'},
-                                'mnp': {'L3': '880052',
-                                        'swe': 'Material- och nanofysik',
-                                        'eng': 'Materials and Nanophysics'},
-                                'photonics': {'L3': '880053',
-                                              'swe': 'Fotonik',
-                                              'eng': 'Photonics'},
-                                'biophysics': {'L3': '880054',
-                                               'swe': 'Biofysik',
-                                               'eng': 'Biophysics'},
-                                }
-                  }
-    },
-    'CBH': {
-        'MTH': {'L2': "879308",
-                'swe': 'Medicinteknik och hälsosystem',
-                'eng': 'Biomedical Engineering and Health Systems',
-                'divisions': {'biomedical-imaging': {'L3': '879320',
-                                                     'swe': 'Medicinsk avbildning',
-                                                     'eng': 'Medical Imaging'},
-                              'ergonomi': {'L3': '879322',
-                                           'swe': 'Ergonomi',
-                                           'eng': 'Ergonomics'},
-                              'grundlaggande-naturv': {'L3': '879323',
-                                                       'swe': 'Grundläggande naturvetenskap',
-                                                       'eng': 'Basic Science'},
-                              'health-informatics': {'L3': '880401',
-                                                     'swe': 'Hälsoinformatik och logistik',
-                                                     'eng': 'Health Informatics and Logistics'},
-                              'Q1x': {'L3': '880402',
-                                      'swe': 'Människa och Kommunikation',
-                                      'eng': 'Human Communication Science'},
-                              'teknisk-vardvetenska': {'L3': '880403',
-                                                       'swe': 'Teknisk vårdvetenskap',
-                                                       'eng': 'Technology in Health Care'},
-                              'omgivningsfysiologi': {'L3': '879317',
-                                                      'swe': 'Omgivningsfysiologi',
-                                                      'eng': 'Environmental Physiology'},
-                              'neuronik': {'L3': '879318',
-                                           'swe': 'Neuronik',
-                                           'eng': 'Neuronic Engineering'},
-                              '': {'L3': '879319',
-                                   'swe': 'Strukturell bioteknik',
-                                   'eng': 'Structural Biotechnology'},
-                              }
-                },
-        'CHE': {'L2': "879316",
-                'swe': 'Kemi',
-                'eng': 'Chemistry',
-                'divisions': {'orgkem': {'L3': '879324',
-                                         'swe': 'Organisk kemi',
-                                         'eng': 'Organic chemistry'},
-                              'glykovetenskap': {'L3': '879326',
-                                                 'swe': 'Glykovetenskap',
-                                                 'eng': 'Glycoscience'},
-                              'tfk': {'L3': '879359',
-                                      'swe': 'Tillämpad fysikalisk kemi',
-                                      'eng': 'Applied Physical Chemistry'},
-                              '': {'L3': '879325',
-                                   'swe': 'Yt- och korrosionsvetenskap',
-                                   'eng': 'Surface and Corrosion Science'},
-                              }
-                },
-        'KET': {'L2': "879314",
-                'swe': 'Kemiteknik',
-                'eng': 'Chemical Engineering',
-                'divisions': {'energy-processes': {'L3': '879328',
-                                                   'swe': 'Energiprocesser',
-                                                   'eng': 'Energy Processes'},
-                              'resource-recovery': {'L3': '879331',
-                                                    'swe': 'Resursåtervinning',
-                                                    'eng': 'Resource recovery'},
-                              'electrochem': {'L3': '879332',
-                                              'swe': 'Tillämpad elektrokemi',
-                                              'eng': 'Applied Electrochemistry'},
-                              'nuclear': {'L3': '-2',
-                                          'swe': 'Kärnavfallsteknik',
-                                          'eng': 'Nuclear Waste Engineering'},
-                              'Q1y': {'L3': '879327',
-                                      'swe': 'Kemisk apparatteknik',
-                                      'eng': 'Chemical Engineering'},
-                              'Q1z': {'L3': '879333',
-                                      'swe': 'Teknisk strömningslära',
-                                      'eng': 'Transport Phenomena'},
-                              'Q1å': {'L3': '879334',
-                                      'swe': 'Processteknologi',
-                                      'eng': 'Process Technology'},
-                              'Q1ä': {'L3': '879650',
-                                      'swe': 'Kemisk teknologi',
-                                      'eng': 'Chemical Technology'},
-                              }
-                },
-        'FPT': {'L2': "879315",
-                'swe': 'Fiber- och polymerteknologi',
-                'eng': 'Fibre- and Polymer Technology',
-                'divisions': {
-                    '': {'L3': '879336',
-                         'swe': 'Polymerteknologi',
-                         'eng': 'Polymer Technology'},
-                    '': {'L3': '879337',
-                         'swe': 'Polymera material',
-                         'eng': 'Polymeric Materials'},
-                    '': {'L3': '879338',
-                         'swe': 'Ytbehandlingsteknik',
-                         'eng': 'Coating Technology'},
-                    '': {'L3': '879339',
-                         'swe': 'Träkemi och massateknologi',
-                         'eng': 'Wood Chemistry and Pulp Technology'},
-                    '': {'L3': '879340',
-                         'swe': 'Fiberteknologi',
-                         'eng': 'Fibre Technology'},
-                    '': {'L3': '879341',
-                         'swe': 'Biokompositer',
-                         'eng': 'Biocomposites'},
-                }
-                },
-        'GTE': {'L2': '879312',
-                'swe': 'Genteknologi',
-                'eng': 'Gene Technology',
-                },
-        'DIB': {'L2': '879311',
-                'swe': 'Industriell bioteknologi',
-                'eng': 'Industrial Biotechnology'
-                },
-        'IIP': {'L2': '879311',
-                'swe': 'Industriell bioteknologi',
-                'eng': 'Industrial Biotechnology'
-                },
-        'PRO': {'L2': "879309",
-                'swe': 'Proteinvetenskap',
-                'eng': 'Protein Science',
-                'divisions': {'nanobio': {'L3': '879342',
-                                          'swe': 'Nanobioteknologi',
-                                          'eng': 'Nano Biotechnology'},
-                              'sysbio': {'L3': '879343',
-                                         'swe': 'Systembiologi',
-                                         'eng': 'Systems Biology'},
-                              'cellular-proteomics': {'L3': '879344',
-                                                      'swe': 'Cellulär och klinisk proteomik',
-                                                      'eng': 'Cellular and Clinical Proteomics'},
-                              'affinity-proteomics': {'L3': '879345',
-                                                      'swe': 'Affinitets-proteomik',
-                                                      'eng': 'Affinity Proteomics'},
-                              'prot-tech': {'L3': '879346',
-                                            'swe': 'Proteinteknologi',
-                                            'eng': 'Protein Technology'},
-                              'proteineng': {'L3': '879347',
-                                             'swe': 'Proteinvetenskap',
-                                             'eng': 'Protein Engineering'},
-                              'drug-discovery': {'L3': '879348',
-                                                 'swe': 'Läkemedelsutveckling',
-                                                 'eng': 'Drug Discovery and Development'},
-                              }
-                },
-        'TCB': {'L2': '879310',
-                'swe': 'Teoretisk kemi och biologi',
-                'eng': 'Theoretical Chemistry and Biology',
-                'divisions': {
-
-                        }
-                }
-    },
-    'EECS': {
-        'CS': { 'L2': "882650",
-                'swe': 'Datavetenskap',
-                'eng': 'Computer Science',
-                'divisions': {'CoS': {'L3': '879305',
-                                      'swe': 'Kommunikationssystem',
-                                      'eng': 'Communication Systems'
-                                      },
-                              'CST': {'L3': '879225',
-                                      'swe': 'Beräkningsvetenskap och beräkningsteknik',
-                                      'eng': 'Computational Science and Technology'
-                                      },
-                              'NSE': {'L3': '879231',
-                                      'swe': 'Nätverk och systemteknik',
-                                      'eng': 'Network and Systems Engineering'
-                                      },
-                              'SCS': {'L3': '879232',
-                                      'swe': 'Programvaruteknik och datorsystem',
-                                      'eng': 'Software and Computer systems'
-                                      },
-                              'TCS': {'L3': '879237',
-                                      'swe': 'Teoretisk datalogi',
-                                      'eng': 'Theoretical Computer Science'
-                                      },
-                              }
-               },
-        'EE': {'L2': '882654',
-               'swe': 'Elektroteknik',
-               'eng': 'Electrical Engineering',
-               'divisions': {'EME': {'L3': '879226',
-                                     'swe': 'Elektroteknisk teori och konstruktion',
-                                     'eng': 'Electromagnetic Engineering'
-                                     },
-                             'EPE': {'L3': '879227',
-                                     'swe': 'Elkraftteknik',
-                                     'eng': 'Electric Power and Energy Systems'
-                                     },
-                             'EES': {'L3': '879249',
-                                     'swe': 'Elektronik och inbyggda system',
-                                     'eng': 'Electronics and Embedded systems'},
-                             'FPP': {'L3': '879228',
-                                     'swe': 'Fusionsplasmafysik',
-                                     'eng': 'Fusion Plasma Physics'
-                                     },
-                             'SPP': {'L3': '879235',
-                                     'swe': 'Rymd- och plasmafysik',
-                                     'eng': 'Space and Plasma Physics'
-                                     },
-
-                                 }
-               },
-        'IS':  {'L2': '882651',
-                'swe': 'Intelligenta system',
-                'eng': "Intelligent systems",
-                'divisions': {'MNS': {'L3': '879230',
-                                      'swe': 'Mikro- och nanosystemteknik',
-                                      'eng': 'Micro and Nanosystems'
-                                      },
-                              'AC': {'L3': '879233',
-                                     'swe': 'Reglerteknik',
-                                     'eng': 'Decision and Control Systems (Automatic Control)'
-                                     },
-                              'RPL': {'L3': '879234',
-                                      'swe': 'Robotik, perception och lärande',
-                                      'eng': 'Robotics, Perception and Learning'
-                                      },
-                              'ISE': {'L3': '879236',
-                                      'swe': 'Teknisk informationsvetenskap',
-                                      'eng': 'Information Science and Engineering'
-                                      },
-                              'TMH': {'L3': '879302',
-                                      'swe': 'Tal, musik och hörsel',
-                                      'eng': 'Speech, Music and Hearing'
-                                      },
-                              'CAS': {'L3': '882655',
-                                      'swe': 'Collaborative Autonomous Systems',
-                                      'eng': 'Collaborative Autonomous Systems'
-                                      },
-                              }
-                },
-        'HCT': {'L2': '882653',
-                'swe': 'Människocentrerad teknologi',
-                'eng': 'Human Centered Technology',
-                'divisions': {'MID': {'L3': '879229',
-                                      'swe': 'Medieteknik och interaktionsdesign',
-                                      'eng': 'Media Technology and Interaction Design'
-                                      }
-                              },
-                },
-
-        }
-}
-
-# the first argument is the acronym of the school, while the seconds is a string name of a department
-def departments_acronym(l1, s2):
-    if l1 not in departments_info:
-        return None
-    for d in departments_info[l1]:
-        if s2 == departments_info[l1][d]['swe'] or s2 == departments_info[l1][d]['eng']:
-            return d
-    return None
-
-def diva_codes_for_departments_KTH_L2_acronyms(l1, l2):
-    global Verbose_Flag
-    if l1:
-        l1_code=departments_info.get(l1, None)
-        if Verbose_Flag:
-            print("L1 = {}".format(l1_code))
-        if l1_code and l2:
-            l2_code=departments_info[l1].get(l2, None)
-            if Verbose_Flag:
-                print("L2 = {}".format(l2_code))
-            return l2_code.get('L2', None)
-    return None
 
 programcodes={
     'ARKIT': {'cycle': 2,
@@ -1763,751 +1040,6 @@ education_program_diva={
               }
 }
 
-# Subject/course codes
-subject_area_codes_diva={
-    '10260': {'eng': 'Accelerator Technique',
-              'swe': 'Acceleratorteknik'
-              },
-    '10306': {'eng': 'Aeronautical Engineering',
-              'swe': 'Flygteknik'
-              },
-    '10261': {'eng': 'Analytical Chemistry',
-              'swe': 'Analytisk kemi'
-              },
-    '10262': {'eng': 'Antenna Systems Technology',
-              'swe': 'Antennsystemteknik'
-              },
-    '10423': {'eng': 'Applied Information Technology',
-              'swe': 'Tillämpad informationsteknik'
-              },
-    '10424': {'eng': 'Applied Logistics',
-              'swe': 'Tillämpad logistik'
-              },
-    '10426': {'eng': 'Applied Material Physics',
-              'swe': 'Tillämpad materialfysik'
-              },
-    '10427': {'eng': 'Applied Materials Technology',
-              'swe': 'Tillämpad materialteknologi'
-              },
-    '10425': {'eng': 'Applied Mathematical Analysis',
-              'swe': 'Tillämpad matematisk analys'
-              },
-    '28053': {'eng': 'Applied Mathematics and Industrial Economics',
-              'swe': 'Tillämpad matematik och industriell ekonomi'
-              },
-    '10422': {'eng': 'Applied Physics',
-              'swe': 'Tillämpad fysik'
-              },
-    '10428': {'eng': 'Applied Process Metallurgy',
-              'swe': 'Tillämpad processmetallurgi'
-              },
-    '10369': {'eng': 'Applied Thermodynamics',
-              'swe': 'Mekanisk värmeteori'
-              },
-    '10429': {'eng': 'Applied Thermodynamics',
-              'swe': 'Tillämpad termodynamik'
-              },
-    '10258': {'eng': 'Architectural Lighting Design and Health',
-              'swe': 'Ljusdesign och hälsa'
-              },
-    '10349': {'eng': 'Architectural Lighting Design',
-              'swe': 'Ljusdesign'
-              },
-    '10264': {'eng': 'Architecture',
-              'swe': 'Arkitektur'
-              },
-    '10397': {'eng': 'Automatic Control',
-              'swe': 'Reglerteknik'
-              },
-    '10269': {'eng': 'Biocomposites',
-              'swe': 'Biokompositer'
-              },
-    '10410': {'eng': 'Biomechanics',
-              'swe': 'Teknik i vården, biomekanik'
-              },
-    '10270': {'eng': 'Biomedical Engineering',
-              'swe': 'Biomedicinsk teknik'
-              },
-    '10253': {'eng': 'Biotechnology',
-              'swe': 'Bioteknologi'
-              },
-    '10271': {'eng': 'Biotechnology',
-              'swe': 'Bioteknik'
-              },
-    '10273': {'eng': 'Building and Real Estate Economics',
-              'swe': 'Bygg- och fastighetsekonomi'
-              },
-    '10484': {'eng': 'Building Design',
-              'swe': 'Projektering'
-              },
-    '10275': {'eng': 'Building Materials',
-              'swe': 'Byggnadsmateriallära'
-              },
-    '10471': {'eng': 'Building Services Engineering and Energy',
-              'swe': 'Installationsteknik och energi'
-              },
-    '10277': {'eng': 'Building Technology',
-              'swe': 'Byggnadsteknik'
-              },
-    '10449': {'eng': 'Building Technology',
-              'swe': 'Byggteknik'
-              },
-    '10266': {'eng': 'Built Environment Analysis',
-              'swe': 'Bebyggelseanalys'
-              },
-    '10485': {'eng': 'Built Environment',
-              'swe': 'Samhällsbyggnad'
-              },
-    '10371': {'eng': 'Casting of Metals',
-              'swe': 'Metallernas gjutning'
-              },
-    '10336': {'eng': 'Ceramic Materials',
-              'swe': 'Keramiska material'
-              },
-    '10337': {'eng': 'Ceramics',
-              'swe': 'Keramteknologi'
-              },
-    '10335': {'eng': 'Chemical Engineering',
-              'swe': 'Kemiteknik'
-              },
-    '10472': {'eng': 'Chemical Science and Engineering',
-              'swe': 'Kemivetenskap'
-              },
-    '10344': {'eng': 'Circuit Electronics',
-              'swe': 'Kretselektronik'
-              },
-    '10481': {'eng': 'Civil Engineering Management',
-              'swe': 'Produktionsteknik'
-              },
-    '10338': {'eng': 'Communication Networks',
-              'swe': 'Kommunikationsnät'
-              },
-    '10340': {'eng': 'Communication Theory',
-              'swe': 'Kommunikationsteori'
-              },
-    '10339': {'eng': 'Communications Systems',
-              'swe': 'Kommunikationssystem'
-              },
-    '10420': {'eng': 'Computational Thermodynamics',
-              'swe': 'Termodynamisk modellering'
-              },
-    '10279': {'eng': 'Computer and Systems Sciences',
-              'swe': 'Data- och systemvetenskap'
-              },
-    '10281': {'eng': 'Computer Communication',
-              'swe': 'Datorkommunikation'
-              },
-    '10452': {'eng': 'Computer Engineering with Business Economics',
-              'swe': 'Datateknik med ekonomi'
-              },
-    '10453': {'eng': 'Computer Engineering with Industrial Economy',
-              'swe': 'Datateknik med industriell ekonomi'
-              },
-    '10460': {'eng': 'Computer Networks and Communication',
-              'swe': 'Datornätverk och kommunikation'
-              },
-    '10282': {'eng': 'Computer Networks',
-              'swe': 'Datornätverk'
-              },
-    '10459': {'eng': 'Computer Networks',
-              'swe': 'Datornät'
-              },
-    '10280': {'eng': 'Computer Science',
-              'swe': 'Datalogi'
-              },
-    '10280': {'eng': 'Computer Science and Engineering',
-              'swe': 'Datalogi'
-              },
-    '10283': {'eng': 'Computer Systems',
-              'swe': 'Datorsystem'
-              },
-    '10454': {'eng': 'Computer Technology and Graphic Programming',
-              'swe': 'Datateknik och grafikprogrammering'
-              },
-    '10456': {'eng': 'Computer Technology and Real Time Programming',
-              'swe': 'Datateknik och realtidsprogrammering'
-              },
-    '10455': {'eng': 'Computer Technology and Software Engineering',
-              'swe': 'Datateknik och programutveckling'
-              },
-    '10457': {'eng': 'Computer Technology, Networks and Security',
-              'swe': 'Datateknik, nätverk och säkerhet'
-              },
-    '10458': {'eng': 'Computer Technology, Program- and System Development',
-              'swe': 'Datateknik, program- och systemutveckling'
-              },
-    '10268': {'eng': 'Concrete Structures',
-              'swe': 'Betongbyggnad'
-              },
-    '10341': {'eng': 'Condensed Matter Physics',
-              'swe': 'Kondenserade materiens fysik'
-              },
-    '10274': {'eng': 'Construction Management and Economics',
-              'swe': 'Byggandets organisation och ekonomi'
-              },
-    '10278': {'eng': 'Construction Management',
-              'swe': 'Byggprojektledning'
-              },
-    '10448': {'eng': 'Constructional Design',
-              'swe': 'Byggdesign'
-              },
-    '10450': {'eng': 'Constructional Engineering and Design with Business Economics',
-              'swe': 'Byggteknik och design med ekonomi'
-              },
-    '10451': {'eng': 'Constructional Engineering and Design',
-              'swe': 'Byggteknik och design'
-              },
-    '10342': {'eng': 'Corrosion Science',
-              'swe': 'Korrosionslära'
-              },
-    '10284': {'eng': 'Design and Building',
-              'swe': 'Design och byggande'
-              },
-    '10445': {'eng': 'Design and Product Development',
-              'swe': 'Design och produktframtagning'
-              },
-    '10446': {'eng': 'Design and Vehicle Engineering',
-              'swe': 'Farkostteknik'
-              },
-    '10285': {'eng': 'Discrete Mathematics',
-              'swe': 'Diskret matematik'
-              },
-    '10257': {'eng': 'Economics of Innovation and Growth',
-              'swe': 'Innovations- och tillväxtekonomi'
-              },
-    '10289': {'eng': 'Electric Power Systems',
-              'swe': 'Elektriska energisystem'
-              },
-    '10463': {'eng': 'Electrical Engineering with Industrial Economy',
-              'swe': 'Elektroteknik med industriell ekonomi'
-              },
-    '10295': {'eng': 'Electrical Engineering',
-              'swe': 'Elektroteknik'
-              },
-    '10290': {'eng': 'Electrical Machines and Drives',
-              'swe': 'Elektriska maskiner och drivsystem'
-              },
-    '10291': {'eng': 'Electrical Machines and Power Electronic',
-              'swe': 'Elektriska maskiner och kraftelektronik'
-              },
-    '10287': {'eng': 'Electrical Measurements',
-              'swe': 'Elektrisk mätteknik'
-              },
-    '10288': {'eng': 'Electrical Plant Engineering',
-              'swe': 'Elektriska anläggningar'
-              },
-    '10292': {'eng': 'Electroacoustics',
-              'swe': 'Elektroakustik'
-              },
-    '10418': {'eng': 'Electromagnetic Theory',
-              'swe': 'Teoretisk elektroteknik'
-              },
-    '10294': {'eng': 'Electronic System Design',
-              'swe': 'Elektroniksystemkonstruktion'
-              },
-    '10293': {'eng': 'Electronic- and Computer Systems',
-              'swe': 'Elektronik- och datorsystem'
-              },
-    '10461': {'eng': 'Electronics and Communications',
-              'swe': 'Elektronik och kommunikation'
-              },
-    '10462': {'eng': 'Electronics Design',
-              'swe': 'Elektronikkonstruktion'
-              },
-    '10466': {'eng': 'Embedded System Design',
-              'swe': 'Inbyggda system'
-              },
-    '10296': {'eng': 'Energy and Climate Studies',
-              'swe': 'Energi och klimatstudier'
-              },
-    '10297': {'eng': 'Energy and Furnace Technology',
-              'swe': 'Energi- och ugnsteknik'
-              },
-    '10298': {'eng': 'Energy Processes',
-              'swe': 'Energiprocesser'
-              },
-    '10251': {'eng': 'Energy Technology',
-              'swe': 'Energiteknik'
-              },
-    '10487': {'eng': 'Engineering and Management',
-              'swe': 'Teknik och management'
-              },
-    '10415': {'eng': 'Engineering Material Physics',
-              'swe': 'Teknisk materialfysik'
-              },
-    '10488': {'eng': 'Engineering Physics',
-              'swe': 'Teknisk fysik'
-              },
-    '10255': {'eng': 'Entrepreneurship and Innovation Management',
-              'swe': 'Entreprenörskap och innovationsledning'
-              },
-    '10376': {'eng': 'Environmental Assessment',
-              'swe': 'Miljöbedömning'
-              },
-    '10377': {'eng': 'Environmental Strategies',
-              'swe': 'Miljöstrategisk analys'
-              },
-    '10300': {'eng': 'Ergonomics',
-              'swe': 'Ergonomi'
-              },
-    '10447': {'eng': 'Facilities for Infrastructure',
-              'swe': 'Anläggningar för infrastruktur'
-              },
-    '10304': {'eng': 'Fiber Technology',
-              'swe': 'Fiberteknologi'
-              },
-    '10464': {'eng': 'Finance',
-              'swe': 'Finans'
-              },
-    '28052': {'eng': 'Financial Mathematics',
-              'swe': 'Finansiell matematik'
-              },
-    '10402': {'eng': 'Fluid Mechanics',
-              'swe': 'Strömningsmekanik'
-              },
-    '10316': {'eng': 'Foundry Technology',
-              'swe': 'Gjuteriteknik'
-              },
-    '10309': {'eng': 'Fusion Plasma Physics',
-              'swe': 'Fusionsplasmafysik'
-              },
-    '10314': {'eng': 'Geodesy',
-              'swe': 'Geodesi'
-              },
-    '10315': {'eng': 'Geoinformatics',
-              'swe': 'Geoinformatik'
-              },
-    '10317': {'eng': 'Ground Water Chemistry',
-              'swe': 'Grundvattenkemi'
-              },
-    '10440': {'eng': 'Heat Transfer',
-              'swe': 'Värmetransporter'
-              },
-    '10435': {'eng': 'Heating and Ventilating Technology',
-              'swe': 'Uppvärmnings- och ventilationsteknik'
-              },
-    '10321': {'eng': 'High Voltage Engineering',
-              'swe': 'Högspänningsteknik'
-              },
-    '10439': {'eng': 'Highway Engineering',
-              'swe': 'Vägteknik'
-              },
-    '10412': {'eng': 'History of Technology',
-              'swe': 'Teknikhistoria'
-              },
-    '10380': {'eng': 'Human - Computer Interaction',
-              'swe': 'Människa - datorinteraktion'
-              },
-    '10437': {'eng': 'Hydraulic Engineering',
-              'swe': 'Vattenbyggnad'
-              },
-    '10322': {'eng': 'Industrial Biotechnology',
-              'swe': 'Industriell bioteknologi'
-              },
-    '10469': {'eng': 'Industrial Business Administration and Manufacturing',
-              'swe': 'Industriell ekonomi och produktion'
-              },
-    '10327': {'eng': 'Industrial Control Systems',
-              'swe': 'Industriella styrsystem'
-              },
-    '10323': {'eng': 'Industrial Design',
-              'swe': 'Industriell design'
-              },
-    '10324': {'eng': 'Industrial Ecology',
-              'swe': 'Industriell ekologi'
-              },
-    '10325': {'eng': 'Industrial Economics and Management',
-              'swe': 'Industriell ekonomi'
-              },
-    '10468': {'eng': 'Industrial Economy and Entrepreneurship',
-              'swe': 'Industriell ekonomi och entreprenörsskap'
-              },
-    '10467': {'eng': 'Industrial IT',
-              'swe': 'Industriell IT'
-              },
-    '10329': {'eng': 'Information and Communication Technology',
-              'swe': 'Informations- och kommunikationsteknik'
-              },
-    '10328': {'eng': 'Information and Software Systems',
-              'swe': 'Information- och programvarusystem'
-              },
-    '10330': {'eng': 'Information Technology',
-              'swe': 'Informationsteknik'
-              },
-    '10470': {'eng': 'Innovation and Design',
-              'swe': 'Innovation och design'
-              },
-    '10382': {'eng': 'Inorganic Chemistry',
-              'swe': 'Oorganisk kemi'
-              },
-    '10331': {'eng': 'Integrated Product Development',
-              'swe': 'Integrerad produktutveckling'
-              },
-    '10313': {'eng': 'Internal Combustion Engineering',
-              'swe': 'Förbränningsmotorteknik'
-              },
-    '10354': {'eng': 'Land and Water Resources',
-              'swe': 'Mark- och vattenresurslära'
-              },
-    '10254': {'eng': 'Land Management',
-              'swe': 'Fastighetsvetenskap'
-              },
-    '10352': {'eng': 'Lightweight Structures',
-              'swe': 'Lättkonstruktioner'
-              },
-    '10475': {'eng': 'Logistics, Business Administration and Manufacturing',
-              'swe': 'Logistik, ekonomi och produktion'
-              },
-    '10350': {'eng': 'Logistics',
-              'swe': 'Logistik'
-              },
-    '10356': {'eng': 'Machine Design',
-              'swe': 'Maskinkonstruktion'
-              },
-    '10351': {'eng': 'Machine Elements',
-              'swe': 'Läran om maskinelement'
-              },
-    '10355': {'eng': 'Machine Elements',
-              'swe': 'Maskinelement'
-              },
-    '10363': {'eng': 'Material Physics',
-              'swe': 'Materialfysik'
-              },
-    '10360': {'eng': 'Materials and Process Design',
-              'swe': 'Material och processdesign'
-              },
-    '10444': {'eng': 'Materials Design and Engineering',
-              'swe': 'Materialdesign'
-              },
-    '10361': {'eng': 'Materials Processing',
-              'swe': 'Materialens processteknologi'
-              },
-    '10478': {'eng': 'Materials Science and Engineering',
-              'swe': 'Materialvetenskap'
-              },
-    '10359': {'eng': 'Mathematical Statistics',
-              'swe': 'Matematisk statistik'
-              },
-    '10358': {'eng': 'Mathematics',
-              'swe': 'Matematik'
-              },
-    '10473': {'eng': 'Mechanical Design',
-              'swe': 'Konstruktion'
-              },
-    '10477': {'eng': 'Mechanical Engineering with Industrial Economy',
-              'swe': 'Maskinteknik med industriell ekonomi'
-              },
-    '10476': {'eng': 'Mechanical Engineering',
-              'swe': 'Maskinteknik'
-              },
-    '10368': {'eng': 'Mechanical Metallurgy',
-              'swe': 'Mekanisk metallografi'
-              },
-    '10367': {'eng': 'Mechanics',
-              'swe': 'Mekanik'
-              },
-    '10479': {'eng': 'Mechatronics and Robotics',
-              'swe': 'Mekatronik och robotik'
-              },
-    '10370': {'eng': 'Mechatronics',
-              'swe': 'Mekatronik'
-              },
-    '10366': {'eng': 'Media Technology',
-              'swe': 'Medieteknik'
-              },
-    '10365': {'eng': 'Medical Engineering',
-              'swe': 'Medicinsk teknik'
-              },
-    '10364': {'eng': 'Medical Imaging',
-              'swe': 'Medicinsk bildbehandling'
-              },
-    '10265': {'eng': 'Metal Working',
-              'swe': 'Bearbetningsteknik'
-              },
-    '10375': {'eng': 'Micro Modelling in Process Science',
-              'swe': 'Mikromodellering inom processvetenskap'
-              },
-    '10373': {'eng': 'Microcomputer Systems',
-              'swe': 'Mikrodatorsystem'
-              },
-    '10374': {'eng': 'Microelectronics and Applied Physics',
-              'swe': 'Mikroelektronik och tillämpad fysik'
-              },
-    '10480': {'eng': 'Mobile Communications Systems',
-              'swe': 'Mobil kommunikation'
-              },
-    '10378': {'eng': 'Molecular Biotechnology',
-              'swe': 'Molekylär bioteknik'
-              },
-    '10379': {'eng': 'Music Acoustics',
-              'swe': 'Musikakustik'
-              },
-    '10353': {'eng': 'Naval Systems',
-              'swe': 'Marina system'
-              },
-    '10346': {'eng': 'Nuclear Chemistry',
-              'swe': 'Kärnkemi'
-              },
-    '10395': {'eng': 'Nuclear Reactor Engineering',
-              'swe': 'Reaktorteknologi'
-              },
-    '10381': {'eng': 'Numerical Analysis',
-              'swe': 'Numerisk analys'
-              },
-    '10383': {'eng': 'Optics',
-              'swe': 'Optik'
-              },
-    '10384': {'eng': 'Optimization and Systems Theory',
-              'swe': 'Optimeringslära och systemteori'
-              },
-    '10385': {'eng': 'Organic Chemistry',
-              'swe': 'Organisk kemi'
-              },
-    '10386': {'eng': 'Paper Technology',
-              'swe': 'Pappersteknik'
-              },
-    '10305': {'eng': 'Philosophy',
-              'swe': 'Filosofi'
-              },
-    '10308': {'eng': 'Photonics with Microwave Engineering',
-              'swe': 'Fotonik med mikrovågsteknik'
-              },
-    '10312': {'eng': 'Physical Chemistry',
-              'swe': 'Fysikalisk kemi'
-              },
-    '10311': {'eng': 'Physical Electrotechnology',
-              'swe': 'Fysikalisk elektroteknik'
-              },
-    '10372': {'eng': 'Physical Metallurgy',
-              'swe': 'Metallografi'
-              },
-    '10310': {'eng': 'Physics',
-              'swe': 'Fysik'
-              },
-    '10431': {'eng': 'Planning of Traffic and Transportation',
-              'swe': 'Trafikplanering'
-              },
-    '10387': {'eng': 'Plasma Physics',
-              'swe': 'Plasmafysik'
-              },
-    '10389': {'eng': 'Polymer Technology',
-              'swe': 'Polymerteknologi'
-              },
-    '10388': {'eng': 'Polymeric Materials',
-              'swe': 'Polymera material'
-              },
-    '10286': {'eng': 'Power Electronics',
-              'swe': 'Effektelektronik'
-              },
-    '10362': {'eng': 'Process Science of Materials',
-              'swe': 'Materialens processvetenskap'
-              },
-    '10390': {'eng': 'Product Realisation and Management',
-              'swe': 'Produktframtagning'
-              },
-    '10326': {'eng': 'Production Engineering',
-              'swe': 'Industriell produktion'
-              },
-    '10319': {'eng': 'Project in Fluid Power',
-              'swe': 'Hydraulik och pneumatik'
-              },
-    '10392': {'eng': 'Project Management and Operational Development',
-              'swe': 'Projektledning och verksamhetsutveckling'
-              },
-    '10357': {'eng': 'Pulp Technology',
-              'swe': 'Massateknologi'
-              },
-    '10394': {'eng': 'Radio Communication Systems',
-              'swe': 'Radiosystemteknik'
-              },
-    '10393': {'eng': 'Radio Electronics',
-              'swe': 'Radioelektronik'
-              },
-    '10333': {'eng': 'Railway Operation',
-              'swe': 'Järnväg och tågtrafik'
-              },
-    '10334': {'eng': 'Railway Technology',
-              'swe': 'Järnvägsteknik'
-              },
-    '10347': {'eng': 'Reactor Safety',
-              'swe': 'Kärnkraftsäkerhet'
-              },
-    '10252': {'eng': 'Real Estate Development and Land Law',
-              'swe': 'Mark- och fastighetsjuridik'
-              },
-    '10302': {'eng': 'Real Estate Economics',
-              'swe': 'Fastighetsekonomi'
-              },
-    '10465': {'eng': 'Real Estate Management',
-              'swe': 'Förvaltning'
-              },
-    '10303': {'eng': 'Real Estate Planning',
-              'swe': 'Fastighetsteknik'
-              },
-    '10345': {'eng': 'Refrigerating Engineering',
-              'swe': 'Kylteknik'
-              },
-    '10396': {'eng': 'Regional Planning',
-              'swe': 'Regional planering'
-              },
-    '10421': {'eng': 'Reliability Centred Asset Management for Electrical Power Systems',
-              'swe': 'Tillförlitlighetsananlys för elkraftsystem'
-              },
-    '10398': {'eng': 'Risk and Safety',
-              'swe': 'Risk och säkerhet'
-              },
-    '10407': {'eng': 'Safety Research',
-              'swe': 'Säkerhetsforskning'
-              },
-    '10267': {'eng': 'Scientific Computing',
-              'swe': 'Beräkningsteknik'
-              },
-    '10318': {'eng': 'Semiconductor Materials',
-              'swe': 'Halvledarmaterial'
-              },
-    '10400': {'eng': 'Signal Processing',
-              'swe': 'Signalbehandling'
-              },
-    '10483': {'eng': 'Software Design',
-              'swe': 'Programvaruutveckling'
-              },
-    '10391': {'eng': 'Software Engineering',
-              'swe': 'Programvaruteknik'
-              },
-    '10482': {'eng': 'Software Engineering',
-              'swe': 'Programutveckling'
-              },
-    '10332': {'eng': 'Soil and Rock Mechanics',
-              'swe': 'Jord- och bergmekanik'
-              },
-    '10320': {'eng': 'Solid Mechanics',
-              'swe': 'Hållfasthetslära'
-              },
-    '10301': {'eng': 'Solid State Electronics',
-              'swe': 'Fasta tillståndets elektronik'
-              },
-    '10348': {'eng': 'Sound and Image Processing',
-              'swe': 'Ljud- och bildbehandling'
-              },
-    '10443': {'eng': 'Space and Plasma Physics',
-              'swe': 'Rymd- och plasmafysik'
-              },
-    '10399': {'eng': 'Space Physics',
-              'swe': 'Rymdfysik'
-              },
-    '10408': {'eng': 'Speech Communication',
-              'swe': 'Talkommunikation'
-              },
-    '10409': {'eng': 'Speech Communication',
-              'swe': 'Talöverföring'
-              },
-    '10403': {'eng': 'Steel Structures',
-              'swe': 'Stålbyggnad'
-              },
-    '10272': {'eng': 'Structural Design and Bridges',
-              'swe': 'Brobyggnad'
-              },
-    '10474': {'eng': 'Structural Engineering',
-              'swe': 'Konstruktionsteknik'
-              },
-    '10276': {'eng': 'Structural Mechanics and Engineering',
-              'swe': 'Byggnadsstatik'
-              },
-    '10442': {'eng': 'Surface Chemistry',
-              'swe': 'Ytkemi'
-              },
-    '10441': {'eng': 'Surface Coating Technology',
-              'swe': 'Ytbehandlingsteknik'
-              },
-    '10414': {'eng': 'Surveying',
-              'swe': 'Teknisk geodesi'
-              },
-    '10436': {'eng': 'Sustainable Buildings',
-              'swe': 'Uthålliga byggnader'
-              },
-    '10750': {'eng': 'Sustainable development',
-              'swe': 'Hållbar utveckling'
-              },
-    '10486': {'eng': 'System Engineering',
-              'swe': 'Systemutveckling'
-              },
-    '10404': {'eng': 'System-on-Chip',
-              'swe': 'System på kisel'
-              },
-    '10405': {'eng': 'Systems Analysis and Economics',
-              'swe': 'Systemanalys och ekonomi'
-              },
-    '10406': {'eng': 'Systems Engineering',
-              'swe': 'Systemteknik'
-              },
-    '10413': {'eng': 'Technical Acoustics',
-              'swe': 'Teknisk akustik'
-              },
-    '10411': {'eng': 'Technology and Learning',
-              'swe': 'Teknik och lärande'
-              },
-    '10489': {'eng': 'Tele and Data Communication',
-              'swe': 'Tele- och datakommunikation'
-              },
-    '10417': {'eng': 'Telecommunication Systems',
-              'swe': 'Telekommunikationssystem'
-              },
-    '10416': {'eng': 'Teleinformatics',
-              'swe': 'Teleinformatik'
-              },
-    '10419': {'eng': 'Theoretical Physics',
-              'swe': 'Teoretisk fysik'
-              },
-    '10343': {'eng': 'Thermal Engineering',
-              'swe': 'Kraft- och värmeteknologi'
-              },
-    '10430': {'eng': 'Traffic and Transport Planning',
-              'swe': 'Trafik- och transportplanering'
-              },
-    '10432': {'eng': 'Transport- and Location Analysis',
-              'swe': 'Transport- och lokaliseringsanalys'
-              },
-    '20650': {'eng': 'Urban and Regional Planning',
-              'swe': 'Urban och regional planering'
-              },
-    '10401': {'eng': 'Urban Planning and Design',
-              'swe': 'Stadsplanering och design'
-              },
-    '10307': {'eng': 'Vehicle Engineering',
-              'swe': 'Fordonsteknik'
-              },
-    '10438': {'eng': 'Water Resources Engineering',
-              'swe': 'Vattenvårdsteknik'
-              },
-    '10259': {'eng': 'Water, Sewage and Waste',
-              'swe': 'VA och avfall'
-              },
-    '10433': {'eng': 'Wood Chemistry',
-              'swe': 'Träkemi'
-              },
-    '10434': {'eng': 'Wood Technology and Processing',
-              'swe': 'Träteknologi'
-              },
-    '10263': {'eng': 'Work Science',
-              'swe': 'Arbetsvetenskap'
-              },
-    '34700': { 'eng': 'Master of Science in Engineering - Engineering Chemistry',
-               'swe': 'Civilingenjörsexamen - Teknisk kemi'
-               },
-    '34550': { 'eng': 'Master of Science - Information and Network Engineering',
-               'swe': 'Teknologie masterexamen - Information och nätverksteknologi'
-               },
-    '35000': { 'eng': 'Master of Science - Technology, Work and Health',
-               'swe': 'Teknologie masterexamen - Teknik, arbete och hälsa'
-               },
-    '30301': { 'eng': 'Bridging Teacher Education Programme in Mathematics,Science and Technology for Graduates with a Third Cycle Degree',
-               'swe': 'Kompletterande pedagogisk utbildning för ämneslärarexamen i matematik, naturvetenskap och teknik för forskarutbildade'
-               },
-    '30300': { 'eng': 'Bridging Teacher Education Programme',
-               'swe': 'Kompletterande pedagogisk utbildning'
-               }
-}
-
 levels_in_diva={
     'H1': { 'eng': 'Independent thesis Advanced level (degree of Master (One Year))',
             'swe': 'Självständigt arbete på avancerad nivå (magisterexamen)'
@@ -2580,13 +1112,6 @@ def guess_diva_level_code_from_program(prgmcode):
         return None
 
 
-def lookup_subject_area_eng(s1):
-    for s in subject_area_codes_diva:
-        se=subject_area_codes_diva[s].get('eng', None)
-        if se and se == s1:
-            return s
-    return None
-
 university_credits_diva={
     '4': { 'credits': 5.0, # 5 HE credits
            'swe': '3 poäng / 5 hp'
@@ -2753,6 +1278,8 @@ def compute_diva_org_code(org_l1_acronym, org_l2_acronym):
 
     if org_l1_acronym and org_l2_acronym:
         diva_org_code=diva_codes_for_departments_KTH_L2_acronyms(org_l1_acronym, org_l2_acronym)
+        if not diva_org_code:
+            diva_org_code=diva_organization_snapshot.department_org_id(org_l1_acronym, org_l2_acronym)
         if type(diva_org_code) == str:
             print("diva_org_code={0}".format(diva_org_code))
             if diva_org_code in inserted_diva_org_codes:
@@ -2811,7 +1338,7 @@ def orgization_to_full_organization_and_acronyms(org, first_name, last_name):
 
             else:
                 # if no, then look up the name (in either Enlish or Swedish) 
-                org_l1_acronym=schools_acronym(org_l1)
+                org_l1_acronym=schools_acronym(org_l1) or diva_organization_snapshot.school_acronym(org_l1)
                 print("org_l1={0}, org_l1_acronym={1}".format(org_l1, org_l1_acronym))
                 if org_l1_acronym:
                     org_l1="{0} ({1})".format(org_l1, org_l1_acronym)
@@ -2838,7 +1365,7 @@ def orgization_to_full_organization_and_acronyms(org, first_name, last_name):
 
             else:
                 # if no, then look up the name (in either Enlish or Swedish) 
-                org_l2_acronym=departments_acronym(org_l1_acronym, org_l2)
+                org_l2_acronym=departments_acronym(org_l1_acronym, org_l2) or diva_organization_snapshot.department_acronym(org_l1_acronym, org_l2)
                 print("org_l2={0}, org_l2_acronym={1}".format(org_l2, org_l2_acronym))
                 if org_l2_acronym:
                     org_l2="{0} ({1})".format(org_l2, org_l2_acronym)
@@ -2860,16 +1387,21 @@ def orgization_to_full_organization_and_acronyms(org, first_name, last_name):
             'org_l2_acronym': org_l2_acronym
             }
 
+def mods_collection_element():
+    import xml.etree.ElementTree as ET
+    root = ET.Element("modsCollection")
+    root.set("xmlns", "http://www.loc.gov/mods/v3")
+    root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
+    root.set("xsi:schemaLocation", "http://www.loc.gov/mods/v3 http://www.loc.gov/standards/mods/v3/mods-3-2.xsd")
+    return root
+
 def process_dict_to_XML(content, extras):
     global testing
     global inserted_diva_org_codes
     inserted_diva_org_codes=set()
     #
     import xml.etree.ElementTree as ET
-    root = ET.Element("modsCollection")
-    root.set("xmlns", "http://www.loc.gov/mods/v3")
-    root.set("xmlns:xsi", "http://www.w3.org/2001/XMLSchema-instance")
-    root.set("xsi:schemaLocation", "http://www.loc.gov/mods/v3 http://www.loc.gov/standards/mods/v3/mods-3-2.xsd")
+    root = mods_collection_element()
     mods = ET.Element("mods")
     root.append(mods)
     mods.set("xmlns", "http://www.loc.gov/mods/v3")
@@ -2968,6 +1500,8 @@ def process_dict_to_XML(content, extras):
                         organisation.set("authority", "kth")
                         if a_org_l1_acronym and a_org_l2_acronym:
                             diva_org_code=diva_codes_for_departments_KTH_L2_acronyms(a_org_l1_acronym, a_org_l2_acronym)
+                            if not diva_org_code:
+                                diva_org_code=diva_organization_snapshot.department_org_id(a_org_l1_acronym, a_org_l2_acronym)
                             if type(diva_org_code) == str:
                                 print("diva_org_code={0}".format(diva_org_code))
                                 organisation.set('xlink:href', diva_org_code)
@@ -3060,6 +1594,8 @@ def process_dict_to_XML(content, extras):
                         organisation.set("authority", "kth")
                         if e_org_l1_acronym and e_org_l2_acronym:
                             diva_org_code=diva_codes_for_departments_KTH_L2_acronyms(e_org_l1_acronym, e_org_l2_acronym)
+                            if not diva_org_code:
+                                diva_org_code=diva_organization_snapshot.department_org_id(e_org_l1_acronym, e_org_l2_acronym)
                             if type(diva_org_code) == str:
                                 print("diva_org_code={0}".format(diva_org_code))
                                 organisation.set('xlink:href', diva_org_code)
@@ -3545,6 +2081,145 @@ def process_dict_to_XML(content, extras):
     return xmlData
 
 
+#######################################################################
+# Batch mode: many JSON files -> one MODS collection (or one MODS file per record)
+#
+# The records are converted in a pool of worker processes, so the (slow) imports and the construction of the
+# tables above are only done once per worker rather than once per thesis. A record that cannot be converted
+# is reported and skipped - it does not stop the batch.
+#######################################################################
+
+# Returns a list of (name, content) for the records in a directory of JSON files or in a JSON lines file
+# ('-' for stdin). If a record cannot be read, content is the error message (a string) rather than a dict.
+def read_batch_records(source):
+    records=[]
+    if os.path.isdir(source):
+        for filename in sorted(os.listdir(source)):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(source, filename), 'r', encoding='utf-8') as json_FH:
+                    records.append((filename[:-5], json.load(json_FH)))
+            except (OSError, ValueError) as e:
+                records.append((filename[:-5], "unable to read JSON: {}".format(e)))
+        return records
+
+    if source == '-':
+        lines=sys.stdin.readlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as json_FH:
+            lines=json_FH.readlines()
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        name="{0}-{1}".format(os.path.basename(source[:-6]) if source.endswith('.jsonl') else 'record', line_number)
+        try:
+            records.append((name, json.loads(line)))
+        except ValueError as e:
+            records.append((name, "unable to read JSON: {}".format(e)))
+    return records
+
+def initialize_worker(verbose, testing_flag):
+    global Verbose_Flag
+    global testing
+    Verbose_Flag=verbose
+    testing=testing_flag
+
+# run in the worker process, returns (name, xmlData, error)
+# The record can have an "extras" entry (e.g., {"extras": {"trita": "TRITA-EECS-EX-2021:219"}}) that overrides the
+# extras given on the command line for this record.
+def process_record(name, content, extras):
+    if not isinstance(content, dict):
+        return name, None, content
+    record_extras=extras
+    if isinstance(content.get('extras', None), dict):
+        record_extras=dict(extras, **content['extras'])
+    try:
+        xmlData=process_dict_to_XML(content, record_extras)
+    except Exception as e:
+        return name, None, "{0}: {1}".format(type(e).__name__, e)
+    if not xmlData:
+        return name, None, "no MODS produced"
+    return name, xmlData, None
+
+# process_dict_to_XML() returns a complete <modsCollection> holding one <mods> element,
+# split this into the part up to and including the <modsCollection ...> tag and the <mods> element itself
+def split_mods_collection(xmlData):
+    start=xmlData.find(b'<modsCollection')
+    end_of_start_tag=xmlData.find(b'>', start)
+    end=xmlData.rfind(b'</modsCollection>')
+    if start < 0 or end_of_start_tag < 0 or end < 0:
+        return None, None
+    return xmlData[:end_of_start_tag+1], xmlData[end_of_start_tag+1:end]
+
+# the part up to and including the <modsCollection ...> tag, as it is in the output of process_dict_to_XML()
+def mods_collection_head():
+    import xml.etree.ElementTree as ET
+    head, empty=split_mods_collection(ET.tostring(mods_collection_element(), encoding='UTF-8', short_empty_elements=False))
+    return head
+
+# The collection is always complete (a header and a footer), even if none of the records could be converted.
+# Returns the list of (name, error) for the records that failed.
+def process_batch(source, extras, output_filename, split_directory=None, processes=None):
+    records=read_batch_records(source)
+    print("{0} records in {1}".format(len(records), source))
+    if not records:
+        return []
+
+    failures=[]
+    number_written=0
+    collection_FH=None
+    if not split_directory:
+        collection_FH=open(output_filename, 'wb')
+    elif not os.path.isdir(split_directory):
+        os.makedirs(split_directory)
+
+    try:
+        with ProcessPoolExecutor(max_workers=processes, initializer=initialize_worker, initargs=(Verbose_Flag, testing)) as executor:
+            names=[r[0] for r in records]
+            contents=[r[1] for r in records]
+            # map() returns the results in the order of the records, so the output is written in this order as they complete
+            for name, xmlData, error in executor.map(process_record, names, contents, repeat(extras), chunksize=4):
+                if error:
+                    print("Error in record {0}: {1}".format(name, error))
+                    failures.append((name, error))
+                    continue
+
+                if split_directory:
+                    with open(os.path.join(split_directory, name+'.xml'), 'wb') as filehandle:
+                        filehandle.write(xmlData)
+                    number_written=number_written+1
+                    continue
+
+                head, mods_element=split_mods_collection(xmlData)
+                if head is None:
+                    print("Error in record {0}: unexpected MODS output".format(name))
+                    failures.append((name, "unexpected MODS output"))
+                    continue
+                if number_written == 0:
+                    # the header of the first record, so the output is as for a single record
+                    collection_FH.write(head)
+                collection_FH.write(mods_element)
+                collection_FH.flush()
+                number_written=number_written+1
+    finally:
+        if collection_FH:
+            if number_written == 0:
+                collection_FH.write(mods_collection_head())
+            collection_FH.write(b'</modsCollection>')
+            collection_FH.close()
+
+    if split_directory:
+        print("wrote {0} MODS files to {1}".format(number_written, split_directory))
+    else:
+        print("wrote {0} MODS records to {1}".format(number_written, output_filename))
+    if failures:
+        print("{0} of {1} records failed:".format(len(failures), len(records)))
+        for name, error in failures:
+            print("\t{0}: {1}".format(name, error))
+    return failures
+
+
 def main(argv):
     global Verbose_Flag
     global testing
@@ -3577,6 +2252,30 @@ def main(argv):
                       help="JSON file for extracted data"
                       )
 
+    argp.add_argument('-b', '--batch',
+                      type=str,
+                      default=None,
+                      help="directory of JSON files or a JSON lines file (- for stdin) to convert into a single MODS collection"
+                      )
+
+    argp.add_argument('-o', '--output',
+                      type=str,
+                      default='modsXML.xml',
+                      help="name of the MODS output file"
+                      )
+
+    argp.add_argument('--split',
+                      type=str,
+                      default=None,
+                      help="in batch mode, write one MODS file per record into this directory"
+                      )
+
+    argp.add_argument('--processes',
+                      type=int,
+                      default=None,
+                      help="number of worker processes in batch mode (default: one per CPU)"
+                      )
+
     argp.add_argument('--cycle',
                       type=int,
                       help="cycle of thesis"
@@ -3658,6 +2357,12 @@ def main(argv):
     if x:
         extras['school_acronym']=x
 
+    if args['batch']:
+        failures=process_batch(args['batch'], extras, args['output'], args['split'], args['processes'])
+        if failures:
+            return 1
+        return
+
     d=None
     json_filename=args["json"]
     if json_filename:
@@ -3675,7 +2380,7 @@ def main(argv):
         if d:
             xmlData=process_dict_to_XML(d, extras)
             if xmlData:             # write out results
-                with open('modsXML.xml','wb+') as filehandle:
+                with open(args['output'],'wb+') as filehandle:
                     filehandle.write(xmlData)
                     filehandle.close()
                     if Verbose_Flag:
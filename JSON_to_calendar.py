@@ -39,6 +39,8 @@ import os			# to make OS calls, here to get time zone info
 
 import requests, time
 
+import canvas_client            # shared, pooled Canvas REST client
+
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
@@ -474,6 +476,7 @@ def initialize(args):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
 
 
             if configuration.get('KTH_Calendar_API') and configuration['KTH_Calendar_API'].get('host') and configuration['KTH_Calendar_API'].get('key'):
@@ -495,40 +498,10 @@ def initialize(args):
 
 # Canvas API related functions
 def list_of_accounts():
-    global Verbose_Flag
-    
-    entries_found_thus_far=[]
-
     # Use the Canvas API to get the list of accounts this user can see
     # GET /api/v1/accounts
     url = "{0}/accounts".format(baseUrl)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-
-    if Verbose_Flag:
-        print("result of getting accounts: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            entries_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            if Verbose_Flag:
-                print("result of getting accounts for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                entries_found_thus_far.append(p_response)
-
-    return entries_found_thus_far
+    return canvas_client.get_paginated_list(url)
 
 # Announcements
 # Announcements are a special type of discussion in Canvas
@@ -536,43 +509,14 @@ def list_of_accounts():
 #
 
 def list_of_canvas_course_announcements(course_id):
-    global Verbose_Flag
-    
-    entries_found_thus_far=[]
-
     # Use the Canvas API to get the list of accounts this user can see
     # GET /api/v1/announcements
     url = "{0}/announcements".format(baseUrl)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
     extra_parameters={'per_page': '100'}
     if course_id:
         extra_parameters['context_codes[]']="course_{}".format(course_id)
 
-    r = requests.get(url, params=extra_parameters, headers = header)
-
-    if Verbose_Flag:
-        print("result of getting announcements: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            entries_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            if Verbose_Flag:
-                print("result of getting accounts for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                entries_found_thus_far.append(p_response)
-
-    return entries_found_thus_far
+    return canvas_client.get_paginated_list(url, extra_parameters)
 
 
 
@@ -762,16 +706,9 @@ def get_seminarlist_from_Cortina(seminartype, school, department, year):
 # Canvas related functions
 
 def list_of_canvas_calendar_events(course_id, start, end):
-    global Verbose_Flag
-    
-    entries_found_thus_far=[]
-
     # Use the Canvas API to get the list of calendar events this user can see in this course
     # GET /api/v1/calendar_events
     url = "{0}/calendar_events".format(baseUrl)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
     start_date=start[0:10]
     end_date=end[0:10]
     print("start_date={}".format(start_date))
@@ -781,30 +718,7 @@ def list_of_canvas_calendar_events(course_id, start, end):
                       'end_date':   end_date
                       }
 
-
-    r = requests.get(url, params=extra_parameters, headers = header)
-
-    if Verbose_Flag:
-        print("result of getting calendar events: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            entries_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            if Verbose_Flag:
-                print("result of getting accounts for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                entries_found_thus_far.append(p_response)
-
-    return entries_found_thus_far
+    return canvas_client.get_paginated_list(url, extra_parameters)
 
 
 def create_calendar_event(course_id, start, end, title, description, location_name, location_address):
@@ -30,14 +30,12 @@ import pandas as pd
 
 import pprint
 
-# for dealing with MODS file
-from bs4 import BeautifulSoup
-
 # for dealing with XML
-from eulxml import xmlmap
-from eulxml.xmlmap import load_xmlobject_from_file, mods
 import lxml.etree as etree
 
+# streaming reader for the MODS file
+from mods_loader import iter_mods_records
+
 from collections import defaultdict
 
 
@@ -84,7 +82,7 @@ def cycle_of_program(s):
 
 
 # processing of MODS data:
-def extract_list_of_dicts_from_mods(tree):
+def extract_list_of_dicts_from_mods(mods_records):
     global testing
     json_records=list()
     current_subject_language=''
@@ -92,29 +90,30 @@ def extract_list_of_dicts_from_mods(tree):
     list_of_topics_Swedish=list()
     thesis_abstract_language=list()
 
-    for i in range(0, len(tree.node)):
+    # the records are read one at a time, each record (node) is cleared once the next one is read
+    for i, node in enumerate(mods_records):
         if testing and i > 10:   # limit the number of theses to process when testing
             break
         print("processing node={}".format(i))
-        if tree.node[i].tag.count("}modsCollection") == 1:
+        if node.tag.count("}modsCollection") == 1:
             # case of a modsCollection
             if Verbose_Flag:
-                print("Tag: " + tree.node[i].tag)
+                print("Tag: " + node.tag)
                 print("Attribute: ")
-                print(tree.node[i].attrib)
+                print(node.attrib)
                 # case of a mods
-        elif tree.node[i].tag.count("}mods") == 1:
+        elif node.tag.count("}mods") == 1:
             if Verbose_Flag:
-                print("new mods Tag: " + tree.node[i].tag)
-                #  print "Attribute: " + etree.tostring(tree.node[i].attrib, pretty_print=True) 
-                print("Attribute: {}".format(tree.node[i].attrib))
+                print("new mods Tag: " + node.tag)
+                #  print "Attribute: " + etree.tostring(node.attrib, pretty_print=True) 
+                print("Attribute: {}".format(node.attrib))
                 
             # extract information about the publication
             pub_info=dict()
 
 
             #
-            current_mod=tree.node[i]
+            current_mod=node
             pub_info['node']=[i]
 
             pub_info['thesis_title']=dict()
@@ -422,12 +421,8 @@ def process_entries_from_MODS_file(mods_filename):
     global testing
     global course_id
 
-    try:
-        with open(mods_filename, "rb") as mods_data_file:
-            tree=load_xmlobject_from_file(mods_data_file, mods.MODS)
-            xml=BeautifulSoup(mods_data_file, 'lxml-xml')
-
-    except:
+    # the file is parsed once, as the records are read, rather than loading it both with eulxml and BeautifulSoup
+    if not os.path.isfile(mods_filename):
         print("Unable to open mods file named {}".format(mods_filename))
         print("Please create a suitable mods file, the default name is theses.mods")
         sys.exit()
@@ -439,7 +434,7 @@ def process_entries_from_MODS_file(mods_filename):
         #<Element {http://www.loc.gov/mods/v3}modsCollection at 0x34249b0>
         #>>> tree.node[1]
         #<Element {http://www.loc.gov/mods/v3}mods at 0x3d46aa0>
-        json_records=extract_list_of_dicts_from_mods(tree)
+        json_records=extract_list_of_dicts_from_mods(iter_mods_records(mods_filename))
         if Verbose_Flag:
             print("json_records={}".format(json_records))
         output_filename="testing.json"
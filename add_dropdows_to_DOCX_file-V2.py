@@ -27,6 +27,10 @@
 #    Only limited testing - this is a program still under development
 #
 # There is no longer a option "cycle" - as this is set based on the exam. 
+#
+# With --all, the covers for all of the exams and languages are generated in parallel worker processes (see --workers).
+# The template is read once and the members other than word/document.xml are copied to each output file as they are,
+# without being decompressed and recompressed.
 # 
 # 2024-06-08 G. Q. Maguire Jr.
 # Base on earlier add_dropdows_to_DOCX_file.py
@@ -48,8 +52,12 @@ from collections import defaultdict
 
 import datetime
 
+import concurrent.futures
+
 # for dealing with the DOCX file - which is a ZIP file
 import zipfile
+import struct
+import binascii
 
 try:
     import zlib
@@ -1093,18 +1101,88 @@ exams=['arkitektexamen',
 
 languages=['sv', 'en']
 
+word_document_file_name='word/document.xml'
+
 
 
-def generate_output_files(input_filename, document, exam, language):
+# The input package is read once. Each member that is not modified is kept as its local file header and compressed
+# data, so that it can be copied to each of the output files without being decompressed and recompressed.
+def read_package(input_filename):
     global Verbose_Flag
 
+    with open(input_filename, 'rb') as input_FH:
+        raw=input_FH.read()
+    document=zipfile.ZipFile(input_filename)
     file_names=document.namelist()
     if Verbose_Flag:
         print("File names in ZIP zip file: {}".format(file_names))
 
-    word_document_file_name='word/document.xml'
-    word_docprop_custom_file_name='docProps/custom.xml'
-    if word_document_file_name not in file_names:
+    package={'members': [], 'document': None}
+    for zinfo in document.infolist():
+        if zinfo.filename == word_document_file_name:
+            package['document']=document.read(zinfo).decode('utf-8')
+            package['members'].append((zinfo, None))
+            continue
+        # the local file header is 30 bytes followed by the file name and the extra field, whose lengths are at offset 26
+        filename_length, extra_length=struct.unpack('<HH', raw[zinfo.header_offset+26:zinfo.header_offset+30])
+        data_offset=zinfo.header_offset+30+filename_length+extra_length
+        end_offset=data_offset+zinfo.compress_size
+        if zinfo.flag_bits & 0x08:
+            # a data descriptor follows the data, with or without its optional signature
+            if raw[end_offset:end_offset+4] == b'PK\x07\x08':
+                end_offset=end_offset+16
+            else:
+                end_offset=end_offset+12
+        package['members'].append((zinfo, raw[zinfo.header_offset:end_offset]))
+    document.close()
+    return package
+
+def central_directory_entry(zinfo, header_offset):
+    dosdate=(zinfo.date_time[0] - 1980) << 9 | zinfo.date_time[1] << 5 | zinfo.date_time[2]
+    dostime=zinfo.date_time[3] << 11 | zinfo.date_time[4] << 5 | (zinfo.date_time[5] // 2)
+    filename=zinfo.filename.encode('utf-8' if zinfo.flag_bits & 0x800 else 'ascii')
+    return struct.pack(zipfile.structCentralDir, zipfile.stringCentralDir, zinfo.create_version, zinfo.create_system,
+                       zinfo.extract_version, zinfo.reserved, zinfo.flag_bits, zinfo.compress_type, dostime, dosdate,
+                       zinfo.CRC, zinfo.compress_size, zinfo.file_size, len(filename), len(zinfo.extra),
+                       len(zinfo.comment), 0, zinfo.internal_attr, zinfo.external_attr, header_offset) + filename + zinfo.extra + zinfo.comment
+
+# write a DOCX file with the members of the package, in their original order, and the new word/document.xml
+def write_package(output_filename, package, document_contents):
+    with open(output_filename, 'wb') as output_FH:
+        central_directory=[]
+        for zinfo, local_record in package['members']:
+            header_offset=output_FH.tell()
+            if local_record is None:
+                data=document_contents.encode('utf-8')
+                new_zinfo=zipfile.ZipInfo(zinfo.filename, date_time=zinfo.date_time)
+                new_zinfo.external_attr=zinfo.external_attr
+                new_zinfo.flag_bits=zinfo.flag_bits & 0x800     # UTF-8 file name
+                new_zinfo.compress_type=compression
+                new_zinfo.file_size=len(data)
+                new_zinfo.CRC=binascii.crc32(data)
+                if compression == zipfile.ZIP_DEFLATED:
+                    compressor=zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+                    data=compressor.compress(data) + compressor.flush()
+                    new_zinfo.extract_version=20
+                new_zinfo.compress_size=len(data)
+                output_FH.write(new_zinfo.FileHeader(False))
+                output_FH.write(data)
+                central_directory.append(central_directory_entry(new_zinfo, header_offset))
+            else:
+                output_FH.write(local_record)
+                central_directory.append(central_directory_entry(zinfo, header_offset))
+        start_of_central_directory=output_FH.tell()
+        for entry in central_directory:
+            output_FH.write(entry)
+        size_of_central_directory=output_FH.tell()-start_of_central_directory
+        output_FH.write(struct.pack(zipfile.structEndArchive, zipfile.stringEndArchive, 0, 0,
+                                    len(central_directory), len(central_directory),
+                                    size_of_central_directory, start_of_central_directory, 0))
+
+def generate_output_files(input_filename, package, exam, language):
+    global Verbose_Flag
+
+    if package['document'] is None:
         print("Missing file: {}".format(word_document_file_name))
         return
 
@@ -1114,25 +1192,22 @@ def generate_output_files(input_filename, document, exam, language):
         output_filename="{0}-{1}.docx".format(exam, language)
         print("outputting modified data to {}".format(output_filename))
 
-    zipOut = zipfile.ZipFile(output_filename, 'w')
-    for fn in file_names:
-        if Verbose_Flag:
-            print("processing file: {}".format(fn))
-        # copy existing file to archive
-        if fn not in [word_document_file_name]:
-            file_contents = document.read(fn)
-        else:
-            if Verbose_Flag:
-                print("processing {}".format(fn))
-            xml_content = document.read(fn).decode('utf-8')
-            if fn == word_document_file_name:
-                file_contents = transform_file(xml_content, exam, language)
-                file_contents = removed_unneded_placeholder_text(file_contents)
-            else:
-                print("Unknown file {}".format(fn))
-        # in any case write the file_contents out
-        zipOut.writestr(fn, file_contents,  compress_type=compression)
-    zipOut.close()
+    if Verbose_Flag:
+        print("processing {}".format(word_document_file_name))
+    file_contents = transform_file(package['document'], exam, language)
+    file_contents = removed_unneded_placeholder_text(file_contents)
+    write_package(output_filename, package, file_contents)
+    return output_filename
+
+# used by the worker processes in the --all case
+def initialize_worker(verbose, worker_package):
+    global Verbose_Flag
+    global package
+    Verbose_Flag=verbose
+    package=worker_package
+
+def generate_output_files_in_worker(input_filename, exam, language):
+    return generate_output_files(input_filename, package, exam, language)
 
 
 def main(argv):
@@ -1176,6 +1251,12 @@ def main(argv):
                       help="DOCX template"
                       )
 
+    argp.add_argument('--workers',
+                      type=int,
+                      default=None,
+                      help="number of worker processes for --all (default: the number of CPUs)"
+                      )
+
 
     args = vars(argp.parse_args(argv))
 
@@ -1216,18 +1297,19 @@ def main(argv):
         print("File name must be specified")
         return
 
-    document = zipfile.ZipFile(input_filename)
-    
+    package=read_package(input_filename)
+
     if not generate_all:
-        generate_output_files(input_filename, document, exam, language)
+        generate_output_files(input_filename, package, exam, language)
     else:
-        for exam in exams:
-            print(f'Working on {exam}')
-            for language in languages:
-                print(f'for {language}')
-                generate_output_files(input_filename, document, exam, language)
-
-    document.close()
+        # each combination of exam and language is generated in a worker process
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args['workers'], initializer=initialize_worker,
+                                                    initargs=(Verbose_Flag, package)) as executor:
+            futures={executor.submit(generate_output_files_in_worker, input_filename, exam, language): (exam, language)
+                     for exam in exams for language in languages}
+            for future in concurrent.futures.as_completed(futures):
+                exam, language=futures[future]
+                print(f'Finished {exam} for {language}: {future.result()}')
 
 
 if __name__ == '__main__':
@@ -13,6 +13,10 @@
 # ./augment-kth-dept-teaching.py
 #   by default it processes the personal.xlsx file
 #
+# All of the department sheets in the file (except 'EECS VS') are processed, so a file made by kth-dept-teaching.py for
+# other schools can also be augmented. The sheets are read at once, the course items and organizations of each person
+# are parsed once, and the course columns are added to a sheet together.
+#
 # 2022-04-10 G. Q. Maguire Jr.
 # buids on kth-dept-teaching.py
 #
@@ -25,6 +29,7 @@ import argparse
 import os                       # to make OS calls, here to get time zone info
 
 import requests
+import http_cache
 
 import time
 
@@ -72,7 +77,7 @@ def get_user_by_name(name):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = http_cache.get(url, headers = header)
     if Verbose_Flag:
         print("result of getting profile: {}".format(r.text))
 
@@ -120,16 +125,11 @@ def main(argv):
     #dept_url=args['url']
     #print("URL is {}".format(dept_url))
 
-    base_eecs_url='https://www.kth.se/directory/j'
+    excluded_sheets=['EECS VS']  # not relevant for augmentation, possible dropt this sheet
+
+    sheets=pd.read_excel(open(args['file'], 'rb'), sheet_name=None)
+    depts=[dept for dept in sheets if dept not in excluded_sheets]
 
-    depts={
-        'CS': 'https://www.kth.se/directory/j/jh',
-        'EE': 'https://www.kth.se/directory/j/jj',
-        # 'EECS VS': 'https://www.kth.se/directory/j/jb',   # not relevant for augmentation, possible dropt this sheet
-        'HCT': 'https://www.kth.se/directory/j/jm',
-        'IS': 'https://www.kth.se/directory/j/jr'
-    }
-    
     if not testing:
         writer = pd.ExcelWriter('personnel-augmented.xlsx', engine='xlsxwriter')
 
@@ -148,16 +148,14 @@ def main(argv):
         courses_cycle3=[]
 
         print("dept={}".format(dept))
-        working_df = pd.read_excel(open(args['file'], 'rb'), sheet_name=dept)
+        working_df = sheets[dept]
         # process the dept's data
         personell_summary[dept]=dict()
 
-        for index, row in working_df.iterrows():
-            course_items=row['courses.items']
-            course_items=literal_eval(course_items)
+        course_items_by_row=working_df['courses.items'].map(literal_eval).tolist()
+        for course_items in course_items_by_row:
             for course in course_items:
                 course_code=course['code']
-                course_roles=course['roles']
                 course_titles=course['title']
                 if course_code not in course_code_info:
                     course_code_info[course_code]=course_titles
@@ -213,61 +211,44 @@ def main(argv):
             for c in degree_project_courses_cycle2:
                 print("{0}: {1}".format(c, course_code_info[c]))
 
-        # Add one column to the spreadsheet per course code
+        # Add one column to the spreadsheet per course code, the codes that are not in any of these lists come last
         courses_cycle1.sort()
-        for c in courses_cycle1:
-            working_df[c]=""
         courses_cycle2.sort()
-        for c in courses_cycle2:
-            working_df[c]=""
         courses_cycle3.sort()
-        for c in courses_cycle3:
-            working_df[c]=""
-
         degree_project_courses_cycle1.sort()
-        for c in degree_project_courses_cycle1:
-            working_df[c]=""
         degree_project_courses_cycle2.sort()
-        for c in degree_project_courses_cycle2:
-            working_df[c]=""
-
+        course_columns=courses_cycle1+courses_cycle2+courses_cycle3+degree_project_courses_cycle1+degree_project_courses_cycle2
+        course_columns=course_columns+[c for c in course_code_info if c not in set(course_columns)]
 
         # augment spreadsheet
-        for index, row in working_df.iterrows():
-            course_items=row['courses.items']
-            course_items=literal_eval(course_items)
-
+        roles_by_course={c: [""]*len(working_df) for c in course_columns}
+        works_for_by_row=working_df['worksFor.items'].tolist()
+        for position, course_items in enumerate(course_items_by_row):
+            if not course_items:
+                continue
             for course in course_items:
-                course_code=course['code']
-                course_roles=course['roles']
-                working_df.at[index, course_code]=course_roles
-                worksFor=literal_eval(row['worksFor.items'])
-                #[{'key': 'app.katalog3.J.JH', 'path': 'j/jh', 'name': 'CS DATAVETENSKAP', 'nameEn': 'DEPARTMENT OF COMPUTER SCIENCE', 'location': ''}, {'key': 'app.katalog3.J.JH.JHK', 'path': 'j/jh/jhk', 'name': 'PROGRAMVARUTEKN & DATORSYSTEM', 'nameEn': 'DIVISION OF SOFTWARE AND COMPUTER SYSTEMS', 'location': 'KISTAGÅNGEN 16, 16440 KISTA'}]
-                longest_path=0
-                for w in worksFor:
-                    path=w['path']
-                    if path:
-                        split_path=path.split('/')
-                        if len(split_path) > longest_path:
-                            longest_path=len(split_path)
-                            name=w['name']
-                            working_df.at[index, 'worksFor.items']=name
+                roles_by_course[course['code']][position]=course['roles']
+            worksFor=literal_eval(works_for_by_row[position])
+            #[{'key': 'app.katalog3.J.JH', 'path': 'j/jh', 'name': 'CS DATAVETENSKAP', 'nameEn': 'DEPARTMENT OF COMPUTER SCIENCE', 'location': ''}, {'key': 'app.katalog3.J.JH.JHK', 'path': 'j/jh/jhk', 'name': 'PROGRAMVARUTEKN & DATORSYSTEM', 'nameEn': 'DIVISION OF SOFTWARE AND COMPUTER SYSTEMS', 'location': 'KISTAGÅNGEN 16, 16440 KISTA'}]
+            longest_path=0
+            for w in worksFor:
+                path=w['path']
+                if path:
+                    split_path=path.split('/')
+                    if len(split_path) > longest_path:
+                        longest_path=len(split_path)
+                        works_for_by_row[position]=w['name']
+        working_df['worksFor.items']=works_for_by_row
+        working_df=pd.concat([working_df, pd.DataFrame(roles_by_course, index=working_df.index)], axis=1)
 
         # sort rows
         working_df.sort_values(by=['worksFor.items', 'title.sv', 'lastName', 'firstName'], inplace=True)
 
 
-        new_row=dict()
-        for course in course_code_info:
-            course_name=course_code_info[course].get('sv')
-            new_row[course]=course_name
-        working_df=working_df.append(new_row, ignore_index=True)
-            
-        new_row=dict()
-        for course in course_code_info:
-            course_name=course_code_info[course].get('en')
-            new_row[course]=course_name
-            working_df=working_df.append(new_row, ignore_index=True)
+        # add a row with the Swedish and a row with the English names of the courses
+        name_rows=[{course: course_code_info[course].get('sv') for course in course_code_info},
+                   {course: course_code_info[course].get('en') for course in course_code_info}]
+        working_df=pd.concat([working_df, pd.DataFrame(name_rows)], ignore_index=True)
 
         # remove unwanted columns
         unwanted_columns=['Unnamed: 0', '_id', 'acceptedTerms', 'isAdminHidden', 'createdAt',
@@ -276,21 +257,18 @@ def main(argv):
                           'avatar.visibility', 'room.placesId', 'room.title', 'links.visibility',
                           'links.items', 'description.visibility', 'description.sv', 'description.en', 'links',
                           'socialId', 'images.big', 'images.visibility', 'description', 'room', '__v', 'courses.visibility']
-        working_df.drop(unwanted_columns, inplace=True, axis=1)
+        working_df.drop(unwanted_columns, inplace=True, axis=1, errors='ignore')
 
         if not testing:
             working_df.to_excel(writer, sheet_name=dept)
 
 
-    summary_df=pd.DataFrame()
-    for dept in depts:
-        summary_df=summary_df.append(summary[dept], ignore_index=True)
-
-    summary_df.to_excel(writer, sheet_name='Summary')
+    summary_df=pd.DataFrame([summary[dept] for dept in depts])
 
     # Close the Pandas Excel writer and output the Excel file.
     if not testing:
-        writer.save()
+        summary_df.to_excel(writer, sheet_name='Summary')
+        writer.close()
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
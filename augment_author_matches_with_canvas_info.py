@@ -13,6 +13,10 @@
 # ./augment_author_matches_with_canvas_info.py --file titles-all-EECS-df1-author-matches.xlsx
 #   by default it processes the titles-all-EECS-df1-author-matches.xlsx file
 #
+# The LADOK id to Canvas user lookups are cached in ladok_id_to_canvas_user.json (change with --cache FILE),
+# so a re-run only asks Canvas about LADOK ids that it has not found before (the ids that were not found are
+# looked up again on each run). Use --refresh to ignore the cache.
+#
 # 2022-12-07 G. Q. Maguire Jr.
 # buids on augment-kth-dept-people-URL.py
 # removed testing data
@@ -28,6 +32,9 @@ import os                       # to make OS calls, here to get time zone info
 import pprint
 
 import requests, time
+from concurrent.futures import ThreadPoolExecutor
+
+import canvas_client            # shared, pooled Canvas REST client
 
 import openpyxl
 # Use Python Pandas to create XLSX files
@@ -67,6 +74,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -77,99 +85,24 @@ def initialize(options):
 # Canvas related routines
 #//////////////////////////////////////////////////////////////////////
 def users_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
     extra_parameters={'per_page': '100',
                       'type': ['StudentEnrollment'],
                       #'state': ['active', 'completed']
                       #'state': ['active', 'invited', 'creation_pending', 'deleted', 'rejected', 'completed', 'inactive']
     }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas_client.users_in_course(course_id, extra_parameters)
 
 def students_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['StudentEnrollment']
-    }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas_client.students_in_course(course_id)
 
 def teachers_in_course(course_id):
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['TeacherEnrollment']
-    }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas_client.teachers_in_course(course_id)
 
 
 def users_in_accounts(account_id, user_id):
@@ -208,18 +141,7 @@ def users_in_accounts(account_id, user_id):
 def user_info(user_id):
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/users/:id
-
-    url = "{0}/users/{1}".format(baseUrl, user_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting user: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        return r.json()
-    return None
+    return canvas_client.user_info(user_id)
 
 def user_profile_info(user_id):
     # Use the Canvas API to get the list of users enrolled in this course
@@ -239,33 +161,9 @@ def user_profile_info(user_id):
 
 
 def courses_for_a_user(user_id):
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     # GET /api/v1/users/:user_id/courses
-
-    url = "{0}/users/{1}/courses".format(baseUrl,user_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100' }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses for a uuser: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas_client.courses_for_a_user(user_id)
 
 
 def lookup_user_in_canvas_with_ladok_id(ladok_id):
@@ -273,76 +171,98 @@ def lookup_user_in_canvas_with_ladok_id(ladok_id):
     ui=user_info(user_id)
     return ui
 
-def lookup_user_by_ladok_id(ladok_id, all_users):
-    print("doing the lookup by the courses for ladok_id: {}".format(ladok_id))
-
-    for u in all_users:
+#//////////////////////////////////////////////////////////////////////
+# Bulk resolution of LADOK ids (i.e., Canvas integration_ids) to Canvas users
+#//////////////////////////////////////////////////////////////////////
+def canvas_user_summary(user):
+    return { 'id':         user['id'],
+             'kthid':      user.get('sis_user_id', None),
+             'login_id':   user.get('login_id', None),
+             'name':       user.get('sortable_name', None)
+            }
+
+# add the users in a list of enrollments to an index keyed by integration_id (i.e., the LADOK id)
+def add_enrollments_to_index(enrollments, index):
+    for u in enrollments:
         integration_id=u['user'].get('integration_id', None)
-        if integration_id and integration_id == ladok_id:
-            canvas_user_id= u['user']['id']
-            kthid=u['user'].get('sis_user_id', None)
-            login_id=u['user'].get('login_id', None)
-            canvas_sortable_name=u['user'].get('sortable_name', None)
-            return { 'id':         canvas_user_id,
-                     'kthid':      kthid,
-                     'login_id':   login_id,
-                     'name':       canvas_sortable_name
-                    }
-
-    # if you cannot find the student via the above, then go deep
-    user_id="sis_integration_id:{}".format(ladok_id)
-    ui=user_info(user_id)
-    if ui:
-        canvas_user_id= ui['id']
-        canvas_sortable_name=ui.get('sortable_name', None)
-        users_courses=courses_for_a_user(canvas_user_id)
-
-        for c in users_courses:
-            students=students_in_course(c)
-            for u in students:
-                integration_id=u['user'].get('integration_id', None)
-                if integration_id and integration_id == ladok_id:
-                    canvas_user_id= u['user']['id']
-                    kthid=u['user'].get('sis_user_id', None)
-                    login_id=u['user'].get('login_id', None)
-                    canvas_sortable_name=u['user'].get('sortable_name', None)
-                    return { 'id':         canvas_user_id,
-                             'kthid':      kthid,
-                             'login_id':   login_id,
-                             'name':       canvas_sortable_name
-                            }
+        if integration_id and integration_id not in index:
+            index[integration_id]=canvas_user_summary(u['user'])
+    return index
+
+def students_in_courses(course_ids):
+    # get the students in each of the courses concurrently, the connections to Canvas are shared
+    with ThreadPoolExecutor(max_workers=canvas_client.max_workers) as executor:
+        return list(executor.map(students_in_course, course_ids))
+
+def users_in_courses(course_ids):
+    with ThreadPoolExecutor(max_workers=canvas_client.max_workers) as executor:
+        return list(executor.map(users_in_course, course_ids))
+
+def load_ladok_id_cache(cache_filename):
+    if not cache_filename or not os.path.isfile(cache_filename):
+        return dict()
+    try:
+        with open(cache_filename, 'r', encoding='utf-8') as cache_FH:
+            # older caches also recorded the LADOK ids that were not found, these are looked up again
+            return {i: u for i, u in json.load(cache_FH).items() if u}
+    except (OSError, ValueError) as e:
+        print("Unable to read cache file {0}: {1} - starting with an empty cache".format(cache_filename, e))
+        return dict()
+
+def save_ladok_id_cache(cache_filename, cache):
+    if not cache_filename:
+        return
+    # write to a temporary file and then rename, so that an interrupted run does not leave a broken cache
+    temp_filename=cache_filename+'.tmp'
+    with open(temp_filename, 'w', encoding='utf-8') as cache_FH:
+        json.dump(cache, cache_FH, ensure_ascii=False)
+    os.replace(temp_filename, cache_filename)
+
+# The fallback for the LADOK ids that are not in any of the degree project course rooms.
+# Each missing LADOK id is looked up once, then the students of the union of all of these users' courses
+# are fetched - each course only once - and indexed.
+def resolve_missing_ladok_ids(missing_ladok_ids, index):
+    missing_ladok_ids=sorted(set(missing_ladok_ids))
+    if not missing_ladok_ids:
+        return index
+
+    print("looking up {} LADOK ids that were not found in the course rooms".format(len(missing_ladok_ids)))
+    with ThreadPoolExecutor(max_workers=canvas_client.max_workers) as executor:
+        user_infos=list(executor.map(lookup_user_in_canvas_with_ladok_id, missing_ladok_ids))
+        canvas_user_ids=[ui['id'] for ui in user_infos if ui]
+        users_courses=list(executor.map(courses_for_a_user, canvas_user_ids))
+
+    course_ids=set()
+    for courses in users_courses:
+        for c in courses:
+            course_ids.add(c['id'])
 
-    return None
+    if Verbose_Flag:
+        print("fetching the students in {} additional courses".format(len(course_ids)))
+    for enrollments in students_in_courses(sorted(course_ids)):
+        add_enrollments_to_index(enrollments, index)
+    return index
 
-def lookup_user_by_ladok_id_hardway(ladok_id, all_users):
-    print("doing the lookup by the courses for ladok_id: {}".format(ladok_id))
+# Returns a dict mapping each of the LADOK ids to a summary of the Canvas user (or None if no user was found).
+# The users found are kept in the cache, so that a later run only has to ask Canvas about LADOK ids it has not found
+# before. LADOK ids that are not found are not cached, as the student might be in Canvas by the next run.
+def resolve_ladok_ids(ladok_ids, course_rooms, cache):
+    wanted=set(i for i in ladok_ids if isinstance(i, str) and i)
+    missing=[i for i in wanted if i not in cache]
+    if not missing:
+        return {i: cache.get(i, None) for i in wanted}
 
-    # if you cannot find the student via the above, then go deep
-    user_id="sis_integration_id:{}".format(ladok_id)
-    ui=user_info(user_id)
-    if ui:
-        canvas_user_id= ui['id']
-        canvas_sortable_name=ui.get('sortable_name', None)
-        print("canvas_user_id={0} {1}".format(canvas_user_id, canvas_sortable_name))
-        users_courses=courses_for_a_user(canvas_user_id)
-        print("users_courses: {}".format(users_courses))
-
-        for c in users_courses:
-            students=students_in_course(c)
-            for u in students:
-                integration_id=u['user'].get('integration_id', None)
-                if integration_id and integration_id == ladok_id:
-                    canvas_user_id= u['user']['id']
-                    kthid=u['user'].get('sis_user_id', None)
-                    login_id=u['user'].get('login_id', None)
-                    canvas_sortable_name=u['user'].get('sortable_name', None)
-                    return { 'id':         canvas_user_id,
-                             'kthid':      kthid,
-                             'login_id':   login_id,
-                             'name':       canvas_sortable_name
-                            }
+    index=dict()
+    print("indexing the users in {} course rooms".format(len(course_rooms)))
+    for enrollments in users_in_courses(sorted(set(course_rooms))):
+        add_enrollments_to_index(enrollments, index)
 
-    return None
+    resolve_missing_ladok_ids([i for i in missing if i not in index], index)
+
+    for i in missing:
+        if index.get(i, None):
+            cache[i]=index[i]
+    return {i: cache.get(i, None) for i in wanted}
 
 
 def main(argv):
@@ -374,6 +294,20 @@ def main(argv):
                       metavar="FILE"
                       )
 
+    parser.add_option('--cache',
+                      type=str,
+                      default="ladok_id_to_canvas_user.json",
+                      help="JSON file used to cache the LADOK id to Canvas user lookups",
+                      metavar="FILE"
+                      )
+
+    parser.add_option('--refresh',
+                      dest="refresh",
+                      default=False,
+                      action="store_true",
+                      help="ignore the existing cache and look up all of the LADOK ids again"
+    )
+
     options, remainder = parser.parse_args()
     
     Verbose_Flag=options.verbose
@@ -391,7 +325,8 @@ def main(argv):
 
     if testing:
         Verbose_Flag=True
-        lookup_user_by_ladok_id_hardway('e8dee006-5a94-11e8-9dae-241de8ab435c', None)
+        ladok_id='e8dee006-5a94-11e8-9dae-241de8ab435c'
+        print("{0}: {1}".format(ladok_id, resolve_ladok_ids([ladok_id], [], dict())[ladok_id]))
         return
 
     input_filename=options.file
@@ -1223,32 +1158,22 @@ def main(argv):
 
         
     ]
-    all_users=[]
+    if options.refresh:
+        cache=dict()
+    else:
+        cache=load_ladok_id_cache(options.cache)
 
-    for course_id in sorted(degree_project_course_rooms):
-        print("working on course room {}".format(course_id))
-        # look for user - then check for integration_id
-        users=users_in_course(course_id)
-        if Verbose_Flag:
-            print("users={}".format(users))
-        all_users.extend(users)
-        
-    #pprint.pprint(all_users)
+    resolved=resolve_ladok_ids(working_df['integration_id'].tolist(), degree_project_course_rooms, cache)
+    save_ladok_id_cache(options.cache, cache)
 
-    for idx, row in working_df.iterrows():
-        integration_id=row['integration_id']
-        if Verbose_Flag:
-            print("integration_id={}".format(integration_id))
-        canvas_user_info=lookup_user_by_ladok_id(integration_id, all_users)
-        
-        if Verbose_Flag:
-            print("canvas_user_info={}".format(canvas_user_info))
+    canvas_user_infos=working_df['integration_id'].map(lambda i: resolved.get(i, None) if isinstance(i, str) else None)
+    found=canvas_user_infos.notna()
+    print("found {0} of {1} rows in Canvas".format(found.sum(), len(working_df)))
+    if Verbose_Flag:
+        print("canvas_user_infos={}".format(canvas_user_infos))
 
-        if canvas_user_info:
-            working_df.at[idx, 'canvas_id']=canvas_user_info['id']
-            working_df.at[idx, 'kthid']=canvas_user_info['kthid']
-            working_df.at[idx, 'login_id']=canvas_user_info['login_id']
-            working_df.at[idx, 'canvas_sortable_name']=canvas_user_info['name']
+    for column, key in [('canvas_id', 'id'), ('kthid', 'kthid'), ('login_id', 'login_id'), ('canvas_sortable_name', 'name')]:
+        working_df.loc[found, column]=canvas_user_infos[found].map(lambda u: u[key])
 
     # Eliminate the index pseudo column
     working_df.reset_index(drop=True, inplace=True)
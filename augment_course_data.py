@@ -139,12 +139,10 @@ def df_name_to_col(df, col_name):
     return 'A'
 
 def collect_dept_names(df):
-    dept_names=set()
-    for index, row in df.iterrows():
-        dept_name=row.get('department_en', None)
-        if dept_name:
-            dept_names.add(dept_name)
-    return sorted(list(dept_names))
+    if 'department_en' not in df.columns:
+        return []
+    dept_names=df['department_en'].dropna()
+    return sorted(set(dept_names[dept_names.astype(bool)]))
 
 
 def main(argv):
@@ -256,17 +254,15 @@ def main(argv):
         dept_colors[d]={'name': d, 'color': c}
     print("dept_colors={}".format(dept_colors))
 
-    course_round_info_df.insert(1, 'cycle', '')
-    for index, row in course_round_info_df.iterrows():
-        course_code=row['code']
-        if len(course_code) == 6:
-            course_cycle=int(course_code[2])
-            course_round_info_df.at[index, 'cycle']=course_cycle
-        elif  len(course_code) == 7:
-            course_cycle=int(course_code[3])
-            course_round_info_df.at[index, 'cycle']=course_cycle
-        else:
-            print("Unable to determine cycle for course code={}".format(course_code))
+    # the cycle is the first digit of the course code
+    course_codes=course_round_info_df['code']
+    code_length=course_codes.str.len()
+    cycle=pd.Series('', index=course_round_info_df.index, dtype=object)
+    cycle[code_length == 6]=course_codes[code_length == 6].str[2].astype(int)
+    cycle[code_length == 7]=course_codes[code_length == 7].str[3].astype(int)
+    for course_code in course_codes[(code_length != 6) & (code_length != 7)]:
+        print("Unable to determine cycle for course code={}".format(course_code))
+    course_round_info_df.insert(1, 'cycle', cycle)
 
     gru_rounds=course_round_info_df.copy(deep=True)
     gru_rounds.drop(gru_rounds[(gru_rounds.cycle < 1) | (gru_rounds.cycle > 2)].index, inplace=True)
@@ -300,10 +296,7 @@ def main(argv):
 
     degree_projects_df=course_round_info_df.copy(deep=True)
     degree_projects_df.insert(2, 'degree_project', '')
-    for index, row in degree_projects_df.iterrows():
-        course_code=row['code'].upper()
-        if course_code[-1:] == 'X':
-            degree_projects_df.at[index, 'degree_project']='X'
+    degree_projects_df.loc[degree_projects_df['code'].str.upper().str[-1:] == 'X', 'degree_project']='X'
             
     degree_projects_df.drop(degree_projects_df[degree_projects_df.degree_project != 'X'].index, inplace=True)
     degree_projects_df.groupby(['code'])['number_of_students'].sum().reset_index()
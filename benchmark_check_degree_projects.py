@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./benchmark_check_degree_projects.py [--file diva_shreadsheet.xlsx] [--rows 50000]
+#
+# Purpose: Compare the time needed to check the examiners of the theses in a DiVA export row by row with iterrows()
+#          (as check_degree_projects_from_DiVA.py used to do) with the column-wise check_examiners().
+#
+# With --file, the theses are read from a DiVA export and the examiners from KTH_examiners-cycle-1.json,
+# KTH_examiners-cycle-2.json, and examiners.json (as check_degree_projects_from_DiVA.py does). Otherwise, a DiVA export
+# with the given number of rows and the examiner data are generated. The program checks that both versions produce
+# the same 'Checked' column.
+#
+# Example:
+# ./benchmark_check_degree_projects.py --file kth-student-theses-2019-20201008.xlsx
+# ./benchmark_check_degree_projects.py --rows 100000
+#
+# 2026-10-18
+#
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import contextlib
+
+import pandas as pd
+
+import check_degree_projects_from_DiVA as cdp
+
+# the row by row version, as it was in main()
+def iterrows_check_examiners(students_df, corrected_names, special_situation, all_examiners_cycle_1, all_examiners_cycle_2):
+    all_examiners=all_examiners_cycle_1.union(all_examiners_cycle_2)
+    current_level=None          # the original printed the level of the previous row for an invalid examiner
+    for index, row in  students_df.iterrows():
+        # stop when you reach an empty PID cell
+        if not (isinstance(row['PID'], int)):
+            break
+
+        sort_ordered_examiner=row['Examiners']
+        if (not (isinstance(sort_ordered_examiner, str))) or (isinstance(sort_ordered_examiner, str) and (len(sort_ordered_examiner) < 1)):
+            students_df.at[index, 'Checked'] = 'No examiner'
+            continue
+
+        status='Unchecked'
+
+        examiner=cdp.normaL_name_oder(sort_ordered_examiner)
+        if corrected_names.get(examiner, False):
+            examiner=corrected_names[examiner]
+
+        if examiner in all_examiners:
+            thesis_level=row['ThesisLevel']
+            current_level=cdp.highest_level(thesis_level)
+
+            if current_level == 2:
+                if examiner in all_examiners_cycle_2:
+                    status='Valid'
+                else:
+                    print("PID={0}, examiner={1}, current_level={2}, Not a valid level 2 examiner".format(row['PID'], examiner, current_level))
+            else:
+                if current_level == 1:
+                    if (examiner in all_examiners_cycle_1):
+                        status='Valid'
+                    else:
+                        if (examiner in all_examiners_cycle_2):
+                            print("PID={0}, examiner={1}, current_level={2}, Not a valid level 1 examiner, but a valid level 2 examiner".format(row['PID'], examiner, current_level))
+                            status='Valid'
+                else:
+                    print("PID={0}, examiner={1}, current_level={2}, Not a valid thesis level".format(row['PID'], examiner, current_level))
+        else:
+            es=special_situation.get(examiner, False)
+            if es:
+                status='Valid '+es
+            else:
+                status='Invalid examiner'
+            print("PID={0}, examiner={1}, current_level={2}, status={3}".format(row['PID'], examiner, current_level, status))
+
+        students_df.at[index, 'Checked'] = status
+    return students_df
+
+def examiners_from_files():
+    with open("KTH_examiners-cycle-1.json") as json_data_file:
+        examiners_cycle_1_info = json.load(json_data_file)
+    with open("KTH_examiners-cycle-2.json") as json_data_file:
+        examiners_cycle_2_info = json.load(json_data_file)
+    with open("examiners.json") as json_data_file:
+        examiners_data = json.load(json_data_file)
+    all_examiners_cycle_1=set()
+    for examiners in examiners_cycle_1_info['all_course_examiners'].values():
+        all_examiners_cycle_1.update(examiners)
+    all_examiners_cycle_2=set()
+    for examiners in examiners_cycle_2_info['all_course_examiners'].values():
+        all_examiners_cycle_2.update(examiners)
+    return examiners_data['corrected_names'], examiners_data['special_situation'], all_examiners_cycle_1, all_examiners_cycle_2
+
+levels=['Självständigt arbete på avancerad nivå (masterexamen)',
+        'Självständigt arbete på avancerad nivå (yrkesexamen);Självständigt arbete på avancerad nivå (masterexamen)',
+        'Självständigt arbete på grundnivå (kandidatexamen)',
+        'Självständigt arbete på grundnivå (högskoleexamen)',
+        'Studentarbete andra termin']
+
+def generated_data(rows):
+    random.seed(1)
+    people=[("Last{}".format(i), "First{}".format(i)) for i in range(3000)]
+    all_examiners_cycle_1={"{1} {0}".format(*p) for p in people[:1500]}
+    all_examiners_cycle_2={"{1} {0}".format(*p) for p in people[1000:2500]}
+    corrected_names={"{1} {0}".format(*p): "{1} {0}".format(*people[i-2600]) for i, p in enumerate(people) if 2600 <= i < 2700}
+    special_situation={"{1} {0}".format(*p): "(guest examiner)" for p in people[2700:2800]}
+    data=[]
+    for pid in range(rows):
+        last, first=random.choice(people)
+        r=random.random()
+        if r < 0.02:
+            examiners=None
+        elif r < 0.04:
+            examiners="{0}, {1}".format(last, first)
+        else:
+            examiners="{0}, {1} [u1{2:05d}], professor (KTH [177], Skolan för elektroteknik och datavetenskap (EECS) [879223], Datavetenskap [879224])".format(last, first, pid % 100000)
+        data.append({'PID': 1000000+pid, 'Examiners': examiners, 'ThesisLevel': random.choice(levels)})
+    return pd.DataFrame(data), corrected_names, special_situation, all_examiners_cycle_1, all_examiners_cycle_2
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='benchmark_check_degree_projects.py: compare the row by row and column-wise examiner checks')
+
+    argp.add_argument('-f', '--file',
+                      type=str,
+                      default=None,
+                      help="DiVA export (XLSX)"
+                      )
+
+    argp.add_argument('-r', '--rows',
+                      type=int,
+                      default=50000,
+                      help="number of generated theses, when no file is given"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    cdp.Verbose_Flag=False
+    if args['file']:
+        students_df = pd.read_excel(open(args['file'], 'rb'))
+        examiner_data=examiners_from_files()
+    else:
+        students_df, *examiner_data=generated_data(args['rows'])
+    print("{0} theses, {1} 1st cycle and {2} 2nd cycle examiners".format(len(students_df), len(examiner_data[2]), len(examiner_data[3])))
+
+    # both versions print the problems they find, which would otherwise dominate the time
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time=time.perf_counter()
+        iterrows_df=iterrows_check_examiners(students_df.copy(), *examiner_data)
+        iterrows_time=time.perf_counter()-start_time
+
+        start_time=time.perf_counter()
+        columnwise_df=cdp.check_examiners(students_df.copy(), *examiner_data)
+        columnwise_time=time.perf_counter()-start_time
+
+    same=iterrows_df['Checked'].equals(columnwise_df['Checked'])
+    print("row by row:  {0:.3f} s".format(iterrows_time))
+    print("column-wise: {0:.3f} s".format(columnwise_time))
+    if columnwise_time > 0:
+        print("speedup: {0:.1f}".format(iterrows_time/columnwise_time))
+    print("same 'Checked' column: {}".format(same))
+    print(columnwise_df['Checked'].value_counts(dropna=False).to_string())
+    if not same:
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
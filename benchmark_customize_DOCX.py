@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./benchmark_customize_DOCX.py [--repeat 200] [template.docx ...]
+#
+# Purpose: Compare the per field rewriting of a DOCX template (replace_value_for_name() for each custom property and
+#          enter_field() for each control box) with the single pass versions (replace_values_for_names() in
+#          customize_DOCX_file.py and enter_fields() in extract_custom_DOCX_properties.py).
+#
+# For each template, a JSON file of the form used by customize_DOCX_file.py is made with a value for each of the
+# author, examiner, supervisor, degree, and course properties, and docProps/custom.xml is customized with both versions.
+# As the thesis templates do not contain the cover's control boxes, these are added to the start of the template's
+# word/document.xml, which is then filled in with both versions (and with transform_file() of old_JSON_to_DOCX_cover.py,
+# which uses enter_fields()). The program checks that the results are identical.
+#
+# Example:
+# ./benchmark_customize_DOCX.py
+# ./benchmark_customize_DOCX.py --repeat 50 Template-thesis-English-2022-with-for-DiVA.docx
+#
+# 2026-10-18
+#
+import io
+import sys
+import time
+import argparse
+import zipfile
+import contextlib
+
+import customize_DOCX_file as cdf
+import extract_custom_DOCX_properties as ecdp
+import old_JSON_to_DOCX_cover as cover
+
+default_templates=['Template-thesis-English-2021-with-for-DiVA.docx',
+                   'Template-thesis-English-2022-with-for-DiVA.docx',
+                   'Template-Mall_för_Examensarbeten-svensk-2021.docx']
+
+def person(kind, n):
+    return {'Last name': "{0}{1}_last".format(kind, n),
+            'First name': "{0}{1}_first".format(kind, n),
+            'Local User Id': "u1{0:06d}".format(n),
+            'E-mail': "{0}{1}@kth.se".format(kind.lower(), n),
+            'organisation': {'L1': 'School of Electrical Engineering and Computer Science',
+                             'L2': 'Computer Science'}}
+
+def custom_values():
+    d=dict()
+    for k in ['Author1', 'Author2', 'Examiner1', 'Supervisor1', 'Supervisor2', 'Supervisor3']:
+        d[k]=person(k[:-1], int(k[-1]))
+    d['Supervisor2']['Other organisation']='Företag AB &amp; Co'
+    d['Cycle']=2
+    d['Credits']=30
+    d['Course code']='DA231X'
+    d['National Subject Categories']='10201, 10206'
+    d['Degree1']={'subjectArea': 'Computer Science and Engineering', 'programcode': 'TCOMK',
+                  'Educational program': 'Degree Programme in Computer Engineering',
+                  'Degree': 'Master of Science in Engineering'}
+    d['Degree2']={'subjectArea': 'Computer Science', 'programcode': 'TCSCM', 'Educational program': 'Master\'s Programme, Computer Science',
+                  'Degree': 'Master of Science'}
+    d['Cooperation']={'Partner_name': 'Företag AB'}
+    return d
+
+# transform_file() with the replacements applied one at a time, as it used to be done
+def per_field_replace(replacements, content):
+    for name, new_value in replacements:
+        content=cdf.replace_value_for_name(name, new_value, content)
+    return content
+
+def per_field_transform_file(content, dict_of_entries):
+    single_pass=cdf.replace_values_for_names
+    cdf.replace_values_for_names=per_field_replace
+    try:
+        return cdf.transform_file(content, dict_of_entries)
+    finally:
+        cdf.replace_values_for_names=single_pass
+
+cover_inline_boxes=['Ämnesområde', 'Nivä_och_hp', 'TRITA', 'År']
+cover_paragraph_boxes=['Title', 'Subtitle', 'Author']
+cover_block_boxes=['Examiner', 'Supervisor', 'Author2']
+
+def placeholder(txt):
+    return '<w:r><w:rPr><w:rStyle w:val="PlaceholderText"/></w:rPr><w:t>{}</w:t></w:r>'.format(txt)
+
+# a cover page with the control boxes that enter_field() knows about
+def cover_xml():
+    parts=[]
+    for control_box in cover_inline_boxes:
+        parts.append('<w:p><w:sdt>' + ecdp.control_box_string(control_box) + '<w:showingPlcHdr/></w:sdtPr><w:sdtContent>' +
+                     placeholder("Click here to enter {}".format(control_box)) + '</w:sdtContent></w:sdt></w:p>')
+    for control_box in cover_paragraph_boxes+cover_block_boxes:
+        parts.append('<w:sdt>' + ecdp.control_box_string(control_box) + '<w:showingPlcHdr/></w:sdtPr><w:sdtContent>' +
+                     '<w:p><w:pPr><w:pStyle w:val="Title"/></w:pPr>' + placeholder("Click here to enter {}".format(control_box)) +
+                     '</w:p></w:sdtContent></w:sdt>')
+    parts.append('<w:p><w:r><w:t>Stockholm, Sverige</w:t></w:r></w:p>')
+    return ''.join(parts)
+
+def cover_values():
+    d={'Ämnesområde': 'Degree project in Computer Science and Engineering',
+       'Nivä_och_hp': 'Second cycle, 30 credits',
+       'Title': 'A title in the language of the thesis',
+       'Subtitle': 'A subtitle in the language of the thesis',
+       'Author': 'Fake A. Student',
+       'language': 'eng',
+       'Author2': 'Another Student',
+       'Examiner': 'Examiner One',
+       'Supervisor': 'Supervisor One',
+       'TRITA': 'TRITA-EECS-EX-2026:0',
+       'År': '2026'}
+    return d
+
+def per_field_enter_fields(content, dict_of_entries):
+    for control_box in dict_of_entries:
+        if control_box == 'language' and dict_of_entries['language'] != 'swe':
+            content=content.replace('Stockholm, Sverige', 'Stockholm, Sweden')
+        else:
+            content=ecdp.enter_field(content, control_box, dict_of_entries[control_box])
+    return content
+
+def time_function(fn, content, dict_of_entries, repeat):
+    # the functions print as they go, which would otherwise dominate the time
+    with contextlib.redirect_stdout(io.StringIO()):
+        start_time=time.perf_counter()
+        for i in range(repeat):
+            result=fn(content, dict_of_entries)
+        elapsed=time.perf_counter()-start_time
+    return result, elapsed/repeat
+
+def report(what, per_field, single_pass):
+    per_field_result, per_field_time=per_field
+    single_pass_result, single_pass_time=single_pass
+    same=per_field_result == single_pass_result
+    print("  {0}: per field {1:.3f} ms, single pass {2:.3f} ms, speedup {3:.1f}, identical output: {4}".format(
+        what, 1000*per_field_time, 1000*single_pass_time, per_field_time/single_pass_time if single_pass_time > 0 else 0, same))
+    return same
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='benchmark_customize_DOCX.py: compare the per field and single pass DOCX rewriting')
+
+    argp.add_argument('templates',
+                      nargs='*',
+                      default=default_templates,
+                      help="DOCX templates"
+                      )
+
+    argp.add_argument('-r', '--repeat',
+                      type=int,
+                      default=200,
+                      help="number of times each template is customized"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    cdf.Verbose_Flag=False
+    cover.Verbose_Flag=False
+    cover.Keep_picture_flag=True    # so that only the control boxes are changed
+    differences=0
+    for filename in args['templates']:
+        with zipfile.ZipFile(filename) as document:
+            custom_xml=document.read('docProps/custom.xml').decode('utf-8')
+            document_xml=document.read('word/document.xml').decode('utf-8')
+        print("{0}: custom.xml {1} bytes, document.xml {2} bytes".format(filename, len(custom_xml), len(document_xml)))
+
+        values=custom_values()
+        if not report('custom.xml',
+                      time_function(per_field_transform_file, custom_xml, values, args['repeat']),
+                      time_function(cdf.transform_file, custom_xml, values, args['repeat'])):
+            differences=differences+1
+
+        body_offset=document_xml.find('<w:body>')+len('<w:body>')
+        document_xml=document_xml[:body_offset]+cover_xml()+document_xml[body_offset:]
+        values=cover_values()
+        per_field=time_function(per_field_enter_fields, document_xml, values, args['repeat'])
+        if not report('document.xml', per_field, time_function(ecdp.enter_fields, document_xml, values, args['repeat'])):
+            differences=differences+1
+        if not report('cover transform_file()', per_field, time_function(cover.transform_file, document_xml, values, args['repeat'])):
+            differences=differences+1
+
+    if differences:
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./benchmark_find_and_extract_references.py directory_of_PDF_files [--csv results.csv]
+#
+# Purpose: Compare the full layout analysis of every page (find_and_extract_references.py --full) with the
+#          default page targeted analysis (which only analyzes the candidate pages found by a cheap pre-pass).
+#
+# Each PDF file is processed once with each strategy, each time in a fresh child process, so that the
+# peak resident set size (RSS) of one run is not hidden by that of an earlier run.
+# For each file the wall time, peak RSS, and the reference pages found are output, together with
+# whether the two strategies found the same pages. If a child process crashes (or takes longer than --timeout seconds),
+# the file is reported as failed for that strategy.
+#
+# Example:
+# ./benchmark_find_and_extract_references.py ../theses --csv benchmark.csv
+#
+# 2026-10-18
+#
+import sys
+import os
+import io
+import time
+import resource
+import argparse
+import contextlib
+import multiprocessing
+
+from queue import Empty
+
+import pandas as pd
+
+strategies=['full', 'targeted']
+
+# run in the child process
+def run_one(filename, strategy, result_queue):
+    import find_and_extract_references as fer
+
+    fer.initialize_worker(False, False, strategy == 'full')
+    start_time=time.perf_counter()
+    # process_file() prints as it goes, which would otherwise dominate the output
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok=fer.process_file(filename, fer.Full_scan_Flag)
+    elapsed=time.perf_counter()-start_time
+    # ru_maxrss is in kilobytes on Linux
+    peak_rss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result_queue.put({'ok': ok,
+                      'time': elapsed,
+                      'peak_rss_MB': peak_rss/1024.0,
+                      'references_page': fer.found_references_page,
+                      'last_references_page': fer.found_last_references_page})
+
+def measure(filename, strategy, timeout):
+    ctx=multiprocessing.get_context('spawn')
+    result_queue=ctx.Queue()
+    p=ctx.Process(target=run_one, args=(filename, strategy, result_queue))
+    p.start()
+    deadline=time.monotonic()+timeout
+    result=None
+    while result is None:
+        try:
+            result=result_queue.get(timeout=1.0)
+        except Empty:
+            if not p.is_alive():
+                print("{0} ({1}): the child process exited with code {2}".format(filename, strategy, p.exitcode))
+                break
+            if time.monotonic() > deadline:
+                print("{0} ({1}): no result after {2} seconds".format(filename, strategy, timeout))
+                p.terminate()
+                break
+    p.join()
+    if result is None:
+        return {'ok': False, 'time': float('nan'), 'peak_rss_MB': float('nan'),
+                'references_page': 'failed', 'last_references_page': 'failed'}
+    return result
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='benchmark_find_and_extract_references.py: compare the full and page targeted analysis')
+
+    argp.add_argument('directory',
+                      help="directory containing the PDF files"
+                      )
+
+    argp.add_argument('--csv',
+                      type=str,
+                      default=None,
+                      help="name of a CSV file for the results"
+                      )
+
+    argp.add_argument('-n', '--number',
+                      type=int,
+                      default=None,
+                      help="only use the first n PDF files"
+                      )
+
+    argp.add_argument('-t', '--timeout',
+                      type=float,
+                      default=600.0,
+                      help="seconds to wait for the analysis of a file"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    pdf_files=sorted([os.path.join(args['directory'], f) for f in os.listdir(args['directory']) if f.lower().endswith('.pdf')])
+    if args['number']:
+        pdf_files=pdf_files[:args['number']]
+    if not pdf_files:
+        print("no PDF files in {}".format(args['directory']))
+        return
+
+    rows=[]
+    for filename in pdf_files:
+        row={'file': os.path.basename(filename)}
+        all_ok=True
+        for strategy in strategies:
+            result=measure(filename, strategy, args['timeout'])
+            all_ok=all_ok and result['ok']
+            row[f'{strategy} time (s)']=round(result['time'], 3)
+            row[f'{strategy} peak RSS (MB)']=round(result['peak_rss_MB'], 1)
+            row[f'{strategy} pages']="{0}-{1}".format(result['references_page'], result['last_references_page'])
+        row['same pages']=all_ok and row['full pages'] == row['targeted pages']
+        if row['targeted time (s)'] > 0:
+            row['speedup']=round(row['full time (s)']/row['targeted time (s)'], 2)
+        print(row)
+        rows.append(row)
+
+    results_df=pd.DataFrame(rows)
+    print(results_df.to_string(index=False))
+    print("total time full={0:.1f}s targeted={1:.1f}s, {2} of {3} files with the same pages".format(
+        results_df['full time (s)'].sum(), results_df['targeted time (s)'].sum(),
+        results_df['same pages'].sum(), len(results_df)))
+
+    if args['csv']:
+        results_df.to_csv(args['csv'], index=False)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
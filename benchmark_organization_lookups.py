@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./benchmark_organization_lookups.py [--records 10000]
+#
+# Purpose: Compare the cost of the organization and subject lookups done for each MODS record when they are done
+#          with the loops over the tables (as JSON_to_MODS.py and DiVA_organization_info.py used to do) and with
+#          the reverse indexes in kth_organization_tables.py.
+#
+# For each simulated record the lookups done for an author and two examiners/supervisors are performed, together with
+# the lookup of the subject area and of the acronyms for a DiVA L2 and L3 id. The program first checks that both
+# versions return the same results for every entry in the tables.
+#
+# Example:
+# ./benchmark_organization_lookups.py --records 20000
+#
+# 2026-10-18
+#
+import sys
+import time
+import random
+import argparse
+
+from kth_organization_tables import schools_info, departments_info, subject_area_codes_diva
+import kth_organization_tables as indexed
+
+#----------------------------------------------------------------------
+# The lookups as they were done with loops over the tables
+#----------------------------------------------------------------------
+def loop_schools_acronym(s1):
+    for s in schools_info:
+        if s1 == schools_info[s]['swe'] or s1 == schools_info[s]['eng']:
+            return s
+    return None
+
+def loop_diva_codes_for_schools_KTH_L1_acronym(s1):
+    for s in schools_info:
+        if s1 == s:
+            return schools_info[s]['L1']
+    return None
+
+# uses .get() as some entries (such as ABE's PHILHIST) have no names, which made the original loop raise KeyError
+def loop_departments_acronym(l1, s2):
+    if l1 not in departments_info:
+        return None
+    for d in departments_info[l1]:
+        if s2 == departments_info[l1][d].get('swe') or s2 == departments_info[l1][d].get('eng'):
+            return d
+    return None
+
+def loop_diva_codes_for_departments_KTH_L2_acronyms(l1, l2):
+    if l1:
+        l1_code=departments_info.get(l1, None)
+        if l1_code and l2:
+            l2_code=departments_info[l1].get(l2, None)
+            if l2_code:
+                return l2_code.get('L2', None)
+    return None
+
+def loop_acronym_from_org_id(key):
+    if isinstance(key, int):
+        key="{}".format(key)
+    for school in departments_info:
+        for dept in departments_info[school]:
+            l2=departments_info[school][dept].get('L2')
+            if l2 == key:
+                return dept
+    for school in departments_info:
+        for dept in departments_info[school]:
+            if departments_info[school][dept].get('divisions'):
+                for division in departments_info[school][dept]['divisions']:
+                    l3=departments_info[school][dept]['divisions'][division].get('L3')
+                    if l3 == key:
+                        return division
+    return None
+
+def loop_lookup_subject_area_eng(s1):
+    for s in subject_area_codes_diva:
+        se=subject_area_codes_diva[s].get('eng', None)
+        if se and se == s1:
+            return s
+    return None
+
+loop_functions={'schools_acronym': loop_schools_acronym,
+                'diva_codes_for_schools_KTH_L1_acronym': loop_diva_codes_for_schools_KTH_L1_acronym,
+                'departments_acronym': loop_departments_acronym,
+                'diva_codes_for_departments_KTH_L2_acronyms': loop_diva_codes_for_departments_KTH_L2_acronyms,
+                'acronym_from_org_id': loop_acronym_from_org_id,
+                'lookup_subject_area_eng': loop_lookup_subject_area_eng}
+
+indexed_functions={name: getattr(indexed, name) for name in loop_functions}
+
+def test_arguments():
+    args={name: [] for name in loop_functions}
+    for s in schools_info:
+        for language in ['swe', 'eng']:
+            args['schools_acronym'].append((schools_info[s][language],))
+        args['diva_codes_for_schools_KTH_L1_acronym'].append((s,))
+    args['schools_acronym'].append(('No such school',))
+    for school in departments_info:
+        for dept in departments_info[school]:
+            d=departments_info[school][dept]
+            for language in ['swe', 'eng']:
+                if language in d:
+                    args['departments_acronym'].append((school, d[language]))
+            args['diva_codes_for_departments_KTH_L2_acronyms'].append((school, dept))
+            if d.get('L2'):
+                args['acronym_from_org_id'].append((d['L2'],))
+                args['acronym_from_org_id'].append((int(d['L2']),))
+            for division in d.get('divisions', {}).values():
+                if division.get('L3'):
+                    args['acronym_from_org_id'].append((division['L3'],))
+    args['departments_acronym'].append(('EECS', 'No such department'))
+    args['acronym_from_org_id'].append(('0',))
+    for s in subject_area_codes_diva:
+        if subject_area_codes_diva[s].get('eng'):
+            args['lookup_subject_area_eng'].append((subject_area_codes_diva[s]['eng'],))
+    args['lookup_subject_area_eng'].append(('No such subject',))
+    return args
+
+def check_results(args):
+    differences=0
+    for name in loop_functions:
+        for a in args[name]:
+            expected=loop_functions[name](*a)
+            result=indexed_functions[name](*a)
+            if expected != result:
+                print("{0}{1}: loop={2} indexed={3}".format(name, a, expected, result))
+                differences=differences+1
+    return differences
+
+# the lookups done for one MODS record: an author and two examiners/supervisors, the subject area, and two org ids
+def record_lookups(args):
+    calls=[]
+    for person in range(3):
+        calls.append(('schools_acronym', random.choice(args['schools_acronym'])))
+        calls.append(('diva_codes_for_schools_KTH_L1_acronym', random.choice(args['diva_codes_for_schools_KTH_L1_acronym'])))
+        calls.append(('departments_acronym', random.choice(args['departments_acronym'])))
+        calls.append(('diva_codes_for_departments_KTH_L2_acronyms', random.choice(args['diva_codes_for_departments_KTH_L2_acronyms'])))
+    calls.append(('lookup_subject_area_eng', random.choice(args['lookup_subject_area_eng'])))
+    calls.append(('acronym_from_org_id', random.choice(args['acronym_from_org_id'])))
+    calls.append(('acronym_from_org_id', random.choice(args['acronym_from_org_id'])))
+    return calls
+
+def time_calls(fns, records):
+    start_time=time.perf_counter()
+    for calls in records:
+        for name, a in calls:
+            fns[name](*a)
+    return time.perf_counter()-start_time
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='benchmark_organization_lookups.py: compare the loop and indexed table lookups')
+
+    argp.add_argument('-r', '--records',
+                      type=int,
+                      default=10000,
+                      help="number of simulated MODS records"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    lookup_args=test_arguments()
+    differences=check_results(lookup_args)
+    print("checked {0} lookups, {1} differences".format(sum(len(v) for v in lookup_args.values()), differences))
+
+    random.seed(1)
+    records=[record_lookups(lookup_args) for i in range(args['records'])]
+    number_of_calls=sum(len(r) for r in records)
+
+    loop_time=time_calls(loop_functions, records)
+    indexed_time=time_calls(indexed_functions, records)
+    print("{0} records with {1} lookups".format(len(records), number_of_calls))
+    print("loops:   {0:.3f} s, {1:.2f} us per record".format(loop_time, 1e6*loop_time/len(records)))
+    print("indexed: {0:.3f} s, {1:.2f} us per record".format(indexed_time, 1e6*indexed_time/len(records)))
+    if indexed_time > 0:
+        print("speedup: {0:.1f}".format(loop_time/indexed_time))
+    if differences:
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
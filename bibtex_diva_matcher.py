@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./bibtex_diva_matcher.py references.bib diva_records.xlsx [--threshold 90] [--json results.json]
+#
+# Purpose: Find the DiVA IDs for the entries of a BibTeX file, given a DataFrame of DiVA (MODS) records as
+#          made by mods_records_to_dataframe() in the citations notebooks.
+#
+# The matching is done as in find_diva_ids() in citations-to-DiVA-Notebook-20250811-all.ipynb and
+# Compute_publications_list_from_DiVA-Notebook-20250907.ipynb:
+#   1. by identifier (DOI, ISBN, URL, PMID), after normalization
+#   2. by a fuzzy comparison of the normalized titles (fuzz.ratio() > threshold)
+#   3. for software entries, by the DOI in the entry's URL appearing in a "Software url:" link of the record
+#
+# Rather than comparing every entry with every record, build_index() computes, once per DataFrame, hash indexes
+# of the normalized identifiers and a blocking index from the words of the normalized titles to the records.
+# The fuzzy comparison is then only done with the records that share the most (rare) title words with the entry
+# and whose title length allows a ratio above the threshold.
+#
+# Usage (from a notebook):
+#   from bibtex_diva_matcher import preprocess_dataframe, find_diva_ids
+#   df1=preprocess_dataframe(user_df)
+#   found_entries=find_diva_ids(bib_database, df1)
+#
+# The results are a dict keyed by the BibTeX key, each value being {'DiVA_ID': ..., 'match_method': ...} with
+# 'DiVA_ID' set to 'Not found in database' when there is no match.
+#
+# The input spreadsheet (or CSV/JSON file) for the command line version should have the columns
+# 'recordInfo.recordIdentifier', 'title.eng', 'subtitle.eng', 'title.swe', 'subtitle.swe', 'doi', ...
+#
+# 2026-10-18
+#
+import re
+import sys
+import json
+import time
+import argparse
+
+import pandas as pd
+
+try:
+    from thefuzz import fuzz
+    ratio=fuzz.ratio
+except ImportError:
+    try:
+        from rapidfuzz import fuzz
+        # rapidfuzz returns a float, thefuzz rounds to an int
+        ratio=lambda a, b: int(round(fuzz.ratio(a, b)))
+    except ImportError:
+        from difflib import SequenceMatcher
+        ratio=lambda a, b: int(round(100*SequenceMatcher(None, a, b).ratio()))
+
+FUZZY_MATCH_THRESHOLD = 90
+
+# the identifier columns, in the order they are tried
+identifier_cols = ['doi', 'isbn', 'url', 'pmid']
+
+title_cols_map = {
+    'eng': ('title.eng', 'subtitle.eng'),
+    'swe': ('title.swe', 'subtitle.swe')
+}
+
+id_column='recordInfo.recordIdentifier'
+
+# the number of records, sharing the most title words with an entry, whose titles are compared with the entry's title
+max_candidates=50
+
+# words that are too common to be useful for blocking
+stop_words={'a', 'an', 'and', 'are', 'as', 'at', 'by', 'for', 'from', 'in', 'into', 'is', 'of', 'on', 'or', 'the', 'to',
+            'with', 'using', 'via', 'towards', 'och', 'av', 'en', 'ett', 'för', 'i', 'med', 'om', 'på', 'till'}
+
+def normalize_identifier(identifier):
+    """Strips common prefixes and handles empty strings."""
+    if not isinstance(identifier, str) or identifier.strip() == "":
+        return None # Return None for empty or non-string data
+    identifier = re.sub(r'^(https?://)?(doi.org/)?(doi:)?', '', identifier, flags=re.IGNORECASE)
+    return identifier.lower().strip()
+
+def normalize_isbn(isbn):
+    """Only keeps the digits (and a final X), so that 978-91-7873-000-1 and 9789178730001 are the same."""
+    if not isinstance(isbn, str) or isbn.strip() == "":
+        return None
+    isbn=re.sub(r'[^0-9Xx]', '', isbn).upper()
+    return isbn or None
+
+normalizers={'isbn': normalize_isbn}
+
+def normalize_title(title, subtitle=None, delimiter_pattern=r'[:—-]' ):
+    if pd.notna(subtitle):
+        full_title = f"{title} {subtitle}"
+    else:
+        full_title = str(title)
+
+    parts = re.split(delimiter_pattern, full_title, 1)
+    cleaned_parts = [re.sub(r'[^\w\s]', '', part).lower().strip() for part in parts]
+
+    return ' '.join(cleaned_parts)
+
+def title_words(norm_title):
+    return {w for w in norm_title.split() if len(w) > 1 and w not in stop_words}
+
+def preprocess_dataframe(df_to_process):
+    """
+    Adds normalized columns to the DataFrame for efficient searching.
+    """
+    # Create an explicit copy to work on. This prevents the SettingWithCopyWarning.
+    df_processed = df_to_process.copy()
+
+    for col in identifier_cols:
+        if col in df_processed.columns:
+            df_processed[f'norm_{col}'] = df_processed[col].apply(normalizers.get(col, normalize_identifier))
+
+    for lang, (title_col, sub_col) in title_cols_map.items():
+        if title_col in df_processed.columns:
+            if sub_col in df_processed.columns:
+                df_processed[f'norm_title_{lang}'] = [normalize_title(t, s) for t, s in zip(df_processed[title_col], df_processed[sub_col])]
+            else:
+                df_processed[f'norm_title_{lang}'] = df_processed[title_col].apply(normalize_title)
+
+    return df_processed
+
+def build_index(dataframe):
+    """
+    Builds the identifier and title word indexes for a DataFrame returned by preprocess_dataframe().
+    """
+    if not any(f'norm_{col}' in dataframe.columns for col in identifier_cols) and \
+       not any(f'norm_title_{lang}' in dataframe.columns for lang in title_cols_map):
+        dataframe=preprocess_dataframe(dataframe)
+
+    diva_ids=list(dataframe[id_column])
+    index={'diva_ids': diva_ids,
+           'identifiers': dict(),   # id_type -> normalized identifier -> first record position
+           'titles': [],            # (record position, normalized title)
+           'words': dict(),         # word -> list of positions in 'titles'
+           'software_links': []}    # (record position, software URL)
+
+    for id_type in identifier_cols:
+        column=f'norm_{id_type}'
+        if column in dataframe.columns:
+            id_index=dict()
+            for position, value in enumerate(dataframe[column]):
+                if isinstance(value, str) and value:
+                    # keep the first record, as with id_match.iloc[0]
+                    id_index.setdefault(value, position)
+            index['identifiers'][id_type]=id_index
+
+    for lang in title_cols_map:
+        column=f'norm_title_{lang}'
+        if column in dataframe.columns:
+            for position, value in enumerate(dataframe[column]):
+                if not isinstance(value, str) or not value or value == 'nan':
+                    continue
+                title_position=len(index['titles'])
+                index['titles'].append((position, value))
+                for w in title_words(value):
+                    index['words'].setdefault(w, []).append(title_position)
+
+    software_url_prefix='Software url: '
+    if 'location.other_links' in dataframe.columns:
+        for position, other_links in enumerate(dataframe['location.other_links']):
+            if isinstance(other_links, list):
+                for ol in other_links:
+                    if isinstance(ol, str) and ol.startswith(software_url_prefix):
+                        index['software_links'].append((position, ol[len(software_url_prefix):]))
+    return index
+
+def title_candidates(index, norm_bib_title, threshold):
+    words=title_words(norm_bib_title)
+    counts=dict()
+    for w in words:
+        for title_position in index['words'].get(w, []):
+            counts[title_position]=counts.get(title_position, 0)+1
+    if not words:
+        # nothing to block on (e.g., a title of only stop words), so compare with all the titles
+        counts={title_position: 0 for title_position in range(len(index['titles']))}
+
+    # ratio() is at most 200*min(len)/(sum of the lengths), so titles whose lengths differ too much cannot match
+    length=len(norm_bib_title)
+    candidates=[]
+    for title_position, count in counts.items():
+        other_length=len(index['titles'][title_position][1])
+        if 200*min(length, other_length) > threshold*(length+other_length):
+            candidates.append((count, title_position))
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+    return [title_position for count, title_position in candidates[:max_candidates]]
+
+def match_entry(entry, index, threshold=FUZZY_MATCH_THRESHOLD, verbose=False):
+    """
+    Returns (DiVA ID, match method) for a BibTeX entry (a dict, as in bib_database.entries) or None.
+    """
+    # Method 1: Match by Identifiers
+    for id_type in identifier_cols:
+        if id_type in entry and id_type in index['identifiers']:
+            norm_bib_id = normalizers.get(id_type, normalize_identifier)(entry[id_type])
+            if verbose:
+                print(f"  Attempting to match on '{id_type}': '{entry.get(id_type)}' -> '{norm_bib_id}'")
+            if norm_bib_id:
+                position=index['identifiers'][id_type].get(norm_bib_id)
+                if position is not None:
+                    return (index['diva_ids'][position], f"Identifier ({id_type})")
+
+    # Method 2: Fallback to Fuzzy Title Matching
+    if 'title' in entry:
+        norm_bib_title = normalize_title(entry['title'])
+        best_score = 0
+        best_match_id = None
+        for title_position in title_candidates(index, norm_bib_title, threshold):
+            position, df_title=index['titles'][title_position]
+            score=ratio(norm_bib_title, df_title)
+            if score > best_score:
+                best_score = score
+                best_match_id = index['diva_ids'][position]
+        if best_score > threshold:
+            return (best_match_id, f"Fuzzy Title (Score: {best_score})")
+
+    # Method 3: the DOI of a software entry in a software link of a record
+    if entry.get('ENTRYTYPE') == 'software':
+        bib_url=entry.get('url', '')
+        doi_prefix='https://doi.org/'
+        if bib_url.startswith(doi_prefix):
+            bib_pseudo_doi=bib_url[len(doi_prefix):]
+            for position, software_url in index['software_links']:
+                if software_url.find(bib_pseudo_doi) > 0:
+                    return (index['diva_ids'][position], f"Software link (url: {software_url})")
+    return None
+
+def find_diva_ids(bib_database, dataframe, threshold=FUZZY_MATCH_THRESHOLD, verbose=False):
+    """
+    Matches all the entries (bib_database can be a bibtexparser database or a list of entries) against a DataFrame of
+    DiVA records (or an index from build_index()).
+    """
+    index=dataframe if isinstance(dataframe, dict) else build_index(dataframe)
+    entries=getattr(bib_database, 'entries', bib_database)
+
+    results = {}
+    for entry in entries:
+        bib_key = entry['ID']
+        if verbose:
+            print(f"Processing BibTeX key: {bib_key}")
+        found_match=match_entry(entry, index, threshold, verbose)
+        if found_match:
+            if verbose:
+                print(f"    -> SUCCESS: Found DiVA ID {found_match[0]} by {found_match[1]}")
+            results[bib_key] = {'DiVA_ID': found_match[0], 'match_method': found_match[1]}
+        else:
+            if verbose:
+                print("  -> FAILED: No match found for this entry.")
+            results[bib_key] = {'DiVA_ID': 'Not found in database', 'match_method': 'None'}
+    return results
+
+def read_records(filename):
+    if filename.endswith('.xlsx'):
+        return pd.read_excel(filename)
+    if filename.endswith('.json'):
+        return pd.read_json(filename)
+    return pd.read_csv(filename)
+
+def main(argv):
+    argp = argparse.ArgumentParser(description='bibtex_diva_matcher.py: find the DiVA IDs of the entries in a BibTeX file')
+
+    argp.add_argument('bibtex_file',
+                      help="BibTeX file"
+                      )
+
+    argp.add_argument('records_file',
+                      help="spreadsheet, CSV, or JSON file of DiVA records"
+                      )
+
+    argp.add_argument('-t', '--threshold',
+                      type=int,
+                      default=FUZZY_MATCH_THRESHOLD,
+                      help="a fuzzy title match requires a score above this"
+                      )
+
+    argp.add_argument('-j', '--json',
+                      type=str,
+                      default=None,
+                      help="output the results to this JSON file"
+                      )
+
+    argp.add_argument('-v', '--verbose',
+                      default=False,
+                      action="store_true",
+                      help="Print lots of output to stdout"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    import bibtexparser
+    from bibtexparser.bparser import BibTexParser
+    with open(args['bibtex_file'], encoding='utf-8') as bibtex_FH:
+        bib_database=bibtexparser.load(bibtex_FH, parser=BibTexParser(ignore_nonstandard_types=False))
+
+    records_df=read_records(args['records_file'])
+
+    start_time=time.perf_counter()
+    index=build_index(preprocess_dataframe(records_df))
+    index_time=time.perf_counter()-start_time
+    results=find_diva_ids(bib_database, index, args['threshold'], args['verbose'])
+    match_time=time.perf_counter()-start_time-index_time
+
+    for bib_key, r in results.items():
+        print(f"{r['DiVA_ID']}\t{r['match_method']}\t{bib_key}")
+    print("matched {0} of {1} entries against {2} records, indexing {3:.3f} s, matching {4:.3f} s".format(
+        sum(1 for r in results.values() if r['DiVA_ID'] != 'Not found in database'), len(results), len(records_df),
+        index_time, match_time))
+
+    if args['json']:
+        with open(args['json'], 'w', encoding='utf-8') as json_FH:
+            json.dump(results, json_FH, ensure_ascii=False, indent=1)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
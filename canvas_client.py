@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# canvas_client.py
+#
+# Purpose: A shared Canvas REST client for the programs in this repository.
+#
+# All requests go through a single requests.Session, so the TCP/TLS connections to
+# Canvas are kept alive and reused (rather than doing a new handshake for every
+# page of every call). For paginated responses, the URLs of all the pages are
+# computed from the 'last' entry in the Link header of the first page and the
+# remaining pages are then fetched concurrently, before being put back together
+# in page order.
+#
+# Canvas does not always return a 'last' link (for example, for some endpoints that
+# use bookmark based pagination), in which case the 'next' links are followed one at
+# a time, just as the individual programs used to do.
+#
+# Usage (from another program):
+#   import canvas_client
+#   ...
+#   # at the end of initialize(options), once baseUrl and header are known
+#   canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
+#   ...
+#   students=canvas_client.students_in_course(course_id)
+#   assignments=canvas_client.get_paginated_list(url, extra_parameters)
+#
+# Read only programs can pass cache=True to configure() to have the GET requests go through http_cache.py.
+#
+# The requests (the GETs and the writes made with post(), put(), and delete()) go through a scheduler that adapts the
+# number of requests in flight to Canvas's rate limit: Canvas returns with each response the cost of the request
+# (X-Request-Cost) and how much is left in the token's bucket (X-Rate-Limit-Remaining). While there is enough left, the
+# number of requests in flight grows (by one per response until the first decrease, then by about one per round trip) up
+# to max_workers; when the bucket gets low or a request is throttled (403 "Rate Limit Exceeded" or 429) it is halved. As
+# a few requests in flight with a short round trip can still be sent faster than the bucket refills, the scheduler also
+# paces the starts of the requests: on the first throttled request the start rate is set to half of the rate measured
+# over the last requests, it is halved on each further throttled request (at most once per second), it is held while the
+# bucket is low, and it grows by about one request/second per second otherwise (until it is no longer what limits the
+# requests). When a request is throttled, no request is started until its backoff (or the Retry-After time given by
+# Canvas, if longer) has passed, and then the request is retried. Hence a program can create things from a thread pool
+# (for example with run_concurrently()) and the scheduler decides how many of them are actually sent at once. report()
+# prints the requests/second achieved and the total cost of the requests.
+#
+#   results=canvas_client.run_concurrently(lambda name: canvas_client.post(url, data={'course_section[name]': name}), names)
+#   canvas_client.report()
+#
+# Alternatively, the client can read the configuration file itself:
+#   canvas_client.initialize(options)
+#
+# 2026-10-18
+#
+import sys
+import json
+import time
+import random
+import collections
+from email.utils import parsedate_to_datetime
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import http_cache
+
+global baseUrl	# the base URL used for access to Canvas
+global header	# the header for all HTML requests
+
+baseUrl=None
+header={}
+Verbose_Flag=False
+Cache_Flag=False	# if True, GET requests go through http_cache (with a short time to live)
+
+# number of pages fetched in parallel and hence the number of connections kept in the pool
+max_workers=8
+
+_session=None
+_session_lock=threading.Lock()
+
+# the scheduler
+initial_concurrency=2
+low_remaining=100.0     # when less than this is left in the rate limit bucket, the concurrency is halved
+max_retries=5
+backoff=1.0             # seconds before the first retry of a throttled request, doubled for each further retry
+min_rate=0.5            # the lowest rate (requests/second) that the starts of the requests are paced to
+
+_concurrency=float(initial_concurrency)
+_in_flight=0
+_last_decrease=0.0
+_slow_start=True
+_rate=None              # requests/second that the starts are paced to, None when they are not paced
+_next_start=0.0         # no request is started before this time (pacing)
+_paused_until=0.0       # no request is started before this time (after a throttled request)
+_starts=collections.deque(maxlen=32)    # the times of the last starts, for measuring the start rate
+_scheduler=threading.Condition()
+stats={'requests': 0, 'cost': 0.0, 'throttled': 0, 'first': None, 'last': None, 'min_remaining': None, 'max_concurrency': 0}
+
+def configure(base_url, canvas_header, verbose=False, workers=None, cache=False):
+    global baseUrl, header, Verbose_Flag, max_workers, _session, Cache_Flag
+    baseUrl=base_url
+    header=canvas_header
+    Verbose_Flag=verbose
+    Cache_Flag=cache
+    if workers:
+        max_workers=workers
+    reset_scheduler()
+    # force a new session so that the new header and pool size take effect
+    with _session_lock:
+        if _session:
+            _session.close()
+        _session=None
+
+# Based upon the options to the program, initialize the variables used to access Canvas via HTML requests
+def initialize(options):
+    # styled based upon https://martin-thoma.com/configuration-files-in-python/
+    config_file=getattr(options, 'config_filename', None)
+    if not config_file:
+        config_file='config.json'
+
+    try:
+        with open(config_file) as json_data_file:
+            configuration = json.load(json_data_file)
+            access_token=configuration["canvas"]["access_token"]
+            if getattr(options, 'containers', False):
+                base_url="http://"+configuration["canvas"]["host"]+"/api/v1"
+                print("using HTTP for the container environment")
+            else:
+                base_url="https://"+configuration["canvas"]["host"]+"/api/v1"
+    except:
+        print("Unable to open configuration file named {}".format(config_file))
+        print("Please create a suitable configuration file, the default name is config.json")
+        sys.exit()
+
+    configure(base_url, {'Authorization' : 'Bearer ' + access_token}, verbose=getattr(options, 'verbose', False))
+
+def session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            s=requests.Session()
+            adapter=HTTPAdapter(pool_connections=4, pool_maxsize=max(max_workers, 10))
+            s.mount('https://', adapter)
+            s.mount('http://', adapter)
+            s.headers.update(header)
+            _session=s
+        return _session
+
+def reset_scheduler():
+    global _concurrency, _in_flight, _last_decrease, _slow_start, _rate, _next_start, _paused_until
+    with _scheduler:
+        _concurrency=float(min(initial_concurrency, max_workers))
+        _in_flight=0
+        _last_decrease=0.0
+        _slow_start=True
+        _rate=None
+        _next_start=0.0
+        _paused_until=0.0
+        _starts.clear()
+        stats.update({'requests': 0, 'cost': 0.0, 'throttled': 0, 'first': None, 'last': None, 'min_remaining': None, 'max_concurrency': 0})
+
+def _acquire():
+    global _in_flight, _next_start
+    with _scheduler:
+        while True:
+            now=time.time()
+            start_at=max(_next_start, _paused_until)
+            if _in_flight < int(_concurrency) and now >= start_at:
+                break
+            _scheduler.wait(start_at-now if now < start_at else None)
+        _in_flight=_in_flight+1
+        _starts.append(now)
+        if _rate:
+            _next_start=now+1.0/_rate
+        if stats['first'] is None:
+            stats['first']=time.time()
+        stats['max_concurrency']=max(stats['max_concurrency'], _in_flight)
+
+def _header_value(r, name):
+    try:
+        return float(r.headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+def throttled(r):
+    return r.status_code == 429 or (r.status_code == 403 and b'Rate Limit Exceeded' in r.content)
+
+# the Retry-After header (in seconds or as an HTTP date) as a number of seconds, None if there is none
+def retry_after(r):
+    value=r.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp()-time.time())
+    except (TypeError, ValueError):
+        return None
+
+# the rate of the last starts, in requests/second
+def _start_rate(now):
+    if len(_starts) < 2 or now <= _starts[0]:
+        return None
+    return len(_starts)/(now-_starts[0])
+
+# additive increase (by 1/concurrency per response, i.e., about one per round trip, after a slow start where it is
+# increased by one per response), multiplicative decrease (at most once per second, as the responses to the requests
+# already in flight will report the same low bucket); the start rate is paced in the same way. If pause is given (for a
+# throttled request), no request is started for that many seconds.
+def _release(r, pause=None):
+    global _in_flight, _concurrency, _last_decrease, _slow_start, _rate, _paused_until
+    cost=_header_value(r, 'X-Request-Cost') if r is not None else None
+    remaining=_header_value(r, 'X-Rate-Limit-Remaining') if r is not None else None
+    with _scheduler:
+        _in_flight=_in_flight-1
+        stats['requests']=stats['requests']+1
+        stats['last']=time.time()
+        if cost:
+            stats['cost']=stats['cost']+cost
+        if remaining is not None and (stats['min_remaining'] is None or remaining < stats['min_remaining']):
+            stats['min_remaining']=remaining
+        now=time.time()
+        if pause:
+            _paused_until=max(_paused_until, now+pause)
+        if r is not None and (throttled(r) or (remaining is not None and remaining < low_remaining)):
+            if throttled(r):
+                stats['throttled']=stats['throttled']+1
+            if now-_last_decrease > 1.0:
+                _concurrency=max(1.0, _concurrency/2)
+                measured=_start_rate(now)
+                # a low bucket only holds the start rate, as the bucket can stay low while the requests go at its refill rate
+                if throttled(r) and (_rate or measured):
+                    _rate=max(min_rate, min(x for x in [_rate, measured] if x)/2)
+                _last_decrease=now
+                _slow_start=False
+                if Verbose_Flag:
+                    print("rate limit remaining {0}, concurrency reduced to {1}, paced to {2} requests/s".format(
+                        remaining, int(_concurrency), None if _rate is None else round(_rate, 1)))
+        elif r is not None:
+            _concurrency=min(float(max_workers), _concurrency+(1.0 if _slow_start else 1.0/_concurrency))
+            if _rate:
+                _rate=_rate+1.0/_rate
+                measured=_start_rate(now)
+                # the pacing is no longer what limits the requests
+                if measured and _rate > 2*measured and len(_starts) == _starts.maxlen:
+                    _rate=None
+        _scheduler.notify_all()
+
+# send a request through the scheduler, throttled requests are retried with an exponential backoff (or after the
+# Retry-After time, if that is longer), during which no other request is started
+def request(method, url, **kwargs):
+    for attempt in range(max_retries+1):
+        _acquire()
+        r=None
+        delay=None
+        try:
+            r = session().request(method, url, **kwargs)
+            if throttled(r) and attempt < max_retries:
+                delay=max(backoff*(2**attempt)*random.uniform(0.5, 1.5), retry_after(r) or 0.0)
+                if Verbose_Flag:
+                    print("{0} {1} was throttled, retrying in {2:.1f} s".format(method, url, delay))
+        finally:
+            _release(r, delay)
+        if delay is None:
+            break
+    return r
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+def put(url, **kwargs):
+    return request('PUT', url, **kwargs)
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+# call fn for each of the items from a pool of max_workers threads, the scheduler limits how many requests are in
+# flight; the results are returned in the order of the items
+def run_concurrently(fn, items):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(fn, items))
+
+def report():
+    if not stats['requests']:
+        return
+    elapsed=stats['last']-stats['first']
+    print("{0} Canvas requests in {1:.1f} s ({2:.1f} requests/s), cost {3:.1f} units, {4} throttled, at most {5} in flight".format(
+        stats['requests'], elapsed, stats['requests']/elapsed if elapsed > 0 else 0.0, stats['cost'], stats['throttled'],
+        stats['max_concurrency']))
+    if stats['min_remaining'] is not None:
+        print("lowest rate limit remaining: {0:.1f}".format(stats['min_remaining']))
+
+def get(url, params=None):
+    if Cache_Flag:
+        # the header is passed so that the token is part of the cache key
+        r = http_cache.get(url, params=params, headers=header, session_to_use=session())
+    else:
+        r = request('GET', url, params=params)
+    if Verbose_Flag:
+        print("GET {0} status code: {1}".format(r.url, r.status_code))
+    return r
+
+def get_json(url, params=None):
+    r = get(url, params)
+    if r.status_code == requests.codes.ok:
+        return r.json()
+    return None
+
+# Compute the URLs of pages 2..N from the 'last' link. Returns None when the page
+# numbers are not simple integers (i.e., bookmark pagination) and so cannot be computed.
+def page_urls_from_links(links):
+    last=links.get('last', None)
+    if not last:
+        return None
+    parsed=urlparse(last['url'])
+    query=parse_qs(parsed.query, keep_blank_values=True)
+    last_page=query.get('page', [None])[0]
+    if not last_page or not last_page.isdigit():
+        return None
+
+    urls=[]
+    for page in range(2, int(last_page)+1):
+        query['page']=[str(page)]
+        urls.append(urlunparse(parsed._replace(query=urlencode(query, doseq=True))))
+    return urls
+
+def _get_page(url):
+    r = get(url)
+    if r.status_code == requests.codes.ok:
+        return r.json()
+    print("Unable to get page {0}, status code {1}".format(url, r.status_code))
+    return None
+
+# With strict=True, None is returned if the first or any later page cannot be fetched, rather than the entries
+# found thus far; use this when a partial list would be taken as the complete list.
+def get_paginated_list(url, params=None, strict=False):
+    entries_found_thus_far=[]
+    if Verbose_Flag:
+        print("url: {}".format(url))
+
+    if params is None:
+        params={'per_page': '100'}
+    elif 'per_page' not in params:
+        params=dict(params, per_page='100')
+
+    r = get(url, params)
+    if Verbose_Flag:
+        print("result of getting first page: {}".format(r.text))
+
+    if r.status_code != requests.codes.ok:
+        if strict:
+            print("Unable to get {0}, status code {1}".format(url, r.status_code))
+            return None
+        return entries_found_thus_far
+
+    entries_found_thus_far.extend(r.json())
+
+    page_urls=page_urls_from_links(r.links)
+    if page_urls is not None:
+        if page_urls:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() returns the results in the order of page_urls
+                for page_response in executor.map(_get_page, page_urls):
+                    if page_response is None:
+                        if strict:
+                            return None
+                        continue
+                    entries_found_thus_far.extend(page_response)
+        return entries_found_thus_far
+
+    # the following is needed when the reponse has been paginated, but the 'last' link is not known
+    while r.links.get('next', False):
+        r = get(r.links['next']['url'])
+        if r.status_code != requests.codes.ok:
+            if strict:
+                print("Unable to get {0}, status code {1}".format(r.url, r.status_code))
+                return None
+            break
+        entries_found_thus_far.extend(r.json())
+
+    return entries_found_thus_far
+
+# Fetch several independent lists concurrently, results are returned in the same order as the urls
+def get_paginated_lists(urls, params=None, strict=False):
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda u: get_paginated_list(u, params, strict), urls))
+
+#//////////////////////////////////////////////////////////////////////
+# Commonly used Canvas routines
+#//////////////////////////////////////////////////////////////////////
+def users_in_course(course_id, extra_parameters=None):
+    # Use the Canvas API to get the list of users enrolled in this course
+    #GET /api/v1/courses/:course_id/enrollments
+    url = "{0}/courses/{1}/enrollments".format(baseUrl, course_id)
+    return get_paginated_list(url, extra_parameters)
+
+def students_in_course(course_id):
+    return users_in_course(course_id, {'per_page': '100', 'type': ['StudentEnrollment']})
+
+def teachers_in_course(course_id):
+    return users_in_course(course_id, {'per_page': '100', 'type': ['TeacherEnrollment']})
+
+def sections_in_course(course_id):
+    # GET /api/v1/courses/:course_id/sections
+    url = "{0}/courses/{1}/sections".format(baseUrl, course_id)
+    return get_paginated_list(url)
+
+def list_assignments(course_id):
+    # GET /api/v1/courses/:course_id/assignments
+    url = "{0}/courses/{1}/assignments".format(baseUrl, course_id)
+    return get_paginated_list(url)
+
+def list_modules(course_id):
+    # GET /api/v1/courses/:course_id/modules
+    url = "{0}/courses/{1}/modules".format(baseUrl, course_id)
+    return get_paginated_list(url)
+
+def list_custom_columns(course_id):
+    # GET /api/v1/courses/:course_id/custom_gradebook_columns
+    url = "{0}/courses/{1}/custom_gradebook_columns".format(baseUrl, course_id)
+    return get_paginated_list(url)
+
+def custom_column_data(course_id, column_id):
+    # GET /api/v1/courses/:course_id/custom_gradebook_columns/:id/data
+    url = "{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(baseUrl, course_id, column_id)
+    return get_paginated_list(url)
+
+# column_data is a list of {'column_id': ..., 'user_id': ..., 'content': ...}, these are all set with a single request.
+# Canvas makes the changes in a background job, the Progress object of the job is returned (None if the request failed).
+def update_custom_column_data(course_id, column_data):
+    # PUT /api/v1/courses/:course_id/custom_gradebook_column_data
+    url = "{0}/courses/{1}/custom_gradebook_column_data".format(baseUrl, course_id)
+    r = put(url, json={'column_data': column_data})
+    if Verbose_Flag:
+        print("result of bulk update of custom column data: {}".format(r.text))
+    if r.status_code == requests.codes.ok:
+        return r.json()
+    print("Unable to update the custom column data, status code {}".format(r.status_code))
+    return None
+
+# poll the Progress object of a background job until the job has completed or failed, returns the last Progress object
+def wait_for_progress(progress, interval=1.0):
+    # GET /api/v1/progress/:id
+    url = "{0}/progress/{1}".format(baseUrl, progress['id'])
+    while progress.get('workflow_state', None) in ['queued', 'running']:
+        time.sleep(interval)
+        new_progress=get_json(url)
+        if new_progress is None:
+            break
+        progress=new_progress
+    return progress
+
+def courses_for_a_user(user_id):
+    # GET /api/v1/users/:user_id/courses
+    url = "{0}/users/{1}/courses".format(baseUrl, user_id)
+    return get_paginated_list(url)
+
+def user_info(user_id):
+    # GET /api/v1/users/:id
+    url = "{0}/users/{1}".format(baseUrl, user_id)
+    return get_json(url)
+
+def user_profile(user_id):
+    # GET /api/v1/users/:user_id/profile
+    url = "{0}/users/{1}/profile".format(baseUrl, user_id)
+    return get_json(url)
@@ -19,6 +19,8 @@
 #
 # ./check_degree_projects_from_DiVA.py kth-student-theses-2019-20201008.xlsx
 #
+# The examiners are checked column-wise by check_examiners(), see benchmark_check_degree_projects.py
+#
 # G. Q. Maguire Jr.
 #
 #
@@ -26,6 +28,8 @@
 #
 
 import requests, time
+import http_cache
+from concurrent.futures import ThreadPoolExecutor
 import pprint
 import optparse
 import sys
@@ -33,6 +37,7 @@ import json
 
 # Use Python Pandas to create XLSX files
 import pandas as pd
+import numpy as np
 
 from bs4 import BeautifulSoup
 
@@ -61,7 +66,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -127,7 +132,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -155,7 +160,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -173,7 +178,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -208,7 +213,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -227,7 +232,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -292,8 +297,11 @@ def course_examiners(courses):
     global Verbose_Flag
     # get the examiners
     courses_info=dict()
-    for c in courses:
-        c_info=v1_get_course_info(c)
+    courses=list(courses)
+    # the course information is fetched concurrently (and is then kept in the HTTP cache), only the parsing is serial
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        courses_xml=list(executor.map(v1_get_course_info, courses))
+    for c, c_info in zip(courses, courses_xml):
         xml=BeautifulSoup(c_info, "lxml")
         examiners=list()
         for examiner in xml.findAll('examiner'):
@@ -416,7 +424,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -485,7 +493,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -621,7 +629,7 @@ def v1_get_academic_year_plan_for_program(program_code, year):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme academic-year-plan: {}".format(r.text))
     #
@@ -706,6 +714,62 @@ def highest_level(thesisLevels):
     return 1
 
 
+# Compute the 'Checked' column for the theses in students_df, column-wise rather than row by row.
+# The examiner names are put into normal order (as normaL_name_oder() does), corrected using corrected_names, and then
+# checked against the examiners of the 1st and 2nd cycle degree project courses, taking into account the highest
+# level of each thesis (as highest_level() does). Examiners that are not in KOPPS can have a special situation.
+# As in the earlier row by row version, the check stops at the first row without an integer PID.
+def check_examiners(students_df, corrected_names, special_situation, all_examiners_cycle_1, all_examiners_cycle_2):
+    global Verbose_Flag
+
+    # stop when you reach an empty PID cell
+    to_check=students_df['PID'].map(lambda x: isinstance(x, int)).cumprod().astype(bool)
+
+    examiners=students_df['Examiners']
+    examiners=examiners.where(examiners.map(lambda x: isinstance(x, str)), '').astype(str)
+    has_examiner=examiners.str.len() > 0
+
+    # the name is before the first '[' or '(' and is of the form "last name, first name"
+    sort_ordered_names=examiners.str.split(r'[\[(]', n=1, regex=True).str[0].str.strip()
+    name_parts=sort_ordered_names.str.split(',', n=2)
+    examiner=name_parts.str[1].str.strip() + ' ' + name_parts.str[0].str.strip()
+
+    # handle changes in name or spelling differences
+    corrected=examiner.map(corrected_names)
+    examiner=corrected.where(corrected.fillna('').astype(bool), examiner)
+
+    # the highest level of the thesis: 2 if any of the levels (separated by semicolons) is a second level
+    levels=students_df['ThesisLevel'].astype(str).str.split(';').explode()
+    current_level=pd.Series(np.where(levels.isin(second_levels).groupby(level=0).any(), 2, 1), index=students_df.index)
+
+    in_cycle_1=examiner.isin(all_examiners_cycle_1)
+    in_cycle_2=examiner.isin(all_examiners_cycle_2)
+    in_kopps=in_cycle_1 | in_cycle_2
+    special=examiner.map(special_situation).fillna('')
+    has_special=special.astype(bool)
+
+    status=np.select([~in_kopps & has_special,
+                      ~in_kopps,
+                      (current_level == 2) & in_cycle_2,
+                      (current_level == 1) & in_kopps],
+                     ['Valid '+special.astype(str), 'Invalid examiner', 'Valid', 'Valid'],
+                     default='Unchecked')
+    status=pd.Series(status, index=students_df.index).where(has_examiner, 'No examiner')
+
+    checked=to_check & has_examiner
+    def report(mask, message):
+        for pid, e, level, st in zip(students_df['PID'][mask], examiner[mask], current_level[mask], status[mask]):
+            print(message.format(pid, e, level, st))
+    report(checked & in_kopps & (current_level == 2) & ~in_cycle_2, "PID={0}, examiner={1}, current_level={2}, Not a valid level 2 examiner")
+    report(checked & (current_level == 1) & ~in_cycle_1 & in_cycle_2, "PID={0}, examiner={1}, current_level={2}, Not a valid level 1 examiner, but a valid level 2 examiner")
+    report(checked & ~in_kopps, "PID={0}, examiner={1}, current_level={2}, status={3}")
+    if Verbose_Flag:
+        report(checked, "PID={0}, examiner={1}, current_level={2}, status={3}")
+
+    students_df.loc[to_check, 'Checked']=status[to_check]
+    return students_df
+
+
 def main():
     global Verbose_Flag
 
@@ -790,58 +854,7 @@ def main():
     all_examiners=all_examiners_cycle_1.union(all_examiners_cycle_2)
     print("Examiners (in KOPPS) 1st cycle: {0}, 2nd cycle: {1}, total: {2}".format(len(all_examiners_cycle_1), len(all_examiners_cycle_2), len(all_examiners)))
 
-    for index, row in  students_df.iterrows():
-        if Verbose_Flag:
-            print("index: {0}, row['Examiners']: {1}, row['ThesisLevel']: {2}".format(index, row['Examiners'], row['ThesisLevel']))
-
-        # stop when you reach an empty PID cell
-        if not (isinstance(row['PID'], int)):
-            break
-
-        sort_ordered_examiner=row['Examiners']
-        # handle chnages in name or spelling differences
-            
-        if (not (isinstance(sort_ordered_examiner, str))) or (isinstance(sort_ordered_examiner, str) and (len(sort_ordered_examiner) < 1)):
-            students_df.at[index, 'Checked'] = 'No examiner'
-            continue
-        
-        status='Unchecked'
-
-        examiner=normaL_name_oder(sort_ordered_examiner)
-        if corrected_names.get(examiner, False):
-            examiner=corrected_names[examiner]
-
-        if examiner in all_examiners:
-
-            thesis_level=row['ThesisLevel']
-            current_level=highest_level(thesis_level)
-
-            if current_level == 2:
-                if examiner in all_examiners_cycle_2:
-                    status='Valid'
-                else:
-                    print("PID={0}, examiner={1}, current_level={2}, Not a valid level 2 examiner".format(row['PID'], examiner, current_level))
-            else:
-                if current_level == 1:
-                    if (examiner in all_examiners_cycle_1):
-                        status='Valid'
-                    else:
-                        if (examiner in all_examiners_cycle_2):
-                            print("PID={0}, examiner={1}, current_level={2}, Not a valid level 1 examiner, but a valid level 2 examiner".format(row['PID'], examiner, current_level))
-                            status='Valid'
-                else:
-                    print("PID={0}, examiner={1}, current_level={2}, Not a valid thesis level".format(row['PID'], examiner, current_level))
-        else:
-            es=special_situation.get(examiner, False)
-            if es:
-                status='Valid '+es
-            else:
-                status='Invalid examiner'
-            print("PID={0}, examiner={1}, current_level={2}, status={3}".format(row['PID'], examiner, current_level, status))
-
-        if Verbose_Flag:
-            print("PID={0}, examiner={1}, current_level={2}, status={3}".format(row['PID'], examiner, current_level, status))
-        students_df.at[index, 'Checked'] = status
+    students_df=check_examiners(students_df, corrected_names, special_situation, all_examiners_cycle_1, all_examiners_cycle_2)
 
     outputfile=spreadsheet_file[:-5]+'-examiners-checked.xlsx'
     writer = pd.ExcelWriter(outputfile, engine='xlsxwriter')
@@ -849,7 +862,7 @@ def main():
     students_df.to_excel(writer, sheet_name="Checked")
 
     # Close the Pandas Excel writer and output the Excel file.
-    writer.save()
+    writer.close()
 
     # examiners_data={
     #     'corrected_names': corrected_names,
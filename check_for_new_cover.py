@@ -51,6 +51,8 @@ import pdfminer.psparser
 from pdfminer.pdfdocument import PDFNoValidXRef
 from pdfminer.psparser import PSEOF
 
+import pdf_batch_driver         # to process the files in a spreadsheet in parallel
+
 def show_ltitem_hierarchy(o: Any, depth=0):
     """Show location and text of LTItem and all its descendants"""
     if depth == 0:
@@ -810,6 +812,146 @@ def process_file(filename):
     return True
 
 
+def initialize_worker(verbose, testing_flag):
+    global Verbose_Flag
+    global testing
+    Verbose_Flag=verbose
+    testing=testing_flag
+
+# Process a single file and return the spreadsheet columns to set for it - used by pdf_batch_driver
+def analyze_file(filename):
+    if not process_file(filename):
+        return {'Unexpected error when processing file': filename}
+
+    result=dict()
+    number_of_errors=len(set_of_errors)
+    cover_image_list=[]
+    left_over_cover_image_list=[]
+    if number_of_errors > 0:
+        result["Number of cover errors"]=number_of_errors
+        for i in set_of_errors:
+            if i == "Found old cover with school name":
+                result["Found old cover with school name"]=True
+            if i == "Case error in Degree project line - it appears to be in all uppercase":
+                result["Case error in Degree project line - it appears to be in all uppercase"]=True
+            if i == "Case error in Degree project line":
+                result["Case error in Degree project line"]=True
+            if i == "Case error in credits":
+                result["Case error in credits"]=True
+            if i == "Case error in cycle":
+                result["Case error in cycle"]=True
+            if i == "English credits units used with an Swedish cycle":
+                result["English credits units used with an Swedish cycle"]=True
+            if i == "Swedish credits units used with an English cycle":
+                result["Swedish credits units used with an English cycle"]=True
+            if i == "Found error in cover incorrect number of credits":
+                result["Found error in cover incorrect number of credits"]=True
+            if i == "Found error in cover with both English and Swedish for the degree project":
+                result["Found error in cover with both English and Swedish for the degree project"]=True
+            if i == "Found error in cover with incorrect level":
+                result["Found error in cover with incorrect level"]=True
+            if i == "Found error in cover with incorrect level":
+                result["Found error in cover with incorrect level"]=True
+            if i == "Found error in cover with stated specialization":
+                result["Found error in cover with stated specialization"]=True
+            if i == "The cover is just a full page picture":
+                result["The cover is just a full page picture"]=True
+            if i == 'Case error in "Project"':
+                result['Case error in "Project"']=True
+            if i == 'Found error in cover with incorrect major subject':
+                result['Found error in cover with incorrect major subject']=True
+            if i.find('Invalid first cycle major subject') >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 2:
+                    result['Invalid first cycle major subject']=tmp_str[1]
+            if i.find('Invalid second cycle major subject') >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 2:
+                    result['Invalid second cycle major subject']=tmp_str[1]
+            if i.find('Unexpectedly large number of credits') >= 0:
+                tmp_str=i.split('=')
+                if len(tmp_str) == 2:
+                    result['Unexpectedly large number of credits']=tmp_str[1]
+            if i.find("cover line length off by") >= 0:
+                tmp_str=i.split('by=')
+                if len(tmp_str) == 2:
+                    result["cover line length off by"]=tmp_str[1]
+            if i.find("cover line off by") >= 0:
+                tmp_str=i.split('by=')
+                if len(tmp_str) == 2:
+                    result["cover line off by"]=tmp_str[1]
+            if i.find("cover line off by length off by") >= 0:
+                tmp_str=i.split('by=')
+                if len(tmp_str) == 3:
+                    result["cover line off by length off by"]=f'({tmp_str[1]}) {tmp_str[2]}'
+            if i.find("possible KTH English logotype off by") >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 2:
+                    result["possible KTH English logotype off by"]=tmp_str[1]
+            if i.find("possible KTH English logotype wrong size") >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 2:
+                    result["possible KTH English logotype wrong size"]=tmp_str[1]
+            if i.find("possible KTH logo off by") >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 2:
+                    result["possible KTH logo off by"]=tmp_str[1]
+            if i.find("possible cover image on cover at") >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 3:
+                    cover_image_list.append(f'({tmp_str[1]}) {tmp_str[2]}')
+            if i.find("possible left over image on cover at") >= 0:
+                tmp_str=i.split(':')
+                if len(tmp_str) == 3:
+                    left_over_cover_image_list.append(f'({tmp_str[1]}) {tmp_str[2]}')
+
+    if len(cover_image_list) > 0:
+        result["possible cover image on cover at"]=cover_image_list
+    if len(left_over_cover_image_list) > 0:
+        result["possible left over image on cover at"]=left_over_cover_image_list
+
+    amount_of_evidence_for_a_new_cover=len(set_of_evidence_for_new_cover)
+    if amount_of_evidence_for_a_new_cover > 0:
+        result["Evidence for new cover"]=amount_of_evidence_for_a_new_cover
+        for i in set_of_evidence_for_new_cover:
+            if i == "English 1st cycle":
+                result["English 1st cycle"]=True
+            if i == "English 2nd cycle":
+                result["English 2nd cycle"]=True
+            if i == "English major subject":
+                result["English major subject"]=True
+            if i == "Swedish 1st cycle":
+                result["Swedish 1st cycle"]=True
+            if i == "Swedish 2nd cycle":
+                result["Swedish 2nd cycle"]=True
+            if i == "Swedish major subject":
+                result["Swedish major subject"]=True
+            if i == "cover line":
+                result["cover line"]=True
+            if i == "cover place English":
+                result["cover place English"]=True
+            if i == "cover place Swedish":
+                result["cover place Swedish"]=True
+            if i == "possible KTH English logotype":
+                result["possible KTH English logotype"]=True
+            if i == "possible KTH logo":
+                result["possible KTH logo"]=True
+            if i == 'valid major subject with learning':
+                result['valid major subject with learning']=True
+            if i == 'valid major subject':
+                result['valid major subject']=True
+            if i.find('cover year=') >= 0:
+                cover_year_str=i.split('=')
+                if len(cover_year_str) == 2:
+                    result['cover year']=cover_year_str[1]
+            if i.find('number of credits') >= 0:
+                number_of_credits_str=i.split('=')
+                if len(number_of_credits_str) == 2:
+                    result['number of credits']=float(number_of_credits_str[1])
+    result['extracted data']="{}".format(extracted_data)
+    return result
+
+
 def main(argv):
     global Verbose_Flag
     global Use_local_time_for_output_flag
@@ -850,6 +992,24 @@ def main(argv):
                       help="Number of rows to skip"
                       )
 
+    argp.add_argument('-j', '--jobs',
+                      type=int,
+                      default=None,
+                      help="number of worker processes to use for a spreadsheet (default: one per CPU)"
+                      )
+
+    argp.add_argument('-c', '--checkpoint',
+                      type=str,
+                      default=None,
+                      help="checkpoint file for a spreadsheet, used to resume an interrupted run"
+                      )
+
+    argp.add_argument('--resume',
+                      default=False,
+                      action="store_true",
+                      help="continue an interrupted run, using the results in the checkpoint file"
+                      )
+
     args = vars(argp.parse_args(argv))
 
     Verbose_Flag=args["verbose"]
@@ -938,154 +1098,16 @@ def main(argv):
     diva_df['extracted data'] = pd.NaT
     faulthandler.enable()
 
-    for idx, row in diva_df.iterrows():
-        if skip_to_row and idx < skip_to_row:
-            continue
-        url=row['FullTextLink']
-        author=row['Name']
-        pid=row['PID']
-        if pd.isna(url):
-            print("no full text for thesis by {}".format(author))
-        else:
-            print(f'{idx}: {author}  {url}')
-            last_slash_in_url=url.rfind('/')
-            if last_slash_in_url < 0:
-                print("Cannot find file name in URL")
-                continue
-            filename="{0}-{1}".format(pid, url[last_slash_in_url+1:])
-            print(f'reading file {filename}')
-
-            if not process_file(filename):
-                diva_df.loc[idx, 'Unexpected error when processing file']=filename
-                continue
-
-            number_of_errors=len(set_of_errors)
-            cover_image_list=[]
-            left_over_cover_image_list=[]
-            if number_of_errors > 0:
-                diva_df.loc[idx, "Number of cover errors"]=number_of_errors
-                for i in set_of_errors:
-                    if i == "Found old cover with school name":
-                        diva_df.loc[idx, "Found old cover with school name"]=True
-                    if i == "Case error in Degree project line - it appears to be in all uppercase":
-                        diva_df.loc[idx, "Case error in Degree project line - it appears to be in all uppercase"]=True
-                    if i == "Case error in Degree project line":
-                        diva_df.loc[idx, "Case error in Degree project line"]=True
-                    if i == "Case error in credits":
-                        diva_df.loc[idx, "Case error in credits"]=True
-                    if i == "Case error in cycle":
-                        diva_df.loc[idx, "Case error in cycle"]=True
-                    if i == "English credits units used with an Swedish cycle":
-                        diva_df.loc[idx, "English credits units used with an Swedish cycle"]=True
-                    if i == "Swedish credits units used with an English cycle":
-                        diva_df.loc[idx, "Swedish credits units used with an English cycle"]=True
-                    if i == "Found error in cover incorrect number of credits":
-                        diva_df.loc[idx, "Found error in cover incorrect number of credits"]=True
-                    if i == "Found error in cover with both English and Swedish for the degree project":
-                        diva_df.loc[idx, "Found error in cover with both English and Swedish for the degree project"]=True
-                    if i == "Found error in cover with incorrect level":
-                        diva_df.loc[idx, "Found error in cover with incorrect level"]=True
-                    if i == "Found error in cover with incorrect level":
-                        diva_df.loc[idx, "Found error in cover with incorrect level"]=True
-                    if i == "Found error in cover with stated specialization":
-                        diva_df.loc[idx, "Found error in cover with stated specialization"]=True
-                    if i == "The cover is just a full page picture":
-                        diva_df.loc[idx, "The cover is just a full page picture"]=True
-                    if i == 'Case error in "Project"':
-                        diva_df.loc[idx, 'Case error in "Project"']=True
-                    if i == 'Found error in cover with incorrect major subject':
-                        diva_df.loc[idx, 'Found error in cover with incorrect major subject']=True
-                    if i.find('Invalid first cycle major subject') >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, 'Invalid first cycle major subject']=tmp_str[1]
-                    if i.find('Invalid second cycle major subject') >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, 'Invalid second cycle major subject']=tmp_str[1]
-                    if i.find('Unexpectedly large number of credits') >= 0:
-                        tmp_str=i.split('=')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, 'Unexpectedly large number of credits']=tmp_str[1]
-                    if i.find("cover line length off by") >= 0:
-                        tmp_str=i.split('by=')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, "cover line length off by"]=tmp_str[1]
-                    if i.find("cover line off by") >= 0:
-                        tmp_str=i.split('by=')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, "cover line off by"]=tmp_str[1]
-                    if i.find("cover line off by length off by") >= 0:
-                        tmp_str=i.split('by=')
-                        if len(tmp_str) == 3:
-                            diva_df.loc[idx, "cover line off by length off by"]=f'({tmp_str[1]}) {tmp_str[2]}'
-                    if i.find("possible KTH English logotype off by") >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, "possible KTH English logotype off by"]=tmp_str[1]
-                    if i.find("possible KTH English logotype wrong size") >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, "possible KTH English logotype wrong size"]=tmp_str[1]
-                    if i.find("possible KTH logo off by") >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 2:
-                            diva_df.loc[idx, "possible KTH logo off by"]=tmp_str[1]
-                    if i.find("possible cover image on cover at") >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 3:
-                            cover_image_list.append(f'({tmp_str[1]}) {tmp_str[2]}')
-                    if i.find("possible left over image on cover at") >= 0:
-                        tmp_str=i.split(':')
-                        if len(tmp_str) == 3:
-                            left_over_cover_image_list.append(f'({tmp_str[1]}) {tmp_str[2]}')
-
-            if len(cover_image_list) > 0:
-                diva_df.loc[idx, "possible cover image on cover at"]=cover_image_list
-            if len(left_over_cover_image_list) > 0:
-                diva_df.loc[idx, "possible left over image on cover at"]=left_over_cover_image_list
-
-            amount_of_evidence_for_a_new_cover=len(set_of_evidence_for_new_cover)
-            if amount_of_evidence_for_a_new_cover > 0:
-                diva_df.loc[idx, "Evidence for new cover"]=amount_of_evidence_for_a_new_cover
-                for i in set_of_evidence_for_new_cover:
-                    if i == "English 1st cycle":
-                        diva_df.loc[idx, "English 1st cycle"]=True
-                    if i == "English 2nd cycle":
-                        diva_df.loc[idx, "English 2nd cycle"]=True
-                    if i == "English major subject":
-                        diva_df.loc[idx, "English major subject"]=True
-                    if i == "Swedish 1st cycle":
-                        diva_df.loc[idx, "Swedish 1st cycle"]=True
-                    if i == "Swedish 2nd cycle":
-                        diva_df.loc[idx, "Swedish 2nd cycle"]=True
-                    if i == "Swedish major subject":
-                        diva_df.loc[idx, "Swedish major subject"]=True
-                    if i == "cover line":
-                        diva_df.loc[idx, "cover line"]=True
-                    if i == "cover place English":
-                        diva_df.loc[idx, "cover place English"]=True
-                    if i == "cover place Swedish":
-                        diva_df.loc[idx, "cover place Swedish"]=True
-                    if i == "possible KTH English logotype":
-                        diva_df.loc[idx, "possible KTH English logotype"]=True
-                    if i == "possible KTH logo":
-                        diva_df.loc[idx, "possible KTH logo"]=True
-                    if i == 'valid major subject with learning':
-                        diva_df.loc[idx, 'valid major subject with learning']=True
-                    if i == 'valid major subject':
-                        diva_df.loc[idx, 'valid major subject']=True
-                    if i.find('cover year=') >= 0:
-                        cover_year_str=i.split('=')
-                        if len(cover_year_str) == 2:
-                            diva_df.loc[idx, 'cover year']=cover_year_str[1]
-                    if i.find('number of credits') >= 0:
-                        number_of_credits_str=i.split('=')
-                        if len(number_of_credits_str) == 2:
-                            diva_df.loc[idx, 'number of credits']=float(number_of_credits_str[1])
-            diva_df.loc[idx, 'extracted data']="{}".format(extracted_data)
-        if args["testing"]:
-            break
+    checkpoint_filename=args['checkpoint']
+    if not checkpoint_filename:
+        checkpoint_filename=pdf_batch_driver.default_checkpoint_filename(spreadsheet_name, 'coverinfo')
+
+    results=pdf_batch_driver.run_batch(diva_df, analyze_file, checkpoint_filename,
+                                       processes=args['jobs'], skip_to_row=skip_to_row, resume=args['resume'],
+                                       limit=1 if args["testing"] else None,
+                                       initializer=initialize_worker, initargs=(Verbose_Flag, testing))
+    pdf_batch_driver.merge_results(diva_df, results)
+
     # clean up the type of the cover year column
     diva_df['cover year'] = diva_df['cover year'].dt.year
 
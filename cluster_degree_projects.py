@@ -98,19 +98,10 @@ def main(argv):
 
 
     # determine all of the subjects
-    for index, row in  degree_project_courses_df.iterrows():
-        school=row['school.code']
-        s0=row['mainSubjects_0_name.en']
-        s1=row['mainSubjects_1_name.en']
-        s2=row['mainSubjects_2_name.en']
-        if isinstance(school, str):
-            schools.add(school)
-        if isinstance(s0, str):
-            subjects.add(s0)
-        if isinstance(s1, str):
-            subjects.add(s1)
-        if isinstance(s2, str):
-            subjects.add(s2)
+    subject_columns=['mainSubjects_0_name.en', 'mainSubjects_1_name.en', 'mainSubjects_2_name.en']
+    schools=set(degree_project_courses_df['school.code'].dropna())
+    school_subjects=degree_project_courses_df.melt(id_vars=['school.code'], value_vars=subject_columns, value_name='subject').dropna(subset=['subject'])
+    subjects=set(school_subjects['subject'])
 
     if Verbose_Flag:
         print("subjects={}".format(subjects))
@@ -120,21 +111,9 @@ def main(argv):
     for s in schools:
         subjects_by_school[s]=set()
 
-    for index, row in  degree_project_courses_df.iterrows():
-        school=row['school.code']
-        s0=row['mainSubjects_0_name.en']
-        s1=row['mainSubjects_1_name.en']
-        s2=row['mainSubjects_2_name.en']
-        
-        if isinstance(s0, str):
-            if s0 != 'Technology':
-                subjects_by_school[school].add(s0)
-        if isinstance(s1, str):
-            if s1 != 'Technology':
-                subjects_by_school[school].add(s1)
-        if isinstance(s2, str):
-            if s2 != 'Technology':
-                subjects_by_school[school].add(s2)
+    school_subjects=school_subjects[school_subjects['subject'] != 'Technology']
+    for school, school_subject_set in school_subjects.groupby('school.code')['subject'].agg(set).items():
+        subjects_by_school[school].update(school_subject_set)
 
     print("subjects_by_school={}".format(subjects_by_school))
 
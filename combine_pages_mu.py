@@ -5,6 +5,10 @@
 #
 # Combine text from the first 25 pages of the PDF files in the input directory into a single text file
 #
+# The PDF files are processed in parallel by worker processes (one PDF file per task, see --workers). The text of each
+# file is written to the output file in the order of the file names. The special cases for particular theses are in the
+# table special_cases.
+#
 # Output:
 #   outputs a single file with all of the extracted pages
 #
@@ -22,6 +26,9 @@ import os
 
 import faulthandler
 
+import itertools
+import concurrent.futures
+
 import pymupdf # import PyMuPDF
 
 pdf_files_to_ignore=['1513609-FULLTEXT03.pdf',
@@ -51,270 +58,224 @@ larger_offset_to_contents={
 
 }
 
-def combine_first_25_pages(input_dir, output_filename):
-    """Combines the first 25 pages of all PDFs in a directory into a single PDF.
+# Special cases for particular theses, indexed by a part of the file name (the DiVA id).
+# Each rule applies to a single page ('page') or to all pages after a given page ('after'), optionally only when the
+# page's text contains one of the strings in 'contains' or starts with the string in 'startswith'.
+# A matching rule sets contents_found or references_found (and optionally skip_last_page).
+special_cases={
+    '1430432': [{'sets': 'contents', 'after': 1, 'contains': ["Table of content"]}],
+    '1501686': [{'sets': 'contents', 'after': 1, 'contains': ["Table of content"]}],
+    '1813632': [{'sets': 'contents', 'after': 1, 'contains': ["Table of content"]}],
+    '1598473': [{'sets': 'contents', 'after': 1, 'contains': ["Table of c ontents"]}],
+    '1427220': [{'sets': 'contents', 'page': 10, 'contains': ["Content"]}],
+    '1704847': [{'sets': 'contents', 'page': 2, 'contains': ["Content"]},
+                {'sets': 'references', 'page': 4, 'contains': ["Preface"]}],
+    '1626735': [{'sets': 'contents', 'page': 7, 'contains': ["Content"]}],
+    '1656258': [{'sets': 'contents', 'page': 13, 'contains': ["Content"]}],
+    '1733649': [{'sets': 'contents', 'page': 11, 'contains': ["Content"]},
+                {'sets': 'references', 'page': 13}],  # Reference literature
+    '1563869': [{'sets': 'contents', 'page': 13, 'contains': ["CONTENT"]}],
+    '1656355': [{'sets': 'contents', 'page': 11, 'startswith': "C O N T E N T S"},
+                {'sets': 'contents', 'page': 13, 'startswith': "C O N T E N T S"}],
+    # in 1754147-FULLTEXT01.pdf the Contents page is just hex codes - not recognizable as normal character, but starts with "􀀋􀀞􀀝􀀢􀀕􀀝􀀢􀀡􀀁"
+    '1754147': [{'sets': 'contents', 'page': 14}],
+    '1389270': [{'sets': 'contents', 'after': 1, 'contains': ["Index"]}],
+    '1557578': [{'sets': 'contents', 'after': 1, 'contains': ["Index"]}],
+    # a thesis that uses the singular rather than the plural
+    '1648564': [{'sets': 'references', 'after': 1, 'contains': ["Reference", "REFERENCE"]}],
+    '1528058': [{'sets': 'references', 'after': 1, 'contains': ["Reference", "REFERENCE"]},
+                {'sets': 'references', 'page': 9, 'contains': ["REFERENCE S"]}],
+    '1464302': [{'sets': 'references', 'page': 13}],  # Reference literature
+    # the table of contents refers to "Sources" and following the TOC is "CHAPTER 1"
+    '1400295': [{'sets': 'references', 'page': 14}],
+    '1654893': [{'sets': 'references', 'page': 13, 'contains': ["1 \n Chapter 1"], 'skip_last_page': True}],
+    '1735246': [{'sets': 'references', 'page': 17, 'contains': ["1\nChap\nter 1"], 'skip_last_page': True}],
+    '1501920': [{'sets': 'references', 'page': 17, 'contains': ["1 Introduction"], 'skip_last_page': True}],
+    # the TOC has "REFEREN CES"
+    '1643849': [{'sets': 'references', 'page': 13, 'contains': ["INTRODUCTION"], 'skip_last_page': True}],
+    '1646381': [{'sets': 'references', 'page': 15, 'contains': ["1 Introduction"], 'skip_last_page': True}],
+    # the string appears as "Reference s"
+    '1756272': [{'sets': 'references', 'after': 0, 'contains': ["This first chapter"], 'skip_last_page': True}],
+    '1703858': [{'sets': 'references', 'after': 0, 'contains': ["I give a general overview of drug delivery to the lung"], 'skip_last_page': True}],
+    '1501689': [{'sets': 'references', 'page': 11, 'contains': ["Under  mitten av 1990 -talet arbetade jag som skiftgående me kanisk reparatör"], 'skip_last_page': True}],
+    # the string appears as "Referenc es"
+    '1530592': [{'sets': 'references', 'page': 12, 'contains': ["Referenc es"]}],
+    # the string appears as "Refe r\nences"
+    '1596193': [{'sets': 'references', 'page': 13, 'contains': ["Refe r\nences"]}],
+    '1751042': [{'sets': 'references', 'page': 10, 'contains': ["Refe r\nences"]}],
+    '1660342': [{'sets': 'references', 'page': 12, 'contains': ["R\neferences"]}],
+    # the TOC shows "BIBLIOGRAPHY" but the text is actually "bibliography"
+    '1557397': [{'sets': 'references', 'page': 7, 'contains': ["bibliography"]}],
+}
+
+def special_cases_for_file(filename):
+    rules=[]
+    for key in special_cases:
+        if filename.find(key) >= 0:
+            rules.extend(special_cases[key])
+    return rules
+
+def rule_matches(rule, i, txt):
+    if 'page' in rule and i != rule['page']:
+        return False
+    if 'after' in rule and i <= rule['after']:
+        return False
+    if 'contains' in rule and not any(s in txt for s in rule['contains']):
+        return False
+    if 'startswith' in rule and not txt.startswith(rule['startswith']):
+        return False
+    return True
+
+page_marker=chr(12)+"***End_of_Page_Marger***\n"
+
+def front_matter_of_file(input_dir, filename):
+    """Returns the text of the cover page and of the front matter (from the table of contents) of a PDF file.
 
     Args:
-      input_dir: The directory containing the PDF files.
-      output_filename: The filename for the combined PDF.
+      input_dir: The directory containing the PDF file.
+      filename: The name of the PDF file.
     """
     global Verbose_Flag
-    global Filter_flag
     global Anonymous_flag
 
-    all_text=""
-    for filename in os.listdir(input_dir):
-        if filename.endswith(".pdf"):
-            filepath = os.path.join(input_dir, filename)
-
-            # skip files with know problems
-            if filename in pdf_files_to_ignore:
-                continue
-
-            if filename in larger_offset_to_contents:
-                max_pages_to_check=larger_offset_to_contents[filename]
-            else:
-                max_pages_to_check=25
-
-            if Verbose_Flag:
-                print(f"Working on {filename}")
-            try:
-                doc = pymupdf.open(filepath)
-                num_pages = len(doc)
-                references_found=False
-                contents_found=False
-                skip_last_page=False
-                for i in range(min(num_pages, max_pages_to_check)):
-                    # get page
-                    page=doc[i]
-
-                    # extract text
-                    txt = page.get_text()
-                    # always output the cover page (or first page)
-                    if i == 0 and not Anonymous_flag:
-                        all_text=all_text + txt + chr(12)+"***End_of_Page_Marger***\n"
-                        continue
-                    # skip the Printed by pages.
-                    if i > 0 and "Printed by" in txt:
-                        continue
-                    if i > 0 and "Universitetsservice US-AB" in txt:
-                        continue
-                    if i > 0 and "public defense" in txt:
-                        continue
-                    if i > 0 and "public defence" in txt:
-                        continue
-                    # if i > 1 and ("Abstract" in txt or "ABSTRACT" in txt):
-                    #     continue
-                    # if i > 1 and ("Sammanfattning" in txt or "SAMMANFATTNING" in txt):
-                    #     continue
-                    if i > 1 and (txt.startswith("Contents") or txt.startswith("CONTENTS") or "Contents" in txt or "CONTENTS" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} - found Contents")
-
-                    if i > 1 and ("Table of contents" in txt or "Table of Contents" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} -- found TOC")
-
-                    if i > 1 and ("Innehållsförteckning" in txt or "INNEHÅLLSFÖRTECKNING" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} -- found TOC (Swedish)")
-
-                    if (filename.find('1430432') >= 0  or filename.find('1501686')  >= 0 or filename.find('1501686')  >= 0 or filename.find('1813632')  >= 0 or filename.find(' 1530592')  >= 0) and i > 1 and "Table of content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-                    if (filename.find('1598473') >= 0 or filename.find('1598473')  >= 0 or filename.find(' 1611997')  >= 0) and i > 1 and "Table of c ontents" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
+    filepath = os.path.join(input_dir, filename)
 
-                    if filename.find('1427220') >= 0 and i == 10 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1704847') >= 0 and i == 2 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1626735') >= 0 and i == 7 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1656258') >= 0 and i == 13 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1733649') >= 0 and i == 11 and "Content" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-                    if filename.find('1563869') >= 0 and i == 13 and "CONTENT" in txt:
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-                        
-
-                    if filename.find('1656355') >= 0 and i == 11 and txt.startswith("C O N T E N T S"):
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
-
-                    if filename.find('1656355') >= 0 and i == 13 and txt.startswith("C O N T E N T S"):
-                        contents_found=True
-                        print(f"{contents_found=} -- special")
+    if filename in larger_offset_to_contents:
+        max_pages_to_check=larger_offset_to_contents[filename]
+    else:
+        max_pages_to_check=25
 
+    # the special cases for this file are looked up once rather than for each page
+    rules=special_cases_for_file(filename)
 
-                    # in 1754147-FULLTEXT01.pdf the Contents page is just hex codes - not recognizable as normal character, but starts with "􀀋􀀞􀀝􀀢􀀕􀀝􀀢􀀡􀀁"
-                    if filename.find('1754147') >= 0 and i == 14:
+    if Verbose_Flag:
+        print(f"Working on {filename}")
+    pages=[]
+    try:
+        doc = pymupdf.open(filepath)
+        num_pages = len(doc)
+        references_found=False
+        contents_found=False
+        skip_last_page=False
+        for i in range(min(num_pages, max_pages_to_check)):
+            # get page
+            page=doc[i]
+
+            # extract text
+            txt = page.get_text()
+            # always output the cover page (or first page)
+            if i == 0 and not Anonymous_flag:
+                pages.append(txt + page_marker)
+                continue
+            # skip the Printed by pages.
+            if i > 0 and "Printed by" in txt:
+                continue
+            if i > 0 and "Universitetsservice US-AB" in txt:
+                continue
+            if i > 0 and "public defense" in txt:
+                continue
+            if i > 0 and "public defence" in txt:
+                continue
+            # if i > 1 and ("Abstract" in txt or "ABSTRACT" in txt):
+            #     continue
+            # if i > 1 and ("Sammanfattning" in txt or "SAMMANFATTNING" in txt):
+            #     continue
+            if i > 1 and (txt.startswith("Contents") or txt.startswith("CONTENTS") or "Contents" in txt or "CONTENTS" in txt):
+                contents_found=True
+                print(f"{contents_found=} - found Contents")
+
+            if i > 1 and ("Table of contents" in txt or "Table of Contents" in txt):
+                contents_found=True
+                print(f"{contents_found=} -- found TOC")
+
+            if i > 1 and ("Innehållsförteckning" in txt or "INNEHÅLLSFÖRTECKNING" in txt):
+                contents_found=True
+                print(f"{contents_found=} -- found TOC (Swedish)")
+
+            # 1650507-FULLTEXT03.pdf uses REFERENCE LIST
+            if i > 1 and ("References" in txt or "REFERENCES" in txt or "REFERENCE LIST" in txt):
+                references_found=True
+                print(f"{references_found=} . References")
+
+            if i > 2 and ("Bibliography" in txt or "BIBLIOGRAPHY" in txt):
+                references_found=True
+                print(f"{references_found=} -- found Bibliography")
+
+            if i > 2 and ("Tryckta källor" in txt or "Elektroniska källor" in txt or "Referenser" in txt):
+                references_found=True
+                print(f"{references_found=} -- found Tryckta/Elektroniska källor")
+
+            # If we reach "Chapter 1" without encountering the references, then assue that we should stop copying
+            if i > 0 and (txt.startswith("Chapter 1") or txt.startswith("CHAPTER 1")):
+                references_found=True
+                print(f"{references_found=} -- found Chapter 1")
+                skip_last_page=True
+
+            for rule in rules:
+                if rule_matches(rule, i, txt):
+                    if rule['sets'] == 'contents':
                         contents_found=True
                         print(f"{contents_found=} -- special")
-                        
-                    if (filename.find('1389270') >= 0 or filename.find('1557578') >= 0) and i > 1 and (txt.startswith("Index") or txt.startswith("Index") or "Index" in txt or "Index" in txt):
-                        contents_found=True
-                        print(f"{contents_found=} - found Index")
-
-                    # special processing for a thesis that uses the singular rather than the plural
-                    if (filename.find('1648564') >= 0 or filename.find('1528058') >= 0) and i > 1 and ("Reference" in txt or "REFERENCE" in txt):
-                        references_found=True
-                        print(f"{references_found=} - found reference")
-
-                    # Reference literature
-                    if (filename.find('1733649') >= 0 or filename.find('1464302') >= 0) and i == 13 and "Reference":
-                        references_found=True
-                        print(f"{references_found=} - found reference")
-
-                    # 1650507-FULLTEXT03.pdf uses REFERENCE LIST
-                    if i > 1 and ("References" in txt or "REFERENCES" in txt or "REFERENCE LIST" in txt):
-                        references_found=True
-                        print(f"{references_found=} . References")
-
-                    if i > 2 and ("Bibliography" in txt or "BIBLIOGRAPHY" in txt):
-                        references_found=True
-                        print(f"{references_found=} -- found Bibliography")
-
-                    if i > 2 and ("Tryckta källor" in txt or "Elektroniska källor" in txt or "Referenser" in txt):
-                        references_found=True
-                        print(f"{references_found=} -- found Tryckta/Elektroniska källor")
-
-                    # If we reach "Chapter 1" without encountering the references, then assue that we should stop copying
-                    if i > 0 and (txt.startswith("Chapter 1") or txt.startswith("CHAPTER 1")):
-                        references_found=True
-                        print(f"{references_found=} -- found Chapter 1")
-                        skip_last_page=True
-
-                    # special case - the table of contents refers to "Sources" and following the TOC is "CHAPTER 1"
-                    if filename.find('1400295') >= 0 and i == 14:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-                    # special case - 1654893
-                    if filename.find('1654893') >= 0 and i == 13 and "1 \n Chapter 1" in txt:
+                    else:
                         references_found=True
                         print(f"{references_found=} ** special")
+                    if rule.get('skip_last_page'):
                         skip_last_page=True
-                        
-                    # special case
-                    if filename.find('1735246') >= 0 and i == 17 and "1\nChap\nter 1" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case
-                    if filename.find('1501920') >= 0 and i == 17 and "1 Introduction" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case - TOC has "REFEREN CES"
-                    if filename.find('1643849') >= 0 and i == 13 and "INTRODUCTION" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case
-                    if filename.find('1646381') >= 0 and i == 15 and "1 Introduction" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case as the string appears as "Reference s"
-                    if filename.find('1756272') >= 0 and i > 0 and "This first chapter" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-                        
-                    # special case as the string appears as "Reference s"
-                    if filename.find('1703858') >= 0 and i > 0 and "I give a general overview of drug delivery to the lung" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    if filename.find('1501689') >= 0 and i == 11 and "Under  mitten av 1990 -talet arbetade jag som skiftgående me kanisk reparatör" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-                        skip_last_page=True
-
-                    # special case as the string appears as "Referenc es"
-                    if filename.find('1530592') >= 0 and i == 12 and "Referenc es" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
 
-                    # special case as the string appears as "Refe r\nences"
-                    if filename.find('1596193') >= 0 and i == 13 and "Refe r\nences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
+            # special processing - a TOC has been seen .- now we see a LIST OFIGURES, ...
+            if contents_found and "LIST OF" in txt:
+                references_found=True
+                print(f"{references_found=} - found LIST OF")
+                skip_last_page=True
 
-                    # special case as the string appears as "REFERENCE S"
-                    if filename.find('1528058') >= 0 and i == 9 and "REFERENCE S" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
+            if contents_found:
+                if len(txt) > 0: # no need to write empty pages, i.e., those without (extractable) text
+                    if not skip_last_page:
+                        pages.append(txt + page_marker)
 
-                    # special case
-                    if filename.find('1751042') >= 0 and i == 10 and "Refe r\nences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
+            # stop copying pages when you have processed a page with "References" on it.
+            if references_found:
+                print(f"[stopping at page {i}; {contents_found=} ")
+                break
 
-                    # special case
-                    if filename.find('1660342') >= 0 and i == 12 and "R\neferences" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
+            if i >= max_pages_to_check - 1:
+                print(f"[stopping at page {i}; {contents_found=}; {references_found=}")
+                break
 
+    except Exception as err:
+        print(f"Unexpected {err=}, {type(err)=}")
+    return "".join(pages)
 
-                    # special case
-                    if filename.find('1704847') >= 0 and i == 4 and "Preface" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
-
-
-                    # The TOC shows "BIBLIOGRAPHY" but the text is actually "bibliography"
-                    if filename.find('1557397') >= 0 and i == 7 and "bibliography" in txt:
-                        references_found=True
-                        print(f"{references_found=} ** special")
+# used by the worker processes
+def initialize_worker(verbose, anonymous):
+    global Verbose_Flag
+    global Anonymous_flag
+    Verbose_Flag=verbose
+    Anonymous_flag=anonymous
 
+def combine_first_25_pages(input_dir, output_filename, workers=None):
+    """Combines the front matter from the first 25 pages of all PDFs in a directory into a single text file.
 
-                    # special processing - a TOC has been seen .- now we see a LIST OFIGURES, ...
-                    if contents_found and "LIST OF" in txt:
-                        references_found=True
-                        print(f"{references_found=} - found LIST OF")
-                        skip_last_page=True
-
-                    if contents_found:
-                        if len(txt) > 0: # no need to write empty pages, i.e., those without (extractable) text
-                            if not skip_last_page:
-                                all_text=all_text + txt + chr(12)+"***End_of_Page_Marger***\n"
+    Each PDF file is processed by a worker process; the results are written to the output file in the order
+    of the file names as they become available.
 
-                    # stop copying pages when you have processed a page with "References" on it.
-                    if references_found:
-                        print(f"[stopping at page {i}; {contents_found=} ")
-                        break
+    Args:
+      input_dir: The directory containing the PDF files.
+      output_filename: The filename for the combined text.
+      workers: The number of worker processes (default: the number of CPUs).
+    """
+    global Verbose_Flag
+    global Anonymous_flag
 
-                    if i >= max_pages_to_check - 1:
-                        print(f"[stopping at page {i}; {contents_found=}; {references_found=}")
-                        break
+    # skip files with know problems
+    filenames=sorted([filename for filename in os.listdir(input_dir)
+                      if filename.endswith(".pdf") and filename not in pdf_files_to_ignore])
 
-            except Exception as err:
-                print(f"Unexpected {err=}, {type(err)=}")
-                continue
-            
     with open(output_filename, "wb") as output_file:
-        output_file.write(all_text.encode("utf8"))
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker,
+                                                    initargs=(Verbose_Flag, Anonymous_flag)) as executor:
+            for txt in executor.map(front_matter_of_file, itertools.repeat(input_dir), filenames):
+                output_file.write(txt.encode("utf8"))
 
 def main():
     global Verbose_Flag
@@ -344,6 +305,13 @@ def main():
                       help="filter out some pages"
     )
 
+    parser.add_option('-w', '--workers',
+                      dest="workers",
+                      type="int",
+                      default=None,
+                      help="number of worker processes (default: the number of CPUs)"
+    )
+
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
@@ -361,7 +329,7 @@ def main():
         input_directory=remainder[0]
         output_file_name=remainder[1]
 
-        combine_first_25_pages(input_directory, output_file_name)
+        combine_first_25_pages(input_directory, output_file_name, options.workers)
 
 
 
@@ -21,6 +21,13 @@
 #
 # with the option "-v" or "--verbose" you get lots of output - showing in detail the operations of the program
 #
+# The files are indexed by their relative path (in NFC form and case folded, as OneDrive does not distinguish case), so
+# the program reports the local files that are missing in OneDrive and the files that are only in OneDrive.
+# If the spreadsheet has a size column (or a SHA-1 hash column) the sizes (hashes) of the files are also compared.
+# With the option "--hash" the SHA-1 hashes of the local files are computed (in a pool of threads) and local files
+# with the same contents are reported. The hashes are cached in a JSON file (see "--cache"), so that on later runs
+# only new or changed files (based on their size and modification time) are read.
+#
 # Example:
 # ./compare_onedrive_folder_with_directory.py   II2202-for-Wouter  II2202-for-wouler-spreadsheet.xlsx
 #
@@ -34,7 +41,10 @@ import pprint
 import optparse
 import sys
 import os.path
-import glob
+import json
+import hashlib
+import unicodedata
+import concurrent.futures
 
 from io import StringIO, BytesIO
 
@@ -48,6 +58,114 @@ import math
 import ast
 
 
+# invald characters in folders and file names from https://support.microsoft.com/en-us/office/restrictions-and-limitations-in-onedrive-and-sharepoint-64883a5d-228e-48f5-b3d2-eb39e07630fa
+oneDriver_invalid_characters=['"', '*', ':',  '<', '>', '?', '/', '\\', '|']
+# removed '/' the set of oneDriver_invalid_characters to get bad_characters
+bad_characters=['"', '*', ':',  '<', '>', '?', '\\', '|']
+
+# columns that, if present in the spreadsheet, give the size and the SHA-1 hash of a file
+size_columns=['Filstorlek', 'Storlek', 'File Size', 'Size']
+hash_columns=['SHA1 Hash', 'sha1Hash', 'SHA1']
+
+# OneDrive does not distinguish upper and lower case and macOS stores names decomposed (NFD), so the relative paths
+# are compared in NFC form and case folded
+def normalize_path(relative_path):
+    return unicodedata.normalize('NFC', relative_path.replace(os.sep, '/')).casefold()
+
+# returns a dict indexed by the normalized relative path of each file in the OneDrive folder
+def onedrive_files_from_spreadsheet(directory_df):
+    global Verbose_Flag
+
+    size_column=next((c for c in size_columns if c in directory_df.columns), None)
+    hash_column=next((c for c in hash_columns if c in directory_df.columns), None)
+
+    oneDrive_prefix=""
+    oneDrive_files=dict()
+    for idx, row in directory_df.iterrows():
+        name=row['Namn']
+        ftype=row['Objekttyp']
+        path=row['Sökväg']
+        if Verbose_Flag:
+            print("idx={0}, name={1}, path={2}".format(idx, name, path))
+        if idx == 0:
+            oneDrive_prefix=path+'/'+name
+            oneDrive_prefix_len=len(oneDrive_prefix)
+            print(f"{oneDrive_prefix=} with length of {oneDrive_prefix_len}")
+
+        if ftype == 'Item' and path.find(oneDrive_prefix) == 0:
+            if path == oneDrive_prefix:
+                fname=name
+            else:
+                if isinstance(name, int):
+                    name=f"{name}"
+                else:
+                    if isinstance(name, float):
+                        print("skipping a file wihout a valid name")
+                        continue
+                fname=path[oneDrive_prefix_len+1:]+'/'+name
+            if Verbose_Flag:
+                print(f"{fname=}")
+            entry={'name': fname, 'size': None, 'sha1': None}
+            if size_column and not pd.isna(row[size_column]):
+                entry['size']=int(row[size_column])
+            if hash_column and isinstance(row[hash_column], str):
+                entry['sha1']=row[hash_column].lower()
+            oneDrive_files[normalize_path(f"{fname}")]=entry
+    return oneDrive_files
+
+# returns a dict indexed by the normalized relative path of each file in the local directory
+def local_files_in_directory(local_directory):
+    local_files=dict()
+    directories=[local_directory]
+    while directories:
+        directory=directories.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # as with glob('**/*'), hidden files and directories are not included
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir(follow_symlinks=True):
+                    directories.append(entry.path)
+                elif entry.is_file(follow_symlinks=True):
+                    st=entry.stat()
+                    relative_path=entry.path[len(local_directory)+1:]
+                    local_files[normalize_path(relative_path)]={'path': entry.path, 'name': relative_path,
+                                                                'size': st.st_size, 'mtime': st.st_mtime_ns}
+    return local_files
+
+def sha1_of_file(file_path):
+    h=hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024*1024), b''):
+            h.update(block)
+    return h.hexdigest()
+
+# adds the SHA-1 hash of each of the local files; the hashes are cached in a JSON file, indexed by the path of the file,
+# and a cached hash is only used if the file still has the same size and modification time
+def add_hashes(local_files, cache_filename, workers):
+    cache=dict()
+    if cache_filename and os.path.isfile(cache_filename):
+        with open(cache_filename, 'r', encoding='utf-8') as cache_FH:
+            cache=json.load(cache_FH)
+
+    to_hash=[]
+    for f in local_files.values():
+        cached=cache.get(f['path'])
+        if cached and cached[0] == f['size'] and cached[1] == f['mtime']:
+            f['sha1']=cached[2]
+        else:
+            to_hash.append(f)
+    print(f"{len(local_files)-len(to_hash)} hashes from the cache, computing {len(to_hash)} hashes")
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for f, sha1 in zip(to_hash, executor.map(sha1_of_file, [f['path'] for f in to_hash])):
+            f['sha1']=sha1
+            cache[f['path']]=[f['size'], f['mtime'], sha1]
+
+    if cache_filename and to_hash:
+        with open(cache_filename, 'w', encoding='utf-8') as cache_FH:
+            json.dump(cache, cache_FH)
+
 def main():
     global Verbose_Flag
 
@@ -67,6 +185,26 @@ def main():
                       help="execute test code"
                       )
 
+    parser.add_option('--hash',
+                      dest="hash",
+                      default=False,
+                      action="store_true",
+                      help="compute the SHA-1 hash of the local files"
+                      )
+
+    parser.add_option('--cache',
+                      dest="cache",
+                      default="file_hash_cache.json",
+                      help="JSON file in which the hashes are cached"
+                      )
+
+    parser.add_option('-w', '--workers',
+                      dest="workers",
+                      type="int",
+                      default=8,
+                      help="number of threads used to compute the hashes"
+                      )
+
 
     options, remainder = parser.parse_args()
 
@@ -121,63 +259,45 @@ def main():
             print("spreadsheet is missing column: {}, please correct".format(c))
             return
 
-    # get the set of files in the local_directory and their sizes
-    list_of_files = filter( os.path.isfile,
-                            glob.glob(local_directory + '/**/*', recursive=True) )
-
-    # get list of files with their size
-    files_with_size = [ (file_path, os.stat(file_path).st_size) 
-                    for file_path in list_of_files ]
+    onedrive_files=onedrive_files_from_spreadsheet(directory_df)
+    local_files=local_files_in_directory(local_directory)
+    print(f"{len(local_files)} local files, {len(onedrive_files)} files in the OneDrive folder")
 
-    # Iterate over list of tuples i.e. file_paths with size
-    # and print them one by one
     if Verbose_Flag:
-        for file_path, file_size in files_with_size:
-            print(file_size, ' -->', file_path)   
-
-    oneDrive_prefix=""
-    oneDrive_files=list()
-
-    # invald characters in folders and file names from https://support.microsoft.com/en-us/office/restrictions-and-limitations-in-onedrive-and-sharepoint-64883a5d-228e-48f5-b3d2-eb39e07630fa
-    oneDriver_invalid_characters=['"', '*', ':',  '<', '>', '?', '/', '\\', '|']
-    # removed '/' the set of oneDriver_invalid_characters to get bad_characters
-    bad_characters=['"', '*', ':',  '<', '>', '?', '\\', '|']
-
-    for idx, row in directory_df.iterrows():
-        name=row['Namn']
-        ftype=row['Objekttyp']
-        path=row['Sökväg']
-        if Verbose_Flag:
-            print("idx={0}, name={1}, path={2}".format(idx, name, path))
-        if idx == 0:
-            oneDrive_prefix=path+'/'+name
-            oneDrive_prefix_len=len(oneDrive_prefix)
-            print(f"{oneDrive_prefix=} with length of {oneDrive_prefix_len}")
-
-        if ftype == 'Item' and path.find(oneDrive_prefix) == 0:
-            if path == oneDrive_prefix:
-                fname=name
-            else:
-                if isinstance(name, int):
-                    name=f"{name}"
-                else:
-                    if isinstance(name, float):
-                        print("skipping a file wihout a valid name")
-                        continue
-                fname=path[oneDrive_prefix_len+1:]+'/'+name
-            if Verbose_Flag:
-                print(f"{fname=}")
-            oneDrive_files.append(fname)
-
-    for file_path, file_size in files_with_size:
-        if file_path[len(local_directory)+1:] not in oneDrive_files:
-            bad_char_exists=False
-            for bc in bad_characters:
-                if bc in file_path[len(local_directory)+1:]:
-                    print(f"Due to a invalid charcter ({bc}) in a OneDriver filename, missing file: {file_path}")
-                    bad_char_exists=True
-            if not bad_char_exists:
-                print(f"Missing file: {file_path}")
+        for f in local_files.values():
+            print(f['size'], ' -->', f['path'])
+
+    if options.hash:
+        add_hashes(local_files, options.cache, options.workers)
+
+    for key in sorted(local_files.keys() - onedrive_files.keys()):
+        file_path=local_files[key]['path']
+        bad_char_exists=False
+        for bc in bad_characters:
+            if bc in local_files[key]['name']:
+                print(f"Due to a invalid charcter ({bc}) in a OneDriver filename, missing file: {file_path}")
+                bad_char_exists=True
+        if not bad_char_exists:
+            print(f"Missing file: {file_path}")
+
+    for key in sorted(onedrive_files.keys() - local_files.keys()):
+        print(f"Extra file (only in OneDrive): {onedrive_files[key]['name']}")
+
+    for key in sorted(local_files.keys() & onedrive_files.keys()):
+        local=local_files[key]
+        remote=onedrive_files[key]
+        if remote['size'] is not None and remote['size'] != local['size']:
+            print(f"Size mismatch: {local['path']} local {local['size']} OneDrive {remote['size']}")
+        elif remote['sha1'] and local.get('sha1') and remote['sha1'] != local['sha1']:
+            print(f"Content mismatch: {local['path']}")
+
+    if options.hash:
+        files_by_hash=dict()
+        for f in local_files.values():
+            files_by_hash.setdefault(f['sha1'], []).append(f['path'])
+        for paths in files_by_hash.values():
+            if len(paths) > 1:
+                print("Duplicate local files: {}".format(', '.join(sorted(paths))))
 
     return
 
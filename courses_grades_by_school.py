@@ -23,6 +23,7 @@
 import ladok3
 import pprint
 import requests, time
+import http_cache
 import json
 import argparse
 import sys
@@ -196,7 +197,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -224,7 +225,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
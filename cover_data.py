@@ -25,6 +25,7 @@
 #
 
 import requests, time
+import http_cache
 import pprint
 import optparse
 import sys
@@ -58,7 +59,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -93,7 +94,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -121,7 +122,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -139,7 +140,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -161,7 +162,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -127,6 +127,12 @@ import argparse
 import os			# to make OS calls, here to get time zone info
 
 import requests
+import http_cache
+
+import canvas_client            # shared, pooled Canvas REST client
+
+# to enter the values into the control boxes of a DOCX file, with a single pass over word/document.xml
+from extract_custom_DOCX_properties import enter_fields, remove_optionalPicture
 
 import time
 
@@ -180,6 +186,7 @@ def initialize(args):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
 
             # The following are only used in when using get_user_by_kthid(kthid)
             kth_api=configuration.get("KTH_API", None)
@@ -205,7 +212,7 @@ def get_course_info_KOPPS(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -228,7 +235,7 @@ def get_user_by_kthid(kthid):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = kth_header)
+    r = http_cache.get(url, headers = kth_header)
     if Verbose_Flag:
         print("result of getting profile: {}".format(r.text))
 
@@ -594,66 +601,15 @@ def address_from_kth_profile(profile, language, default_school_acronym):
 # Canvas related functions
 
 def list_my_courses():
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of courses for the user making the query
     #GET /api/v1/courses
-
     url = "{0}/courses".format(baseUrl)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of courses
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            if Verbose_Flag:
-                print("result of getting courses for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas_client.get_paginated_list(url)
 
 def list_users_courses(user_id):
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of courses for the user making the query
     # GET /api/v1/users/:user_id/courses
-
-    url = "{0}/users/{1}/courses".format(baseUrl,user_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of courses
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            if Verbose_Flag:
-                print("result of getting courses for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    return canvas_client.courses_for_a_user(user_id)
 
 
 
@@ -677,76 +633,21 @@ def canvas_course_info(course_id):
 def students_in_course(course_id):
     global Verbose_Flag
     global testing
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
     if testing: # for testing purposes include the teachers in the list of students, so a teacher can try the "self" code paths
         extra_parameters={'per_page': '100',
                           'type': ['StudentEnrollment', 'TeacherEnrollment']
                           }
-    else:
-        extra_parameters={'per_page': '100',
-                          'type': ['StudentEnrollment']
-                          }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
+        return canvas_client.users_in_course(course_id, extra_parameters)
 
-    return users_found_thus_far
+    return canvas_client.students_in_course(course_id)
 
 
 def teachers_in_course(course_id):
-    global Verbose_Flag
-    global testing
-    users_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100',
-                      'type': ['TeacherEnrollment']
-                      }
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            users_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)
-            page_response = r.json()  
-            for p_response in page_response:  
-                users_found_thus_far.append(p_response)
-
-    return users_found_thus_far
+    return canvas_client.teachers_in_course(course_id)
 
 def examiners_in_course(teachers):
     examiners=[]
@@ -830,93 +731,23 @@ def user_profile(user_id):
 
 
 def members_of_groups(group_id):
-    members_found_thus_far=[]
-
     # Use the Canvas API to get the list of members of group
     # GET /api/v1/groups/:group_id/users
-
     url = "{0}/groups/{1}/users".format(baseUrl, group_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting group info: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            members_found_thus_far.append(p_response['id'])
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                members_found_thus_far.append(p_response['id'])
-    return members_found_thus_far
+    return [p_response['id'] for p_response in canvas_client.get_paginated_list(url)]
 
 
 
 def list_groups_in_course(course_id):
-    groups_found_thus_far=[]
-
     # Use the Canvas API to get the list of groups in this course
     # GET /api/v1/courses/:course_id/groups
-
     url = "{0}/courses/{1}/groups".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting groups: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            groups_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                groups_found_thus_far.append(p_response)
-    return groups_found_thus_far
+    return canvas_client.get_paginated_list(url)
 
 def sections_in_course(course_id):
-    sections_found_thus_far=[]
     # Use the Canvas API to get the list of sections for this course
     #GET /api/v1/courses/:course_id/sections
-
-    url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
-
-    return sections_found_thus_far
+    return canvas_client.sections_in_course(course_id)
 
 def assignment_id_from_assignment_name(assignments_info, assignment_name): 
     for i in assignments_info:
@@ -925,35 +756,9 @@ def assignment_id_from_assignment_name(assignments_info, assignment_name):
     return False
 
 def list_assignments(course_id):
-    assignments_found_thus_far=[]
     # Use the Canvas API to get the list of assignments for the course
     #GET /api/v1/courses/:course_id/assignments
-
-    url = "{0}/courses/{1}/assignments".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            assignments_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of assignments
-        while r.links.get('next', False):
-            r = requests.get(r.links['next']['url'], headers=header)  
-            if Verbose_Flag:
-                print("result of getting assignments for a paginated response: {}".format(r.text))
-            page_response = r.json()  
-            for p_response in page_response:  
-                assignments_found_thus_far.append(p_response)
-
-    return assignments_found_thus_far
+    return canvas_client.list_assignments(course_id)
 
 def get_grade_for_assignment(course_id, assignment_id, user_id):
     global Verbose_Flag
@@ -2072,14 +1877,10 @@ program_areas2 = {
 def transform_file(content, dict_of_entries):
     global Keep_picture_flag
 
-    for control_box in dict_of_entries:
-        # 'language' is a pseudo control box, it reflects the language of the thesis title
-        # We use it to change the language for the address on the cover
-        if control_box == 'language' and  dict_of_entries['language'] != 'swe':
-            content=content.replace('Stockholm, Sverige', 'Stockholm, Sweden')
-        else:
-            value=dict_of_entries[control_box]
-            content=enter_field(content, control_box, value)
+    # 'language' is a pseudo control box, it reflects the language of the thesis title
+    # We use it to change the language for the address on the cover
+    # The result is the same as calling enter_field() for each control box in turn.
+    content=enter_fields(content, dict_of_entries)
     if not Keep_picture_flag:
         # remove the optional picture
         content=remove_optionalPicture(content)
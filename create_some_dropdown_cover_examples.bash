@@ -3,6 +3,8 @@
 # it is assumened that the program is add_dropdows_to_DOCX_file.py
 # it is assumened that z6.docx contain a saved version of the English covers
 # it is assumened that z7.docx contain a saved version of the Swedish covers
+# For the cover introduced on 2024-06-05, a single run produces all of the examples (in parallel):
+#   ../add_dropdows_to_DOCX_file-V2.py --all --file Cover_with_picture-e.docx
 mkdir Some_examples
 cd Some_examples
 cp ../z6.docx .
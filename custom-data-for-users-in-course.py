@@ -2,9 +2,17 @@
 # -*- coding: utf-8 -*-
 #
 # ./custom-data-for-users-in-course.py course_id
+# ./custom-data-for-users-in-course.py --sync programs.xlsx [--dry-run] course_id
 #
 # Output: none
 #
+# with the option '--sync' the program_of_study custom data of the users in the course is set from a spreadsheet (xlsx or
+# csv) with the columns sis_user_id, code, and start (and optionally name), one row per program of a user. If there is no
+# name column, the English title of the program is taken from KOPPS. The current custom data of the users is fetched
+# concurrently and only the users whose data differs are written. A summary of the unchanged, updated, and failed users
+# is printed at the end. Users in the course who are not in the spreadsheet are left as they are.
+# with the option '-n' or '--dry-run' nothing is written, the users that would be updated are only counted.
+#
 # with the option '-C'or '--containers' use HTTP rather than HTTPS for access to Canvas
 # with the option -t' or '--testing' testing mode
 #
@@ -20,12 +28,19 @@
 #
 # ./custom-data-for-users-in-course.py -C 5
 #
+# ./custom-data-for-users-in-course.py --sync programs-2026.xlsx 4
+#
 # G. Q. Maguire Jr.
 #
 # 2019.02.02
 #
+# 2026-10-18 batch sync of the program_of_study custom data
+#
 
 import requests, time
+import http_cache
+
+import canvas_client            # shared, pooled Canvas REST client
 import pprint
 import optparse
 import sys
@@ -33,6 +48,9 @@ import json
 
 from bs4 import BeautifulSoup
 
+# Use Python Pandas to read the spreadsheet of the programs of the users
+import pandas as pd
+
 #############################
 ###### EDIT THIS STUFF ######
 #############################
@@ -63,6 +81,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -73,34 +92,9 @@ selected_user_data={}
 
 
 def users_in_course(course_id):
-    user_found_thus_far=[]
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas_client.users_in_course(course_id)
 
 def user_profile_url(user_id):
     # Use the Canvas API to get the profile of a user
@@ -109,7 +103,7 @@ def user_profile_url(user_id):
     if Verbose_Flag:
         print("user url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting profile: {}".format(r.text))
 
@@ -137,7 +131,7 @@ def put_user_custom_data_by_sis_id(user_id, name_space, scope, data):
     payload={'ns': name_space,
              'data': data
     }
-    r = requests.put(url, headers = header, json=payload)
+    r = canvas_client.put(url, json=payload)
     if Verbose_Flag:
         print("result of setting custom data: {}".format(r.text))
 
@@ -156,7 +150,7 @@ def put_user_custom_data_by_user_id(user_id, name_space, scope, data):
     payload={'ns': name_space,
              'data': data
     }
-    r = requests.put(url, headers = header, json=payload)
+    r = canvas_client.put(url, json=payload)
     if Verbose_Flag:
         print("result of setting custom data: {}".format(r.text))
 
@@ -174,7 +168,7 @@ def get_user_custom_data_by_sis_id(user_id, name_space, scope):
 
     payload={'ns': name_space }
 
-    r = requests.get(url, headers = header, json=payload)
+    r = canvas_client.request('GET', url, json=payload)
     if Verbose_Flag:
         print("result of getting custom data: {}".format(r.text))
 
@@ -192,7 +186,7 @@ def get_user_custom_data_by_user_id(user_id, name_space, scope):
 
     payload={'ns': name_space }
 
-    r = requests.get(url, headers = header, json=payload)
+    r = canvas_client.request('GET', url, json=payload)
     if Verbose_Flag:
         print("result of getting custom data: {}".format(r.text))
 
@@ -203,102 +197,104 @@ def get_user_custom_data_by_user_id(user_id, name_space, scope):
 
 
 
-def section_name_from_section_id(sections_info, section_id): 
-    for i in sections_info:
-        if i['id'] == section_id:
-            return i['name']
+program_of_study_ns='se.kth.canvas-app.program_of_study'
+program_of_study_scope='program_of_study'
 
-def sections_in_course(course_id):
-    sections_found_thus_far=[]
-    # Use the Canvas API to get the list of sections for this course
-    #GET /api/v1/courses/:course_id/sections
-
-    url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
+# read the spreadsheet with the wanted programs, returns a dict of sis_user_id -> {'programs': [...]}
+def wanted_programs_of_study(filename):
+    if filename.endswith('.csv'):
+        programs_df=pd.read_csv(filename, dtype=str)
+    else:
+        programs_df=pd.read_excel(filename, dtype=str)
+
+    missing=[c for c in ['sis_user_id', 'code', 'start'] if c not in programs_df.columns]
+    if missing:
+        print("The spreadsheet {0} is missing the column(s): {1}".format(filename, ', '.join(missing)))
+        return None
+
+    program_titles=None
+    if 'name' not in programs_df.columns:
+        program_titles=programs_and_owner_and_titles()
+
+    wanted=dict()
+    for row in programs_df.dropna(subset=['sis_user_id', 'code']).itertuples(index=False):
+        code=row.code.strip()
+        if program_titles is None:
+            name=row.name if isinstance(row.name, str) else ''
+        else:
+            name=program_titles.get(code, {}).get('title_en', '')
+        start=row.start.strip() if isinstance(row.start, str) else ''
+        # the start year is stored as a number, as in the example in the comment above put_user_custom_data_by_sis_id()
+        if start.isdigit():
+            start=int(start)
+        wanted.setdefault(row.sis_user_id.strip(), {'programs': []})['programs'].append({'code': code, 'name': name, 'start': start})
+    return wanted
+
+# Returns the user's current custom data, None if the user has none, and False if it could not be fetched
+def current_program_of_study(sis_user_id):
+    # GET /api/v1/users/:user_id/custom_data(/*scope)
+    url = "{0}/users/sis_user_id:{1}/custom_data/{2}".format(baseUrl, sis_user_id, program_of_study_scope)
+    r = canvas_client.get(url, params={'ns': program_of_study_ns})
+    if r.status_code == requests.codes.ok:
+        return r.json().get('data', None)
+    if r.status_code == 404:    # no custom data has been set (in this scope)
+        return None
+    print("Unable to get the custom data of {0}, status code {1}".format(sis_user_id, r.status_code))
+    return False
 
-    r = requests.get(url, headers = header)
+# only write the user's custom data if it differs from the wanted data, returns 'unchanged', 'updated', or 'failed'
+def sync_program_of_study(sis_user_id, data, dry_run=False):
+    current=current_program_of_study(sis_user_id)
+    if current is False:
+        return 'failed'
+    if current == data:
+        return 'unchanged'
     if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
+        print("{0}: {1} -> {2}".format(sis_user_id, current, data))
+    if dry_run:
+        return 'updated'
 
+    url = "{0}/users/sis_user_id:{1}/custom_data/{2}".format(baseUrl, sis_user_id, program_of_study_scope)
+    r = canvas_client.put(url, json={'ns': program_of_study_ns, 'data': data})
     if r.status_code == requests.codes.ok:
-        page_response=r.json()
+        return 'updated'
+    print("Unable to set the custom data of {0}, status code {1}".format(sis_user_id, r.status_code))
+    return 'failed'
 
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
+def sync_programs_of_study(all_users_in_course, wanted, dry_run=False):
+    sis_ids_in_course={user['sis_user_id'] for user in all_users_in_course if user.get('sis_user_id', None)}
+    sis_ids=sorted(sis_ids_in_course.intersection(wanted))
+    not_in_course=len(set(wanted)-sis_ids_in_course)
 
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    sections_found_thus_far.append(p_response)
+    # the reads (and the writes that are needed) are done concurrently, with canvas_client's scheduler limiting how many are in flight
+    results=canvas_client.run_concurrently(lambda sis_user_id: sync_program_of_study(sis_user_id, wanted[sis_user_id], dry_run), sis_ids)
 
-    return sections_found_thus_far
+    summary={outcome: results.count(outcome) for outcome in ['unchanged', 'updated', 'failed']}
+    print("{0} unchanged, {1} {2}, {3} failed ({4} users in the spreadsheet are not in the course)".format(
+        summary['unchanged'], summary['updated'], 'to update' if dry_run else 'updated', summary['failed'], not_in_course))
+    return summary
+
+def section_name_from_section_id(sections_info, section_id): 
+    for i in sections_info:
+        if i['id'] == section_id:
+            return i['name']
+
+def sections_in_course(course_id):
+    # Use the Canvas API to get the list of sections for this course
+    #GET /api/v1/courses/:course_id/sections
+    return canvas_client.sections_in_course(course_id)
 
 def list_your_courses():
-    courses_found_thus_far=[]
     # Use the Canvas API to get the list of all of your courses
     # GET /api/v1/courses
-
-    url = baseUrl+'courses'
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting courses: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            courses_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting courses for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    courses_found_thus_far.append(p_response)
-
-    return courses_found_thus_far
+    url = "{0}/courses".format(baseUrl)
+    return canvas_client.get_paginated_list(url)
 
 def users_in_account(account_id):
-    user_found_thus_far=[]
     # Use the Canvas API to get the list of users known to the system
     # GET /api/v1/accounts/:account_id/users
-
     url = "{0}/accounts/{1}/users".format(baseUrl, account_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting users for account: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas_client.get_paginated_list(url)
 
 def create_user(account_id, user_name, short_name, sortable_name, time_zone, locale, birthdate, unique_id, password, sis_user_id, email_address):
     # Create a user
@@ -407,7 +403,7 @@ def create_user(account_id, user_name, short_name, sortable_name, time_zone, loc
              'force_validations': 'false',
              'enable_sis_reactivation': 'false',
     }
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("status code: {0}, result of creating a user: {1}".format(r.status_code, r.text))
 
@@ -417,36 +413,9 @@ def create_user(account_id, user_name, short_name, sortable_name, time_zone, loc
     return page_response
 
 def enrollments_in_course(course_id):
-    global Verbose_Flag
-    users_found_thus_far=[]
-
     # Use the Canvas API to get the list of users enrolled in this course
     #GET /api/v1/courses/:course_id/enrollments
-
-    url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    extra_parameters={'per_page': '100'}
-    r = requests.get(url, params=extra_parameters, headers = header)
-    if Verbose_Flag:
-        print("result of getting enrollments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-        
-        for p_response in page_response:  
-            user_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                page_response = r.json()  
-                for p_response in page_response:  
-                    user_found_thus_far.append(p_response)
-    return user_found_thus_far
+    return canvas_client.users_in_course(course_id)
 
 # Enroll a user 
 # return the user's Canvas user_id
@@ -479,7 +448,7 @@ def enroll_user_with_sis_id(course_id, sis_id, role, section_id):
     if section_id:              # if there is a section_id then add the users to section
         payload['enrollment[course_section_id]']=section_id
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of posting an enrollment: {}".format(r.text))
     if r.status_code == requests.codes.ok:
@@ -526,7 +495,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -584,6 +553,19 @@ def main():
                       help="for the container enviroment in the virtual machine"
     )
 
+    parser.add_option('--sync',
+                      dest="sync_filename",
+                      default=None,
+                      help="set the program_of_study custom data from the spreadsheet FILE", metavar="FILE"
+    )
+
+    parser.add_option('-n', '--dry-run',
+                      dest="dry_run",
+                      default=False,
+                      action="store_true",
+                      help="with --sync, do not write anything"
+    )
+
 
     
     options, remainder = parser.parse_args()
@@ -620,6 +602,16 @@ def main():
 
         sys.exit()
 
+    if options.sync_filename:
+        wanted=wanted_programs_of_study(options.sync_filename)
+        if wanted is None:
+            sys.exit()
+        summary=sync_programs_of_study(all_users_in_course, wanted, options.dry_run)
+        canvas_client.report()
+        if summary['failed']:
+            sys.exit(1)
+        return
+
     all_sis_ids=set()
 
     for user in all_users_in_course:
@@ -636,5 +628,7 @@ def main():
     #result_for_self=get_user_custom_data_by_user_id('self', 'se.kth.canvas-app.program_of_study', 'program_of_study')
     #print("result of getting custom data for user self is {0}".format(result_for_self))
 
+    canvas_client.report()
+
 if __name__ == "__main__": main()
 
@@ -17,6 +17,8 @@
 # Notes:
 #    Only one test json file has been run.
 #
+# The values for all of the properties are collected and then entered in a single pass over docProps/custom.xml.
+#
 # The dates from Canvas are in ISO 8601 format.
 # 
 # 2021-12-07 G. Q. Maguire Jr.
@@ -79,6 +81,55 @@ def replace_value_for_name(name, new_value, xml_content):
             return prefix + "{}".format(new_value) + postfix
     return xml_content
 
+# the tokens that replace_value_for_name() searches for, found with a single scan of custom.xml
+property_token_pattern=re.compile(r'name="([^"]*)"|<vt:lpwstr>|</vt:lpwstr>')
+
+# returns a dict mapping each property name to the (start, end) offsets of the value that
+# replace_value_for_name() would replace, i.e., the text of the first <vt:lpwstr> after the first name="..."
+def property_value_spans(xml_content):
+    pattern1='<property '
+    offset=xml_content.find(pattern1)
+    spans=dict()
+    if offset < 0:
+        return spans
+    pending_names=[]            # names waiting for a <vt:lpwstr>
+    open_names=[]               # names waiting for the </vt:lpwstr>
+    for m in property_token_pattern.finditer(xml_content, offset+len(pattern1)):
+        token=m.group(0)
+        if token == '<vt:lpwstr>':
+            for name in pending_names:
+                spans[name]=(m.end(), None)
+            open_names.extend(pending_names)
+            pending_names=[]
+        elif token == '</vt:lpwstr>':
+            for name in open_names:
+                spans[name]=(spans[name][0], m.start())
+            open_names=[]
+        elif m.group(1) not in spans and m.group(1) not in pending_names:
+            pending_names.append(m.group(1))
+    # names without a complete value cannot be replaced
+    return {name: span for name, span in spans.items() if span[1] is not None}
+
+# apply a list of (name, new_value) replacements in order, with the same result as calling replace_value_for_name() for
+# each of them, but locating the properties once and building the new custom.xml once
+def replace_values_for_names(replacements, xml_content):
+    spans=property_value_spans(xml_content)
+    new_values=dict()
+    for name, new_value in replacements:
+        span=spans.get(name)
+        if span is None:
+            print("No property named {} in the document".format(name))
+            continue
+        new_values[span]="{}".format(new_value)
+    parts=[]
+    offset=0
+    for start, end in sorted(new_values):
+        parts.append(xml_content[offset:start])
+        parts.append(new_values[(start, end)])
+        offset=end
+    parts.append(xml_content[offset:])
+    return ''.join(parts)
+
 def mark_first_field_as_dirty(content):
     # <w:fldChar w:fldCharType="begin" w:dirty="true"/>
     pattern='<w:fldChar w:fldCharType="begin"'
@@ -142,6 +193,8 @@ def transform_file(content, dict_of_entries):
     global Verbose_Flag
     # <property fmtid="xxxx" pid="2" name="property_name"><vt:lpwstr>property_value</vt:lpwstr>
     #
+    # the replacements are collected and then applied in a single pass
+    replacements=[]
     for k in dict_of_entries:
         print("k={}".format(k))
         if k in ['Author1', 'Author2', 'Examiner1', 'Supervisor1', 'Supervisor2', 'Supervisor3']:
@@ -150,14 +203,14 @@ def transform_file(content, dict_of_entries):
                     if name in ['Last name', 'First name', 'Local User Id', 'E-mail', 'Other organisation']:
                         new_value=dict_of_entries[k].get(name)
                         docx_name=mapping_JSON_to_field_names(k, name)
-                        content=replace_value_for_name(docx_name, new_value, content)
+                        replacements.append((docx_name, new_value))
                         #print("*** docx_name={0}, new_value={1}, content={2}".format(docx_name, new_value, content))
                         print("*** docx_name={0}, new_value={1}".format(docx_name, new_value))
                     elif name == 'organisation':
                         for level in dict_of_entries[k][name]:
                             new_value=dict_of_entries[k][name].get(level)
                             docx_name=mapping_JSON_to_field_names(k, level)
-                            content=replace_value_for_name(docx_name, new_value, content)
+                            replacements.append((docx_name, new_value))
                             print("*** docx_name={0}, new_value={1}".format(docx_name, new_value))
                     else:
                         print("should not get here - processing k={0} name={1}".format(k, name))
@@ -165,7 +218,7 @@ def transform_file(content, dict_of_entries):
         elif k in ['Cycle', 'Credits']:
             if isinstance(dict_of_entries[k], int):
                 new_value=dict_of_entries[k]
-                content=replace_value_for_name(k, new_value, content)
+                replacements.append((k, new_value))
                 print("*** name={0}, new_value={1}".format(k, new_value))
 
         elif k in ['Course code', 'National Subject Categories']:
@@ -173,7 +226,7 @@ def transform_file(content, dict_of_entries):
                 new_value=dict_of_entries[k]
                 #print("k='{0}', name='{1}'".format(k, name))
                 docx_name=mapping_JSON_to_field_names(k, name)
-                content=replace_value_for_name(docx_name, new_value, content)
+                replacements.append((docx_name, new_value))
                 print("*** docx_name={0}, new_value={1}".format(docx_name, new_value))
         elif k in ['Degree1', 'Degree2', 'Cooperation']:
             if isinstance(dict_of_entries[k], dict):
@@ -181,7 +234,7 @@ def transform_file(content, dict_of_entries):
                     if name in ['subjectArea', 'programcode', 'Educational program', 'Degree', 'Partner_name']:
                         new_value=dict_of_entries[k].get(name)
                         docx_name=mapping_JSON_to_field_names(k, name)
-                        content=replace_value_for_name(docx_name, new_value, content)
+                        replacements.append((docx_name, new_value))
                         #print("*** docx_name={0}, new_value={1}, content={2}".format(docx_name, new_value, content))
                         print("*** docx_name={0}, new_value={1}".format(docx_name, new_value))
 
@@ -193,7 +246,7 @@ def transform_file(content, dict_of_entries):
         #         print("*** name={0}, new_value={1}, content={2}".format(name, new_value, content))
         else:
             print("type={} - do not know how to process".format(type(dict_of_entries[k])))
-    return content
+    return replace_values_for_names(replacements, content)
 
 def main(argv):
     global Verbose_Flag
@@ -17,6 +17,7 @@
 #
 
 import requests, time
+import http_cache
 import pprint
 import optparse
 import sys
@@ -53,7 +54,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -116,7 +117,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -144,7 +145,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -162,7 +163,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -197,7 +198,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -216,7 +217,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -338,7 +339,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -407,7 +408,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
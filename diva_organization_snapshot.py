@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# diva_organization_snapshot.py
+#
+# Purpose: A local snapshot of the DiVA organisation records (made by DiVA_organization_info.py) and the organisation
+#          tree built from it, with indexes for looking up an organisation by id, acronym, or name.
+#
+# The snapshot is an SQLite database (by default diva_organizations.sqlite) with one row per organisation: its id,
+# the id of its parent, a digest of the DiVA record it was parsed from, and the parsed entry (as JSON).
+# DiVA_organization_info.py compares the digest of each record it gets from DiVA with the stored digests, so that
+# only the new and changed records are parsed and written, and the organisations no longer in DiVA are removed.
+#
+# When the snapshot is loaded, the parent and children of each organisation are linked and the indexes by id, acronym,
+# and name are built, so each lookup is a dict lookup. The acronyms are taken from the records themselves: the
+# organisationCode, an acronym in parentheses at the end of a name (such as "Datavetenskap (CS)"), or the acronym that
+# kth_organization_tables.py has for one of the record's names under the same school. So an organisation whose id is not
+# (or not yet) in kth_organization_tables.py can still be found by its acronym. The acronym that
+# kth_organization_tables.py has for the id is preferred, when there is one. The snapshot is loaded on the first lookup;
+# if there is no snapshot file, the lookups return None (and the programs fall back to the tables in
+# kth_organization_tables.py).
+#
+# Usage (from another program):
+#   import diva_organization_snapshot
+#   ...
+#   acronym=diva_organization_snapshot.school_acronym('Skolan för elektroteknik och datavetenskap')
+#   l2=diva_organization_snapshot.department_org_id('EECS', 'CS')
+#
+# The name of the snapshot file can be set with the environment variable DIVA_ORG_SNAPSHOT (or by calling load()).
+#
+# 2026-10-18
+#
+import os
+import json
+import sqlite3
+import hashlib
+import re
+
+from kth_organization_tables import schools_info, acronym_from_org_id, school_acronym_by_name, department_acronym_by_name
+
+snapshot_filename=os.environ.get('DIVA_ORG_SNAPSHOT', 'diva_organizations.sqlite')
+
+organisations=dict()            # id -> entry, as made by DiVA_organization_info.py
+parent_by_id=dict()             # id -> id of the parent organisation
+children_by_id=dict()           # id -> list of the ids of the child organisations
+acronym_by_id=dict()            # id -> acronym of the school, department, or division
+id_by_acronym=dict()            # (parent id, acronym) -> id, for each of the acronyms of the organisation
+ids_by_name=dict()              # Swedish or English name -> list of ids
+_loaded=False
+
+school_by_L1_id=dict()
+
+# use int() to convert to an integer, if this fails, then just use the string - as DiVA_organization_info.py does
+def org_id(x):
+    if x is None:
+        return None
+    try:
+        return int(x)
+    except:
+        return x
+
+for s in schools_info:
+    school_by_L1_id[org_id(schools_info[s]['L1'])]=s
+
+def record_digest(rec):
+    return hashlib.sha1(json.dumps(rec, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def parent_of_entry(entry):
+    x=entry.get('parentOrganisation', None)
+    if x:
+        return org_id(x.get('linkedRecordId', None))
+    return None
+
+def names_of_entry(entry):
+    names=[]
+    for key in ['organisationName', 'organisationAlternativeName']:
+        x=entry.get(key, None)
+        if x and x.get('name'):
+            names.append(x['name'])
+    return names
+
+# an acronym in parentheses at the end of a name, such as "Skolan för elektroteknik och datavetenskap (EECS)"
+acronym_in_name_pattern=re.compile(r'\(([A-ZÅÄÖ][A-Za-zÅÄÖåäö0-9&-]{0,15})\)\s*$')
+
+# the acronyms of an organisation, taken from its record, the preferred one first
+def acronyms_of_entry(id, entry, parent_id):
+    acronyms=[]
+    def add(acronym):
+        if acronym and acronym not in acronyms:
+            acronyms.append(acronym)
+
+    add(school_by_L1_id.get(id, None) or acronym_from_org_id(id))
+    code=entry.get('organisationCode', None)
+    if isinstance(code, str):
+        add(code.strip())
+    names=names_of_entry(entry)
+    for name in names:
+        m=acronym_in_name_pattern.search(name)
+        if m:
+            add(m.group(1))
+    school=school_by_L1_id.get(parent_id, None)
+    for name in names:
+        if school:
+            add(department_acronym_by_name.get((school, name), None))
+        else:
+            add(school_acronym_by_name.get(name, None))
+    return acronyms
+
+def _connection(filename=None):
+    conn=sqlite3.connect(filename or snapshot_filename)
+    conn.execute('CREATE TABLE IF NOT EXISTS organisations (id TEXT PRIMARY KEY, parent_id TEXT, digest TEXT, entry TEXT)')
+    return conn
+
+# digest -> id, for all of the stored organisations
+def stored_digests(filename=None):
+    if not os.path.exists(filename or snapshot_filename):
+        return dict()
+    conn=_connection(filename)
+    digests={digest: org_id(id) for id, digest in conn.execute('SELECT id, digest FROM organisations')}
+    conn.close()
+    return digests
+
+# changed is a dict of id -> (digest, entry) for the new and changed organisations, removed is a list of ids
+def update(changed, removed, filename=None):
+    conn=_connection(filename)
+    with conn:
+        conn.executemany('INSERT OR REPLACE INTO organisations (id, parent_id, digest, entry) VALUES (?, ?, ?, ?)',
+                         [(str(id), None if parent_of_entry(entry) is None else str(parent_of_entry(entry)), digest, json.dumps(entry, ensure_ascii=False))
+                          for id, (digest, entry) in changed.items()])
+        conn.executemany('DELETE FROM organisations WHERE id=?', [(str(id),) for id in removed])
+    conn.close()
+
+def load(filename=None):
+    global snapshot_filename, _loaded
+    if filename:
+        snapshot_filename=filename
+    for index in [organisations, parent_by_id, children_by_id, acronym_by_id, id_by_acronym, ids_by_name]:
+        index.clear()
+    _loaded=True
+    if not os.path.exists(snapshot_filename):
+        return organisations
+
+    conn=_connection()
+    for id, entry in conn.execute('SELECT id, entry FROM organisations'):
+        organisations[org_id(id)]=json.loads(entry)
+    conn.close()
+
+    for id in sorted(organisations, key=str):
+        entry=organisations[id]
+        parent_id=parent_of_entry(entry)
+        if parent_id is not None:
+            parent_by_id[id]=parent_id
+            children_by_id.setdefault(parent_id, []).append(id)
+        acronyms=acronyms_of_entry(id, entry, parent_id)
+        if acronyms:
+            acronym_by_id[id]=acronyms[0]
+        for acronym in acronyms:
+            id_by_acronym.setdefault((parent_id, acronym), id)
+        for name in names_of_entry(entry):
+            ids_by_name.setdefault(name, []).append(id)
+    return organisations
+
+def _ensure_loaded():
+    if not _loaded:
+        load()
+
+#----------------------------------------------------------------------
+# Lookups
+#----------------------------------------------------------------------
+def organisation(id):
+    _ensure_loaded()
+    return organisations.get(org_id(id), None)
+
+def parent_id(id):
+    _ensure_loaded()
+    return parent_by_id.get(org_id(id), None)
+
+def children(id):
+    _ensure_loaded()
+    return children_by_id.get(org_id(id), [])
+
+# the ids from the organisation up to the top organisation
+def ancestors(id):
+    _ensure_loaded()
+    path=[]
+    id=parent_by_id.get(org_id(id), None)
+    while id is not None and id not in path:
+        path.append(id)
+        id=parent_by_id.get(id, None)
+    return path
+
+# the id of the topOrganisation record
+def top_organisation_id():
+    _ensure_loaded()
+    for id, entry in organisations.items():
+        record_type=entry.get('recordInfo', {}).get('type', None)
+        if isinstance(record_type, dict) and record_type.get('linkedRecordId', None) == 'topOrganisation':
+            return id
+    return None
+
+def org_id_by_name(name, parent=None):
+    _ensure_loaded()
+    for id in ids_by_name.get(name, []):
+        if parent is None or parent_by_id.get(id, None) == org_id(parent):
+            return id
+    return None
+
+# English or Swedish school name -> school acronym
+def school_acronym(name):
+    _ensure_loaded()
+    for id in ids_by_name.get(name, []):
+        if id in school_by_L1_id:
+            return school_by_L1_id[id]
+    return None
+
+# the first argument is the acronym of the school, while the seconds is a string name of a department
+def department_acronym(school, name):
+    if school not in schools_info:
+        return None
+    id=org_id_by_name(name, parent=schools_info[school]['L1'])
+    if id is None:
+        return None
+    return acronym_by_id.get(id, None)
+
+# (school acronym, department acronym) -> DiVA org code (the L2 id), as a string
+def department_org_id(school, department):
+    _ensure_loaded()
+    if school not in schools_info:
+        return None
+    id=id_by_acronym.get((org_id(schools_info[school]['L1']), department), None)
+    if id is None:
+        return None
+    return str(id)
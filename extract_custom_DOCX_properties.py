@@ -54,6 +54,9 @@ modes = { zipfile.ZIP_DEFLATED: 'deflated',
           zipfile.ZIP_STORED:   'stored',
           }
 
+# set by main(); the default is for when enter_fields() is called from another program
+Verbose_Flag=False
+
 
 
 
@@ -1308,6 +1311,75 @@ def enter_field(content, control_box, value):
         print("Did not field control box for {}".format(control_box))
     return content
 
+control_box_pattern=re.compile(r'<w:sdtPr><w:alias w:val="([^"]*)"/><w:tag w:val="\1"/>')
+
+# returns the offset of the first instance of each control box, found with a single scan of the document
+def control_box_offsets(content):
+    offsets=dict()
+    for m in control_box_pattern.finditer(content):
+        offsets.setdefault(m.group(1), m.start())
+    return offsets
+
+# enter the values for all of the control boxes (and handle the 'language' pseudo control box), with the same result as
+# calling enter_field() for each of them in turn, but locating the control boxes once and building the new document once
+def enter_fields(content, dict_of_entries):
+    offsets=control_box_offsets(content)
+    edits=[]                    # (start, end, remaining content, value, entered before the language was handled)
+    language_handled=False
+    for control_box in dict_of_entries:
+        # 'language' is a pseudo control box, it reflects the language of the thesis title
+        # We use it to change the language for the address on the cover
+        if control_box == 'language' and dict_of_entries['language'] != 'swe':
+            language_handled=True
+            continue
+        value=dict_of_entries[control_box]
+        print("processing control_box: {}".format(control_box))
+        offset_to_pattern=offsets.get(control_box)
+        if offset_to_pattern is None:
+            print("Did not field control box for {}".format(control_box))
+            continue
+        pattern=control_box_string(control_box)
+        if control_box in ['Ämnesområde', 'Nivä_och_hp', 'Title', 'Subtitle', 'Author', 'TRITA', 'År']:
+            end_marker='</w:sdtContent></w:sdt>'
+        else:
+            end_marker='</w:p></w:sdtContent></w:sdt>'
+        start=offset_to_pattern+len(pattern)
+        offset_end_of_paragraph=content.find(end_marker, start+1)
+        if offset_end_of_paragraph < 0:
+            continue
+        new_text=run_of_text(value)
+        if control_box not in ['Ämnesområde', 'Nivä_och_hp', 'TRITA', 'År']:
+            new_text=new_text + '</w:p>'
+        edits.append((start, offset_end_of_paragraph, clean_content(content[start:offset_end_of_paragraph], control_box),
+                      new_text, not language_handled))
+
+    edits.sort(key=lambda e: e[0])
+    for previous, e in zip(edits, edits[1:]):
+        if e[0] < previous[1]:
+            # nested control boxes - fall back to entering the fields one at a time
+            for control_box in dict_of_entries:
+                if control_box == 'language' and dict_of_entries['language'] != 'swe':
+                    content=content.replace('Stockholm, Sverige', 'Stockholm, Sweden')
+                else:
+                    content=enter_field(content, control_box, dict_of_entries[control_box])
+            return content
+
+    def address(txt):
+        if language_handled:
+            return txt.replace('Stockholm, Sverige', 'Stockholm, Sweden')
+        return txt
+
+    parts=[]
+    offset=0
+    for start, end, remaining_content, new_text, before_language in edits:
+        parts.append(address(content[offset:start]))
+        parts.append(address(remaining_content))
+        # a value entered after the address was changed is not itself changed
+        parts.append(address(new_text) if before_language else new_text)
+        offset=end
+    parts.append(address(content[offset:]))
+    return ''.join(parts)
+
 def remove_optionalPicture(content):
     global Verbose_Flag
     if Verbose_Flag:
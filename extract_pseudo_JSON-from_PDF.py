@@ -18,6 +18,10 @@
 # default output file is calendar_event.json
 #
 # ./extract_pseudo_JSON-from_PDF.py --pdf test5.pdf --json event.json --pdf test.pdf --acronyms acronyms.tex
+#
+# The pages are converted to text starting from the last page, until the For DIVA information has been found.
+# Use --full to convert all of the pages (from the first page). To process all of the PDF files in a directory:
+# ./extract_pseudo_JSON-from_PDF.py --directory theses
 ##
 #
 # To get the correct pdfminer package od:
@@ -31,6 +35,7 @@ import sys
 sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf8', buffering=1)
 
 import json
+import time
 import argparse
 import os			# to make OS calls, here to get time zone info
 
@@ -685,77 +690,69 @@ def replace_ligature(s):
     return s
 
 
-def main(argv):
-    global Verbose_Flag
-    global Use_local_time_for_output_flag
-    global testing
-
-    argp = argparse.ArgumentParser(description="extract_pseudo_JSON-from_PDF.py: Extract the pseudo JSON from the end of the thesis PDF file")
-
-    argp.add_argument('-v', '--verbose', required=False,
-                      default=False,
-                      action="store_true",
-                      help="Print lots of output to stdout")
-
-    argp.add_argument('-t', '--testing',
-                      default=False,
-                      action="store_true",
-                      help="execute test code"
-                      )
-
-    argp.add_argument('-p', '--pdf',
-                      type=str,
-                      default="test.pdf",
-                      help="read PDF file"
-                      )
-
-    argp.add_argument('-j', '--json',
-                      type=str,
-                      default="calendar_event.json",
-                      help="JSON file for extracted calendar event"
-                      )
-
-    argp.add_argument('-a', '--acronyms',
-                      type=str,
-                      default="acronyms.tex",
-                      help="acronyms filename"
-                      )
-
-    argp.add_argument('-l', '--ligatures',
-                      default=False,
-                      action="store_true",
-                      help="leave ligatures rahter than replace them"
-                      )
-
-
-
-    args = vars(argp.parse_args(argv))
+# the strings that start the For DIVA information, in the order they are looked for
+quad__euro_marker='€€€€'
+For_DIVA_markers=["{0} For DIVA {0}".format(quad__euro_marker),
+                  "{0} FOR DIVA {0}".format(quad__euro_marker),
+                  "For DIVA"]              # the older For DIVA string
+# the last entry of the JSON part of the For DIVA information, with right or straight double quote marks
+lang_instances_markers=['”Number of lang instances”:', '"Number of lang instances":']
+
+# returns True if text contains a For DIVA marker followed by the "Number of lang instances" entry
+def For_DIVA_block_found(text):
+    for marker in For_DIVA_markers:
+        start=text.find(marker)
+        if start >= 0:
+            return any(text.find(m, start) > 0 for m in lang_instances_markers)
+    return False
 
-    Verbose_Flag=args["verbose"]
+def text_of_page(rsrcmgr, page, laparams):
+    output_string = BytesIO()
+    device = TextConverter(rsrcmgr, output_string, laparams=laparams)
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    interpreter.process_page(page)
+    device.close()
+    return output_string.getvalue().decode('UTF-8')
+
+# Get the text of the PDF file. As the For DIVA information is on the last pages of the thesis, the pages are
+# converted starting from the last page, until the text of the pages converted so far contains the For DIVA
+# marker and the "Number of lang instances" entry. If they are not found, all the pages will have been converted,
+# which gives the same text as converting the pages from the first to the last (i.e., the full scan).
+# rsrcmgr can be passed in to reuse one resource manager for several files.
+def get_text(filename, rsrcmgr=None, full_scan=False):
+    global Verbose_Flag
 
-    filename=args["pdf"]
-    if Verbose_Flag:
-        print("filename={}".format(filename))
+    if rsrcmgr is None:
+        rsrcmgr = PDFResourceManager()
+    else:
+        # the cached fonts are keyed by the object ids of the previous file, which could match other fonts in this file
+        getattr(rsrcmgr, '_cached_fonts', dict()).clear()
+    laparams=LAParams()
 
-    #output_string = StringIO()
-    output_string = BytesIO()
     with open(filename, 'rb') as in_file:
         parser = PDFParser(in_file)
         doc = PDFDocument(parser)
-        rsrcmgr = PDFResourceManager()
-        device = TextConverter(rsrcmgr, output_string, laparams=LAParams())
-        #device = HTMLConverter(rsrcmgr, output_string, laparams=LAParams(), layoutmode='normal', codec='utf-8')
-
-        interpreter = PDFPageInterpreter(rsrcmgr, device)
-        for page in PDFPage.create_pages(doc):
-            interpreter.process_page(page)
 
-        text=output_string.getvalue().decode('UTF-8')
+        if full_scan:
+            output_string = BytesIO()
+            device = TextConverter(rsrcmgr, output_string, laparams=laparams)
+            interpreter = PDFPageInterpreter(rsrcmgr, device)
+            for page in PDFPage.create_pages(doc):
+                interpreter.process_page(page)
+            return output_string.getvalue().decode('UTF-8')
+
+        pages=list(PDFPage.create_pages(doc))
+        page_texts=list()
+        for page in reversed(pages):
+            page_texts.append(text_of_page(rsrcmgr, page, laparams))
+            if For_DIVA_block_found(''.join(reversed(page_texts))):
+                break
         if Verbose_Flag:
-            print("text: {}".format(text))
+            print("converted the last {0} of {1} pages".format(len(page_texts), len(pages)))
+        return ''.join(reversed(page_texts))
 
-    # define the maker string
-    quad__euro_marker='€€€€'
+def extract_For_DIVA_data(text, filename, args):
+    global Verbose_Flag
 
     # look for the new start of the For DiVA information
     diva_start=text.find("{0} For DIVA {0}".format(quad__euro_marker))
@@ -1045,6 +1042,106 @@ def main(argv):
                     j_as_string = json.dumps(d, ensure_ascii=False)
                     print(j_as_string, file=output_FH)
 
+# process all of the PDF files in a directory, the JSON output for file.pdf is put into file.json
+def process_directory(args):
+    global Verbose_Flag
+    directory=args['directory']
+    pdf_files=sorted([os.path.join(directory, f) for f in os.listdir(directory) if f.lower().endswith('.pdf')])
+    print("{0} PDF files in {1}".format(len(pdf_files), directory))
+
+    # one resource manager for all of the files
+    rsrcmgr = PDFResourceManager()
+    total_time=0.0
+    for filename in pdf_files:
+        start_time=time.perf_counter()
+        try:
+            text=get_text(filename, rsrcmgr, full_scan=args['full'])
+        except Exception as e:
+            print("Error when reading {0}: {1}".format(filename, e))
+            continue
+        elapsed=time.perf_counter()-start_time
+        total_time=total_time+elapsed
+        print("{0}: text extracted in {1:.2f} seconds".format(filename, elapsed))
+        file_args=dict(args, json=os.path.splitext(filename)[0]+'.json')
+        try:
+            extract_For_DIVA_data(text, filename, file_args)
+        except Exception as e:
+            print("Error when extracting the For DIVA data from {0}: {1}".format(filename, e))
+    print("extracted the text of {0} files in {1:.1f} seconds".format(len(pdf_files), total_time))
+
+def main(argv):
+    global Verbose_Flag
+    global Use_local_time_for_output_flag
+    global testing
+
+    argp = argparse.ArgumentParser(description="extract_pseudo_JSON-from_PDF.py: Extract the pseudo JSON from the end of the thesis PDF file")
+
+    argp.add_argument('-v', '--verbose', required=False,
+                      default=False,
+                      action="store_true",
+                      help="Print lots of output to stdout")
+
+    argp.add_argument('-t', '--testing',
+                      default=False,
+                      action="store_true",
+                      help="execute test code"
+                      )
+
+    argp.add_argument('-p', '--pdf',
+                      type=str,
+                      default="test.pdf",
+                      help="read PDF file"
+                      )
+
+    argp.add_argument('-j', '--json',
+                      type=str,
+                      default="calendar_event.json",
+                      help="JSON file for extracted calendar event"
+                      )
+
+    argp.add_argument('-a', '--acronyms',
+                      type=str,
+                      default="acronyms.tex",
+                      help="acronyms filename"
+                      )
+
+    argp.add_argument('-l', '--ligatures',
+                      default=False,
+                      action="store_true",
+                      help="leave ligatures rahter than replace them"
+                      )
+
+    argp.add_argument('-f', '--full',
+                      default=False,
+                      action="store_true",
+                      help="convert all of the pages, rather than starting from the last page"
+                      )
+
+    argp.add_argument('-d', '--directory',
+                      type=str,
+                      default=None,
+                      help="process all of the PDF files in this directory, the output for file.pdf is file.json"
+                      )
+
+
+
+    args = vars(argp.parse_args(argv))
+
+    Verbose_Flag=args["verbose"]
+
+    filename=args["pdf"]
+    if Verbose_Flag:
+        print("filename={}".format(filename))
+
+    if args['directory']:
+        return process_directory(args)
+
+    text=get_text(filename, full_scan=args['full'])
+    if Verbose_Flag:
+        print("text: {}".format(text))
+
+    extract_For_DIVA_data(text, filename, args)
+
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
 
@@ -56,6 +56,8 @@ import pdfminer.psparser
 from pdfminer.pdfdocument import PDFNoValidXRef
 from pdfminer.psparser import PSEOF
 
+import pdf_batch_driver         # to process the files in a spreadsheet in parallel
+
 def show_ltitem_hierarchy(o: Any, depth=0):
     """Show location and text of LTItem and all its descendants"""
     if depth == 0:
@@ -246,6 +248,26 @@ def process_file(filename):
     return True
 
 
+def initialize_worker(verbose, testing_flag):
+    global Verbose_Flag
+    global testing
+    Verbose_Flag=verbose
+    testing=testing_flag
+
+# Process a single file and return the spreadsheet columns to set for it - used by pdf_batch_driver
+def analyze_file(filename):
+    global found_For_DIVA_page
+    found_For_DIVA_page=False
+
+    if not process_file(filename):
+        return {'Unexpected error when processing file': filename}
+
+    if found_For_DIVA_page:
+        print("Found for DIVA page at {0} in {1}".format(found_For_DIVA_page, filename))
+        return {'For DIVA page(s) present': found_For_DIVA_page}
+    return {}
+
+
 def main(argv):
     global Verbose_Flag
     global Use_local_time_for_output_flag
@@ -287,6 +309,24 @@ def main(argv):
                       help="Number of rows to skip"
                       )
 
+    argp.add_argument('-j', '--jobs',
+                      type=int,
+                      default=None,
+                      help="number of worker processes to use for a spreadsheet (default: one per CPU)"
+                      )
+
+    argp.add_argument('-c', '--checkpoint',
+                      type=str,
+                      default=None,
+                      help="checkpoint file for a spreadsheet, used to resume an interrupted run"
+                      )
+
+    argp.add_argument('--resume',
+                      default=False,
+                      action="store_true",
+                      help="continue an interrupted run, using the results in the checkpoint file"
+                      )
+
     args = vars(argp.parse_args(argv))
 
     Verbose_Flag=args["verbose"]
@@ -323,34 +363,15 @@ def main(argv):
     diva_df['For DIVA page(s) present'] = pd.NaT
 
 
-    for idx, row in diva_df.iterrows():
-        found_For_DIVA_page=False
-        if skip_to_row and idx < skip_to_row:
-            continue
-        url=row['FullTextLink']
-        author=row['Name']
-        pid=row['PID']
-        if pd.isna(url):
-            print("no full text for thesis by {}".format(author))
-        else:
-            print(f'{idx}: {author}  {url}')
-            last_slash_in_url=url.rfind('/')
-            if last_slash_in_url < 0:
-                print("Cannot find file name in URL")
-                continue
-            filename="{0}-{1}".format(pid, url[last_slash_in_url+1:])
-            print(f'reading file {filename}')
-
-            if not process_file(filename):
-                diva_df.loc[idx, 'Unexpected error when processing file']=filename
-                continue
-
-            if found_For_DIVA_page:
-                print("Found for DIVA page at {0} in {1} by author(s) {2}".format(found_For_DIVA_page, filename, row['Name']))
-                diva_df.loc[idx, 'For DIVA page(s) present'] = found_For_DIVA_page
+    checkpoint_filename=args['checkpoint']
+    if not checkpoint_filename:
+        checkpoint_filename=pdf_batch_driver.default_checkpoint_filename(spreadsheet_name, 'forDIVA')
 
-        if args["testing"]:
-            break
+    results=pdf_batch_driver.run_batch(diva_df, analyze_file, checkpoint_filename,
+                                       processes=args['jobs'], skip_to_row=skip_to_row, resume=args['resume'],
+                                       limit=1 if args["testing"] else None,
+                                       initializer=initialize_worker, initargs=(Verbose_Flag, testing))
+    pdf_batch_driver.merge_results(diva_df, results)
 
     # the following was inspired by the section "Using XlsxWriter with Pandas" on http://xlsxwriter.readthedocs.io/working_with_pandas.html
     # set up the output write
@@ -55,6 +55,14 @@ from pdfminer.layout import LAParams, LTTextBox, LTText, LTChar, LTAnno
 import pdfminer.psparser
 from pdfminer.pdfdocument import PDFNoValidXRef
 from pdfminer.psparser import PSEOF
+# for the cheap pre-pass that looks for the candidate pages
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument, PDFNoOutlines
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import PSLiteral
+
+import pdf_batch_driver         # to process the files in a spreadsheet in parallel
 
 font_families_and_names={
     # font_name style
@@ -1572,6 +1580,10 @@ found_appendix_page=False
 global found_TOC_page
 found_TOC_page=False
 
+# if True, do the layout analysis of every page rather than only the candidate pages found by the pre-pass
+global Full_scan_Flag
+Full_scan_Flag=False
+
 # Match against targets including an all caps version of target with a vertical bar
 def check_for_one_target_string_alone(txt, targets):
     txt=txt.strip()
@@ -1837,7 +1849,169 @@ def process_element(o: Any, pgnumber):
             for i in o:
                 process_element(i, pgnumber)
 
-def process_file(filename):
+#######################################################################
+# Cheap pre-pass to find the pages that the full layout analysis has to look at
+#
+# The full analysis (extract_pages() with LAParams and process_element()) is done for every page, but the
+# references are almost always in the last third of the thesis. The pre-pass first looks in the PDF outline
+# (bookmarks) for a References/Bibliography entry. If there is none, it takes the strings shown by the text
+# operators in each page's content streams (without interpreting the page) and looks for the strings that the
+# checks above react to. With fonts that use 2-byte glyph ids the strings are not text, so nothing is found and
+# all of the pages are analyzed.
+#######################################################################
+reference_target_strings=['References', 'Bibliography']
+appendix_target_strings=['Appendix', 'Appendices']
+toc_target_strings=['Contents', 'Table of contents']
+max_toc_length = 5          #  as in check_for_references_in_section_heading()
+
+# outline titles such as "References", "7 References", or "Bibliography"
+outline_references_re=re.compile(r'^\s*(\d+(\.\d+)*\.?\s*)?(References|Bibliography)\b', re.IGNORECASE)
+outline_toc_re=re.compile(r'^\s*(Table of )?Contents\b', re.IGNORECASE)
+
+def page_number_of_outline_destination(document, dest, action, page_numbers_by_objid):
+    if dest is None and action:
+        action=resolve1(action)
+        if isinstance(action, dict):
+            dest=action.get('D')
+    dest=resolve1(dest)
+    if isinstance(dest, PSLiteral):
+        dest=dest.name
+    if isinstance(dest, (str, bytes)):
+        # a named destination
+        dest=resolve1(document.get_dest(dest))
+    if isinstance(dest, dict):
+        dest=resolve1(dest.get('D'))
+    if isinstance(dest, list) and dest:
+        return page_numbers_by_objid.get(getattr(dest[0], 'objid', None))
+    return None
+
+# returns a tuple of the page numbers (starting from 1) of the References and Contents entries in the outline
+def outline_pages(document, page_numbers_by_objid):
+    references_pages=set()
+    toc_pages=set()
+    try:
+        for (level, title, dest, action, se) in document.get_outlines():
+            if not title:
+                continue
+            if outline_references_re.match(title):
+                pages=references_pages
+            elif outline_toc_re.match(title):
+                pages=toc_pages
+            else:
+                continue
+            try:
+                page_number=page_number_of_outline_destination(document, dest, action, page_numbers_by_objid)
+            except Exception as e:
+                if Verbose_Flag:
+                    print("Unable to resolve the outline entry {0}: {1}".format(title, e))
+                continue
+            if page_number:
+                pages.add(page_number)
+    except PDFNoOutlines:
+        pass
+    return references_pages, toc_pages
+
+def contains_target_string(txt, targets):
+    for t in targets:
+        if txt.find(t) >= 0 or txt.find(t.upper()) >= 0:
+            return True
+    return False
+
+pdf_string_escapes={b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f', b'(': b'(', b')': b')', b'\\': b'\\'}
+
+def unescape_pdf_string(s):
+    def replace_escape(m):
+        e=m.group(1)
+        if e[:1].isdigit():
+            return bytes([int(e, 8) & 0xff])
+        return pdf_string_escapes.get(e, e)
+    return re.sub(rb'\\([0-7]{1,3}|.)', replace_escape, s, flags=re.DOTALL)
+
+# a literal string (without nested parentheses) or a hex string, followed by a text showing operator or inside a TJ array
+pdf_text_object_re=re.compile(rb'BT(.*?)ET', re.DOTALL)
+pdf_shown_text_re=re.compile(rb'\[((?:\((?:\\.|[^\\()])*\)|<[0-9A-Fa-f\s]*>|[^\]])*)\]\s*TJ|\(((?:\\.|[^\\()])*)\)\s*(?:Tj|\'|")|<([0-9A-Fa-f\s]*)>\s*(?:Tj|\'|")', re.DOTALL)
+pdf_string_in_array_re=re.compile(rb'\(((?:\\.|[^\\()])*)\)|<([0-9A-Fa-f\s]*)>|([-+]?[0-9]*\.?[0-9]+)', re.DOTALL)
+# a gap in a TJ array (in thousandths of the font size) that is taken as a space between words
+pdf_word_gap=180.0
+
+def hex_string_bytes(h):
+    h=re.sub(rb'\s', b'', h)
+    if len(h) % 2:
+        h=h+b'0'
+    return bytes.fromhex(h.decode('ascii'))
+
+# The text shown by the text operators of a page's content streams, without interpreting the page (no fonts are loaded
+# and no characters are placed). The strings are taken as they are, which gives the text for the simple (8-bit) fonts
+# that pdfLaTeX uses, but not for the fonts with 2-byte glyph ids - for those pages nothing will match.
+def page_text_from_contents(page):
+    data=b''.join(resolve1(stream).get_data() for stream in page.contents)
+    strings=[]
+    for text_object in pdf_text_object_re.finditer(data):
+        for m in pdf_shown_text_re.finditer(text_object.group(1)):
+            if m.group(1) is not None:
+                # the parts of a TJ array are a single word unless there is a large gap between them
+                parts=[]
+                for part in pdf_string_in_array_re.finditer(m.group(1)):
+                    if part.group(1) is not None:
+                        parts.append(unescape_pdf_string(part.group(1)))
+                    elif part.group(2) is not None:
+                        parts.append(hex_string_bytes(part.group(2)))
+                    elif -float(part.group(3)) > pdf_word_gap:
+                        parts.append(b' ')
+                strings.append(b''.join(parts))
+            elif m.group(2) is not None:
+                strings.append(unescape_pdf_string(m.group(2)))
+            else:
+                strings.append(hex_string_bytes(m.group(3)))
+    return b' '.join(strings).decode('latin-1')
+
+# Returns (number_of_pages, candidate_pages), where candidate_pages is a sorted list of page numbers (starting from 1)
+# or None if the pre-pass did not find any likely references page - in which case all of the pages have to be analyzed.
+# The candidates are taken from the outline if it has a References entry, otherwise from a scan of the text in the
+# pages' content streams (see page_text_from_contents()), so the pages are not interpreted.
+def candidate_reference_pages(filename):
+    with open(filename, 'rb') as fp:
+        document=PDFDocument(PDFParser(fp))
+        pages=list(PDFPage.create_pages(document))
+        number_of_pages=len(pages)
+        page_numbers_by_objid=dict()
+        for page_number, page in enumerate(pages, start=1):
+            page_numbers_by_objid[page.pageid]=page_number
+
+        references_pages, toc_pages=outline_pages(document, page_numbers_by_objid)
+        if references_pages:
+            first_page=min(references_pages)
+            if Verbose_Flag:
+                print("outline has references at page(s) {0} and contents at page(s) {1}".format(references_pages, toc_pages))
+            return number_of_pages, sorted(toc_pages | set(range(first_page, number_of_pages+1)))
+
+        # otherwise look at the strings shown on each page, without interpreting the pages
+        hits=set()
+        toc_pages=set()
+        references_pages=[]
+        for page_number, page in enumerate(pages, start=1):
+            txt=page_text_from_contents(page)
+            if contains_target_string(txt, toc_target_strings):
+                toc_pages.add(page_number)
+                hits.add(page_number)
+            if contains_target_string(txt, appendix_target_strings):
+                hits.add(page_number)
+            if contains_target_string(txt, reference_target_strings):
+                references_pages.append(page_number)
+                hits.add(page_number)
+
+    # ignore mentions of References in the table of contents (and in the few pages after it)
+    last_toc_page=max(toc_pages) if toc_pages else 0
+    references_pages=[p for p in references_pages if p > last_toc_page + max_toc_length]
+    if not references_pages:
+        return number_of_pages, None
+
+    first_page=references_pages[0]
+    return number_of_pages, sorted(hits | set(range(first_page, number_of_pages+1)))
+
+
+# With full_scan=False, the layout analysis is only done for the pages selected by candidate_reference_pages()
+def process_file(filename, full_scan=False):
     global Verbose_Flag
     global Use_local_time_for_output_flag
     global testing
@@ -1848,6 +2022,9 @@ def process_file(filename):
     global found_references_page
     global found_last_references_page
     global found_appendix_page
+    global found_TOC_page
+    global found_heading_rule
+    global page_heading_place_y
 
 
     extracted_data=[]
@@ -1865,11 +2042,29 @@ def process_file(filename):
     found_last_references_page=False
     found_TOC_page=False
     found_appendix_page=False
+    # the heading rule position is per file, so it must not be carried over from the previous file
+    found_heading_rule=False
+    page_heading_place_y=780.0
 
     page_index = 0
     try:
-        for page in extract_pages(filename):
-            page_index=page_index+1
+        candidate_pages=None
+        if not full_scan:
+            try:
+                number_of_pages, candidate_pages=candidate_reference_pages(filename)
+            except Exception as e:
+                print(f'Error in the pre-pass over {filename}, analyzing all of the pages: {e}')
+                candidate_pages=None
+            if Verbose_Flag:
+                print("candidate pages for the layout analysis: {}".format(candidate_pages))
+
+        if candidate_pages is None:
+            pages_to_analyze=enumerate(extract_pages(filename), start=1)
+        else:
+            # extract_pages() numbers the pages from 0 and returns them in order
+            pages_to_analyze=zip(candidate_pages, extract_pages(filename, page_numbers=[p-1 for p in candidate_pages]))
+
+        for page_index, page in pages_to_analyze:
             if Verbose_Flag:
                 print(f'Processing page={page_index}')
 
@@ -1890,6 +2085,15 @@ def process_file(filename):
         print(f'Error in PDF extractor: {e}')
         return False
 
+    if candidate_pages is not None:
+        # in testing mode the pages are only shown, so there is nothing to fall back for
+        if not found_references_page and not testing:
+            # the pre-pass pointed at the wrong pages, so fall back to analyzing all of them
+            if Verbose_Flag:
+                print("no references found in the candidate pages, analyzing all of the pages")
+            return process_file(filename, full_scan=True)
+        page_index=number_of_pages
+
     if found_references_page:
         if not found_appendix_page and not found_last_references_page:
             found_last_references_page=page_index-1
@@ -1897,6 +2101,47 @@ def process_file(filename):
     return True
 
 
+def initialize_worker(verbose, testing_flag, full_scan=False):
+    global Verbose_Flag
+    global testing
+    global Full_scan_Flag
+    Verbose_Flag=verbose
+    testing=testing_flag
+    Full_scan_Flag=full_scan
+
+# Process a single file and return the spreadsheet columns to set for it - used by pdf_batch_driver
+# The reference pages are also extracted into a separate PDF file (with qpdf).
+def analyze_file(filename):
+    if not process_file(filename, Full_scan_Flag):
+        return {'Unexpected error when processing file': filename}
+
+    result=dict()
+    if found_references_page:
+        print("Found references page at {0} in {1}".format(found_references_page, filename))
+        if found_last_references_page:
+            result['References page(s) present'] = "{0}-{1}".format(found_references_page, found_last_references_page)
+        else:
+            result['References page(s) present'] = "{0}".format(found_references_page)
+
+        if filename.endswith('.pdf'):
+            output_filename="{0}-refpages.pdf".format(filename[:-4])
+        else:
+            output_filename="{0}-refpages.pdf".format(filename)
+
+        if found_last_references_page:
+            cmd="qpdf {0} --pages . {1}-{2} -- {3}".format(filename, found_references_page, found_last_references_page, output_filename)
+        else:
+            cmd="qpdf {0} --pages . {1} -- {2}".format(filename, found_references_page, output_filename)
+        if Verbose_Flag:
+            print("cmd: {0}".format(cmd))
+
+        with subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE) as proc:
+            cmd_ouput=proc.stdout.read()
+            if len(cmd_ouput) > 0:
+                print(cmd_ouput)
+    return result
+
+
 def main(argv):
     global Verbose_Flag
     global Use_local_time_for_output_flag
@@ -1907,6 +2152,7 @@ def main(argv):
     global cycle
     global found_references_page
     global found_last_references_page
+    global Full_scan_Flag
 
     argp = argparse.ArgumentParser(description='find_and_extract_references.py: FInd reference page(s) within the PDF file')
 
@@ -1939,6 +2185,30 @@ def main(argv):
                       help="Number of rows to skip"
                       )
 
+    argp.add_argument('-j', '--jobs',
+                      type=int,
+                      default=None,
+                      help="number of worker processes to use for a spreadsheet (default: one per CPU)"
+                      )
+
+    argp.add_argument('-c', '--checkpoint',
+                      type=str,
+                      default=None,
+                      help="checkpoint file for a spreadsheet, used to resume an interrupted run"
+                      )
+
+    argp.add_argument('--resume',
+                      default=False,
+                      action="store_true",
+                      help="continue an interrupted run, using the results in the checkpoint file"
+                      )
+
+    argp.add_argument('-f', '--full',
+                      default=False,
+                      action="store_true",
+                      help="do the layout analysis of all of the pages, rather than only the candidate pages found by a cheap pre-pass"
+                      )
+
     argp.add_argument('-d', '--dump',
                       default=False,
                       action="store_true",
@@ -1950,6 +2220,7 @@ def main(argv):
 
     Verbose_Flag=args["verbose"]
     testing=args["testing"]
+    Full_scan_Flag=args["full"]
 
     if args["dump"]:
         print("dumping the font information")
@@ -1964,7 +2235,7 @@ def main(argv):
         if Verbose_Flag:
             print("filename={}".format(filename))
 
-        if not process_file(filename):
+        if not process_file(filename, Full_scan_Flag):
             return
         if found_references_page:
             print("Found references page at {0} in {1}".format(found_references_page, filename))
@@ -2010,55 +2281,15 @@ def main(argv):
     diva_df['For DIVA page(s) present'] = pd.NaT
 
 
-    for idx, row in diva_df.iterrows():
-        found_references_page=False
-        found_last_references_page=False
-        if skip_to_row and idx < skip_to_row:
-            continue
-        url=row['FullTextLink']
-        author=row['Name']
-        pid=row['PID']
-        if pd.isna(url):
-            print("no full text for thesis by {}".format(author))
-        else:
-            print(f'{idx}: {author}  {url}')
-            last_slash_in_url=url.rfind('/')
-            if last_slash_in_url < 0:
-                print("Cannot find file name in URL")
-                continue
-            filename="{0}-{1}".format(pid, url[last_slash_in_url+1:])
-            print(f'reading file {filename}')
-
-            if not process_file(filename):
-                diva_df.loc[idx, 'Unexpected error when processing file']=filename
-                continue
-
-            if found_references_page:
-                print("Found references page at {0} in {1} by author(s) {2}".format(found_references_page, filename, row['Name']))
-                if found_last_references_page:
-                    diva_df.loc[idx, 'References page(s) present'] = "{0}-{1}".format(found_references_page, found_last_references_page)
-                else:
-                    diva_df.loc[idx, 'References page(s) present'] = "{0}".format(found_references_page)
-
-                if filename.endswith('.pdf'):
-                    output_filename="{0}-refpages.pdf".format(filename[:-4])
-                else:
-                    output_filename="{0}-refpages.pdf".format(filename)
-
-                if found_last_references_page:
-                    cmd="qpdf {0} --pages . {1}-{2} -- {3}".format(filename, found_references_page, found_last_references_page, output_filename)
-                else:
-                    cmd="qpdf {0} --pages . {1} -- {2}".format(filename, found_references_page, output_filename)
-                if Verbose_Flag:
-                    print("cmd: {0}".format(cmd))
-
-                with subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE) as proc:
-                    cmd_ouput=proc.stdout.read()
-                    if len(cmd_ouput) > 0:
-                        print(cmd_ouput)
+    checkpoint_filename=args['checkpoint']
+    if not checkpoint_filename:
+        checkpoint_filename=pdf_batch_driver.default_checkpoint_filename(spreadsheet_name, 'references')
 
-        if args["testing"]:
-            break
+    results=pdf_batch_driver.run_batch(diva_df, analyze_file, checkpoint_filename,
+                                       processes=args['jobs'], skip_to_row=skip_to_row, resume=args['resume'],
+                                       limit=1 if args["testing"] else None,
+                                       initializer=initialize_worker, initargs=(Verbose_Flag, testing, Full_scan_Flag))
+    pdf_batch_driver.merge_results(diva_df, results)
 
     # the following was inspired by the section "Using XlsxWriter with Pandas" on http://xlsxwriter.readthedocs.io/working_with_pandas.html
     # set up the output write
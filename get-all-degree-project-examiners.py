@@ -29,6 +29,8 @@
 #
 
 import requests, time
+import http_cache
+from concurrent.futures import ThreadPoolExecutor
 import pprint
 import optparse
 import sys
@@ -64,7 +66,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -132,7 +134,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -160,7 +162,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -178,7 +180,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -201,7 +203,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -269,8 +271,11 @@ def course_examiners(courses):
     global Verbose_Flag
     # get the examiners
     courses_info=dict()
-    for c in courses:
-        c_info=v1_get_course_info(c)
+    courses=list(courses)
+    # the course information is fetched concurrently (and is then kept in the HTTP cache), only the parsing is serial
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        courses_xml=list(executor.map(v1_get_course_info, courses))
+    for c, c_info in zip(courses, courses_xml):
         xml=BeautifulSoup(c_info, "lxml")
         examiners=list()
         for examiner in xml.findAll('examiner'):
@@ -393,7 +398,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -465,7 +470,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -603,7 +608,7 @@ def v1_get_academic_year_plan_for_program(program_code, year):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme academic-year-plan: {}".format(r.text))
     #
@@ -1,39 +1,90 @@
 #!/usr/bin/python3
 # -*- coding: utf-8 -*-
 #
-# ./get-downloads-for-diva-documents.py urns.xlsx
+# ./get-downloads-for-diva-documents.py urns.xlsx [--workers 8] [--rate 10] [--csv diva-downloads.csv] [--parquet diva-downloads.parquet]
 #
 # Output: diva-downloads.xlsx
 #           a spreadsheet of download data
 #
+#         diva-downloads.csv
+#           the results are appended to this file as the pages are fetched, if the program is interrupted
+#           running it again with the same CSV file only fetches the pages for the remaining DiVA IDs
+#           (use --restart to start over); pages that could not be fetched are not written, so they are retried
+#
 #
 # Input
 # URNs are of the form: urn:nbn:se:kth:diva-230996
 # DiVA, id: diva2:1221139
 # this corresponds to a web page at http://kth.diva-portal.org/smash/record.jsf?pid=diva2%3A1221139&dswid=-8502
 #
+# The pages are fetched by a pool of worker threads (--workers, i.e., at most this many concurrent connections),
+# and the rate at which requests are started is limited (--rate requests per second) so as to be polite to DiVA.
+# Replies with status 429 or 503 are retried after the time given in their Retry-After header.
+# Each page is parsed once with lxml, collecting the downloads, hits, year, and language in a single pass over its spans.
+#
 # G. Q. Maguire Jr.
 #
 #
 # 2019.05.08
+# 2026-10-18 fetch the pages concurrently with rate limiting, write the results incrementally, and resume
 #
 
 import requests, time
 import pprint
 import optparse
 import sys
+import os
+import csv
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from requests.adapters import HTTPAdapter
 
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
-from bs4 import BeautifulSoup
+import lxml.html
 
 ################################
 ######    DiVA related   ######
 ################################
 DiVAUrlbase = 'http://kth.diva-portal.org/smash/record.jsf?pid=diva2%3A'
 
+result_columns=['diva2 ids', 'Downloads', 'Hits', 'Year', 'Language']
+
+Verbose_Flag=False
+
+# polite access to DiVA: at most max_workers connections and at most requests_per_second new requests
+max_workers=8
+requests_per_second=10.0
+max_retries=5
+
+_session=None
+_session_lock=threading.Lock()
+_rate_lock=threading.Lock()
+_next_request_time=0.0
+
+def session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            s=requests.Session()
+            adapter=HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            s.mount('https://', adapter)
+            s.mount('http://', adapter)
+            _session=s
+        return _session
+
+# wait until this thread may start a request, the requests are spaced 1/requests_per_second apart
+def wait_for_turn():
+    global _next_request_time
+    with _rate_lock:
+        now=time.monotonic()
+        start=max(now, _next_request_time)
+        _next_request_time=start+1.0/requests_per_second
+    if start > now:
+        time.sleep(start-now)
 
 def get_diva_page(diva_id):
     global Verbose_Flag
@@ -42,81 +93,139 @@ def get_diva_page(diva_id):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
-    if Verbose_Flag:
-        print("result of getting get_diva_page: {}".format(r.text))
-    #
-    if r.status_code == requests.codes.ok:
-        return r.text           # simply return the XML
+    for attempt in range(max_retries):
+        wait_for_turn()
+        try:
+            r = session().get(url, timeout=60)
+        except requests.exceptions.RequestException as e:
+            print("error getting {0}: {1}".format(url, e))
+            time.sleep(2**attempt)
+            continue
+        if r.status_code in [429, 503]:
+            retry_after=r.headers.get('Retry-After', '')
+            time.sleep(int(retry_after) if retry_after.isdigit() else 2**attempt)
+            continue
+        if Verbose_Flag:
+            print("result of getting get_diva_page: {}".format(r.text))
+        #
+        if r.status_code == requests.codes.ok:
+            return r.text           # simply return the XML
+        return None
     #
     return None
 
-def get_download_count(xml):
-    #<div class="attachment">
-    p1=xml.find('div', attrs={'class': 'attachment'})
-    if p1:
-        #<span class="singleRow">94 downloads</span>
-        found=p1.find('span', attrs={'class': 'singleRow'})
-        if found:
-            for singlerow in found:
-                h1=singlerow.string
-                if h1:
-                    offset_to_download_string=h1.find('downloads')
-                    count_string=h1[0:(offset_to_download_string)]
-                    if Verbose_Flag:
-                        print("count_string={0}".format(count_string))
-                    return int(count_string.strip())
-    # no full text
-    return -1
-
-def get_hits_count(xml):
-    #<div class="attachment">
-    found=xml.findAll('span', attrs={'class': 'singleRow'})
-    # look for <span class="singleRow">Total: 735                     hits</span>
-    if found:
-        if Verbose_Flag:
-            print("found={0}, length={1}".format(found, len(found)))
-        for idx, singlerow in enumerate(found):
-            h1=singlerow.string
-            if Verbose_Flag:
-                print("h1{0}={1}".format(idx, h1))
-            if h1:
-                if h1.find('Total:')>=0:
-                    offset_to_hits_string=h1.find('hits')
-                    hits_string=h1[0:(offset_to_hits_string)].strip()
-                    if Verbose_Flag:
-                        print("hits_string={0}".format(hits_string))
-                    total_hits_string=hits_string.split(':')
-                    return int(total_hits_string[1].strip())
-    # no hits information
-    return -1
-
-def get_year_and_language(xml):
-    found=xml.findAll('span', attrs={'class': 'displayFields'})
-    # look for <span class="displayFields">1995 (Swedish)</span>
-    if found:
-        if Verbose_Flag:
-            print("found={0}, length={1}".format(found, len(found)))
-        for idx, singlerow in enumerate(found):
-            h1=singlerow.string
-            if Verbose_Flag:
-                print("h1 {0}={1}".format(idx, h1))
-            if h1:
-                if h1.find('(English)')>=0 or h1.find('(Swedish)')>=0:
-                    fields=h1.split('(')
-                    year_string=fields[0].strip()
-                    lang_string=fields[1].strip(')')
-                    if Verbose_Flag:
-                        print("year_string={0}".format(year_string))
-                        print("lang_string={0}".format(lang_string))
-                    return {'year': int(year_string),
-                            'lang': lang_string}
-    # no year and language information
+# as with BeautifulSoup's attrs={'class': ...}, the element matches if the name is one of its classes
+def _has_class(element, class_name):
+    return class_name in (element.get('class') or '').split()
+
+def _span_text(span):
+    # the equivalent of BeautifulSoup's .string, i.e., only spans that directly contain a single string
+    if len(span) == 0:
+        return span.text
     return None
 
+# Collect the downloads, hits, and year and language in one pass over the spans of the page
+#   <div class="attachment"> ... <span class="singleRow">94 downloads</span>
+#   <span class="singleRow">Total: 735                     hits</span>
+#   <span class="displayFields">1995 (Swedish)</span>
+# The downloads and hits are -1 and the year and language None when the page does not contain them.
+def parse_diva_page(page):
+    result={'Downloads': -1, 'Hits': -1, 'Year': None, 'Language': None}
+    if not page:
+        return result
+    tree=lxml.html.fromstring(page)
+    attachment=next((div for div in tree.iter('div') if _has_class(div, 'attachment')), None)
+    seen_attachment_row=False
+    for span in tree.iter('span'):
+        if _has_class(span, 'singleRow'):
+            h1=_span_text(span)
+            # only the first singleRow in the first attachment div gives the download count (as with find())
+            if not seen_attachment_row and attachment is not None:
+                parent=span.getparent()
+                while parent is not None and parent is not attachment:
+                    parent=parent.getparent()
+                if parent is not None:
+                    seen_attachment_row=True
+                    if h1 and h1.find('downloads') >= 0:
+                        try:
+                            result['Downloads']=int(h1[0:h1.find('downloads')].strip())
+                        except ValueError:
+                            pass
+            if h1 and result['Hits'] == -1 and h1.find('Total:') >= 0:
+                hits_string=h1[0:h1.find('hits')].strip()
+                try:
+                    result['Hits']=int(hits_string.split(':')[1].strip())
+                except (ValueError, IndexError):
+                    pass
+        elif _has_class(span, 'displayFields') and result['Year'] is None:
+            h1=_span_text(span)
+            if h1 and (h1.find('(English)') >= 0 or h1.find('(Swedish)') >= 0):
+                fields=h1.split('(')
+                try:
+                    result['Year']=int(fields[0].strip())
+                    result['Language']=fields[1].strip(')')
+                except ValueError:
+                    pass
+    if Verbose_Flag:
+        print("parsed page: {}".format(result))
+    return result
+
+# returns None if the page could not be fetched, so that it is not recorded as done and is fetched again on the next run
+def fetch_and_parse(diva2_ids_entry):
+    diva2_id=diva2_ids_entry.split(':')[1]
+    page=get_diva_page(diva2_id)
+    if page is None:
+        return None
+    result=parse_diva_page(page)
+    result['diva2 ids']=diva2_ids_entry
+    return result
+
+def already_done(csv_filename):
+    if not os.path.isfile(csv_filename):
+        return set()
+    done_df=pd.read_csv(csv_filename, usecols=['diva2 ids'])
+    return set(done_df['diva2 ids'])
+
+def scrape(diva2_ids, csv_filename, restart=False, flush_every=100):
+    if restart and os.path.isfile(csv_filename):
+        os.remove(csv_filename)
+    done=already_done(csv_filename)
+    work=[d for d in dict.fromkeys(diva2_ids) if d not in done]
+    print("{0} DiVA IDs, {1} already in {2}, {3} to fetch".format(len(set(diva2_ids)), len(done), csv_filename, len(work)))
+    if not work:
+        return
+
+    new_file=not os.path.isfile(csv_filename)
+    start_time=time.time()
+    failed=0
+    with open(csv_filename, 'a', newline='', encoding='utf-8') as csv_FH:
+        writer=csv.DictWriter(csv_FH, fieldnames=result_columns)
+        if new_file:
+            writer.writeheader()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures=[executor.submit(fetch_and_parse, d) for d in work]
+            for number_done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    result=future.result()
+                except Exception as e:
+                    print("error processing a page: {}".format(e))
+                    result=None
+                if result is None:
+                    failed=failed+1
+                else:
+                    writer.writerow(result)
+                if number_done % flush_every == 0:
+                    csv_FH.flush()
+                    elapsed=time.time()-start_time
+                    print("{0} of {1} pages in {2:.1f} seconds ({3:.1f} pages/s)".format(number_done, len(work), elapsed, number_done/elapsed))
+    print("fetched {0} pages in {1:.1f} seconds".format(len(work)-failed, time.time()-start_time))
+    if failed:
+        print("{0} pages could not be fetched, run the program again to retry them".format(failed))
 
 def main():
     global Verbose_Flag
+    global max_workers
+    global requests_per_second
 
     default_picture_size=128
 
@@ -129,6 +238,39 @@ def main():
                       help="Print lots of output to stdout"
     )
 
+    parser.add_option('-w', '--workers',
+                      dest="workers",
+                      type="int",
+                      default=8,
+                      help="maximum number of concurrent connections to DiVA"
+    )
+
+    parser.add_option('-r', '--rate',
+                      dest="rate",
+                      type="float",
+                      default=10.0,
+                      help="maximum number of requests per second"
+    )
+
+    parser.add_option('--csv',
+                      dest="csv_filename",
+                      default="diva-downloads.csv",
+                      help="CSV file the results are appended to (and resumed from)"
+    )
+
+    parser.add_option('--parquet',
+                      dest="parquet_filename",
+                      default=None,
+                      help="also output the results as a Parquet file"
+    )
+
+    parser.add_option('--restart',
+                      dest="restart",
+                      default=False,
+                      action="store_true",
+                      help="ignore the results already in the CSV file"
+    )
+
     options, remainder = parser.parse_args()
 
     Verbose_Flag=options.verbose
@@ -143,35 +285,25 @@ def main():
     else:
         file_of_DiVA_ids=remainder[0]
 
+    max_workers=options.workers
+    requests_per_second=options.rate
+
     ids_df=pd.read_excel(open(file_of_DiVA_ids, 'rb'), sheet_name='Sheet1')
 
-    column_names=list(ids_df)
+    scrape(list(ids_df['diva2 ids']), options.csv_filename, restart=options.restart)
 
-    ids_df['Downloads']=None
-    ids_df['Hits']=None
-    ids_df['Year']=None
-    ids_df['Language']=None
-    
-    for idx, row in ids_df.iterrows():
-        diva2_id=row['diva2 ids'].split(':')[1]
-        if Verbose_Flag:
-            print("ids_df[{0}]={1}".format(idx, diva2_id))
-        page=get_diva_page(diva2_id)
-        xml=BeautifulSoup(page, features="html.parser")
-        count=get_download_count(xml)
-        ids_df.loc[idx, 'Downloads']=count
-        hits=get_hits_count(xml)
-        ids_df.loc[idx, 'Hits']=hits
-        y_l=get_year_and_language(xml)
-        ids_df.loc[idx, 'Year']=y_l['year']
-        ids_df.loc[idx, 'Language']=y_l['lang']
+    results_df=pd.read_csv(options.csv_filename).drop_duplicates(subset='diva2 ids', keep='last')
+    ids_df=ids_df.drop(columns=[c for c in result_columns[1:] if c in ids_df.columns])
+    ids_df=ids_df.merge(results_df, on='diva2 ids', how='left')
+
+    if options.parquet_filename:
+        ids_df.to_parquet(options.parquet_filename)
 
     writer = pd.ExcelWriter('diva-downloads.xlsx', engine='xlsxwriter')
 
     ids_df.to_excel(writer, sheet_name='Downloads')
 
     # Close the Pandas Excel writer and output the Excel file.
-    writer.save()
+    writer.close()
 
 if __name__ == "__main__": main()
-
@@ -25,6 +25,7 @@
 #
 
 import requests, time
+import http_cache
 import pprint
 import optparse
 import sys
@@ -70,7 +71,7 @@ def v2_get_schools():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v2 schools: {}".format(r.text))
     #
@@ -81,7 +82,7 @@ def v2_get_schools():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v2 schools: {}".format(r.text))
     #
@@ -113,7 +114,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -133,7 +134,7 @@ def v2_get_programmes_third_cycle():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v2 doctoral programme: {}".format(r.text))
     #
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# http_cache.py
+#
+# Purpose: A shared, on-disk, read-through cache for the GET requests that the programs in this repository
+#          make to KOPPS, the KTH profile API, and (optionally) Canvas.
+#
+# The KOPPS helpers (get_dept_courses(), get_course_info(), v1_get_course_info(), v1_get_programmes(), ...) and
+# get_user_by_kthid() are copied into many of the programs. Without a cache, each program re-downloads the same catalog
+# data; with the cache, running the term's setup programs one after the other fetches each resource once.
+#
+# The responses are kept in an SQLite database (by default http_cache.sqlite in the current directory), keyed by the
+# URL, the query parameters, and a hash of the Authorization header (so that responses fetched with one token are not
+# returned for another). Only responses with status 200 are stored.
+#
+# Each endpoint has a time to live (see ttl_by_endpoint). While an entry is fresh it is returned without contacting
+# the server. Once it is stale, the request is revalidated using If-None-Match (ETag) and If-Modified-Since; a 304 reply
+# simply makes the stored entry fresh again. If the server cannot be reached, the stale entry is returned.
+# URLs that do not match any endpoint are not cached.
+#
+# In offline mode every stored entry is returned regardless of its age and a request for something not in the cache
+# returns a response with status 504, without contacting the server.
+#
+# Usage (from another program):
+#   import http_cache
+#   ...
+#   r = http_cache.get(url)                      # instead of r = requests.get(url)
+#   r = http_cache.get(url, headers = header)
+#
+# The cache is controlled by the following environment variables (or by calling configure()):
+#   HTTP_CACHE_FILE     name of the SQLite file
+#   HTTP_CACHE_OFFLINE  if set to 1, run in offline mode
+#   HTTP_CACHE_DISABLE  if set to 1, all requests go to the server and nothing is stored
+#   HTTP_CACHE_STATS    if set to 1, the hit/miss statistics are printed when the program exits
+#
+# 2026-10-18
+#
+import os
+import re
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+cache_filename=os.environ.get('HTTP_CACHE_FILE', 'http_cache.sqlite')
+Offline_Flag=os.environ.get('HTTP_CACHE_OFFLINE', '0') == '1'
+Disabled_Flag=os.environ.get('HTTP_CACHE_DISABLE', '0') == '1'
+Verbose_Flag=False
+
+day=24*60*60
+
+# time to live in seconds, the first matching pattern is used
+ttl_by_endpoint=[
+    (re.compile(r'/api/kopps/'), 1*day),          # KOPPS: programmes, departments, courses, course rounds
+    (re.compile(r'/profile/v1/'), 1*day),         # KTH profile API (get_user_by_kthid)
+    (re.compile(r'/student/kurser/'), 1*day),     # the course and programme web pages (programme_syllabi)
+    (re.compile(r'/api/v1/'), 10*60),             # Canvas - only used when canvas_client is configured with cache=True
+]
+
+statistics={'hits': 0,            # fresh entry returned
+            'misses': 0,          # fetched from the server and stored
+            'revalidated': 0,     # stale entry confirmed by a 304 reply
+            'stale': 0,           # stale or offline entry returned without a fresh reply from the server
+            'bypassed': 0}        # not cacheable (no TTL, cache disabled, or not a 200 reply)
+_statistics_lock=threading.Lock()
+
+_local=threading.local()          # one SQLite connection per thread
+_session=None
+_session_lock=threading.Lock()
+
+def configure(filename=None, offline=None, disabled=None, verbose=None):
+    global cache_filename, Offline_Flag, Disabled_Flag, Verbose_Flag
+    if filename:
+        cache_filename=filename
+        _local.__dict__.clear()
+    if offline is not None:
+        Offline_Flag=offline
+    if disabled is not None:
+        Disabled_Flag=disabled
+    if verbose is not None:
+        Verbose_Flag=verbose
+
+def _count(what):
+    with _statistics_lock:
+        statistics[what]=statistics[what]+1
+
+def print_statistics():
+    total=sum(statistics.values())
+    if total == 0:
+        return
+    served=statistics['hits']+statistics['revalidated']+statistics['stale']
+    print("HTTP cache: {0} requests, {1} hits, {2} revalidated, {3} stale, {4} misses, {5} bypassed ({6:.0f}% served from {7})".format(
+        total, statistics['hits'], statistics['revalidated'], statistics['stale'], statistics['misses'], statistics['bypassed'],
+        100.0*served/total, cache_filename))
+
+if os.environ.get('HTTP_CACHE_STATS', '0') == '1':
+    atexit.register(print_statistics)
+
+def ttl_for_url(url):
+    for pattern, ttl in ttl_by_endpoint:
+        if pattern.search(url):
+            return ttl
+    return None
+
+def _connection():
+    conn=getattr(_local, 'conn', None)
+    if conn is None:
+        conn=sqlite3.connect(cache_filename, timeout=30)
+        # WAL lets several programs (or worker processes) read the cache while another one writes to it
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, url TEXT, fetched REAL, headers TEXT, body BLOB)')
+        conn.commit()
+        _local.conn=conn
+    return conn
+
+def session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            s=requests.Session()
+            adapter=HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            s.mount('https://', adapter)
+            s.mount('http://', adapter)
+            _session=s
+        return _session
+
+def cache_key(url, params=None, headers=None):
+    if params:
+        if isinstance(params, dict):
+            params=sorted((k, v if isinstance(v, (str, int, float)) else list(v)) for k, v in params.items())
+        else:
+            params=sorted(params)
+    authorization=''
+    if headers:
+        authorization=CaseInsensitiveDict(headers).get('Authorization', '')
+    authorization_hash=hashlib.sha256(authorization.encode('utf-8')).hexdigest() if authorization else ''
+    return hashlib.sha256(json.dumps([url, params or [], authorization_hash], default=str).encode('utf-8')).hexdigest()
+
+def _lookup(key):
+    row=_connection().execute('SELECT fetched, headers, body FROM responses WHERE key=?', (key,)).fetchone()
+    if row is None:
+        return None
+    return {'fetched': row[0], 'headers': json.loads(row[1]), 'body': row[2]}
+
+def _store(key, url, headers, body):
+    conn=_connection()
+    conn.execute('INSERT OR REPLACE INTO responses (key, url, fetched, headers, body) VALUES (?, ?, ?, ?, ?)',
+                 (key, url, time.time(), json.dumps(headers), body))
+    conn.commit()
+
+def _touch(key):
+    conn=_connection()
+    conn.execute('UPDATE responses SET fetched=? WHERE key=?', (time.time(), key))
+    conn.commit()
+
+def _response(url, status_code, headers, body, reason='OK'):
+    r=requests.models.Response()
+    r.status_code=status_code
+    r.reason=reason
+    r.headers=CaseInsensitiveDict(headers)
+    r._content=body
+    r.url=url
+    r.encoding=requests.utils.get_encoding_from_headers(r.headers)
+    return r
+
+# the stored headers describe the decoded body, so the transfer related ones are dropped
+def _headers_to_store(r):
+    return {k: v for k, v in r.headers.items() if k.lower() not in ['content-encoding', 'content-length', 'transfer-encoding', 'set-cookie']}
+
+# a drop-in replacement for requests.get(url, params=..., headers=...) for the cacheable endpoints
+def get(url, params=None, headers=None, session_to_use=None):
+    s=session_to_use or session()
+    ttl=ttl_for_url(url)
+    if Disabled_Flag or ttl is None:
+        _count('bypassed')
+        return s.get(url, params=params, headers=headers)
+
+    key=cache_key(url, params, headers)
+    entry=_lookup(key)
+    if entry:
+        if Offline_Flag:
+            _count('stale')
+            return _response(url, 200, entry['headers'], entry['body'])
+        if time.time()-entry['fetched'] < ttl:
+            _count('hits')
+            if Verbose_Flag:
+                print("cache hit for {}".format(url))
+            return _response(url, 200, entry['headers'], entry['body'])
+    elif Offline_Flag:
+        _count('bypassed')
+        return _response(url, 504, {}, b'', reason='Not in the HTTP cache (offline mode)')
+
+    request_headers=dict(headers) if headers else dict()
+    if entry:
+        stored=CaseInsensitiveDict(entry['headers'])
+        if stored.get('ETag'):
+            request_headers['If-None-Match']=stored['ETag']
+        if stored.get('Last-Modified'):
+            request_headers['If-Modified-Since']=stored['Last-Modified']
+
+    try:
+        r=s.get(url, params=params, headers=request_headers)
+    except requests.exceptions.ConnectionError:
+        if entry:
+            _count('stale')
+            print("Unable to reach the server, using the cached response for {}".format(url))
+            return _response(url, 200, entry['headers'], entry['body'])
+        raise
+
+    if entry and r.status_code == requests.codes.not_modified:
+        _touch(key)
+        _count('revalidated')
+        return _response(url, 200, entry['headers'], entry['body'])
+
+    if r.status_code == requests.codes.ok:
+        _store(key, url, _headers_to_store(r), r.content)
+        _count('misses')
+    elif entry and r.status_code >= 500:
+        _count('stale')
+        return _response(url, 200, entry['headers'], entry['body'])
+    else:
+        _count('bypassed')
+    return r
+
+# remove all the entries, or only those whose URL starts with prefix
+def clear(prefix=None):
+    conn=_connection()
+    if prefix:
+        conn.execute('DELETE FROM responses WHERE url LIKE ?', (prefix+'%',))
+    else:
+        conn.execute('DELETE FROM responses')
+    conn.commit()
@@ -2,10 +2,16 @@
 #
 # ./insert_teachers_grading_standards.py -a account_id cycle_number school_acronym course_code
 # ./insert_teachers_grading_standards.py   course_id cycle_number school_acronym course_code
+# ./insert_teachers_grading_standards.py --all course_id cycle_number school_acronym
 #
 # Generate a "grading standard" scale with the names of teachers as the "grades".
-# Note that if the grading scale is already present, it does nothing unless the "-f" (force) flag is set.
-# In the latter case it adds the grading scale.
+# Note that if the grading scale is already present with the same grades, it does nothing unless the "-f" (force) flag
+# is set. In the latter case it adds the grading scale. If a scale with the same title has different grades (for example,
+# as there is a new examiner), the scale is replaced.
+#
+# With the option "--all" the scales for all of the degree project course codes in the course data file are made.
+# The existing grading standards are fetched once (all of the pages) and compared by title and grades with the wanted
+# scales, then only the scales that are missing or changed are created or replaced (concurrently).
 #
 # G. Q. Maguire Jr.
 #
@@ -14,6 +20,7 @@
 # Test with
 #  ./insert_teachers_grading_standards.py -v 11 2 EECS II246X
 #  ./insert_teachers_grading_standards.py -v --config config-test.json 11 2 EECS II246X
+#  ./insert_teachers_grading_standards.py --all 11 2 EECS
 # 
 #
 
@@ -22,6 +29,8 @@ import optparse
 import sys
 import json
 
+import canvas_client            # shared, pooled Canvas REST client
+
 
 #############################
 ###### EDIT THIS STUFF ######
@@ -49,6 +58,7 @@ def initialize(options):
 
                      header = {'Authorization' : 'Bearer ' + access_token}
                      payload = {}
+                     canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
        except:
               print("Unable to open configuration file named {}".format(config_file))
               print("Please create a suitable configuration file, the default name is config.json")
@@ -87,14 +97,41 @@ def create_grading_standard(course_or_account, id, name, scale):
        if Verbose_Flag:
               print("payload={0}".format(payload))
 
-       r = requests.post(url, headers = header, json=payload)
+       r = canvas_client.post(url, json=payload)
        if r.status_code == requests.codes.ok:
               page_response=r.json()
-              print("inserted grading standard")
+              print("inserted grading standard: {}".format(name))
               return True
        print("r.status_code={0}".format(r.status_code))
        return False
 
+def update_grading_standard(course_or_account, id, grading_standard_id, name, scale):
+       global Verbose_Flag
+       # Use the Canvas API to update a grading standard
+       # PUT /api/v1/accounts/:account_id/grading_standards/:grading_standard_id
+       # or
+       # PUT /api/v1/courses/:course_id/grading_standards/:grading_standard_id
+
+       if course_or_account:
+              url = "{0}/courses/{1}/grading_standards/{2}".format(baseUrl, id, grading_standard_id)
+       else:
+              url = "{0}/accounts/{1}/grading_standards/{2}".format(baseUrl, id, grading_standard_id)
+
+       if Verbose_Flag:
+              print("url: {}".format(url))
+
+       payload={'title': name,
+                'grading_scheme_entry': scale
+       }
+
+       r = canvas_client.put(url, json=payload)
+       if r.status_code == requests.codes.ok:
+              print("replaced grading standard: {}".format(name))
+              return True
+       if Verbose_Flag:
+              print("r.status_code={0}".format(r.status_code))
+       return False
+
 def get_grading_standards(course_or_account, id):
        global Verbose_Flag
        # Use the Canvas API to get a grading standard
@@ -112,11 +149,78 @@ def get_grading_standards(course_or_account, id):
        if Verbose_Flag:
               print("url: " + url)
 
-       r = requests.get(url, headers = header)
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-              return page_response
-       return None
+       return canvas_client.get_paginated_list(url)
+
+# title -> grading standard, when there are several with the same title only the highest numbered instance is used
+def existing_grading_standards(course_or_account, id):
+       canvas_grading_standards=dict()
+       for s in get_grading_standards(course_or_account, id):
+              old=canvas_grading_standards.get(s['title'], None)
+              if old and s['id'] < old['id']:
+                     continue
+              canvas_grading_standards[s['title']]=s
+              if Verbose_Flag:
+                     print("title={0} for id={1}".format(s['title'], s['id']))
+       return canvas_grading_standards
+
+# the examiners in the given order, from 100 down to just above 0, followed by 'none selected' at 0
+def scale_for_examiners(examiners):
+       scale=[]
+       number_of_examiners=len(examiners)
+       index=0
+       for e in examiners:
+              i=number_of_examiners-index
+              d=dict()
+              d['name']=e
+              d['value'] =(float(i)/float(number_of_examiners))*100.0
+              if Verbose_Flag:
+                     print("d={0}".format(d))
+              scale.append(d)
+              index=index+1
+       scale.append({'name': 'none selected', 'value': 0.0})
+       return scale
+
+# Canvas returns the values of the grading scheme as fractions, rather than as percentages
+def same_scale(scale, grading_standard):
+       existing=[(e['name'], round(float(e['value']), 4)) for e in grading_standard.get('grading_scheme', [])]
+       wanted=[(e['name'], round(e['value']/100.0, 4)) for e in scale]
+       return existing == wanted
+
+# wanted_scales is a dict of title -> scale, returns the number of scales that could not be created or replaced
+def synchronize_grading_standards(course_or_account, id, wanted_scales, force):
+       canvas_grading_standards=existing_grading_standards(course_or_account, id)
+       if Verbose_Flag:
+              print("canvas_grading_standards={}".format(canvas_grading_standards))
+
+       jobs=[]
+       unchanged=0
+       for title, scale in wanted_scales.items():
+              existing=canvas_grading_standards.get(title, None)
+              if force or not existing:
+                     jobs.append(('create', title, scale, None))
+              elif not same_scale(scale, existing):
+                     jobs.append(('replace', title, scale, existing['id']))
+              else:
+                     unchanged=unchanged+1
+
+       def run(job):
+              action, title, scale, grading_standard_id=job
+              if action == 'replace':
+                     if update_grading_standard(course_or_account, id, grading_standard_id, title, scale):
+                            return True
+                     # for a Canvas without the update call, add a new instance, as the highest numbered one is used
+              return create_grading_standard(course_or_account, id, title, scale)
+
+       results=canvas_client.run_concurrently(run, jobs)
+       failed=[job[1] for job, status in zip(jobs, results) if not status]
+       print("{0} grading standards unchanged, {1} created, {2} replaced, {3} failed".format(
+              unchanged,
+              len([job for job, status in zip(jobs, results) if status and job[0] == 'create']),
+              len([job for job, status in zip(jobs, results) if status and job[0] == 'replace']),
+              len(failed)))
+       if failed:
+              print("failed: {}".format(', '.join(failed)))
+       return len(failed)
 
 kth_examiners=["Åberg Wennerholm, Malin",
                "Åbom, Mats",
@@ -652,6 +756,13 @@ def main():
                          help="Replace existing grading scheme"
        )
 
+       parser.add_option('-A', '--all',
+                         dest="all_course_codes",
+                         default=False,
+                         action="store_true",
+                         help="create or update the scales for all of the course codes in the course data file"
+       )
+
        parser.add_option('-t', '--testing',
                          dest="testing",
                          default=False,
@@ -685,7 +796,10 @@ def main():
               print("Course or account {0}: course_or_account = {1}".format(options.account,
                                                                             course_or_account))
 
-       if (not options.testing) and (len(remainder) < 4):
+       if (not options.testing) and options.all_course_codes and (len(remainder) < 3):
+              print("Insuffient arguments must provide a course_id|account_id cycle_number school_acronym\n")
+              return
+       if (not options.testing) and (not options.all_course_codes) and (len(remainder) < 4):
               print("Insuffient arguments must provide a course_id|account_id cycle_number school_acronym course_code\n")
               return
        if (options.testing) and (len(remainder) < 3):
@@ -704,7 +818,7 @@ def main():
        cycle_number=remainder[1] # note that cycle_number is a string with the value '1' or '2'
        school_acronym=remainder[2]
 
-       if (not options.testing):
+       if (not options.testing) and (not options.all_course_codes):
               course_code=remainder[3]
 
        inputfile_name="course-data-{0}-cycle-{1}.json".format(school_acronym, cycle_number)
@@ -726,74 +840,31 @@ def main():
        dept_codes=all_data['dept_codes']
        all_course_examiners=all_data['all_course_examiners']
 
-       canvas_grading_standards=dict()
-       available_grading_standards=get_grading_standards(True, canvas_course_id)
-       if available_grading_standards:
-              for s in available_grading_standards:
-                     old_id=canvas_grading_standards.get(s['title'], None)
-                     if old_id and s['id'] < old_id: # use only the highest numbered instance of each scale
-                            continue
-       else:
-              canvas_grading_standards[s['title']]=s['id']
-              if Verbose_Flag:
-                     print("title={0} for id={1}".format(s['title'], s['id']))
+       if (options.testing):
+              all_examiners=set()
+              for course in all_course_examiners:
+                     for examiner in all_course_examiners[course]:
+                            all_examiners.add(examiner)
 
-       if Verbose_Flag:
-              print("canvas_grading_standards={}".format(canvas_grading_standards))
+              # the following is for extreme testing
+              # all_examiners=kth_examiners
 
-       if (options.testing):
-              potential_grading_standard_id=canvas_grading_standards.get("All examiners", None)
-              if Force_Flag or (not potential_grading_standard_id):
-                     name="All examiners"
-                     scale=[]
-                     all_examiners=set()
-                     for course in all_course_examiners:
-                            for examiner in all_course_examiners[course]:
-                                   all_examiners.add(examiner)
-
-                     # the following is for extreme testing
-                     # all_examiners=kth_examiners
-
-                     number_of_examiners=len(all_examiners)
-                     print("number_of_examiners={}".format(number_of_examiners))
-
-                     index=0
-                     for e in sorted(all_examiners):
-                            i=number_of_examiners-index
-                            d=dict()
-                            d['name']=e
-                            d['value'] =(float(i)/float(number_of_examiners))*100.0
-                            print("d={0}".format(d))
-                            scale.append(d)
-                            index=index+1
-                     scale.append({'name': 'none selected', 'value': 0.0})
-
-                     print("scale is {}".format(scale))
-                     status=create_grading_standard(course_or_account, canvas_course_id, name, scale)
-                     print("status={0}".format(status))
-                     if Verbose_Flag and status:
-                            print("Created new grading scale: {}".format(name))
+              print("number_of_examiners={}".format(len(all_examiners)))
+              wanted_scales={"All examiners": scale_for_examiners(sorted(all_examiners))}
+
+       elif options.all_course_codes:
+              wanted_scales=dict()
+              for course_code in sorted(all_course_examiners):
+                     if all_course_examiners[course_code]:
+                            wanted_scales[course_code]=scale_for_examiners(all_course_examiners[course_code])
+                     else:
+                            print("{} has no examiners, so no scale is made".format(course_code))
 
        else:
-              potential_grading_standard_id=canvas_grading_standards.get(course_code, None)
-              if Force_Flag or (not potential_grading_standard_id):
-                     name=course_code
-                     scale=[]
-                     number_of_examiners=len(all_course_examiners[course_code])
-                     index=0
-                     for e in all_course_examiners[course_code]:
-                            i=number_of_examiners-index
-                            d=dict()
-                            d['name']=e
-                            d['value'] =(float(i)/float(number_of_examiners))*100.0
-                            print("d={0}".format(d))
-                            scale.append(d)
-                            index=index+1
-                     scale.append({'name': 'none selected', 'value': 0.0})
-
-                     status=create_grading_standard(course_or_account, canvas_course_id, name, scale)
-                     print("status={0}".format(status))
-                     if Verbose_Flag and status:
-                            print("Created new grading scale: {}".format(name))
+              wanted_scales={course_code: scale_for_examiners(all_course_examiners[course_code])}
+
+       synchronize_grading_standards(course_or_account, canvas_course_id, wanted_scales, Force_Flag)
+
+       canvas_client.report()
 
 if __name__ == "__main__": main()
@@ -8,11 +8,22 @@
 #
 # Output: a spreadsheet named: personnel.xlsx with the data boua the persons in the EECS school by department
 #
+# The directory pages and the profiles are fetched concurrently (--workers, default 8) over the keep-alive session of
+# http_cache.py. Each directory page is parsed once with BeautifulSoup and each username is looked up once, even if the
+# person is listed in several departments. The profile lookups go through the HTTP cache, so a second run (within the
+# cache's time to live) does not contact the profile API again. Each department's sheet is made as soon as all of
+# its profiles have been fetched, while the file itself is written once all of the sheets are done (or when the program
+# stops because of an error). A directory page or profile lookup that fails is reported and counted, and the program
+# continues without it.
 #
 # Example:
-# kth-dept-teaching.py https://www.kth.se/directory/j/jh
+# kth-dept-teaching.py
+#   crawls the five EECS departments
+# kth-dept-teaching.py --url https://www.kth.se/directory/j/jh --url https://www.kth.se/directory/a
+#   crawls the given directory pages, the sheets are named after the last part of the URL (JH and A)
 #
 # 2022-04-08 G. Q. Maguire Jr.
+# 2026-10-18 concurrent crawler
 #
 import re
 import sys
@@ -23,10 +34,14 @@ import argparse
 import os			# to make OS calls, here to get time zone info
 
 import requests
+import http_cache
 
 import time
 
 import pprint
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bs4 import BeautifulSoup
 
 from collections import defaultdict
 
@@ -71,7 +86,7 @@ def get_user_by_name(name):
        if Verbose_Flag:
               print("url: {}".format(url))
 
-       r = requests.get(url, headers = header)
+       r = http_cache.get(url, headers = header)
        if Verbose_Flag:
               print("result of getting profile: {}".format(r.text))
 
@@ -80,7 +95,85 @@ def get_user_by_name(name):
               return page_response
        return []
 
-
+profile_url_prefix='https://www.kth.se/profile/'
+
+def get_directory_page(url):
+    r = http_cache.session().get(url)
+    if r.status_code == requests.codes.ok:
+        return r.text
+    print("Unable to get the directory page {0}, status code={1}".format(url, r.status_code))
+    return None
+
+# the links to the profiles are in the lastname column of the directory page's table
+def profile_urls_in_directory_page(page):
+    profile_urls=[]
+    soup=BeautifulSoup(page, "lxml")
+    for link in soup.select('td.lastname a[href]'):
+        profile_urls.append(link['href'].split('?')[0])
+    return profile_urls
+
+def username_from_profile_url(url_p):
+    offset_to_name=url_p.find(profile_url_prefix)
+    if offset_to_name >= 0:
+        return url_p[offset_to_name+len(profile_url_prefix):]
+    return None
+
+def sheet_name_for_url(url):
+    return url.rstrip('/').rsplit('/', 1)[-1].upper()[:31]
+
+# the result of a future, or None (and the failure is reported) if the call raised an exception
+def result_or_none(future, what):
+    try:
+        return future.result()
+    except Exception as e:
+        print("Unable to get {0}: {1}".format(what, e))
+        return None
+
+# fetch the directory pages and the profiles, adding a sheet for each department to the writer
+# returns the number of directory pages and profiles that could not be fetched
+def crawl_departments(depts, writer, workers):
+    failures=0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        page_futures={executor.submit(get_directory_page, depts[dept]): dept for dept in depts}
+
+        # as each directory page arrives, the lookups of its people are started
+        usernames=dict()
+        profile_futures=dict()  # username -> future, so that someone in several departments is looked up once
+        for future in as_completed(page_futures):
+            dept=page_futures[future]
+            page=result_or_none(future, "the directory page of {}".format(dept))
+            usernames[dept]=[]
+            if not page:
+                failures=failures+1
+                continue
+            profile_urls=profile_urls_in_directory_page(page)
+            print("{0}: number of profiles is {1}".format(dept, len(profile_urls)))
+            for url_p in profile_urls:
+                name=username_from_profile_url(url_p)
+                if name is None:
+                    continue
+                usernames[dept].append(name)
+                if name not in profile_futures:
+                    profile_futures[name]=executor.submit(get_user_by_name, name)
+
+        # the sheets are made in the order of depts, while the remaining lookups continue
+        failed_names=set()
+        for dept in depts:
+            personnel=[]
+            for name in usernames[dept]:
+                if name in failed_names:
+                    continue
+                user_info=result_or_none(profile_futures[name], "the profile of {}".format(name))
+                if type(user_info) is not dict:
+                    print("name={0} type is {1}".format(name, type(user_info)))
+                    failed_names.add(name)
+                    continue
+                personnel.append(user_info)
+            personnel_df=pd.json_normalize(personnel)
+            personnel_df.to_excel(writer, sheet_name=dept)
+            if Verbose_Flag:
+                print("added sheet {0} with {1} persons".format(dept, len(personnel)))
+    return failures+len(failed_names)
 
 def main(argv):
     global Verbose_Flag
@@ -101,8 +194,15 @@ def main(argv):
 
     argp.add_argument('--url',
                       type=str,
+                      action='append',
                       default=None,
-                      help="url to dept"
+                      help="url to dept (can be given several times), by default the EECS departments"
+                      )
+
+    argp.add_argument('-w', '--workers',
+                      type=int,
+                      default=8,
+                      help="number of concurrent requests"
                       )
 
     argp.add_argument("--config", type=str, default='config.json',
@@ -119,9 +219,6 @@ def main(argv):
     if Verbose_Flag:
         print("testing={}".format(testing))
 
-    #dept_url=args['url']
-    #print("URL is {}".format(dept_url))
-
     base_eecs_url='https://www.kth.se/directory/j'
 
     depts={
@@ -131,78 +228,17 @@ def main(argv):
         'HCT': 'https://www.kth.se/directory/j/jm',
         'IS': 'https://www.kth.se/directory/j/jr'
         }
-
-    profile_urls=dict()
-    personnel=dict()
-
-    # initialize a dict of empty lists
-    profile_urls=dict()
-    for dept in depts:
-        profile_urls[dept]=[]
-        personnel[dept]=[]
-
-    for dept in depts:
-        r = requests.get(depts[dept])
-        #print(r.status_code)
-        if r.status_code == requests.codes.ok:
-            # print(r.text)
-            lines=r.text.splitlines(keepends=False)
-            print("number of lines is {}".format(len(lines)))
-            for l in lines:
-                if l.find('<td class="lastname">') > 0:
-                    pattern_1='<a href="'
-                    start_offset_1=l.find(pattern_1)
-                    if start_offset_1 > 0:
-                        remainder_1=l[start_offset_1+len(pattern_1):]
-                        pattern_2='?'
-                        start_offset_2=remainder_1.find(pattern_2)
-                        profile_url=remainder_1[:start_offset_2]
-                        profile_urls[dept].append(profile_url)
-    
-    for dept in depts:
-        for index, url_p in enumerate(profile_urls[dept]):
-            pattern='https://www.kth.se/profile/'
-            offset_to_name=url_p.find(pattern)
-            if offset_to_name >= 0:
-                name=url_p[offset_to_name+len(pattern):]
-                user_info=get_user_by_name(name)
-                if type(user_info) is not dict:
-                    print("name={0} type is {1}".format(name, type(user_info)))
-                    continue
-                #print("{0}:{1}".format(name, user_info))
-                # entry=dict()
-                # if user_info.get('kthId'):
-                #     entry['kthId']=user_info['kthId']
-                # entry['username']=user_info['username']
-                # if user_info.get('title'):
-                #     entry['title']=user_info['title']
-                # if user_info.get('emailAddress'):
-                #     entry['emailAddress']=user_info['emailAddress']
-                
-                # if user_info['researcher']:
-                #     entry['researchGate']=user_info['researcher'].get('researchGate')
-                #     entry['googleScholarId']=user_info['researcher'].get('googleScholarId')
-                #     entry['scopusId']=user_info['researcher'].get('scopusId')
-                #     entry['researcherId']=user_info['researcher'].get('researcherId')
-                # if user_info['courses']:
-                #     c_user_info=[]
-                #     for c in user_info['courses']:
-                #         if user_info['courses'].get('code'):
-                #             c_user_info.append({user_info['courses']['code']: user_info['courses']['roles']})
-                #     entry['courses']=c_user_info
-                personnel[dept].append(user_info)
-
-    # for dept in depts:
-    #     print("personnel[dept]={}".format(personnel[dept]))
+    if args['url']:
+        depts={sheet_name_for_url(url): url for url in args['url']}
 
     writer = pd.ExcelWriter('personnel.xlsx', engine='xlsxwriter')
-    for dept in depts:
-        personnel_df=pd.json_normalize(personnel[dept])
-        personnel_df.to_excel(writer, sheet_name=dept)
-
-    # Close the Pandas Excel writer and output the Excel file.
-    writer.save()
+    try:
+        failures=crawl_departments(depts, writer, args['workers'])
+    finally:
+        # Close the Pandas Excel writer and output the Excel file.
+        writer.close()
+    if failures:
+        print("{} directory pages or profiles could not be fetched".format(failures))
 
 if __name__ == '__main__':
     sys.exit(main(sys.argv[1:]))
-
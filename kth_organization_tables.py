@@ -0,0 +1,1543 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# kth_organization_tables.py
+#
+# Purpose: The static tables of KTH's schools (L1), departments (L2), and divisions (L3) and of DiVA's
+#          subject area codes, together with reverse indexes for looking up entries by name or DiVA id.
+#
+# These tables used to be copied into each program and searched with nested loops for every lookup.
+# Now they are defined once here and the reverse indexes are built when the module is imported, so that
+# the lookups (which are done several times per author and examiner in each MODS record) are dict lookups.
+#
+# Usage (from another program):
+#   from kth_organization_tables import schools_info, departments_info, subject_area_codes_diva
+#   from kth_organization_tables import schools_acronym, departments_acronym, lookup_subject_area_eng, ...
+#
+# Note that when a name or id occurs more than once in a table, the index keeps the first entry - as the
+# loops that it replaces returned the first match.
+#
+# 2026-10-18
+#
+
+schools_info={'ABE': {'L1': "5850",
+                      'swe': 'Skolan för Arkitektur och samhällsbyggnad',
+                      'eng': 'School of Architecture and the Built Environment'},
+              'ITM': {'L1': "6023",
+                      'swe': 'Skolan för Industriell teknik och management',
+                      'eng': 'School of Industrial Engineering and Management'},
+              'SCI': {'L1': "6091",
+                      'swe': 'Skolan för Teknikvetenskap',
+                      'eng': 'School of Engineering Sciences'},
+              'CBH': {'L1': "879224",
+                      'swe': 'Skolan för Kemi, bioteknologi och hälsa',
+                      'eng': 'School of Engineering Sciences in Chemistry, Biotechnology and Health'},
+              'EECS': {'L1': "879223",
+                       'swe': 'Skolan för Elektroteknik och datavetenskap',
+                      'eng': 'School of Electrical Engineering and Computer Science'}
+              }
+
+# Here departments are a level L2
+# departments_info={
+#     'ABE': {
+#         'ARCH': {'swe': 'Arkitektur',
+#                  'eng': 'Architecture'},
+#         'BYV': {'swe': 'Byggvetenskap',
+#              'eng': 'Civil and Architectural Engineering'},
+#         'PHILHIST': {'swe': 'Filosofi och historia',
+#                      'eng': 'Philosophy and History'},
+#         'FOB': {'swe': 'Fastigheter och byggande',
+#                 'eng': 'Real Estate and Construction Management'},
+#         'SEED': {'swe': 'Hållbar utveckling, miljövetenskap och teknik',
+#                  'eng': 'Sustainable development, environmental science and engineering'},
+#         'SOM': {'swe': 'Samhällsplanering och miljö',
+#              'eng': 'Urban Planning and Environment'}
+#     },
+#     'ITM': {
+#         'EGI': {'swe': 'Energiteknik',
+#                 'eng': 'Energy Technology'},
+#         'INDEK': {'swe': 'Industriell ekonomi och organisation',
+#                   'eng': 'Industrial Economics and Management'},
+#         'Learning': {'swe': 'Lärande', # could not find an acronym for this department
+#                      'eng': 'Learning'},
+#         'MMK': {'swe': 'Maskinkonstruktion',
+#                 'eng': 'Machine Design'},
+#         'MSE': {'swe': 'Materialvetenskap',
+#                 'eng': 'Materials Science and Engineering'},
+#         'IIP': {'swe': 'Industriell produktion',
+#                 'eng': 'Production Engineering'},
+#         'HPU': {'swe': 'Hållbar produktionsutveckling',
+#                 'eng': 'Sustainable Production Development'}
+#     },
+#     'SCI': {
+#         #  could not find an acronym
+#         'Fysikinstitutionen': {'swe': 'Fysik',
+#                                'eng': 'Physics'},
+#         'MATH': {'swe': 'Matematik',
+#                  'eng': 'Mathematics'},
+#         'TEKMEK': {'swe': 'Teknisk mekanik',
+#                    'eng': 'Engineering Mechanics'},
+#         'APHYS': {'swe': 'Tillämpad fysik',
+#                   'eng': 'Applied physics'}
+#     },
+#     'CBH': {
+#         'MTH': {'swe': 'Medicinsk teknik och hälsosystem',
+#                 'eng': 'Biomedical Engineering and Health Systems'},
+#         'CHE': {'swe': 'Chemistry',
+#                 'eng': 'Kemi'},
+#         'KET': {'swe': 'Kemiteknik',
+#                 'eng': 'Chemical Engineering'},
+#         'FPT': {'swe': 'Fiber- och polymerteknologi',
+#                 'eng': 'Fibre and Polymer Technology'},
+#         'GTE': {'swe': 'Genteknologi',
+#                 'eng': 'Gene Technology'},
+#         'DIB': {'swe': 'Industriell bioteknologi',
+#                 'eng': 'Industrial Biotechnology'},
+#         'IIP': {'swe': 'Ingenjörspedagogik',
+#                 'eng': 'Engineering Pedagogics'},
+#         'PRO': {'swe': 'Proteinvetenskap',
+#                 'eng': 'Protein Science'},
+#         'TCB': {'swe': 'Teoretisk kemi och biologi',
+#                 'eng': 'Theoretical Chemistry and Biology'}
+#         },
+#         'EECS': {
+#             'CS': {'swe': 'Datavetenskap',
+#                    'eng': 'Computer Science'},
+#             'EE': {'swe': 'Elektroteknik',
+#                    'eng': 'Electrical Engineering'},
+#             'HCT': {'swe': 'Människocentrerad teknologi',
+#                     'eng': 'Human Centered Technology'},
+#             'IS':  {'swe': 'Intelligenta system',
+#                     'eng': 'Intelligent Systems'}
+#         }
+# }
+
+departments_info={
+    'ABE': {
+        'ARCH': {'L2': "5851",
+                 'swe': 'Arkitektur',
+                 'eng': 'Architecture',
+                 'divisions': {'Q1a': {'L3': '5852',
+                                       'swe': 'Arkitekturens historia och teori',
+                                       'eng': 'History and Theory of Architecture'
+                                       },
+                               'Q1b': {'L3': '5853',
+                                       'swe': 'Arkitektonisk gestaltning',
+                                       'eng': 'Architectural Design'
+                                       },
+                               'Q1c': {'L3': '5854',
+                                       'swe': 'Arkitekturteknik',
+                                       'eng': 'Architectural Technologies'
+                                       },
+                               'Q1d': {'L3': '5855',
+                                       'swe': 'Kritiska studier i arkitektur',
+                                       'eng': 'Critical Studies in Architecture'
+                                       },
+                               'Q1e': {'L3': '5856',
+                                       'swe': 'Stadsbyggnad',
+                                       'eng': 'Urban Design'
+                                       },
+                               'Q1f': {'L3': '876913',
+                                       'swe': 'Ljusdesign',
+                                       'eng': 'Lighting Design'
+                                       },
+                               },
+                 },
+        'BYV':  {'L2': "5857",
+                 'swe': 'Byggvetenskap',
+                 'eng': 'Civil and Architectural Engineering',
+                 'divisions': {'betong': {'L3': '5861',
+                                          'swe': 'Betongbyggnad',
+                                          'eng': 'Concrete Structures'
+                                          },
+                               'bro-och-stalbyggnad': {'L3': '10153',
+                                                       'swe': 'Bro- och stålbyggnad',
+                                                       'eng': 'Structural Engineering and Bridges'
+                                                       },
+                               'byggteknik-och-design': {'L3': '5867',
+                                                         'swe': 'Byggteknik och design',
+                                                         'eng': 'Building Technology and Design'
+                                                         },
+                               'byggtnadseknik-och-design': {'L3': '5859',
+                                                             'swe': 'Byggnadsteknik',
+                                                             'eng': 'Building Technology'
+                                                             },
+                               'byggnadsmaterial': {'L3': '5860',
+                                                    'swe': 'Byggnadsmaterial',
+                                                    'eng': 'Building Materials'
+                                                    },
+                               'hallbara-byggnader': {'L3': '881151',
+                                                      'swe': 'Hållbara byggnader',
+                                                      'eng': 'Sustainable Buildings'
+                                                      },
+                               'jord-o-bergmekanik': {'L3': '5864',
+                                                      'swe': 'Jord- och bergmekanik',
+                                                      'eng': 'Soil and Rock Mechanics'},
+
+                                   'transportvetenskap': {'L3': '881700',
+                                                          'swe': 'Transportplanering',
+                                                          'eng': 'Transport planning'},
+                               'Q1g': {'L3': '5862',
+                                       'swe': 'Miljö- och resursinformation',
+                                       'eng': 'Environmental and Natural Resources Information System'},
+                               'Q1h': {'L3': '5865',
+                                       'swe': 'Stålbyggnad',
+                                       'eng': 'Steel Structures'},
+                               },
+                 },
+        'PHILHIST': { 'phil': {'L2': '5874',
+                               'swe': 'Filosofi',
+                               'eng': 'Philosophy'
+                               },
+                      'historia': {'L2': '14702',
+                                   'swe': 'Historiska studier av teknik, vetenskap och miljö',
+                                   'eng': 'History of Science, Technology and Environment'},
+                     },
+        'FOB': {'L2': "5869",
+                'swe': 'Fastigheter och byggande',
+                'eng': 'Real Estate and Construction Management',
+                'divisions': {'fastighetsvetenskap': {'L3': '5871',
+                                                      'swe': 'Fastighetsvetenskap',
+                                                      'eng': 'Real Estate Planning and Land Law'},
+                              'geo': {'L3': '879656',
+                                      'swe': 'Geodesi och satellitpositionering',
+                                      'eng': 'Geodesy and Satellite Positioning'},
+                              'fastighetsekonomi-och-finans': {'L3': '882950',
+                                                               'swe': 'Fastighetsekonomi och finans',
+                                                               'eng': 'Real Estate Economics and Finance'},
+                              'fastighetsforetagande-och-finansiella-system': {'L3': '882951',
+                                                                               'swe': 'Fastighetsföretagande och finansiella system',
+                                                                               'eng': 'Real Estate Business and Financial Systems'},
+                              'ledning-och-organisering-i-byggande-och-forvaltning': {'L3': '882952',
+                                                                                      'swe': 'Ledning och organisering i byggande och förvaltning',
+                                                                                      'eng': 'Construction and Facilities Management'},
+                              }
+                },
+        'SEED': { 'L2': "13604",
+                  'swe': 'Hållbar utveckling, miljövetenskap och teknik',
+                  'eng': 'Sustainable development, Environmental science and Engineering',
+                  'divisions': {
+                      'Q1ö': {'L3': '878258',
+                              'swe': 'Hållbarhet och miljöteknik',
+                              'eng': 'Sustainability and Environmental Engineering'},
+                      'hallbarhet-utvardering-och-styrning': {'L3': '878259',
+                                                              'swe': 'Hållbarhet, utvärdering och styrning',
+                                                              'eng': 'Sustainability Assessment and Management'},
+                      'strategiska-hallbarhetsstudier': {'L3': '878260',
+                                                         'swe': 'Strategiska hållbarhetsstudier',
+                                                         'eng': 'Strategic Sustainability Studies'},
+                      'vatten-och-miljoteknik': {'L3': '878261',
+                                                 'swe': 'Vatten- och miljöteknik',
+                                                 'eng': 'Water and Environmental Engineering'},
+                      'resurser-energi-och-infrastruktur': {'L3': '878262',
+                                                            'swe': 'Resurser, energi och infrastruktur',
+                                                            'eng': 'Resources, Energy and Infrastructure'},
+                  }
+                 },
+        'SOM': {'L2': "5884",
+                'swe': 'Samhällsplanering och miljö',
+                'eng': 'Urban Planning and Environment',
+                'divisions': {'urbana-studier': {'L3': '5885',
+                                                 'swe': 'Urbana och regionala studier',
+                                                 'eng': 'Urban and Regional Studies'},
+                              'gis': {'L3': '872751',
+                                      'swe': 'Geoinformatik',
+                                      'eng': 'Geoinformatics'},
+                              'sek': {'L3': '885102',
+                                      'swe': 'Transport och systemanalys',
+                                      'eng': 'Transport and Systems Analysis'},
+                              }
+                }
+    },
+    'ITM': {
+        'EGI': {'L2': "6024",
+                'swe': 'Energiteknik',
+                'eng': 'Energy Technology',
+                'divisions': {'Energisystem': {'L3': '883952',
+                                               'swe': 'Energisystem',
+                                               'eng': 'Energy Systems'},
+                              'heat-and-power-technology': {'L3': '6026',
+                                                            'swe': 'Kraft- och värmeteknologi',
+                                                            'eng': 'Heat and Power Technology'},
+                              'applied-thermodynamics': {'L3': '6025',
+                                                         'swe': 'Tillämpad termodynamik och kylteknik',
+                                                         'eng': 'Applied Thermodynamics and Refrigeration'},
+                              }
+                },
+        'INDEK': {'L2': "6030",
+                  'swe': 'Industriell ekonomi och organisation (Inst.)',
+                  'eng': 'Industrial Economics and Management (Dept.)',
+                  'divisions': {
+                      'MT': {'L3': '883956',
+                             'swe': 'Management & Teknologi',
+                             'eng': 'Management & Technology'},
+                      'SIDE': {'L3': '883957',
+                               'swe': 'Hållbarhet, Industriell dynamik & entreprenörskap',
+                               'eng': 'Sustainability, Industrial Dynamics & Entrepreneurship'},
+                      'AFC': {'L3': '883958',
+                              'swe': 'Redovisning, Finansiering & Förändring',
+                              'eng': 'Accounting, Finance & Changes'},
+                  }
+                  },
+        'Learning': {'L2': "879306",
+                     'swe': 'Lärande',
+                     'eng': 'Learning',
+                     'divisions': {'DL': {'L3': '883959',
+                                          'swe': 'Digitalt lärande"',
+                                          'eng': 'Digital Learning'},
+                                   'STEM': {'L3': '883960',
+                                            'swe': 'Lärande i Stem',
+                                            'eng': 'Learning in Stem'},
+                                   'sprak': {'L3': '883961',
+                                             'swe': 'Språk och kommunikation',
+                                             'eng': 'Language and communication'},
+                                   'VH': {'L3': '883962', # # this is a center
+                                          'swe': 'Vetenskapens hus',
+                                          'eng': 'House of Science'},
+                                   }
+                     },
+        'MMK': {'L2': "6038",
+                'swe': 'Maskinkonstruktion (Inst.)',
+                'eng': 'Machine Design (Dept.)',
+                'divisions': {'Q1i': {'L3': '6039',
+                                      'swe': 'Integrerad produktutveckling',
+                                      'eng': 'Integrated Product Development'},
+                              'Förbränningsmotorteknik': {'L3': '6040',
+                                                          'swe': 'Förbränningsmotorteknik',
+                                                          'eng': 'Internal Combustion Engines'},
+                              'mechatronics': {'L3': '6041',
+                                               'swe': 'Mekatronik',
+                                               'eng': 'Mechatronics'},
+                              'SKD': {'L3': '-1', # does not have a LADOK code 
+                                      'swe': 'System- och komponentdesign',
+                                      'eng': 'Systems and Component Design'},
+                              'Tribologi': {'L3': '6047',
+                                            'swe': 'Tribologi',
+                                            'eng': 'Tribologi'},
+                              'machine-elements': {'L3': '6043',
+                                                   'swe': 'Maskinelement',
+                                                   'eng': 'Machine Elements'},
+                              'Q1j': {'L3': '6042',
+                                      'swe': 'Inbyggda styrsystem',
+                                      'eng': 'Embedded Control Systems'},
+
+                                   'Q1k': {'L3': '6044',
+                                           'swe': 'Maskinkonstruktion (Avd.)',
+                                           'eng': 'Machine Design (Div.)'},
+                              'Q1l': {'L3': '6045',
+                                      'swe': 'Produktinnovationsteknik',
+                                      'eng': 'Product Innovation Technology'},
+                              'Q1m': {'L3': '6046',
+                                      'swe': 'Produkt- och tjänstedesign',
+                                      'eng': 'Product and Service Design'},
+                              }
+                },
+        'MSE': {'L2': '6048',
+                'swe': 'Materialvetenskap',
+                'eng': 'Materials Science and Engineering',
+                'divisions': {'process': {'L3': '883963',
+                                          'swe': 'Processer',
+                                          'eng': 'Process'},
+                              'structures': {'L3': '883964',
+                                             'swe': 'Strukturer',
+                                             'eng': 'Structures'},
+                              'properties': {'L3': '883965',
+                                             'swe': 'Egenskaper',
+                                             'eng': 'Properties'},
+                              }
+                },
+        'IIP': {'L2': '6061',
+                'swe': 'Industriell produktion',
+                'eng': 'Production Engineering',
+                'divisions': {'Q1n': {'L3': '883600',
+                                      'swe': 'Tillverkning och mätsystem',
+                                      'eng': 'Manufacturing and Metrology Systems'},
+                              'Q1o': {'L3': '883601',
+                                      'swe': 'Hållbara produktionssystem',
+                                      'eng': 'Sustainable Production Systems'},
+                              'Q1p': {'L3': '883608',
+                                      'swe': 'Digital smart produktion',
+                                      'eng': 'Digital Smart Production'},
+                              }
+                },
+        'HPU': {'L2': '880900',
+                'swe': 'Hållbar produktionsutveckling (ML)',
+                'eng': 'Sustainable production development',
+                'divisions': {'Production Management': {'L3': '883953',
+                                                        'swe': 'Processledning och hållbar produktion',
+                                                        'eng': 'Process management and sustainable production'},
+                              'Production Logistics': {'L3': '883955',
+                                                       'swe': 'Avancerad underhållsteknik och produktionslogistik',
+                                                       'eng': 'Advanced maintenance technology and production logistics'},
+                              # Industrial Dependability
+                        }
+                }
+    },
+    'SCI': {
+        'Fysik': {'L2': '6128',
+                  'swe': 'Fysik',
+                  'eng': 'Physics',
+                  'divisions': {'Q1q': {'L3': '6129',
+                                        'swe': 'Atom- och molekylfysik',
+                                        'eng': 'Atomic and Molecular Physics'},
+                                'MI': {'L3': '6130',
+                                       'swe': 'Medicinsk bildfysik',
+                                       'eng': 'Physics of Medical Imaging'},
+                                'nuclear': {'L3': '6131',
+                                            'swe': 'Kärnfysik',
+                                            'eng': 'Nuclear Physics'},
+                                'NPS': {'L3': '6132',
+                                        'swe': 'Kärnkraftssäkerhet',
+                                        'eng': 'Nuclear Power Safety'},
+                                'particle': {'L3': '6133',
+                                             'swe': 'Partikel- och astropartikelfysik',
+                                             'eng': 'Particle and Astroparticle Physics'},
+                                'condensed': {'L3': '876906',
+                                              'swe': 'Kondenserade materiens teori',
+                                              'eng': 'Condensed Matter Theory'},
+                                'Q1r': {'L3': '876907',
+                                        'swe': 'Matematisk fysik',
+                                        'eng': 'Mathematical Physics'},
+                                'Q1s': {'L3': '876908',
+                                        'swe': 'Materialteori',
+                                        'eng': 'Theory of Materials'},
+                                'Q1t': {'L3': '876909',
+                                        'swe': 'Statistisk fysik',
+                                        'eng': 'Statistical Physics'},
+                                'Q1u': {'L3': '876910',
+                                        'swe': 'Teoretisk biologisk fysik',
+                                        'eng': 'Theoretical Biological Physics'},
+                                'Q1v': {'L3': '876911',
+                                        'swe': 'Teoretisk partikelfysik',
+                                        'eng': 'Theoretical Particle Physics'},
+                                'NE': {'L3': '880050',
+                                       'swe': 'Kärnenergiteknik',
+                                       'eng': 'Nuclear Engineering'},
+                                'Q1w': {'L3': '880100',
+                                        'swe': 'Reaktorfysik och teknologi',
+                                        'eng': 'Reactor physics and technology'},
+                                }
+                  },
+        'MATH': {'L2': "6115",
+                 'swe': 'Matematik (Inst.)',
+                 'eng': 'Mathematics (Dept.)',
+                 'divisions': {'math': {'L3': '6116',
+                                        'swe': 'Matematik (Avd.)',
+                                        'eng': 'Mathematics (Div.)'},
+                               'mathstat': {'L3': '6117',
+                                            'swe': 'Matematisk statistik',
+                                            'eng': 'Mathematical Statistics'},
+                               'optsys': {'L3': '6118',
+                                          'swe': 'Optimeringslära och systemteori',
+                                          'eng': 'Optimization and Systems Theory'},
+                               'NA': {'L3': '11800',
+                                      'swe': 'Numerisk analys',
+                                      'eng': 'Numerical Analysis'},
+                               }
+                 },
+        'Mekanik': {'L2': '6119',
+                    'swe': 'Mekanik',
+                    'eng': 'Mechanics'
+                    },
+        'TEKMEK': { 'L2': "882656",
+                    'swe': 'Teknisk mekanik',
+                    'eng': 'Engineering Mechanics',
+                    'divisions': {'Farkostteknik och Solidmekanik': {'L3': "882657",
+                                                                     'swe': 'Farkostteknik och Solidmekanik',
+                                                                     'eng': 'Vehicle Engineering and Solid Mechanics'},
+                                  'Strömningsmekanik och Teknisk Akustik': {'L3': '882658',
+                                                                            'swe': 'Strömningsmekanik och Teknisk Akustik',
+                                                                            'eng': 'Fluid Mechanics and Engineering Acoustics'},
+                                  }
+                   },
+        'APHYS': {'L2': '6108',
+                  'swe': 'Tillämpad fysik',
+                  'eng': 'Applied Physics',
+                  'divisions': {'biox': {'L3': '6109',
+                                         'swe': 'Biomedicinsk fysik och röntgenfysik',
+                                         'eng': 'Biomedical and X-ray Physics'},
+                                'laserphysics': {'L3': '6112',
+                                                 'swe': 'Laserfysik',
+                                                 'eng': 'Laser Physics'},
+                                'nanophysics': {'L3': '6113',
+                                                'swe': 'Nanostrukturfysik',
+                                                'eng': 'Nanostructure Physics'},
+                                'qeo': {'L3': '880051',
+                                        'swe': 'Kvant- och biofotonik',
+                                        'eng': 'Quantum and Biophotonics'},
+                                'mnp': {'L3': '880052',
+                                        'swe': 'Material- och nanofysik',
+                                        'eng': 'Materials and Nanophysics'},
+                                'photonics': {'L3': '880053',
+                                              'swe': 'Fotonik',
+                                              'eng': 'Photonics'},
+                                'biophysics': {'L3': '880054',
+                                               'swe': 'Biofysik',
+                                               'eng': 'Biophysics'},
+                                }
+                  }
+    },
+    'CBH': {
+        'MTH': {'L2': "879308",
+                'swe': 'Medicinteknik och hälsosystem',
+                'eng': 'Biomedical Engineering and Health Systems',
+                'divisions': {'biomedical-imaging': {'L3': '879320',
+                                                     'swe': 'Medicinsk avbildning',
+                                                     'eng': 'Medical Imaging'},
+                              'ergonomi': {'L3': '879322',
+                                           'swe': 'Ergonomi',
+                                           'eng': 'Ergonomics'},
+                              'grundlaggande-naturv': {'L3': '879323',
+                                                       'swe': 'Grundläggande naturvetenskap',
+                                                       'eng': 'Basic Science'},
+                              'health-informatics': {'L3': '880401',
+                                                     'swe': 'Hälsoinformatik och logistik',
+                                                     'eng': 'Health Informatics and Logistics'},
+                              'Q1x': {'L3': '880402',
+                                      'swe': 'Människa och Kommunikation',
+                                      'eng': 'Human Communication Science'},
+                              'teknisk-vardvetenska': {'L3': '880403',
+                                                       'swe': 'Teknisk vårdvetenskap',
+                                                       'eng': 'Technology in Health Care'},
+                              'omgivningsfysiologi': {'L3': '879317',
+                                                      'swe': 'Omgivningsfysiologi',
+                                                      'eng': 'Environmental Physiology'},
+                              'neuronik': {'L3': '879318',
+                                           'swe': 'Neuronik',
+                                           'eng': 'Neuronic Engineering'},
+                              '': {'L3': '879319',
+                                   'swe': 'Strukturell bioteknik',
+                                   'eng': 'Structural Biotechnology'},
+                              }
+                },
+        'CHE': {'L2': "879316",
+                'swe': 'Kemi',
+                'eng': 'Chemistry',
+                'divisions': {'orgkem': {'L3': '879324',
+                                         'swe': 'Organisk kemi',
+                                         'eng': 'Organic chemistry'},
+                              'glykovetenskap': {'L3': '879326',
+                                                 'swe': 'Glykovetenskap',
+                                                 'eng': 'Glycoscience'},
+                              'tfk': {'L3': '879359',
+                                      'swe': 'Tillämpad fysikalisk kemi',
+                                      'eng': 'Applied Physical Chemistry'},
+                              '': {'L3': '879325',
+                                   'swe': 'Yt- och korrosionsvetenskap',
+                                   'eng': 'Surface and Corrosion Science'},
+                              }
+                },
+        'KET': {'L2': "879314",
+                'swe': 'Kemiteknik',
+                'eng': 'Chemical Engineering',
+                'divisions': {'energy-processes': {'L3': '879328',
+                                                   'swe': 'Energiprocesser',
+                                                   'eng': 'Energy Processes'},
+                              'resource-recovery': {'L3': '879331',
+                                                    'swe': 'Resursåtervinning',
+                                                    'eng': 'Resource recovery'},
+                              'electrochem': {'L3': '879332',
+                                              'swe': 'Tillämpad elektrokemi',
+                                              'eng': 'Applied Electrochemistry'},
+                              'nuclear': {'L3': '-2',
+                                          'swe': 'Kärnavfallsteknik',
+                                          'eng': 'Nuclear Waste Engineering'},
+                              'Q1y': {'L3': '879327',
+                                      'swe': 'Kemisk apparatteknik',
+                                      'eng': 'Chemical Engineering'},
+                              'Q1z': {'L3': '879333',
+                                      'swe': 'Teknisk strömningslära',
+                                      'eng': 'Transport Phenomena'},
+                              'Q1å': {'L3': '879334',
+                                      'swe': 'Processteknologi',
+                                      'eng': 'Process Technology'},
+                              'Q1ä': {'L3': '879650',
+                                      'swe': 'Kemisk teknologi',
+                                      'eng': 'Chemical Technology'},
+                              }
+                },
+        'FPT': {'L2': "879315",
+                'swe': 'Fiber- och polymerteknologi',
+                'eng': 'Fibre- and Polymer Technology',
+                'divisions': {
+                    '': {'L3': '879336',
+                         'swe': 'Polymerteknologi',
+                         'eng': 'Polymer Technology'},
+                    '': {'L3': '879337',
+                         'swe': 'Polymera material',
+                         'eng': 'Polymeric Materials'},
+                    '': {'L3': '879338',
+                         'swe': 'Ytbehandlingsteknik',
+                         'eng': 'Coating Technology'},
+                    '': {'L3': '879339',
+                         'swe': 'Träkemi och massateknologi',
+                         'eng': 'Wood Chemistry and Pulp Technology'},
+                    '': {'L3': '879340',
+                         'swe': 'Fiberteknologi',
+                         'eng': 'Fibre Technology'},
+                    '': {'L3': '879341',
+                         'swe': 'Biokompositer',
+                         'eng': 'Biocomposites'},
+                }
+                },
+        'GTE': {'L2': '879312',
+                'swe': 'Genteknologi',
+                'eng': 'Gene Technology',
+                },
+        'DIB': {'L2': '879311',
+                'swe': 'Industriell bioteknologi',
+                'eng': 'Industrial Biotechnology'
+                },
+        'IIP': {'L2': '879311',
+                'swe': 'Industriell bioteknologi',
+                'eng': 'Industrial Biotechnology'
+                },
+        'PRO': {'L2': "879309",
+                'swe': 'Proteinvetenskap',
+                'eng': 'Protein Science',
+                'divisions': {'nanobio': {'L3': '879342',
+                                          'swe': 'Nanobioteknologi',
+                                          'eng': 'Nano Biotechnology'},
+                              'sysbio': {'L3': '879343',
+                                         'swe': 'Systembiologi',
+                                         'eng': 'Systems Biology'},
+                              'cellular-proteomics': {'L3': '879344',
+                                                      'swe': 'Cellulär och klinisk proteomik',
+                                                      'eng': 'Cellular and Clinical Proteomics'},
+                              'affinity-proteomics': {'L3': '879345',
+                                                      'swe': 'Affinitets-proteomik',
+                                                      'eng': 'Affinity Proteomics'},
+                              'prot-tech': {'L3': '879346',
+                                            'swe': 'Proteinteknologi',
+                                            'eng': 'Protein Technology'},
+                              'proteineng': {'L3': '879347',
+                                             'swe': 'Proteinvetenskap',
+                                             'eng': 'Protein Engineering'},
+                              'drug-discovery': {'L3': '879348',
+                                                 'swe': 'Läkemedelsutveckling',
+                                                 'eng': 'Drug Discovery and Development'},
+                              }
+                },
+        'TCB': {'L2': '879310',
+                'swe': 'Teoretisk kemi och biologi',
+                'eng': 'Theoretical Chemistry and Biology',
+                'divisions': {
+
+                        }
+                }
+    },
+    'EECS': {
+        'CS': { 'L2': "882650",
+                'swe': 'Datavetenskap',
+                'eng': 'Computer Science',
+                'divisions': {'CoS': {'L3': '879305',
+                                      'swe': 'Kommunikationssystem',
+                                      'eng': 'Communication Systems'
+                                      },
+                              'CST': {'L3': '879225',
+                                      'swe': 'Beräkningsvetenskap och beräkningsteknik',
+                                      'eng': 'Computational Science and Technology'
+                                      },
+                              'NSE': {'L3': '879231',
+                                      'swe': 'Nätverk och systemteknik',
+                                      'eng': 'Network and Systems Engineering'
+                                      },
+                              'SCS': {'L3': '879232',
+                                      'swe': 'Programvaruteknik och datorsystem',
+                                      'eng': 'Software and Computer systems'
+                                      },
+                              'TCS': {'L3': '879237',
+                                      'swe': 'Teoretisk datalogi',
+                                      'eng': 'Theoretical Computer Science'
+                                      },
+                              }
+               },
+        'EE': {'L2': '882654',
+               'swe': 'Elektroteknik',
+               'eng': 'Electrical Engineering',
+               'divisions': {'EME': {'L3': '879226',
+                                     'swe': 'Elektroteknisk teori och konstruktion',
+                                     'eng': 'Electromagnetic Engineering'
+                                     },
+                             'EPE': {'L3': '879227',
+                                     'swe': 'Elkraftteknik',
+                                     'eng': 'Electric Power and Energy Systems'
+                                     },
+                             'EES': {'L3': '879249',
+                                     'swe': 'Elektronik och inbyggda system',
+                                     'eng': 'Electronics and Embedded systems'},
+                             'FPP': {'L3': '879228',
+                                     'swe': 'Fusionsplasmafysik',
+                                     'eng': 'Fusion Plasma Physics'
+                                     },
+                             'SPP': {'L3': '879235',
+                                     'swe': 'Rymd- och plasmafysik',
+                                     'eng': 'Space and Plasma Physics'
+                                     },
+
+                                 }
+               },
+        'IS':  {'L2': '882651',
+                'swe': 'Intelligenta system',
+                'eng': "Intelligent systems",
+                'divisions': {'MNS': {'L3': '879230',
+                                      'swe': 'Mikro- och nanosystemteknik',
+                                      'eng': 'Micro and Nanosystems'
+                                      },
+                              'AC': {'L3': '879233',
+                                     'swe': 'Reglerteknik',
+                                     'eng': 'Decision and Control Systems (Automatic Control)'
+                                     },
+                              'RPL': {'L3': '879234',
+                                      'swe': 'Robotik, perception och lärande',
+                                      'eng': 'Robotics, Perception and Learning'
+                                      },
+                              'ISE': {'L3': '879236',
+                                      'swe': 'Teknisk informationsvetenskap',
+                                      'eng': 'Information Science and Engineering'
+                                      },
+                              'TMH': {'L3': '879302',
+                                      'swe': 'Tal, musik och hörsel',
+                                      'eng': 'Speech, Music and Hearing'
+                                      },
+                              'CAS': {'L3': '882655',
+                                      'swe': 'Collaborative Autonomous Systems',
+                                      'eng': 'Collaborative Autonomous Systems'
+                                      },
+                              }
+                },
+        'HCT': {'L2': '882653',
+                'swe': 'Människocentrerad teknologi',
+                'eng': 'Human Centered Technology',
+                'divisions': {'MID': {'L3': '879229',
+                                      'swe': 'Medieteknik och interaktionsdesign',
+                                      'eng': 'Media Technology and Interaction Design'
+                                      }
+                              },
+                },
+
+        }
+}
+
+# Subject/course codes
+subject_area_codes_diva={
+    '10260': {'eng': 'Accelerator Technique',
+              'swe': 'Acceleratorteknik'
+              },
+    '10306': {'eng': 'Aeronautical Engineering',
+              'swe': 'Flygteknik'
+              },
+    '10261': {'eng': 'Analytical Chemistry',
+              'swe': 'Analytisk kemi'
+              },
+    '10262': {'eng': 'Antenna Systems Technology',
+              'swe': 'Antennsystemteknik'
+              },
+    '10423': {'eng': 'Applied Information Technology',
+              'swe': 'Tillämpad informationsteknik'
+              },
+    '10424': {'eng': 'Applied Logistics',
+              'swe': 'Tillämpad logistik'
+              },
+    '10426': {'eng': 'Applied Material Physics',
+              'swe': 'Tillämpad materialfysik'
+              },
+    '10427': {'eng': 'Applied Materials Technology',
+              'swe': 'Tillämpad materialteknologi'
+              },
+    '10425': {'eng': 'Applied Mathematical Analysis',
+              'swe': 'Tillämpad matematisk analys'
+              },
+    '28053': {'eng': 'Applied Mathematics and Industrial Economics',
+              'swe': 'Tillämpad matematik och industriell ekonomi'
+              },
+    '10422': {'eng': 'Applied Physics',
+              'swe': 'Tillämpad fysik'
+              },
+    '10428': {'eng': 'Applied Process Metallurgy',
+              'swe': 'Tillämpad processmetallurgi'
+              },
+    '10369': {'eng': 'Applied Thermodynamics',
+              'swe': 'Mekanisk värmeteori'
+              },
+    '10429': {'eng': 'Applied Thermodynamics',
+              'swe': 'Tillämpad termodynamik'
+              },
+    '10258': {'eng': 'Architectural Lighting Design and Health',
+              'swe': 'Ljusdesign och hälsa'
+              },
+    '10349': {'eng': 'Architectural Lighting Design',
+              'swe': 'Ljusdesign'
+              },
+    '10264': {'eng': 'Architecture',
+              'swe': 'Arkitektur'
+              },
+    '10397': {'eng': 'Automatic Control',
+              'swe': 'Reglerteknik'
+              },
+    '10269': {'eng': 'Biocomposites',
+              'swe': 'Biokompositer'
+              },
+    '10410': {'eng': 'Biomechanics',
+              'swe': 'Teknik i vården, biomekanik'
+              },
+    '10270': {'eng': 'Biomedical Engineering',
+              'swe': 'Biomedicinsk teknik'
+              },
+    '10253': {'eng': 'Biotechnology',
+              'swe': 'Bioteknologi'
+              },
+    '10271': {'eng': 'Biotechnology',
+              'swe': 'Bioteknik'
+              },
+    '10273': {'eng': 'Building and Real Estate Economics',
+              'swe': 'Bygg- och fastighetsekonomi'
+              },
+    '10484': {'eng': 'Building Design',
+              'swe': 'Projektering'
+              },
+    '10275': {'eng': 'Building Materials',
+              'swe': 'Byggnadsmateriallära'
+              },
+    '10471': {'eng': 'Building Services Engineering and Energy',
+              'swe': 'Installationsteknik och energi'
+              },
+    '10277': {'eng': 'Building Technology',
+              'swe': 'Byggnadsteknik'
+              },
+    '10449': {'eng': 'Building Technology',
+              'swe': 'Byggteknik'
+              },
+    '10266': {'eng': 'Built Environment Analysis',
+              'swe': 'Bebyggelseanalys'
+              },
+    '10485': {'eng': 'Built Environment',
+              'swe': 'Samhällsbyggnad'
+              },
+    '10371': {'eng': 'Casting of Metals',
+              'swe': 'Metallernas gjutning'
+              },
+    '10336': {'eng': 'Ceramic Materials',
+              'swe': 'Keramiska material'
+              },
+    '10337': {'eng': 'Ceramics',
+              'swe': 'Keramteknologi'
+              },
+    '10335': {'eng': 'Chemical Engineering',
+              'swe': 'Kemiteknik'
+              },
+    '10472': {'eng': 'Chemical Science and Engineering',
+              'swe': 'Kemivetenskap'
+              },
+    '10344': {'eng': 'Circuit Electronics',
+              'swe': 'Kretselektronik'
+              },
+    '10481': {'eng': 'Civil Engineering Management',
+              'swe': 'Produktionsteknik'
+              },
+    '10338': {'eng': 'Communication Networks',
+              'swe': 'Kommunikationsnät'
+              },
+    '10340': {'eng': 'Communication Theory',
+              'swe': 'Kommunikationsteori'
+              },
+    '10339': {'eng': 'Communications Systems',
+              'swe': 'Kommunikationssystem'
+              },
+    '10420': {'eng': 'Computational Thermodynamics',
+              'swe': 'Termodynamisk modellering'
+              },
+    '10279': {'eng': 'Computer and Systems Sciences',
+              'swe': 'Data- och systemvetenskap'
+              },
+    '10281': {'eng': 'Computer Communication',
+              'swe': 'Datorkommunikation'
+              },
+    '10452': {'eng': 'Computer Engineering with Business Economics',
+              'swe': 'Datateknik med ekonomi'
+              },
+    '10453': {'eng': 'Computer Engineering with Industrial Economy',
+              'swe': 'Datateknik med industriell ekonomi'
+              },
+    '10460': {'eng': 'Computer Networks and Communication',
+              'swe': 'Datornätverk och kommunikation'
+              },
+    '10282': {'eng': 'Computer Networks',
+              'swe': 'Datornätverk'
+              },
+    '10459': {'eng': 'Computer Networks',
+              'swe': 'Datornät'
+              },
+    '10280': {'eng': 'Computer Science',
+              'swe': 'Datalogi'
+              },
+    '10280': {'eng': 'Computer Science and Engineering',
+              'swe': 'Datalogi'
+              },
+    '10283': {'eng': 'Computer Systems',
+              'swe': 'Datorsystem'
+              },
+    '10454': {'eng': 'Computer Technology and Graphic Programming',
+              'swe': 'Datateknik och grafikprogrammering'
+              },
+    '10456': {'eng': 'Computer Technology and Real Time Programming',
+              'swe': 'Datateknik och realtidsprogrammering'
+              },
+    '10455': {'eng': 'Computer Technology and Software Engineering',
+              'swe': 'Datateknik och programutveckling'
+              },
+    '10457': {'eng': 'Computer Technology, Networks and Security',
+              'swe': 'Datateknik, nätverk och säkerhet'
+              },
+    '10458': {'eng': 'Computer Technology, Program- and System Development',
+              'swe': 'Datateknik, program- och systemutveckling'
+              },
+    '10268': {'eng': 'Concrete Structures',
+              'swe': 'Betongbyggnad'
+              },
+    '10341': {'eng': 'Condensed Matter Physics',
+              'swe': 'Kondenserade materiens fysik'
+              },
+    '10274': {'eng': 'Construction Management and Economics',
+              'swe': 'Byggandets organisation och ekonomi'
+              },
+    '10278': {'eng': 'Construction Management',
+              'swe': 'Byggprojektledning'
+              },
+    '10448': {'eng': 'Constructional Design',
+              'swe': 'Byggdesign'
+              },
+    '10450': {'eng': 'Constructional Engineering and Design with Business Economics',
+              'swe': 'Byggteknik och design med ekonomi'
+              },
+    '10451': {'eng': 'Constructional Engineering and Design',
+              'swe': 'Byggteknik och design'
+              },
+    '10342': {'eng': 'Corrosion Science',
+              'swe': 'Korrosionslära'
+              },
+    '10284': {'eng': 'Design and Building',
+              'swe': 'Design och byggande'
+              },
+    '10445': {'eng': 'Design and Product Development',
+              'swe': 'Design och produktframtagning'
+              },
+    '10446': {'eng': 'Design and Vehicle Engineering',
+              'swe': 'Farkostteknik'
+              },
+    '10285': {'eng': 'Discrete Mathematics',
+              'swe': 'Diskret matematik'
+              },
+    '10257': {'eng': 'Economics of Innovation and Growth',
+              'swe': 'Innovations- och tillväxtekonomi'
+              },
+    '10289': {'eng': 'Electric Power Systems',
+              'swe': 'Elektriska energisystem'
+              },
+    '10463': {'eng': 'Electrical Engineering with Industrial Economy',
+              'swe': 'Elektroteknik med industriell ekonomi'
+              },
+    '10295': {'eng': 'Electrical Engineering',
+              'swe': 'Elektroteknik'
+              },
+    '10290': {'eng': 'Electrical Machines and Drives',
+              'swe': 'Elektriska maskiner och drivsystem'
+              },
+    '10291': {'eng': 'Electrical Machines and Power Electronic',
+              'swe': 'Elektriska maskiner och kraftelektronik'
+              },
+    '10287': {'eng': 'Electrical Measurements',
+              'swe': 'Elektrisk mätteknik'
+              },
+    '10288': {'eng': 'Electrical Plant Engineering',
+              'swe': 'Elektriska anläggningar'
+              },
+    '10292': {'eng': 'Electroacoustics',
+              'swe': 'Elektroakustik'
+              },
+    '10418': {'eng': 'Electromagnetic Theory',
+              'swe': 'Teoretisk elektroteknik'
+              },
+    '10294': {'eng': 'Electronic System Design',
+              'swe': 'Elektroniksystemkonstruktion'
+              },
+    '10293': {'eng': 'Electronic- and Computer Systems',
+              'swe': 'Elektronik- och datorsystem'
+              },
+    '10461': {'eng': 'Electronics and Communications',
+              'swe': 'Elektronik och kommunikation'
+              },
+    '10462': {'eng': 'Electronics Design',
+              'swe': 'Elektronikkonstruktion'
+              },
+    '10466': {'eng': 'Embedded System Design',
+              'swe': 'Inbyggda system'
+              },
+    '10296': {'eng': 'Energy and Climate Studies',
+              'swe': 'Energi och klimatstudier'
+              },
+    '10297': {'eng': 'Energy and Furnace Technology',
+              'swe': 'Energi- och ugnsteknik'
+              },
+    '10298': {'eng': 'Energy Processes',
+              'swe': 'Energiprocesser'
+              },
+    '10251': {'eng': 'Energy Technology',
+              'swe': 'Energiteknik'
+              },
+    '10487': {'eng': 'Engineering and Management',
+              'swe': 'Teknik och management'
+              },
+    '10415': {'eng': 'Engineering Material Physics',
+              'swe': 'Teknisk materialfysik'
+              },
+    '10488': {'eng': 'Engineering Physics',
+              'swe': 'Teknisk fysik'
+              },
+    '10255': {'eng': 'Entrepreneurship and Innovation Management',
+              'swe': 'Entreprenörskap och innovationsledning'
+              },
+    '10376': {'eng': 'Environmental Assessment',
+              'swe': 'Miljöbedömning'
+              },
+    '10377': {'eng': 'Environmental Strategies',
+              'swe': 'Miljöstrategisk analys'
+              },
+    '10300': {'eng': 'Ergonomics',
+              'swe': 'Ergonomi'
+              },
+    '10447': {'eng': 'Facilities for Infrastructure',
+              'swe': 'Anläggningar för infrastruktur'
+              },
+    '10304': {'eng': 'Fiber Technology',
+              'swe': 'Fiberteknologi'
+              },
+    '10464': {'eng': 'Finance',
+              'swe': 'Finans'
+              },
+    '28052': {'eng': 'Financial Mathematics',
+              'swe': 'Finansiell matematik'
+              },
+    '10402': {'eng': 'Fluid Mechanics',
+              'swe': 'Strömningsmekanik'
+              },
+    '10316': {'eng': 'Foundry Technology',
+              'swe': 'Gjuteriteknik'
+              },
+    '10309': {'eng': 'Fusion Plasma Physics',
+              'swe': 'Fusionsplasmafysik'
+              },
+    '10314': {'eng': 'Geodesy',
+              'swe': 'Geodesi'
+              },
+    '10315': {'eng': 'Geoinformatics',
+              'swe': 'Geoinformatik'
+              },
+    '10317': {'eng': 'Ground Water Chemistry',
+              'swe': 'Grundvattenkemi'
+              },
+    '10440': {'eng': 'Heat Transfer',
+              'swe': 'Värmetransporter'
+              },
+    '10435': {'eng': 'Heating and Ventilating Technology',
+              'swe': 'Uppvärmnings- och ventilationsteknik'
+              },
+    '10321': {'eng': 'High Voltage Engineering',
+              'swe': 'Högspänningsteknik'
+              },
+    '10439': {'eng': 'Highway Engineering',
+              'swe': 'Vägteknik'
+              },
+    '10412': {'eng': 'History of Technology',
+              'swe': 'Teknikhistoria'
+              },
+    '10380': {'eng': 'Human - Computer Interaction',
+              'swe': 'Människa - datorinteraktion'
+              },
+    '10437': {'eng': 'Hydraulic Engineering',
+              'swe': 'Vattenbyggnad'
+              },
+    '10322': {'eng': 'Industrial Biotechnology',
+              'swe': 'Industriell bioteknologi'
+              },
+    '10469': {'eng': 'Industrial Business Administration and Manufacturing',
+              'swe': 'Industriell ekonomi och produktion'
+              },
+    '10327': {'eng': 'Industrial Control Systems',
+              'swe': 'Industriella styrsystem'
+              },
+    '10323': {'eng': 'Industrial Design',
+              'swe': 'Industriell design'
+              },
+    '10324': {'eng': 'Industrial Ecology',
+              'swe': 'Industriell ekologi'
+              },
+    '10325': {'eng': 'Industrial Economics and Management',
+              'swe': 'Industriell ekonomi'
+              },
+    '10468': {'eng': 'Industrial Economy and Entrepreneurship',
+              'swe': 'Industriell ekonomi och entreprenörsskap'
+              },
+    '10467': {'eng': 'Industrial IT',
+              'swe': 'Industriell IT'
+              },
+    '10329': {'eng': 'Information and Communication Technology',
+              'swe': 'Informations- och kommunikationsteknik'
+              },
+    '10328': {'eng': 'Information and Software Systems',
+              'swe': 'Information- och programvarusystem'
+              },
+    '10330': {'eng': 'Information Technology',
+              'swe': 'Informationsteknik'
+              },
+    '10470': {'eng': 'Innovation and Design',
+              'swe': 'Innovation och design'
+              },
+    '10382': {'eng': 'Inorganic Chemistry',
+              'swe': 'Oorganisk kemi'
+              },
+    '10331': {'eng': 'Integrated Product Development',
+              'swe': 'Integrerad produktutveckling'
+              },
+    '10313': {'eng': 'Internal Combustion Engineering',
+              'swe': 'Förbränningsmotorteknik'
+              },
+    '10354': {'eng': 'Land and Water Resources',
+              'swe': 'Mark- och vattenresurslära'
+              },
+    '10254': {'eng': 'Land Management',
+              'swe': 'Fastighetsvetenskap'
+              },
+    '10352': {'eng': 'Lightweight Structures',
+              'swe': 'Lättkonstruktioner'
+              },
+    '10475': {'eng': 'Logistics, Business Administration and Manufacturing',
+              'swe': 'Logistik, ekonomi och produktion'
+              },
+    '10350': {'eng': 'Logistics',
+              'swe': 'Logistik'
+              },
+    '10356': {'eng': 'Machine Design',
+              'swe': 'Maskinkonstruktion'
+              },
+    '10351': {'eng': 'Machine Elements',
+              'swe': 'Läran om maskinelement'
+              },
+    '10355': {'eng': 'Machine Elements',
+              'swe': 'Maskinelement'
+              },
+    '10363': {'eng': 'Material Physics',
+              'swe': 'Materialfysik'
+              },
+    '10360': {'eng': 'Materials and Process Design',
+              'swe': 'Material och processdesign'
+              },
+    '10444': {'eng': 'Materials Design and Engineering',
+              'swe': 'Materialdesign'
+              },
+    '10361': {'eng': 'Materials Processing',
+              'swe': 'Materialens processteknologi'
+              },
+    '10478': {'eng': 'Materials Science and Engineering',
+              'swe': 'Materialvetenskap'
+              },
+    '10359': {'eng': 'Mathematical Statistics',
+              'swe': 'Matematisk statistik'
+              },
+    '10358': {'eng': 'Mathematics',
+              'swe': 'Matematik'
+              },
+    '10473': {'eng': 'Mechanical Design',
+              'swe': 'Konstruktion'
+              },
+    '10477': {'eng': 'Mechanical Engineering with Industrial Economy',
+              'swe': 'Maskinteknik med industriell ekonomi'
+              },
+    '10476': {'eng': 'Mechanical Engineering',
+              'swe': 'Maskinteknik'
+              },
+    '10368': {'eng': 'Mechanical Metallurgy',
+              'swe': 'Mekanisk metallografi'
+              },
+    '10367': {'eng': 'Mechanics',
+              'swe': 'Mekanik'
+              },
+    '10479': {'eng': 'Mechatronics and Robotics',
+              'swe': 'Mekatronik och robotik'
+              },
+    '10370': {'eng': 'Mechatronics',
+              'swe': 'Mekatronik'
+              },
+    '10366': {'eng': 'Media Technology',
+              'swe': 'Medieteknik'
+              },
+    '10365': {'eng': 'Medical Engineering',
+              'swe': 'Medicinsk teknik'
+              },
+    '10364': {'eng': 'Medical Imaging',
+              'swe': 'Medicinsk bildbehandling'
+              },
+    '10265': {'eng': 'Metal Working',
+              'swe': 'Bearbetningsteknik'
+              },
+    '10375': {'eng': 'Micro Modelling in Process Science',
+              'swe': 'Mikromodellering inom processvetenskap'
+              },
+    '10373': {'eng': 'Microcomputer Systems',
+              'swe': 'Mikrodatorsystem'
+              },
+    '10374': {'eng': 'Microelectronics and Applied Physics',
+              'swe': 'Mikroelektronik och tillämpad fysik'
+              },
+    '10480': {'eng': 'Mobile Communications Systems',
+              'swe': 'Mobil kommunikation'
+              },
+    '10378': {'eng': 'Molecular Biotechnology',
+              'swe': 'Molekylär bioteknik'
+              },
+    '10379': {'eng': 'Music Acoustics',
+              'swe': 'Musikakustik'
+              },
+    '10353': {'eng': 'Naval Systems',
+              'swe': 'Marina system'
+              },
+    '10346': {'eng': 'Nuclear Chemistry',
+              'swe': 'Kärnkemi'
+              },
+    '10395': {'eng': 'Nuclear Reactor Engineering',
+              'swe': 'Reaktorteknologi'
+              },
+    '10381': {'eng': 'Numerical Analysis',
+              'swe': 'Numerisk analys'
+              },
+    '10383': {'eng': 'Optics',
+              'swe': 'Optik'
+              },
+    '10384': {'eng': 'Optimization and Systems Theory',
+              'swe': 'Optimeringslära och systemteori'
+              },
+    '10385': {'eng': 'Organic Chemistry',
+              'swe': 'Organisk kemi'
+              },
+    '10386': {'eng': 'Paper Technology',
+              'swe': 'Pappersteknik'
+              },
+    '10305': {'eng': 'Philosophy',
+              'swe': 'Filosofi'
+              },
+    '10308': {'eng': 'Photonics with Microwave Engineering',
+              'swe': 'Fotonik med mikrovågsteknik'
+              },
+    '10312': {'eng': 'Physical Chemistry',
+              'swe': 'Fysikalisk kemi'
+              },
+    '10311': {'eng': 'Physical Electrotechnology',
+              'swe': 'Fysikalisk elektroteknik'
+              },
+    '10372': {'eng': 'Physical Metallurgy',
+              'swe': 'Metallografi'
+              },
+    '10310': {'eng': 'Physics',
+              'swe': 'Fysik'
+              },
+    '10431': {'eng': 'Planning of Traffic and Transportation',
+              'swe': 'Trafikplanering'
+              },
+    '10387': {'eng': 'Plasma Physics',
+              'swe': 'Plasmafysik'
+              },
+    '10389': {'eng': 'Polymer Technology',
+              'swe': 'Polymerteknologi'
+              },
+    '10388': {'eng': 'Polymeric Materials',
+              'swe': 'Polymera material'
+              },
+    '10286': {'eng': 'Power Electronics',
+              'swe': 'Effektelektronik'
+              },
+    '10362': {'eng': 'Process Science of Materials',
+              'swe': 'Materialens processvetenskap'
+              },
+    '10390': {'eng': 'Product Realisation and Management',
+              'swe': 'Produktframtagning'
+              },
+    '10326': {'eng': 'Production Engineering',
+              'swe': 'Industriell produktion'
+              },
+    '10319': {'eng': 'Project in Fluid Power',
+              'swe': 'Hydraulik och pneumatik'
+              },
+    '10392': {'eng': 'Project Management and Operational Development',
+              'swe': 'Projektledning och verksamhetsutveckling'
+              },
+    '10357': {'eng': 'Pulp Technology',
+              'swe': 'Massateknologi'
+              },
+    '10394': {'eng': 'Radio Communication Systems',
+              'swe': 'Radiosystemteknik'
+              },
+    '10393': {'eng': 'Radio Electronics',
+              'swe': 'Radioelektronik'
+              },
+    '10333': {'eng': 'Railway Operation',
+              'swe': 'Järnväg och tågtrafik'
+              },
+    '10334': {'eng': 'Railway Technology',
+              'swe': 'Järnvägsteknik'
+              },
+    '10347': {'eng': 'Reactor Safety',
+              'swe': 'Kärnkraftsäkerhet'
+              },
+    '10252': {'eng': 'Real Estate Development and Land Law',
+              'swe': 'Mark- och fastighetsjuridik'
+              },
+    '10302': {'eng': 'Real Estate Economics',
+              'swe': 'Fastighetsekonomi'
+              },
+    '10465': {'eng': 'Real Estate Management',
+              'swe': 'Förvaltning'
+              },
+    '10303': {'eng': 'Real Estate Planning',
+              'swe': 'Fastighetsteknik'
+              },
+    '10345': {'eng': 'Refrigerating Engineering',
+              'swe': 'Kylteknik'
+              },
+    '10396': {'eng': 'Regional Planning',
+              'swe': 'Regional planering'
+              },
+    '10421': {'eng': 'Reliability Centred Asset Management for Electrical Power Systems',
+              'swe': 'Tillförlitlighetsananlys för elkraftsystem'
+              },
+    '10398': {'eng': 'Risk and Safety',
+              'swe': 'Risk och säkerhet'
+              },
+    '10407': {'eng': 'Safety Research',
+              'swe': 'Säkerhetsforskning'
+              },
+    '10267': {'eng': 'Scientific Computing',
+              'swe': 'Beräkningsteknik'
+              },
+    '10318': {'eng': 'Semiconductor Materials',
+              'swe': 'Halvledarmaterial'
+              },
+    '10400': {'eng': 'Signal Processing',
+              'swe': 'Signalbehandling'
+              },
+    '10483': {'eng': 'Software Design',
+              'swe': 'Programvaruutveckling'
+              },
+    '10391': {'eng': 'Software Engineering',
+              'swe': 'Programvaruteknik'
+              },
+    '10482': {'eng': 'Software Engineering',
+              'swe': 'Programutveckling'
+              },
+    '10332': {'eng': 'Soil and Rock Mechanics',
+              'swe': 'Jord- och bergmekanik'
+              },
+    '10320': {'eng': 'Solid Mechanics',
+              'swe': 'Hållfasthetslära'
+              },
+    '10301': {'eng': 'Solid State Electronics',
+              'swe': 'Fasta tillståndets elektronik'
+              },
+    '10348': {'eng': 'Sound and Image Processing',
+              'swe': 'Ljud- och bildbehandling'
+              },
+    '10443': {'eng': 'Space and Plasma Physics',
+              'swe': 'Rymd- och plasmafysik'
+              },
+    '10399': {'eng': 'Space Physics',
+              'swe': 'Rymdfysik'
+              },
+    '10408': {'eng': 'Speech Communication',
+              'swe': 'Talkommunikation'
+              },
+    '10409': {'eng': 'Speech Communication',
+              'swe': 'Talöverföring'
+              },
+    '10403': {'eng': 'Steel Structures',
+              'swe': 'Stålbyggnad'
+              },
+    '10272': {'eng': 'Structural Design and Bridges',
+              'swe': 'Brobyggnad'
+              },
+    '10474': {'eng': 'Structural Engineering',
+              'swe': 'Konstruktionsteknik'
+              },
+    '10276': {'eng': 'Structural Mechanics and Engineering',
+              'swe': 'Byggnadsstatik'
+              },
+    '10442': {'eng': 'Surface Chemistry',
+              'swe': 'Ytkemi'
+              },
+    '10441': {'eng': 'Surface Coating Technology',
+              'swe': 'Ytbehandlingsteknik'
+              },
+    '10414': {'eng': 'Surveying',
+              'swe': 'Teknisk geodesi'
+              },
+    '10436': {'eng': 'Sustainable Buildings',
+              'swe': 'Uthålliga byggnader'
+              },
+    '10750': {'eng': 'Sustainable development',
+              'swe': 'Hållbar utveckling'
+              },
+    '10486': {'eng': 'System Engineering',
+              'swe': 'Systemutveckling'
+              },
+    '10404': {'eng': 'System-on-Chip',
+              'swe': 'System på kisel'
+              },
+    '10405': {'eng': 'Systems Analysis and Economics',
+              'swe': 'Systemanalys och ekonomi'
+              },
+    '10406': {'eng': 'Systems Engineering',
+              'swe': 'Systemteknik'
+              },
+    '10413': {'eng': 'Technical Acoustics',
+              'swe': 'Teknisk akustik'
+              },
+    '10411': {'eng': 'Technology and Learning',
+              'swe': 'Teknik och lärande'
+              },
+    '10489': {'eng': 'Tele and Data Communication',
+              'swe': 'Tele- och datakommunikation'
+              },
+    '10417': {'eng': 'Telecommunication Systems',
+              'swe': 'Telekommunikationssystem'
+              },
+    '10416': {'eng': 'Teleinformatics',
+              'swe': 'Teleinformatik'
+              },
+    '10419': {'eng': 'Theoretical Physics',
+              'swe': 'Teoretisk fysik'
+              },
+    '10343': {'eng': 'Thermal Engineering',
+              'swe': 'Kraft- och värmeteknologi'
+              },
+    '10430': {'eng': 'Traffic and Transport Planning',
+              'swe': 'Trafik- och transportplanering'
+              },
+    '10432': {'eng': 'Transport- and Location Analysis',
+              'swe': 'Transport- och lokaliseringsanalys'
+              },
+    '20650': {'eng': 'Urban and Regional Planning',
+              'swe': 'Urban och regional planering'
+              },
+    '10401': {'eng': 'Urban Planning and Design',
+              'swe': 'Stadsplanering och design'
+              },
+    '10307': {'eng': 'Vehicle Engineering',
+              'swe': 'Fordonsteknik'
+              },
+    '10438': {'eng': 'Water Resources Engineering',
+              'swe': 'Vattenvårdsteknik'
+              },
+    '10259': {'eng': 'Water, Sewage and Waste',
+              'swe': 'VA och avfall'
+              },
+    '10433': {'eng': 'Wood Chemistry',
+              'swe': 'Träkemi'
+              },
+    '10434': {'eng': 'Wood Technology and Processing',
+              'swe': 'Träteknologi'
+              },
+    '10263': {'eng': 'Work Science',
+              'swe': 'Arbetsvetenskap'
+              },
+    '34700': { 'eng': 'Master of Science in Engineering - Engineering Chemistry',
+               'swe': 'Civilingenjörsexamen - Teknisk kemi'
+               },
+    '34550': { 'eng': 'Master of Science - Information and Network Engineering',
+               'swe': 'Teknologie masterexamen - Information och nätverksteknologi'
+               },
+    '35000': { 'eng': 'Master of Science - Technology, Work and Health',
+               'swe': 'Teknologie masterexamen - Teknik, arbete och hälsa'
+               },
+    '30301': { 'eng': 'Bridging Teacher Education Programme in Mathematics,Science and Technology for Graduates with a Third Cycle Degree',
+               'swe': 'Kompletterande pedagogisk utbildning för ämneslärarexamen i matematik, naturvetenskap och teknik för forskarutbildade'
+               },
+    '30300': { 'eng': 'Bridging Teacher Education Programme',
+               'swe': 'Kompletterande pedagogisk utbildning'
+               }
+}
+
+
+#----------------------------------------------------------------------
+# Reverse indexes
+#----------------------------------------------------------------------
+# English or Swedish school name -> school acronym
+school_acronym_by_name=dict()
+for s in schools_info:
+    for language in ['swe', 'eng']:
+        school_acronym_by_name.setdefault(schools_info[s][language], s)
+
+# (school acronym, English or Swedish department name) -> department acronym
+# Note that some entries (such as ABE's PHILHIST) are groups of departments without names of their own.
+department_acronym_by_name=dict()
+# L2 id -> department acronym and L3 id -> division acronym
+department_acronym_by_L2_id=dict()
+division_acronym_by_L3_id=dict()
+# (school acronym, department acronym) -> DiVA org code (the L2 id)
+diva_code_by_department_acronym=dict()
+for school in departments_info:
+    for dept in departments_info[school]:
+        d=departments_info[school][dept]
+        for language in ['swe', 'eng']:
+            if language in d:
+                department_acronym_by_name.setdefault((school, d[language]), dept)
+        if d.get('L2'):
+            department_acronym_by_L2_id.setdefault(d['L2'], dept)
+            diva_code_by_department_acronym[(school, dept)]=d['L2']
+        if d.get('divisions'):
+            for division in d['divisions']:
+                l3=d['divisions'][division].get('L3')
+                if l3:
+                    division_acronym_by_L3_id.setdefault(l3, division)
+
+# English subject area name -> DiVA subject area code
+subject_area_code_by_eng=dict()
+for s in subject_area_codes_diva:
+    se=subject_area_codes_diva[s].get('eng', None)
+    if se:
+        subject_area_code_by_eng.setdefault(se, s)
+
+#----------------------------------------------------------------------
+# Lookups
+#----------------------------------------------------------------------
+def schools_acronym(s1):
+    return school_acronym_by_name.get(s1, None)
+
+def diva_codes_for_schools_KTH_L1(s1):
+    s=school_acronym_by_name.get(s1, None)
+    if s:
+        return schools_info[s]['L1']
+    return None
+
+def diva_codes_for_schools_KTH_L1_acronym(s1):
+    if s1 in schools_info:
+        return schools_info[s1]['L1']
+    return None
+
+# the first argument is the acronym of the school, while the seconds is a string name of a department
+def departments_acronym(l1, s2):
+    return department_acronym_by_name.get((l1, s2), None)
+
+def diva_codes_for_departments_KTH_L2_acronyms(l1, l2):
+    if l1 and l2:
+        return diva_code_by_department_acronym.get((l1, l2), None)
+    return None
+
+# returns the acronym of the department (for an L2 id) or the division (for an L3 id)
+def acronym_from_org_id(key):
+    # convert numeric values ot strings for the later lookup
+    if isinstance(key, int):
+        key="{}".format(key)
+    #
+    return department_acronym_by_L2_id.get(key, division_acronym_by_L3_id.get(key, None))
+
+def lookup_subject_area_eng(s1):
+    return subject_area_code_by_eng.get(s1, None)
@@ -1,9 +1,22 @@
 #!/usr/bin/python3
 #
 # ./list-all-custom-column-entries.py course_id
+# ./list-all-custom-column-entries.py course_id --parquet snapshot.parquet
+# ./list-all-custom-column-entries.py course_id --update custom-column-entries-course_id-column-all.xlsx [--dry-run] [--allow-delete]
 #
 # Outputs an xlsx file of the form containing all of the custom columns: custom-column-entries-course_id-column-column_all.xlsx
 # The first column of the output will be user_id.
+# The entries of all of the custom columns are fetched concurrently and put into one wide table with a row per user_id.
+# With the option "--parquet" this table is also written as a Parquet file.
+# The table is also written, unchanged, as the base snapshot custom-column-entries-course_id-column-all-base.csv.
+#
+# With the option "--update" the (edited) xlsx, csv, or Parquet file is compared with the base snapshot that it was made
+# from (or the file given with "--base"), so only the cells that the user has edited are written back, all of them with a
+# single bulk update (which Canvas does as a background job, the program waits for it to finish). An edited cell whose
+# entry in Canvas has changed since the base snapshot was made is not written, but reported. A cell that has been
+# emptied would remove the entry, so these are only written with the option "--allow-delete". After the update, the
+# base snapshot is updated with the cells that were written. With "-n" or "--dry-run" the changes are only counted (and
+# with "-v" listed).
 #
 # with the option '-C'or '--containers' use HTTP rather than HTTPS for access to Canvas
 # with the option "-v" or "--verbose" you get lots of output - showing in detail the operations of the program
@@ -17,11 +30,14 @@
 #
 # 2019.02.19
 #
+# 2026-10-18 bulk snapshot and update of all of the custom columns
+#
 
 import csv, requests, time
 from pprint import pprint
 import optparse
 import sys
+import os
 
 from io import StringIO, BytesIO
 
@@ -30,6 +46,8 @@ import json
 # Use Python Pandas to create XLSX files
 import pandas as pd
 
+import canvas_client            # shared, pooled Canvas REST client
+
 #############################
 ###### EDIT THIS STUFF ######
 #############################
@@ -59,6 +77,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=options.verbose)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -70,66 +89,128 @@ def initialize(options):
 ##############################################################################
 
 def list_custom_column_entries(course_id, column_number):
-       entries_found_thus_far=[]
-
        # Use the Canvas API to get the list of custom column entries for a specific column for the course
        #GET /api/v1/courses/:course_id/custom_gradebook_columns/:id/data
-
-       url = "{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(baseUrl,course_id, column_number)
-       if Verbose_Flag:
-              print("url: " + url)
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-       for p_response in page_response:  
-              entries_found_thus_far.append(p_response)
-
-       # the following is needed when the reponse has been paginated
-       # i.e., when the response is split into pieces - each returning only some of the list of modules
-       # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-       while r.links['current']['url'] != r.links['last']['url']:  
-              r = requests.get(r.links['next']['url'], headers=header)  
-              page_response = r.json()  
-              for p_response in page_response:  
-                     entries_found_thus_far.append(p_response)
-
-       return entries_found_thus_far
+       return canvas_client.custom_column_data(course_id, column_number)
 
 def list_custom_columns(course_id):
-       columns_found_thus_far=[]
-       # Use the Canvas API to get the list of custom column for this course
+       # Use the Canvas API to get the list of custom column for this course (including the hidden columns)
        #GET /api/v1/courses/:course_id/custom_gradebook_columns
-
        url = "{0}/courses/{1}/custom_gradebook_columns".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     columns_found_thus_far.append(p_response)
+       return canvas_client.get_paginated_list(url, {'include_hidden': 'true'})
 
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            columns_found_thus_far.append(p_response)
+# Returns a DataFrame indexed by user_id with a column (named by its title) for each custom column.
+# The entries of all of the columns are fetched concurrently.
+def custom_columns_snapshot(course_id, list_of_columns):
+       urls=["{0}/courses/{1}/custom_gradebook_columns/{2}/data".format(baseUrl, course_id, column['id']) for column in list_of_columns]
+       list_of_entries=canvas_client.get_paginated_lists(urls)
 
-       return columns_found_thus_far
+       columns=[]
+       for column, entries in zip(list_of_columns, list_of_entries):
+              if Verbose_Flag:
+                     print("column_name: {0}; column_number: {1}; {2} entries".format(column['title'], column['id'], len(entries)))
+              columns.append(pd.Series({e['user_id']: e['content'] for e in entries}, name=column['title'], dtype=object))
 
+       if not columns:
+              snapshot_df=pd.DataFrame()
+       else:
+              # an outer join on user_id, as a column might not have an entry for every user
+              snapshot_df=pd.concat(columns, axis=1)
+       snapshot_df.index.name='user_id'
+       return snapshot_df.sort_index()
+
+# read a (possibly edited) snapshot from an xlsx, csv, or Parquet file, returns a DataFrame indexed by user_id
+def read_snapshot(filename):
+       if filename.endswith('.parquet'):
+              df=pd.read_parquet(filename)
+       elif filename.endswith('.csv'):
+              df=pd.read_csv(filename, dtype=str)
+       else:
+              df=pd.read_excel(filename, dtype=str)
+
+       if 'user_id' not in df.columns:
+              print("There is no user_id column in {}".format(filename))
+              return None
+       df=df[df['user_id'].notna()]
+       df['user_id']=pd.to_numeric(df['user_id']).astype(int)
+       return df.set_index('user_id')
+
+# write a snapshot (indexed by user_id) as an xlsx, csv, or Parquet file, with user_id as the first column
+def write_snapshot(df, filename):
+       df=df.reset_index()
+       if filename.endswith('.parquet'):
+              df.to_parquet(filename, index=False)
+       elif filename.endswith('.csv'):
+              df.to_csv(filename, index=False)
+       else:
+              df.to_excel(filename, sheet_name='Custom_Columns', index=False)
+
+# the content of a cell as the string that Canvas stores, an empty cell is ''
+def cell_content(value):
+       if not isinstance(value, str) and pd.isna(value):
+              return ''
+       if isinstance(value, float) and value.is_integer():
+              return str(int(value))
+       return str(value)
+
+def base_snapshot_filename(course_id):
+       return 'custom-column-entries-'+str(course_id)+'-column-all-base.csv'
+
+# the values of a column of a snapshot for the given users as strings, users (and columns) not in the snapshot are ''
+def column_values(df, column_name, index):
+       if column_name not in df.columns:
+              return pd.Series('', index=index)
+       return df[column_name].reindex(index).map(cell_content)
+
+# Compare the new (edited) snapshot with the base snapshot it was made from and return the column_data for the bulk
+# update of the cells that the user has edited. Only the columns and users in the new snapshot are considered, so cells
+# that are not in it are left as they are. An edited cell whose current entry in Canvas is no longer the one in the base
+# snapshot is skipped (as someone else has changed it), as is an emptied cell unless allow_delete is True.
+def changed_cells(base_df, current_df, new_df, list_of_columns, allow_delete=False):
+       column_ids={column['title']: column['id'] for column in list_of_columns}
+       column_data=[]
+       conflicts=0
+       deletions=0
+       for column_name in new_df.columns:
+              if column_name not in column_ids:
+                     print("There is no custom column named {}, skipping it".format(column_name))
+                     continue
+
+              new_values=new_df[column_name].map(cell_content)
+              base_values=column_values(base_df, column_name, new_df.index)
+              current_values=column_values(current_df, column_name, new_df.index)
+
+              for user_id in new_values.index[new_values != base_values]:
+                     if current_values[user_id] == new_values[user_id]:
+                            continue    # already in Canvas
+                     if current_values[user_id] != base_values[user_id]:
+                            print("user_id: {0}; {1}: changed in Canvas from '{2}' to '{3}' since the base snapshot, not writing '{4}'".format(
+                                   user_id, column_name, base_values[user_id], current_values[user_id], new_values[user_id]))
+                            conflicts=conflicts+1
+                            continue
+                     if not new_values[user_id] and not allow_delete:
+                            if Verbose_Flag:
+                                   print("user_id: {0}; {1}: not removing '{2}'".format(user_id, column_name, current_values[user_id]))
+                            deletions=deletions+1
+                            continue
+                     if Verbose_Flag:
+                            print("user_id: {0}; {1}: '{2}' -> '{3}'".format(user_id, column_name, current_values[user_id], new_values[user_id]))
+                     column_data.append({'column_id': column_ids[column_name],
+                                         'user_id': int(user_id),
+                                         'content': new_values[user_id]})
+       if conflicts:
+              print("{} edited cells were changed in Canvas since the base snapshot and were not written".format(conflicts))
+       if deletions:
+              print("{} emptied cells were not written, use --allow-delete to remove these entries".format(deletions))
+       return column_data
+
+# the base snapshot with the cells in column_data set to their new content
+def updated_base(base_df, column_data, list_of_columns):
+       column_titles={column['id']: column['title'] for column in list_of_columns}
+       base_df=base_df.astype(object)
+       for d in column_data:
+              base_df.loc[d['user_id'], column_titles[d['column_id']]]=d['content'] if d['content'] else None
+       return base_df.sort_index()
 
 def insert_column_name(course_id, column_name):
        global Verbose_Flag
@@ -148,7 +229,7 @@ def insert_column_name(course_id, column_name):
        if Verbose_Flag:
               print("url: {}".format(url))
        payload={'column[title]': column_name}
-       r = requests.post(url, headers = header, data=payload)
+       r = canvas_client.post(url, data=payload)
        if r.status_code == requests.codes.ok:
               if Verbose_Flag:
                      print("result of post creating custom column:  {}".format(r.text))
@@ -179,6 +260,38 @@ def main():
                          help="for the container enviroment in the virtual machine"
        )
 
+       parser.add_option('--parquet',
+                         dest="parquet_filename",
+                         default=None,
+                         help="also output the custom columns as a Parquet file"
+       )
+
+       parser.add_option('--update',
+                         dest="update_filename",
+                         default=None,
+                         help="write the changed cells in FILE (xlsx, csv, or Parquet) back to Canvas", metavar="FILE"
+       )
+
+       parser.add_option('-n', '--dry-run',
+                         dest="dry_run",
+                         default=False,
+                         action="store_true",
+                         help="with --update, only report the changes"
+       )
+
+       parser.add_option('--base',
+                         dest="base_filename",
+                         default=None,
+                         help="with --update, the snapshot that FILE was edited from (default: the base snapshot written with the xlsx file)", metavar="FILE"
+       )
+
+       parser.add_option('--allow-delete',
+                         dest="allow_delete",
+                         default=False,
+                         action="store_true",
+                         help="with --update, remove the entries of the cells that have been emptied"
+       )
+
        options, remainder = parser.parse_args()
 
        Verbose_Flag=options.verbose
@@ -197,60 +310,49 @@ def main():
               return
 
        course_id=remainder[0]
-       list_of_columns=list_custom_columns(course_id)              
+       list_of_columns=list_custom_columns(course_id)
+       if not list_of_columns:
+              print("There were no custom columns")
+              return
 
-       custom_columns_present=False
-       index=0
-       for column in list_of_columns:
-              column_name=column['title']
-              column_number=column['id']
+       merge_df=custom_columns_snapshot(course_id, list_of_columns)
+
+       if options.update_filename:
+              base_filename=options.base_filename or base_snapshot_filename(course_id)
+              if not os.path.exists(base_filename):
+                     print("There is no base snapshot {}, list the custom columns first or use --base".format(base_filename))
+                     return
+              base_df=read_snapshot(base_filename)
+              new_df=read_snapshot(options.update_filename)
+              if base_df is None or new_df is None:
+                     return
+              column_data=changed_cells(base_df, merge_df, new_df, list_of_columns, options.allow_delete)
+              print("{0} changed cells in {1} columns".format(len(column_data), len({d['column_id'] for d in column_data})))
+              if column_data and not options.dry_run:
+                     progress=canvas_client.update_custom_column_data(course_id, column_data)
+                     if progress:
+                            progress=canvas_client.wait_for_progress(progress)
+                            print("bulk update of the custom columns: {}".format(progress.get('workflow_state', None)))
+                            if progress.get('workflow_state', None) == 'completed':
+                                   write_snapshot(updated_base(base_df, column_data, list_of_columns), base_filename)
+              canvas_client.report()
+              return
 
-              if Verbose_Flag:
-                     print('column_name: ', column_name, '; column_number: ', column_number)
+       # the base snapshot, which --update compares the edited file with
+       write_snapshot(merge_df, base_snapshot_filename(course_id))
 
-              output=list_custom_column_entries(course_id, column_number)
-              if (output):
-                     if Verbose_Flag:
-                            print(output)
-
-                     # the following was inspired by pbreach's answer on Jan 21 '14 at 18:17 in http://stackoverflow.com/questions/21104592/json-to-pandas-dataframe
-                     # create a Panda dataframe from the output
-                     df=pd.io.json.json_normalize(output)
-                     df.rename(columns = {'content': column_name}, inplace = True)
-                     index=index+1
-                     
-                     if index == 1:
-                            if Verbose_Flag:
-                                   print('index: ', index)
-                            merge_df = df
-                            custom_columns_present=True
-                     else:
-                            if Verbose_Flag:
-                                   print('else index: ', index)
-                            # Note that one has to do an outer join in case on of the columns does not have a matching entry.
-                            # This works because the outer join uses the union of the keys from both inputs.
-                            new_merge_df = pd.merge(merge_df, df, on='user_id', how='outer')
-                            merge_df=new_merge_df
-
-
-       #  based upon contribution by Ed Chum on Aug 4 '14 at 15:30 at http://stackoverflow.com/questions/25122099/move-column-by-name-to-front-of-table-in-pandas
-       # get a list of columns
-       #cols = list(merge_df)
-       if custom_columns_present:
-              cols = list(merge_df)
-              # move the column to head of list using index, pop and insert
-              cols.insert(0, cols.pop(cols.index('user_id')))
-              # use ix to reorder
-              merge_df = merge_df.ix[:, cols]
-
-              # the following was inspired by the section "Using XlsxWriter with Pandas" on http://xlsxwriter.readthedocs.io/working_with_pandas.html
-              # set up the output write
-              writer = pd.ExcelWriter('custom-column-entries-'+str(course_id)+'-column-all.xlsx', engine='xlsxwriter')
-              # Convert the dataframe to an XlsxWriter Excel object.
-              merge_df.to_excel(writer, sheet_name='Custom_Columns')
-              # Close the Pandas Excel writer and output the Excel file.
-              writer.save()
-       else:
-              print("There were no custom columns")
-if __name__ == "__main__": main()
+       # user_id as the first column of the output
+       merge_df=merge_df.reset_index()
 
+       if options.parquet_filename:
+              merge_df.to_parquet(options.parquet_filename, index=False)
+
+       # the following was inspired by the section "Using XlsxWriter with Pandas" on http://xlsxwriter.readthedocs.io/working_with_pandas.html
+       # set up the output write
+       writer = pd.ExcelWriter('custom-column-entries-'+str(course_id)+'-column-all.xlsx', engine='xlsxwriter')
+       # Convert the dataframe to an XlsxWriter Excel object.
+       merge_df.to_excel(writer, sheet_name='Custom_Columns', index=False)
+       # Close the Pandas Excel writer and output the Excel file.
+       writer.close()
+
+if __name__ == "__main__": main()
@@ -0,0 +1,878 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# ./mods_loader.py file.mods [--parquet file.parquet] [--chunk 5000]
+#
+# Purpose: A streaming loader for MODS files (such as those exported from DiVA), for use by the notebooks and programs.
+#
+# The file is parsed with lxml's iterparse and each <mods> element is cleared (and removed from its parent)
+# once it has been processed, so that even a KTH-wide MODS export of hundreds of MB is read in bounded memory.
+# Each record is turned into a plain dict by mods_record_to_dict() (the per-record code of mods_records_to_dataframe()
+# in the DiVA notebooks). mods_records_to_dataframe() collects the dicts and builds the DataFrame once, rather than
+# creating and concatenating a DataFrame per record (which made loading quadratic in the number of records).
+#
+# For files that are too large for a DataFrame, mods_to_parquet() writes the flattened records to a Parquet file in
+# chunks. As the columns are only known once all the records have been seen, the file is read twice: once to
+# collect the column names and once to write the chunks. All the values are stored as strings (lists and dicts as JSON).
+#
+# Usage (from a notebook or program):
+#   from mods_loader import iter_mods_records, iter_mods_dicts, mods_records_to_dataframe
+#   user_df=mods_records_to_dataframe(filename)
+#   for record in iter_mods_records(filename):    # lxml elements, only valid until the next record is read
+#       ...
+#
+# Example:
+# ./mods_loader.py kth-theses.mods --parquet kth-theses.parquet
+#
+# 2026-10-18
+#
+import sys
+import json
+import time
+import argparse
+
+import pandas as pd
+import lxml.etree as etree
+
+MODS_namespace='{http://www.loc.gov/mods/v3}'
+
+Verbose_Flag=False
+
+def verbosePrint(msg):
+    global Verbose_Flag
+    if Verbose_Flag:
+        print(msg)
+
+# Yields the <mods> elements of a file (a filename or a file opened in binary mode). Each element is cleared once
+# the consumer asks for the next one, so it must not be kept.
+def iter_mods_records(source, limit=None):
+    context=etree.iterparse(source, events=('end',), tag=MODS_namespace+'mods', huge_tree=True)
+    number_of_records=0
+    for event, record in context:
+        yield record
+        number_of_records=number_of_records+1
+        record.clear(keep_tail=False)
+        # also drop the references from the parent (modsCollection) to the records already processed
+        while record.getprevious() is not None:
+            del record.getparent()[0]
+        if limit and number_of_records >= limit:
+            break
+    del context
+
+def collect_originInfo(mod_elem):
+    originInfo=dict()
+    for elem in mod_elem:
+        if elem.tag.count("}languageTerm") == 1:
+            if elem.text is not None:
+                originInfo["LanguageTerm"]=elem.text
+        elif elem.tag.count("}dateIssued") == 1:
+            if elem.text is not None:
+                originInfo["CreatedDate"]=elem.text
+        elif elem.tag.count("}dateOther") == 1:
+            # <dateOther type="defence">2018-07-26T13:00:00</dateOther>
+            # <dateOther type="academicTerm">VT 2018</dateOther>
+            # <dateOther type="availableFrom">2018-11-19T09:16:45</dateOther>
+            if elem.text is not None:
+                type=elem.attrib.get('type')
+                if type == 'defence':
+                    originInfo['DefenceDate']=elem.text
+                elif type == 'academicTerm':
+                    originInfo['academicTerm']=elem.text
+                elif type == 'availableFrom':
+                    originInfo['PublicationDate']=elem.text
+                else:
+                    originInfo["dateOther"]=elem.text
+        elif elem.tag.count("}place") == 1:
+            if elem.text is not None:
+                originInfo["place"]=elem.text
+        elif elem.tag.count("}publisher") == 1:
+            if elem.text is not None:
+                originInfo["publisher"]=elem.text
+        elif elem.tag.count("}edition") == 1:
+            if elem.text is not None:
+                originInfo["edition"]=elem.text
+        elif elem.tag.count("}genre") == 1:
+            if elem.text is not None:
+                originInfo["genre"]=elem.text
+        else:
+            print("Unhandled case in collect_originInfo: {}".format(elem))
+    return originInfo
+
+def update_key_list(diva_entry, key, name_struct):
+    current_value=diva_entry.get(key, list())
+    current_value.append(name_struct)
+    return current_value
+
+# The following have been adapted from https://www.loc.gov/marc/relators/relaterm.html
+# for use in the content of KTH, where a 'mon' is an 'examiner' and a 'ths' is a 'supervisor'
+
+MARC_Code_for_Relators = {
+    'abr': 'abridger',
+    'acp': 'art copyist',
+    'act': 'actor',
+    'adi': 'art director',
+    'adp': 'adapter',
+    'anl': 'analyst',
+    'anm': 'animator',
+    'ann': 'annotator',
+    'anc': 'announcer',
+    'ant': 'bibliographic antecedent',
+    'ape': 'appellee',
+    'apl': 'appellant',
+    'app': 'applicant',
+    'aqt': 'author in quotations or text abstracts',
+    'arc': 'architect',
+    'ard': 'artistic director',
+    'arr': 'arranger',
+    'art': 'artist',
+    'asg': 'assignee',
+    'asn': 'associated name',
+    'ato': 'autographer',
+    'att': 'attributed name',
+    'auc': 'auctioneer',
+    'aud': 'author of dialog',
+    'aue': 'audio engineer',
+    'aui': 'author of introduction',
+    'aup': 'audio producer',
+    'aus': 'screenwriter',
+    'aut': 'author',
+    'bdd': 'binding designer',
+    'bjd': 'bookjacket designer',
+    'bka': 'book artist',
+    'bkd': 'book designer',
+    'bkp': 'book producer',
+    'blw': 'blurb writer',
+    'bnd': 'binder',
+    'bpd': 'bookplate designer',
+    'brd': 'broadcaster',
+    'brl': 'braille embosser',
+    'bsl': 'bookseller',
+    'cad': 'casting director',
+    'cas': 'caster',
+    'ccp': 'conceptor',
+    'chr': 'choreographer',
+    'cli': 'client',
+    'cll': 'calligrapher',
+    'clr': 'colorist',
+    'clt': 'collotyper',
+    'cmm': 'commentator',
+    'cmp': 'composer',
+    'cmt': 'compositor',
+    'cnd': 'conductor',
+    'cng': 'cinematographer',
+    'cns': 'censor',
+    'coe': 'contestant-appellee',
+    'col': 'collector',
+    'com': 'compiler',
+    'con': 'conservator',
+    'cop': 'camera operator',
+    'cor': 'collection registrar',
+    'cos': 'contestant',
+    'cot': 'contestant-appellant',
+    'cou': 'court governed',
+    'cov': 'cover designer',
+    'cpc': 'copyright claimant',
+    'cpe': 'complainant-appellee',
+    'cph': 'copyright holder',
+    'cpl': 'complainant',
+    'cpt': 'complainant-appellant',
+    'cre': 'creator',
+    'crp': 'correspondent',
+    'crr': 'corrector',
+    'crt': 'court reporter',
+    'csl': 'consultant',
+    'csp': 'consultant to a project',
+    'cst': 'costume designer',
+    'ctb': 'contributor',
+    'cte': 'contestee-appellee',
+    'ctg': 'cartographer',
+    'ctr': 'contractor',
+    'cts': 'contestee',
+    'ctt': 'contestee-appellant',
+    'cur': 'curator',
+    'cwt': 'commentator for written text',
+    'dbd': 'dubbing director',
+    'dbp': 'distribution place',
+    'dfd': 'defendant',
+    'dfe': 'defendant-appellee',
+    'dft': 'defendant-appellant',
+    'dgc': 'degree committee member',
+    'dgg': 'degree granting institution',
+    'dgs': 'degree supervisor',
+    'dis': 'dissertant',
+    'djo': 'dj',
+    'dln': 'delineator',
+    'dnc': 'dancer',
+    'dnr': 'donor',
+    'dpc': 'depicted',
+    'dpt': 'depositor',
+    'drm': 'draftsman',
+    'drt': 'director',
+    'dsr': 'designer',
+    'dst': 'distributor',
+    'dtc': 'data contributor',
+    'dte': 'dedicatee',
+    'dtm': 'data manager',
+    'dto': 'dedicator',
+    'dub': 'dubious author',
+    'edc': 'editor of compilation',
+    'edd': 'editorial director',
+    'edm': 'editor of moving image work',
+    'edt': 'editor',
+    'egr': 'engraver',
+    'elg': 'electrician',
+    'elt': 'electrotyper',
+    'enj': 'enacting jurisdiction',
+    'eng': 'engineer',
+    'etr': 'etcher',
+    'evp': 'event place',
+    'exp': 'expert',
+    'fac': 'facsimilist',
+    'fds': 'film distributor',
+    'fld': 'field director',
+    'flm': 'film editor',
+    'fmd': 'film director',
+    'fmk': 'filmmaker',
+    'fmo': 'former owner',
+    'fmp': 'film producer',
+    'fnd': 'funder',
+    'fon': 'founder',
+    'fpy': 'first party',
+    'frg': 'forger',
+    'gdv': 'game developer',
+    'gis': 'geographic information specialist',
+    'his': 'host institution',
+    'hnr': 'honoree',
+    'hst': 'host',
+    'ill': 'illustrator',
+    'ilu': 'illuminator',
+    'ink': 'inker',
+    'ins': 'inscriber',
+    'inv': 'inventor',
+    'isb': 'issuing body',
+    'itr': 'instrumentalist',
+    'ive': 'interviewee',
+    'ivr': 'interviewer',
+    'jud': 'judge',
+    'jug': 'jurisdiction governed',
+    'lbr': 'laboratory',
+    'lbt': 'librettist',
+    'ldr': 'laboratory director',
+    'led': 'lead',
+    'lee': 'libelee-appellee',
+    'lel': 'libelee',
+    'len': 'lender',
+    'let': 'libelee-appellant',
+    'lgd': 'lighting designer',
+    'lie': 'libelant-appellee',
+    'lil': 'libelant',
+    'lit': 'libelant-appellant',
+    'lsa': 'landscape architect',
+    'lse': 'licensee',
+    'lso': 'licensor',
+    'ltg': 'lithographer',
+    'ltr': 'letterer',
+    'lyr': 'lyricist',
+    'mcp': 'music copyist',
+    'mdc': 'metadata contact',
+    'med': 'medium',
+    'mfp': 'manufacture place',
+    'mfr': 'manufacturer',
+    'mka': 'makeup artist',
+    'mod': 'moderator',
+    #'mon': 'monitor',
+    'mon': 'examiner',
+    'mrb': 'marbler',
+    'mrk': 'markup editor',
+    'msd': 'musical director',
+    'mte': 'metal-engraver',
+    'mtk': 'minute taker',
+    'mup': 'music programmer',
+    'mus': 'musician',
+    'mxe': 'mixing engineer',
+    'nan': 'news anchor',
+    'nrt': 'narrator',
+    'onp': 'onscreen participant',
+    'opn': 'opponent',
+    'osp': 'onscreen presenter',
+    'org': 'organizer',
+    'orm': 'organizer',
+    'oth': 'other',
+    'own': 'owner',
+    'pad': 'place of address',
+    'pan': 'panelist',
+    'pat': 'patron',
+    'pbd': 'publishing director',
+    'pbl': 'publisher',
+    'pdr': 'project director',
+    'pfr': 'proofreader',
+    'pgr': 'programmer',
+    'pht': 'photographer',
+    'plt': 'platemaker',
+    'pma': 'permitting agency',
+    'pmn': 'production manager',
+    'pnc': 'penciller',
+    'pop': 'printer of plates',
+    'ppm': 'papermaker',
+    'ppt': 'puppeteer',
+    'pra': 'praeses',
+    'prc': 'process contact',
+    'prd': 'production personnel',
+    'pre': 'presenter',
+    'prf': 'performer',
+    'prg': 'programmer',
+    'prm': 'printmaker',
+    'prn': 'production company',
+    'pro': 'producer',
+    'prp': 'production place',
+    'prs': 'production designer',
+    'prt': 'printer',
+    'prv': 'provider',
+    'pta': 'patent applicant',
+    'pte': 'plaintiff-appellee',
+    'pth': 'patent holder',
+    'ptf': 'plaintiff',
+    'ptt': 'plaintiff-appellant',
+    'pup': 'publication place',
+    'rbr': 'rubricator',
+    'rcd': 'recordist',
+    'rce': 'recording engineer',
+    'rcp': 'addressee',
+    'rdd': 'radio director',
+    'red': 'redaktor',
+    'ren': 'renderer',
+    'res': 'researcher',
+    'rev': 'reviewer',
+    'rpc': 'radio producer',
+    'rps': 'repository',
+    'rpt': 'reporter',
+    'rpy': 'responsible party',
+    'rsd': 'stage director',
+    'rsg': 'restager',
+    'rsr': 'restorationist',
+    'rsp': 'respondent',
+    'rst': 'respondent-appellant',
+    'rse': 'respondent-appellee',
+    'rth': 'research team head',
+    'rtm': 'research team member',
+    'rxa': 'remix artist',
+    'sad': 'scientific advisor',
+    'sce': 'scenarist',
+    'scl': 'sculptor',
+    'scr': 'scribe',
+    'sds': 'sound designer',
+    'sde': 'sound engineer',
+    'sec': 'secretary',
+    'sfx': 'special effects provider',
+    'sgd': 'stage director',
+    'sgn': 'signer',
+    'sht': 'supporting host',
+    'sll': 'seller',
+    'sng': 'singer',
+    'spk': 'speaker',
+    'spn': 'sponsor',
+    'spy': 'second party',
+    'srv': 'surveyor',
+    'std': 'set designer',
+    'stg': 'setting',
+    'stm': 'stage manager',
+    'stn': 'standards body',
+    'str': 'stereotyper',
+    'stl': 'storyteller',
+    'swd': 'software developer',
+    'tad': 'technical advisor',
+    'tau': 'television writer',
+    'tcd': 'technical director',
+    'tch': 'teacher',
+    #'ths': 'thesis advisor',
+    'ths': 'supervisor',
+    'tld': 'television director',
+    'tlg': 'television guest',
+    'tlh': 'television host',
+    'tlp': 'television producer',
+    'trc': 'transcriber',
+    'trl': 'translator',
+    'tyd': 'type designer',
+    'tyg': 'typographer',
+    'uvp': 'university place',
+    'vac': 'voice actor',
+    'vdg': 'videographer',
+    'vfx': 'visual effects provider',
+    'wac': 'writer of added commentary',
+    'wal': 'writer of added lyrics',
+    'wam': 'writer of accompanying material',
+    'wat': 'writer of added text',
+    'waw': 'writer of afterword',
+    'wdc': 'woodcutter',
+    'wde': 'wood engraver',
+    'wfs': 'writer of film story',
+    'wfw': 'writer of foreword',
+    'wft': 'writer of intertitles',
+    'win': 'writer of introduction',
+    'wit': 'witness',
+    'wpr': 'writer of preface',
+    'wst': 'writer of supplementary textual content',
+}
+
+def mods_record_to_dict(record, n_index):
+    diva_entry=dict()
+    diva_entry['node']=n_index
+    verbosePrint(f"{n_index=} {record=}")
+    verbosePrint(record.tag)
+    if record.tag.count("}mods") == 1:
+        #print("Attribute: {}".format(record.attrib))
+        for mod_element in record:
+            verbosePrint(mod_element)
+            if mod_element.tag.count("}genre") >= 1:
+                if mod_element.attrib.get('authority') == "diva" and mod_element.attrib.get('type') == "publicationTypeCode":
+                    diva_entry['publicationTypeCode']=mod_element.text
+                    verbosePrint(F"publicationTypeCode= {mod_element.text}")
+                    if mod_element.attrib.get('type') == "publicationType":
+                        authority=mod_element.attrib.get('authority')
+                        current_pubtype=diva_entry.get('publicationType', dict())
+                        if authority == 'diva':
+                            lang=mod_element.attrib.get('lang')
+                            if lang:
+                                current_pubtype.update({lang: mod_element.text})
+                            diva_entry['diva_publicationType']=current_pubtype
+                        elif authority == 'svep':
+                            diva_entry['svep_publicationType']=mod_element.text
+                        elif authority == 'kev':
+                            lang=mod_element.attrib.get('lang')
+                            current_pubtype=diva_entry.get('kev_publicationType', dict())
+                            if lang:
+                                current_pubtype.update({lang: mod_element.text})
+                            diva_entry['kev_publicationType']=current_pubtype
+                        else:
+                            print(f"Unhandled case in publicationType: {mod_element.attrib=} {mod_element.text=}")
+            elif mod_element.tag.count("}name") == 1:
+                # <name type="personal" authority="kth" xlink:href="u19gy7zg">
+                # <name type="corporate" authority="kth" xlink:href="5956"><namePart>KTH</namePart><namePart>Skolan för datavetenskap och kommunikation (CSC)</namePart>
+                if mod_element.attrib.get('type') == "personal":
+                    name_type='personal'
+                elif mod_element.attrib.get('type') == "corporate":
+                    name_type='corporate'
+                elif mod_element.attrib.get('type') == "conference":
+                    name_type='conference'    
+                else:
+                    name_type='unknown'
+                name_struct={'type': name_type}
+                name_authority=mod_element.attrib.get('authority')
+                if name_authority is not None:
+                    name_struct['authority']=name_authority
+                xlink=mod_element.attrib.get('{http://www.w3.org/1999/xlink}href', None)
+                if xlink is not None:
+                    name_struct['xlink']=xlink
+                for elem in mod_element:
+                    if elem.tag.count("}namePart") == 1:
+                        # personal name
+                        namePart_type=elem.attrib.get('type')
+                        if namePart_type == 'family':
+                            name_struct['family']=elem.text
+                        elif namePart_type == 'given':
+                            name_struct['given']=elem.text
+                        elif namePart_type == 'termsOfAddress':
+                            # <namePart type="termsOfAddress">professor</namePart>
+                            name_struct['termsOfAddress']=elem.text
+                        elif name_type =='conference':
+                            name_struct['conference']=elem.text
+                        else:
+                            orglevel=0
+                            orglevels=dict()
+                            for org in elem:
+                                orglevelname=f"L{orglevel}"
+                                orglevels[orglevelname]=elem.text
+                                orglevel=orglevel+1
+                            if orglevels:
+                                name_struct['orglevels']=orglevels
+                    elif elem.tag.count("}role") == 1:
+                        # <role><roleTerm type="code" authority="marcrelator">pbl</roleTerm>
+                        for role in elem:
+                            role_type=role.attrib.get('type')
+                            role_authority=role.attrib.get('authority')
+                            # the codes come from https://www.loc.gov/marc/relators/relaterm.html
+                            if role_type=='code'and role_authority=='marcrelator':
+                                if role.text in MARC_Code_for_Relators:
+                                    name_struct['role']=MARC_Code_for_Relators[role.text]
+                                else:
+                                    print(f'Unhandled role: {role.text}')
+                    elif elem.tag.count("}affiliation") == 1:
+                        # <affiliation>KTH, Kommunikationssystem, CoS</affiliation>
+                        name_struct['affiliation']=elem.text
+                    elif elem.tag.count("}description") == 1:
+                        # <description>orcid.org=0000-0002-6066-746X</description>
+                        name_struct['description']=elem.text
+                    else:
+                        print('Unhandled case of role')
+                name_role=name_struct.get('role', None)
+                if name_role is not None:
+                    # There should only be one examiner, but we support several
+                    # There can be multiple supervisors and authors
+                    if name_role in ['examiner',  'supervisor', 'opponent',  'applicant', 'architect', 'author', 'author of dialog',
+                                     'author of introduction', 'author in quotations or text abstracts', 'editor', 'artist',
+                                     'cinematographer', 'commentator',
+                                     'commentator for written text', 'contributor', 'cover designer',
+                                     'creator', 'curator',  'designer', 'director', 'dissertant',
+                                     'filmmaker',  'illustrator', 'inventor',
+                                     'narrator', 'photographer', 'producer', 'project director', 'programmer',
+                                     'publisher', 'researcher', 'screenwriter', 'translator', 'writer of accompanying material'
+                                     ]:
+                        diva_entry[name_role] = update_key_list(diva_entry, name_role, name_struct)
+                    elif name_role == 'other':
+                        if name_struct.get('type', None) == 'corporate':
+                            if name_struct.get('description', None) == 'Research Group':
+                                diva_entry['research group']= name_struct
+                            else:
+                                print(f'Unhandled name - other: {name_struct} with role: {name_role}')
+                        else:
+                            print(f'Unhandled name - unknown: {name_struct} with role: {name_role}')
+                else:
+                    if name_type == 'conference':
+                        diva_entry['conference']=name_struct.get('conference')
+                    elif name_type == 'personal': # as it an author but role not explicit
+                        diva_entry['author'] = update_key_list(diva_entry, 'author', name_struct)
+                    else:
+                        print(f'Unhandled name - with name_type: {name_type=} {name_struct=} {diva_entry=}')
+            elif mod_element.tag.count("}titleInfo") == 1:
+                #current_titleInfo=diva_entry.get('titleInfo', dict())
+                #diva_entry['titleInfo']=current_titleInfo
+                lang=mod_element.attrib.get('lang')
+                for elem in mod_element:
+                    if elem.tag.count("}title") == 1:
+                        #current_title=current_titleInfo.get('title', dict())
+                        current_title=diva_entry.get('title', dict())
+                        current_title.update({lang: elem.text})
+                        diva_entry['title']=current_title
+                    elif elem.tag.count("}subTitle") == 1:
+                        #current_subtitle=current_titleInfo.get('subtitle', dict())
+                        current_subtitle=diva_entry.get('subtitle', dict())
+                        current_subtitle.update({lang: elem.text})
+                        diva_entry['subtitle']=current_subtitle
+                    else:
+                        print("Unhandled case in titleInfo")
+            elif mod_element.tag.count("}language") == 1:
+                i=0
+                temp_dict=dict()
+                for elem in mod_element:
+                    i=i+1
+                    if elem.tag.count("}languageTerm") == 1:
+                        if elem.text is not None:
+                            name='languageTerm_{0}'.format(i)
+                            temp_dict[name]=[elem.text]
+                    elif elem.tag.count("}dateIssued") == 1:
+                        if elem.text is not None:
+                            verbosePrint("dateIssued: ".format(elem.text))
+                            name='dateIssued_{0}'.format(i)
+                            temp_dict[name]=[elem.text]
+                    elif elem.tag.count("}dateOther") == 1:
+                        if elem.text is not None:
+                            verbosePrint("dateOther: {0}{1}".format(elem.attrib, elem.text))
+                            name='dateOther_{0}'.format(i)
+                            temp_dict[name]=[elem.text]
+                    else:
+                        verbosePrint("mod_emem[" + str(i) +"]".format(elem))
+                        name='language_{0}'.format(i)
+                        temp_dict[name]=[elem.text]
+                verbosePrint("temp_dict={}".format(temp_dict))
+            elif mod_element.tag.count("}originInfo") == 1:
+                diva_entry['originInfo']=collect_originInfo(mod_element)
+                diva_entry['Year']=diva_entry['originInfo'].get("CreatedDate", 'Unknown year')
+            elif mod_element.tag.count("}identifier") == 1:
+                if mod_element.text is not None and mod_element.attrib.get('type') in ['libris', 'articleId', 'url', 'doi', 'pmid', 'isi', 'scopus', 'uri', 'isrn', 'isbn', 'local']:
+                    diva_entry[mod_element.attrib.get('type')]=mod_element.text
+                else:
+                    print(f"unexpected identifier type: {mod_element.attrib.get('type')}")
+            elif mod_element.tag.count("}abstract") == 1:
+                current_abstracts=diva_entry.get('abstract', dict())
+                lang=mod_element.attrib.get('lang')
+                if lang == '-1' or not isinstance(lang , str):
+                    # print(f"{lang=} in {diva_entry=}")
+                    lang='swe' # corect the entry in  diva2:905489
+                current_abstracts.update({lang: mod_element.text})
+                diva_entry['abstract']=current_abstracts
+            elif mod_element.tag.count("}subject") == 1:
+                #<subject lang="eng" xlink:href="9895"><topic>Master of Science - Computer Science</topic><genre>Educational program</genre></subject>
+                #<subject lang="swe" xlink:href="9895"><topic>Teknologie masterexamen - Datalogi</topic><genre>Educational program</genre></subject>
+                #<subject lang="eng" xlink:href="10280"><topic>Computer Science</topic><genre>Subject/course</genre></subject>
+                #<subject lang="swe" xlink:href="10280"><topic>Datalogi</topic><genre>Subject/course</genre></subject>
+                xlink=mod_element.attrib.get('{http://www.w3.org/1999/xlink}href', None)
+                xlinks=mod_element.attrib.get('xlink', None)
+                authority=mod_element.attrib.get('authority', None)
+                if authority:
+                    subject=f'{authority}'
+                elif xlink:    
+                    subject='xlink' 
+                elif xlinks:    
+                    subject='xlinks' 
+                else:
+                    subject='keywords'
+                lang=mod_element.attrib.get('lang')
+                current_subject=diva_entry.get(subject, dict())
+                topics=current_subject.get(lang, list())
+                for elem in mod_element:
+                    if elem.tag.count("}topic") == 1:
+                        topics.append(elem.text)
+                        current_subject.update({lang: topics})
+                diva_entry[subject]=current_subject
+            elif mod_element.tag.count("}recordInfo") == 1:
+                #<recordInfo>
+                #<recordOrigin>u1d13i2c</recordOrigin>
+                #<recordContentSource>kth</recordContentSource>
+                #<recordCreationDate>2019-06-26</recordCreationDate>
+                #<recordChangeDate>2022-06-26</recordChangeDate>
+                #<recordIdentifier>diva2:1330685</recordIdentifier>
+                #</recordInfo>
+                current_recordInfo=diva_entry.get('recordInfo', dict())
+                for elem in mod_element:
+                    #if elem.text is not None:
+                    #    print(f"in recordInfo {elem.text}")
+                    if elem.tag.count("}recordOrigin") == 1:
+                        current_recordInfo["recordOrigin"]=elem.text
+                    elif elem.tag.count("}recordContentSource") == 1:
+                        current_recordInfo["recordContentSource"]=elem.text
+                    elif elem.tag.count("}recordCreationDate") == 1:
+                        current_recordInfo["recordCreationDate"]=elem.text
+                    elif elem.tag.count("}recordChangeDate") == 1:
+                        current_recordInfo["recordChangeDate"]=elem.text
+                    elif elem.tag.count("}recordIdentifier") == 1:
+                        current_recordInfo["recordIdentifier"]=elem.text
+                    else:
+                        print("unhandled case in recordInfo")
+                    diva_entry['recordInfo']=current_recordInfo
+            elif mod_element.tag.count("}location") == 1:
+                # <location><url displayLabel="fulltext" note="free" access="raw object">http://kth.diva-portal.org/smash/get/diva2:821850/FULLTEXT01.pdf</url></location>
+                current_location=diva_entry.get('location', dict())
+                for elem in mod_element:
+                    if elem.tag.count("}url") == 1:
+                        label=elem.attrib.get('displayLabel', None)
+                        if label:
+                            if elem.text:
+                                if elem.text == diva_entry['title'].get('eng', None) or elem.text == diva_entry['title'].get('swe', None):
+                                    cl=current_location.get('url', list())
+                                    cl.append(elem.text)
+                                    current_location['url']=cl
+                                elif label.find(',') >= 0 or label.startswith('Betydelsen av skuggning'):
+                                    cl=current_location.get('url', list())
+                                    cl.append(elem.text)
+                                    current_location['url']=cl
+                                elif label == 'Fulltext' or label == 'fulltext' or label == 'Kandidatexjobb i Medieteknik (DM129X) år 2010':
+                                    cl=current_location.get('url', list())
+                                    cl.append(elem.text)
+                                    current_location['url']=cl
+                                else:
+                                    cl=current_location.get('other_links', list())
+                                    cl.append(label+' url: '+elem.text)
+                                    current_location['other_links']=cl
+                            else:
+                                cl=current_location.get(label, list())
+                                cl.append("")
+                                current_location[label]=cl
+                        else:
+                            if elem.text:
+                                cl=current_location.get('url', list())
+                                cl.append(elem.text)
+                                current_location['url']=cl
+                            else:
+                                cl=current_location.get('url', list())
+                                cl.append("")
+                                current_location['url']=cl
+                    else:
+                        print("Unhandled case in }location")
+                    diva_entry['location']=current_location
+            elif mod_element.tag.count("}typeOfResource") == 1:
+                # <typeOfResource>text</typeOfResource>
+                diva_entry['typeOfResource']=mod_element.text
+            elif mod_element.tag.count("}relatedItem") == 1:            
+                #<relatedItem type="series">
+                #  <titleInfo><title>Trita-ICT-COS</title></titleInfo>
+                #  <identifier type="issn">1653-6347</identifier>
+                #  <identifier type="local">247</identifier>
+                #  <identifier type="issue number">COS/CCS 2007-24</identifier>
+                #</relatedItem>
+                relatedItemType=mod_element.attrib.get('type', None)
+                if not relatedItemType:
+                    relatedItemType='relatedItem'
+                titleInfo=dict()
+                for elem in mod_element:
+                    if relatedItemType == 'host':
+                        titleInfo["host"]='host'
+                    if elem is not None:
+                        if elem.tag.count("}titleInfo") == 1:
+                            for title in elem:
+                                if title is not None and title.text:
+                                    titleInfo["title"]=title.text
+                        elif elem.tag.count("}identifier") >= 1:
+                            for subelem in elem:
+                                identifier_type=subelem.attrib.get('type', None)
+                                titleInfo[f"{identifier_type}"]=subelem.text
+                        elif elem.tag.count("}note") == 1:
+                            note_type=elem.attrib.get('type', None)
+                            if note_type is None:
+                                note_type='note'
+                            if elem.text is not None:
+                                titleInfo[note_type]=elem.text
+                        elif elem.tag.count("}part") == 1:
+                            for subelem in elem:
+                                if subelem.tag == 'detail':
+                                    detail_type=subelem.attrib.get('type', None)
+                                    if detail_type == 'volume':
+                                        for subsubelem in subelem:
+                                            if subsubelem.tag == 'number':
+                                                titleInfo[f"volume"]=subsubelem.text
+                                    if detail_type == 'issue':
+                                        for subsubelem in subelem:
+                                            if subsubelem.tag == 'number':
+                                                titleInfo[f"issue"]=subsubelem.text
+                        elif elem.tag.count("}genre") == 1:
+                            if elem.text is not None:
+                                titleInfo['genre']=elem.text
+                            else:
+                                elemattr=elem.attrib.get('type', None)
+                                if elemattr:
+                                    print(f"genre case in relatedItem for {elem=} with type {elemattr}")
+                                else:
+                                    print(f"genre case in relatedItem for {elem=}")
+                        else:
+                            print(f"Unhanded case in relatedItem for {elem=}")
+                diva_entry[relatedItemType]=titleInfo
+            elif mod_element.tag.count("}physicalDescription") == 1:
+                #<physicalDescription>
+                #  <form authority="marcform">electronic</form>
+                #  <extent>xii,74</extent></physicalDescription>
+                for elem in mod_element:
+                    if elem.tag.count("}extent") == 1:
+                        diva_entry['Pages']=elem.text
+            elif mod_element.tag.count("}note") == 1:
+                #<note type="level" lang="swe">Självständigt arbete på avancerad nivå (masterexamen)</note>
+                #<note type="universityCredits" lang="swe">20 poäng / 30 hp</note>
+                #<note type="cooperation">Saab AB</note>
+                notetype=mod_element.attrib.get('type', None)
+                if not notetype:
+                    continue
+                elif notetype in ['level', 'universityCredits', 'cooperation', 'venue',  'funder', 'papers',
+                                  'sustainableDevelopment', 'publicationStatus', 'creatorCount',
+                                  'version identification'
+]:
+                    diva_entry[notetype]=mod_element.text
+
+                elif notetype in ['degree', 'thesis', 'patent', 'project']:
+                    diva_entry[f"{notetype}_note"]=mod_element.text
+                elif notetype == 'publicationChannel':
+                    diva_entry["degree_publicationChannel"]=mod_element.text
+                else:
+                    print(f"unhandled case of note for {notetype}")
+            else:
+                print("Unhandled case in mod mod_element={}".format(mod_element))
+    return diva_entry
+
+def iter_mods_dicts(source, limit=None):
+    for n_index, record in enumerate(iter_mods_records(source, limit), start=1):
+        yield mods_record_to_dict(record, n_index)
+
+# mods_records can be a filename, or an iterable of MODS records (such as a pymods.MODSReader or iter_mods_records())
+def mods_records_to_dataframe(mods_records): # return a dataframe
+    if isinstance(mods_records, str):
+        mods_records=iter_mods_records(mods_records)
+    entries=[mods_record_to_dict(record, n_index) for n_index, record in enumerate(mods_records, start=1)]
+    try:
+        return pd.json_normalize(entries)
+    except BaseException as err:
+        print(f"Unexpected {err=}, {type(err)=}, normalizing the records one at a time")
+    # find the records that cannot be normalized and skip them, as the per-record version did
+    good_entries=list()
+    for diva_entry in entries:
+        try:
+            pd.json_normalize(diva_entry)
+            good_entries.append(diva_entry)
+        except BaseException as err:
+            print(f"Unexpected {err=}, {type(err)=} with {diva_entry=}")
+    return pd.json_normalize(good_entries)
+
+# nested dicts become columns named 'a.b', as with pd.json_normalize()
+def flatten_dict(d, prefix='', flat=None):
+    if flat is None:
+        flat=dict()
+    for key, value in d.items():
+        name=f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flatten_dict(value, name+'.', flat)
+        else:
+            flat[name]=value
+    return flat
+
+def _as_string(value):
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+def mods_to_parquet(source, parquet_filename, chunk_size=5000):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # first pass: the names of all the columns, in the order they are first seen
+    columns=dict()
+    for diva_entry in iter_mods_dicts(source):
+        for name in flatten_dict(diva_entry):
+            columns.setdefault(name, None)
+    schema=pa.schema([(name, pa.string()) for name in columns])
+
+    # second pass: write the records in chunks
+    number_of_records=0
+    with pq.ParquetWriter(parquet_filename, schema) as writer:
+        chunk=list()
+        for diva_entry in iter_mods_dicts(source):
+            chunk.append(flatten_dict(diva_entry))
+            if len(chunk) >= chunk_size:
+                writer.write_table(pa.Table.from_pylist([{name: _as_string(r.get(name)) for name in columns} for r in chunk], schema=schema))
+                number_of_records=number_of_records+len(chunk)
+                chunk=list()
+        if chunk:
+            writer.write_table(pa.Table.from_pylist([{name: _as_string(r.get(name)) for name in columns} for r in chunk], schema=schema))
+            number_of_records=number_of_records+len(chunk)
+    return number_of_records, len(columns)
+
+def main(argv):
+    global Verbose_Flag
+
+    argp = argparse.ArgumentParser(description='mods_loader.py: load a MODS file into a DataFrame or a Parquet file')
+
+    argp.add_argument('mods_file',
+                      help="MODS file"
+                      )
+
+    argp.add_argument('-p', '--parquet',
+                      type=str,
+                      default=None,
+                      help="write the records to this Parquet file rather than loading them into a DataFrame"
+                      )
+
+    argp.add_argument('-c', '--chunk',
+                      type=int,
+                      default=5000,
+                      help="number of records per Parquet row group"
+                      )
+
+    argp.add_argument('-v', '--verbose',
+                      default=False,
+                      action="store_true",
+                      help="Print lots of output to stdout"
+                      )
+
+    args = vars(argp.parse_args(argv))
+
+    Verbose_Flag=args['verbose']
+
+    start_time=time.perf_counter()
+    if args['parquet']:
+        number_of_records, number_of_columns=mods_to_parquet(args['mods_file'], args['parquet'], args['chunk'])
+        print("wrote {0} records with {1} columns to {2}".format(number_of_records, number_of_columns, args['parquet']))
+    else:
+        df=mods_records_to_dataframe(args['mods_file'])
+        print("loaded {0} records with {1} columns".format(df.shape[0], df.shape[1]))
+    print("in {0:.1f} seconds".format(time.perf_counter()-start_time))
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -73,6 +73,9 @@ from dateutil.tz import tzlocal
 # for dealing with the DOCX file - which is a ZIP file
 import zipfile
 
+# to enter the values into all of the control boxes with a single pass over word/document.xml
+import extract_custom_DOCX_properties
+
 try:
     import zlib
     compression = zipfile.ZIP_DEFLATED
@@ -1360,14 +1363,10 @@ def remove_optionalPicture(content):
 def transform_file(content, dict_of_entries):
     global Keep_picture_flag
 
-    for control_box in dict_of_entries:
-        # 'language' is a pseudo control box, it reflects the language of the thesis title
-        # We use it to change the language for the address on the cover
-        if control_box == 'language' and  dict_of_entries['language'] != 'swe':
-            content=content.replace('Stockholm, Sverige', 'Stockholm, Sweden')
-        else:
-            value=dict_of_entries[control_box]
-            content=enter_field(content, control_box, value)
+    # 'language' is a pseudo control box, it reflects the language of the thesis title
+    # We use it to change the language for the address on the cover
+    # The result is the same as calling enter_field() for each control box in turn.
+    content=extract_custom_DOCX_properties.enter_fields(content, dict_of_entries)
     if not Keep_picture_flag:
         # remove the optional picture
         content=remove_optionalPicture(content)
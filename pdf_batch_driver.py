@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# -*- mode: python; python-indent-offset: 4 -*-
+#
+# pdf_batch_driver.py
+#
+# Purpose: A shared batch driver for the programs that scan the PDF files listed in a DiVA spreadsheet
+#          (find_and_extract_references.py, check_for_new_cover.py, find_back_cover_page.py, and find_For_DIVA_page.py).
+#
+# Each of these programs provides a function analyze_file(filename) that calls its process_file(filename)
+# and returns a dict whose keys are the spreadsheet columns to set and whose values are the values for this file.
+# The driver runs analyze_file() in a pool of worker processes. As each worker is a separate process, the
+# module level state that process_file() uses (extracted_data, set_of_errors, found_references_page, ...)
+# is private to that worker and is reset by process_file() for each file - so the files can be processed in parallel.
+#
+# The results are appended to a checkpoint file (in JSON lines format) as they arrive and the file is
+# flushed to disk every N files. If a run is interrupted, running the program again with the same checkpoint file and
+# the --resume option skips the rows that have already been processed (each entry records the name of the file it is for,
+# so an entry is only used if the row still has the same file). Without --resume an existing checkpoint file is
+# overwritten, and when a run completes its checkpoint file is removed. Finally, the results are merged into the
+# spreadsheet in row order.
+#
+# Usage (from one of the programs):
+#   import pdf_batch_driver
+#   ...
+#   results=pdf_batch_driver.run_batch(diva_df, analyze_file, checkpoint_filename, processes=args['jobs'],
+#                                      resume=args['resume'], initializer=initialize_worker, initargs=(Verbose_Flag, testing))
+#   pdf_batch_driver.merge_results(diva_df, results)
+#
+# 2026-10-18
+#
+import os
+import json
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+# name of the local copy of the full text of the thesis in a row of the DiVA spreadsheet, i.e., PID-FULLTEXT01.pdf
+# returns None if there is no full text
+def filename_for_row(row):
+    url=row['FullTextLink']
+    author=row['Name']
+    pid=row['PID']
+    if pd.isna(url):
+        print("no full text for thesis by {}".format(author))
+        return None
+
+    last_slash_in_url=url.rfind('/')
+    if last_slash_in_url < 0:
+        print("Cannot find file name in URL")
+        return None
+    return "{0}-{1}".format(pid, url[last_slash_in_url+1:])
+
+# filenames maps the row index to the name of the file for that row, entries for another file are ignored
+def load_checkpoint(checkpoint_filename, filenames):
+    results=dict()
+    if not checkpoint_filename or not os.path.isfile(checkpoint_filename):
+        return results
+
+    ignored=0
+    with open(checkpoint_filename, 'r', encoding='utf-8') as checkpoint_FH:
+        for line in checkpoint_FH:
+            try:
+                entry=json.loads(line)
+            except ValueError:
+                # the last line can be incomplete if the previous run crashed while writing it
+                continue
+            if entry.get('filename', None) != filenames.get(entry['idx'], None):
+                ignored=ignored+1
+                continue
+            results[entry['idx']]=entry['result']
+    print("resuming with {0} files already processed according to {1}".format(len(results), checkpoint_filename))
+    if ignored:
+        print("ignoring {} entries in the checkpoint file that are for other files".format(ignored))
+    return results
+
+# run in the worker process
+def _analyze_one(analyze_fn, idx, filename):
+    print(f'{idx}: reading file {filename}')
+    try:
+        result=analyze_fn(filename)
+    except Exception as e:
+        print(f'Error when processing file {filename}: {e}')
+        result={'Unexpected error when processing file': filename}
+    return idx, result
+
+# Returns a dict mapping the row index to the result of analyze_fn() for that row's file.
+#   processes        - the number of worker processes (None means one per CPU), with 1 the files are processed in this process
+#   checkpoint_every - the number of files between flushes of the checkpoint file
+#   skip_to_row      - rows with a smaller index are skipped (as with the --nth option)
+#   limit            - only process this many files (for testing)
+#   resume           - use the results in the checkpoint file from an interrupted run, otherwise the checkpoint file is overwritten
+#   initializer      - called with initargs in each worker process, to set the program's global flags (Verbose_Flag, testing, ...)
+#                      as main() is not run in the workers
+def run_batch(diva_df, analyze_fn, checkpoint_filename, processes=None, checkpoint_every=50, skip_to_row=None, limit=None,
+              resume=False, initializer=None, initargs=()):
+    filenames=dict()
+    for idx, row in diva_df.iterrows():
+        if skip_to_row and idx < skip_to_row:
+            continue
+        filename=filename_for_row(row)
+        if filename:
+            filenames[int(idx)]=filename
+
+    if resume:
+        results=load_checkpoint(checkpoint_filename, filenames)
+    else:
+        results=dict()
+        if checkpoint_filename and os.path.isfile(checkpoint_filename):
+            print("starting over, the results in {} are not used (use --resume to continue an interrupted run)".format(checkpoint_filename))
+
+    work=[(idx, filename) for idx, filename in filenames.items() if idx not in results]
+    if limit:
+        work=work[:limit]
+
+    print("{0} files to process".format(len(work)))
+    start_time=time.time()
+    number_done=0
+    checkpoint_FH=open(checkpoint_filename, 'a' if resume else 'w', encoding='utf-8') if checkpoint_filename and work else None
+
+    def record(idx, result):
+        nonlocal number_done
+        results[idx]=result
+        number_done=number_done+1
+        if checkpoint_FH:
+            checkpoint_FH.write(json.dumps({'idx': idx, 'filename': filenames[idx], 'result': result}, default=str, ensure_ascii=False)+'\n')
+            if number_done % checkpoint_every == 0:
+                checkpoint_FH.flush()
+                os.fsync(checkpoint_FH.fileno())
+        if number_done % checkpoint_every == 0:
+            elapsed=time.time()-start_time
+            print("processed {0} of {1} files in {2:.1f} seconds".format(number_done, len(work), elapsed))
+
+    try:
+        if processes == 1:
+            for idx, filename in work:
+                record(*_analyze_one(analyze_fn, idx, filename))
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=initializer, initargs=initargs) as executor:
+                futures=[executor.submit(_analyze_one, analyze_fn, idx, filename) for idx, filename in work]
+                for future in as_completed(futures):
+                    record(*future.result())
+    finally:
+        if checkpoint_FH:
+            checkpoint_FH.close()
+
+    print("processed {0} files in {1:.1f} seconds".format(number_done, time.time()-start_time))
+    # the run is complete, so the checkpoint is no longer needed (and must not be used by a later run)
+    if checkpoint_filename and os.path.isfile(checkpoint_filename):
+        os.remove(checkpoint_filename)
+    return results
+
+# put the results into the spreadsheet, in row order
+def merge_results(diva_df, results):
+    for idx in sorted(results):
+        for column, value in results[idx].items():
+            if isinstance(value, list):
+                # a list cannot be assigned to a single cell with .loc, nor stored in a column of datetimes (pd.NaT)
+                if column not in diva_df.columns or diva_df[column].dtype != object:
+                    diva_df[column]=diva_df.get(column, pd.NaT)
+                    diva_df[column]=diva_df[column].astype(object)
+                diva_df.at[idx, column]=value
+            else:
+                diva_df.loc[idx, column]=value
+    return diva_df
+
+def default_checkpoint_filename(spreadsheet_name, program_name):
+    return "{0}-{1}-checkpoint.jsonl".format(spreadsheet_name[:-5], program_name)
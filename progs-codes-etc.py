@@ -24,6 +24,8 @@
 #
 
 import requests, time
+import http_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import pprint
 import optparse
@@ -63,7 +65,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -129,7 +131,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -157,7 +159,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -175,7 +177,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -210,7 +212,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -229,7 +231,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -290,8 +292,11 @@ def course_examiners(courses):
     global Verbose_Flag
     # get the examiners
     courses_info=dict()
-    for c in courses:
-        c_info=v1_get_course_info(c)
+    courses=list(courses)
+    # the course information is fetched concurrently (and is then kept in the HTTP cache), only the parsing is serial
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        courses_xml=list(executor.map(v1_get_course_info, courses))
+    for c, c_info in zip(courses, courses_xml):
         xml=BeautifulSoup(c_info, "lxml")
         examiners=list()
         for examiner in xml.findAll('examiner'):
@@ -414,7 +419,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -483,7 +488,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -619,7 +624,7 @@ def v1_get_academic_year_plan_for_program(program_code, year):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme academic-year-plan: {}".format(r.text))
     #
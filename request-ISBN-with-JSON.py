@@ -53,6 +53,7 @@ import os			# to make OS calls, here to get time zone info
 #import time
 import pprint
 import requests
+import diva_organization_snapshot
 import logging
 
 
@@ -75,11 +76,12 @@ schools_info={'ABE': {'swe': 'Skolan för Arkitektur och samhällsbyggnad',
                       'eng': 'School of Electrical Engineering and Computer Science'}
               }
 
+# names that are not in schools_info are looked up in the snapshot of the DiVA organisations, if there is one
 def schools_acronym(s1):
     for s in schools_info:
         if s1 == schools_info[s]['swe'] or s1 == schools_info[s]['eng']:
             return s
-    return None
+    return diva_organization_snapshot.school_acronym(s1)
 
 
 # org is of the form "organisation":
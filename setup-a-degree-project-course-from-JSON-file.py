@@ -61,9 +61,13 @@
 #
 # 2020.01.21 based on setup-degree-project-course-from-JSON-file.py
 #
+# 2026-10-18 the writes to Canvas go through canvas_client.py's scheduler, and the sections are created concurrently
+#
 # Note: At present if you use the -A option, you need to run the program again with the -o options to correctly set up the outcomes
 #
 import requests, time
+
+import canvas_client            # shared, pooled Canvas REST client
 import pprint
 import optparse
 import sys
@@ -339,6 +343,7 @@ def initialize(options):
 
             header = {'Authorization' : 'Bearer ' + access_token}
             payload = {}
+            canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
     except:
         print("Unable to open configuration file named {}".format(config_file))
         print("Please create a suitable configuration file, the default name is config.json")
@@ -526,7 +531,7 @@ def create_assignment(course_id, name, max_points, grading_type, description, as
     if assignment_group_id:
         payload['assignment[assignment_group_id]']=assignment_group_id
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -572,7 +577,7 @@ def create_assignment_with_submission(course_id, name, max_points, grading_type,
     if assignment_group_id:
         payload['assignment[assignment_group_id]']=assignment_group_id
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -608,7 +613,7 @@ def create_assignment_with_textual_submission(course_id, name, max_points, gradi
 
 
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -658,7 +663,7 @@ def create_assignment_with_submission_with_peerreview(course_id, name, max_point
     if assignment_group_id:
         payload['assignment[assignment_group_id]']=assignment_group_id
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -684,7 +689,7 @@ def create_module_assignment_item(course_id, module_id, assignment_id, item_name
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -740,7 +745,7 @@ def create_module(course_id, module_name, requires_module_id):
     else:
         payload = {'module[name]': module_name
         }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -761,7 +766,7 @@ def create_gatekeeper_module(course_id, module_name):
                'module[position]': 1,
                'module[require_sequential_progress]': True
     }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -870,7 +875,7 @@ def create_survey_quiz(course_id):
              'quiz[published]': True
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -907,7 +912,7 @@ def create_quiz_question_group(course_id, quiz_id, question_group_name):
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     print("result of post creating question group: {}".format(r.text))
     print("r.status_code={}".format(r.status_code))
@@ -949,7 +954,7 @@ def create_question_boolean(course_id, quiz_id, index, name, question_text, answ
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -980,7 +985,7 @@ def create_question_multiple_choice(course_id, quiz_id, index, name, question_te
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1012,7 +1017,7 @@ def create_question_multiple_choice_with_points(course_id, quiz_id, index, name,
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1042,7 +1047,7 @@ def create_question_essay(course_id, quiz_id, index, name, question_text):
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1070,7 +1075,7 @@ def create_question_short_answer_question(course_id, quiz_id, index, name, quest
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1104,7 +1109,7 @@ def create_question_multiple_dropdowns(course_id, quiz_id, index, name, question
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1138,7 +1143,7 @@ def create_question_multiple_dropdowns_with_points(course_id, quiz_id, index, na
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1162,7 +1167,7 @@ def create_module_quiz_item(course_id, module_id, quiz_id, item_name, points):
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -1322,7 +1327,7 @@ def insert_column_name(course_id, column_name):
     if Verbose_Flag:
        print("url: {}".format(url))
     payload={'column[title]': column_name}
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post creating custom column: {}".format(r.text))
     if r.status_code == requests.codes.ok:
@@ -1403,7 +1408,7 @@ def put_custom_column_entries(course_id, column_number, user_id, data_to_store):
         print("url: " + url)
         
     payload={'column_data[content]': data_to_store}
-    r = requests.put(url, headers = header, data=payload)
+    r = canvas_client.put(url, data=payload)
 
     if Verbose_Flag:
         print("result of putting data into custom_gradebook_column: {}".format(r.text))
@@ -1456,19 +1461,23 @@ def create_sections_in_course(course_id, section_names):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    for section_name in section_names:
+    # the sections are created concurrently, canvas_client's scheduler decides how many are sent at once
+    def create_section(section_name):
         #course_section[name]
         payload={'course_section[name]': section_name}
-        r = requests.post(url, headers = header, data=payload)
+        r = canvas_client.post(url, data=payload)
 
         if Verbose_Flag:
             print("result of creating section: {}".format(r.text))
 
         if r.status_code == requests.codes.ok:
-            page_response=r.json()
+            return r.json()
+        print("Unable to create section {0}, status code {1}".format(section_name, r.status_code))
+        return None
 
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
+    for section in canvas_client.run_concurrently(create_section, section_names):
+        if section:
+            sections_found_thus_far.append(section)
 
     return sections_found_thus_far
 
@@ -1498,7 +1507,7 @@ def create_course_page(course_id, page_title, page_contents):
                  'published': 'true'
                  }
     }
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     if Verbose_Flag:
         print("result of creating a page: {}".format(r.text))
@@ -1523,7 +1532,7 @@ def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
                }
     }
 
-    r = requests.post(url, headers = header, json = payload)
+    r = canvas_client.post(url, json = payload)
     if Verbose_Flag:
         print("result of creating module page item: {}".format(r.text))
 
@@ -2038,7 +2047,7 @@ def create_assignment_group(course_id, name, position, group_weight, rules):
              'group_weight': group_weight,
              'rules': rules,
     }
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment group: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -2148,7 +2157,7 @@ Masterexamen</p>
              'quiz[assignment_group_id]': target_group
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -2851,7 +2860,7 @@ def set_features_for_course(course_id, feature, state):
         print("url: {}".format(url))
 
     payload={'state': state }
-    r = requests.put(url, headers = header, json=payload)
+    r = canvas_client.put(url, json=payload)
     if Verbose_Flag:
         print("result of setting feature: {}".format(r.text))
 
@@ -2967,7 +2976,7 @@ def create_outcomes_subgroup(course_id, group_id, name, description):
              #'vendor_guid': xxx,
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of creating outcomean  subgroup: {}".format(r.text))
 
@@ -3030,7 +3039,7 @@ def create_one_outcome(course_id, group_id, name, description, display_name, rat
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of creating an outcome: {}".format(r.text))
 
@@ -3108,7 +3117,7 @@ def create_a_rubric_for_an_assignment(course_id, assignment_id, outcome_id, name
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of creating a rubric: {}".format(r.text))
 
@@ -3442,5 +3451,7 @@ def main():
         result=create_a_rubric_for_an_assignment(course_id, presentation_assignment_id, outcome_id, 'Presentation outcome', 'Just a short description of the presentation outcome')
         print("result is {}".format(result))
 
+    canvas_client.report()
+
 if __name__ == "__main__": main()
 
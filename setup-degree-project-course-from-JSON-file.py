@@ -24,6 +24,8 @@
 #
 # "-A" or "--all" set everything up (sets all of the above options to true)
 #
+# "-P" or "--plan" only show what would be created, without changing the course
+#
 # "-t" or "--testing" to enable small tests to be done
 # 
 #
@@ -49,14 +51,30 @@
 # Create pages for the course
 #   ./setup-degree-project-course-from-JSON-file.py --config config-test.json -p 1 12683
 #
+# Show what would be created for the whole course
+#   ./setup-degree-project-course-from-JSON-file.py --config config-test.json -A -P 1 12683 EECS
+#
+# The modules, survey, sections, columns, pages, and assignments are described as data (lists of entries, each with a
+# kind and a name) rather than being created step by step. The current state of the course is fetched once (one
+# paginated GET per kind of object, done concurrently), the entries that do not already exist are computed, and
+# only these are created. Entries that do not depend on each other (such as sections, pages, custom columns, and quiz
+# questions) are created concurrently; an entry is only created once what it depends on exists (the module for a
+# module item, the quiz for a question, the module that is a prerequisite for a module, and the assignment group for
+# an assignment). The modules, module items, and assignments are created one after the other, so that they keep their
+# order. Hence running the program again on a course that is already set up only does the GETs and makes no changes.
+#
 # G. Q. Maguire Jr.
 #
 #
 # 2019.02.04, based on setup-degree-project-course.py
 # 2019.05.19 added creation of a section "Awaiting Assignment of Examiner"
+# 2026-10-18 plan the course as data, fetch the current state once, and only create what is missing
 #
 
 import requests, time
+
+import canvas_client            # shared, pooled Canvas REST client
+from concurrent.futures import ThreadPoolExecutor
 import pprint
 import optparse
 import sys
@@ -332,40 +350,16 @@ def initialize(options):
 
                      header = {'Authorization' : 'Bearer ' + access_token}
                      payload = {}
+                     canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
        except:
               print("Unable to open configuration file named {}".format(config_file))
               print("Please create a suitable configuration file, the default name is config.json")
               sys.exit()
 
 def users_in_course(course_id):
-       user_found_thus_far=[]
        # Use the Canvas API to get the list of users enrolled in this course
        #GET /api/v1/courses/:course_id/enrollments
-
-       url = "{0}/courses/{1}/enrollments".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       extra_parameters={'per_page': '100'}
-       r = requests.get(url, params=extra_parameters, headers = header)
-       if Verbose_Flag:
-              print("result of getting enrollments: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     user_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            user_found_thus_far.append(p_response)
-       return user_found_thus_far
+       return canvas_client.users_in_course(course_id)
 
 def user_profile_url(user_id):
        # Use the Canvas API to get the profile of a user
@@ -375,7 +369,7 @@ def user_profile_url(user_id):
        if Verbose_Flag:
               print("user url: {}".format(url))
 
-       r = requests.get(url, headers = header)
+       r = canvas_client.get(url)
        if Verbose_Flag:
               print("result of getting profile: {}".format(r.text))
 
@@ -390,98 +384,20 @@ def section_name_from_section_id(sections_info, section_id):
                    return i['name']
 
 def sections_in_course(course_id):
-       sections_found_thus_far=[]
        # Use the Canvas API to get the list of sections for this course
        #GET /api/v1/courses/:course_id/sections
-
-       url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting sections: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     sections_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            sections_found_thus_far.append(p_response)
-
-       return sections_found_thus_far
+       return canvas_client.sections_in_course(course_id)
 
 def list_your_courses():
-       courses_found_thus_far=[]
        # Use the Canvas API to get the list of all of your courses
        # GET /api/v1/courses
-
-       url = baseUrl+'courses'
-       if Verbose_Flag:
-              print("url: {}".format(url))
-
-       r = requests.get(url, headers = header)
-       if Verbose_Flag:
-              print("result of getting courses: {}".format(r.text))
-
-       if r.status_code == requests.codes.ok:
-              page_response=r.json()
-
-              for p_response in page_response:  
-                     courses_found_thus_far.append(p_response)
-
-              # the following is needed when the reponse has been paginated
-              # i.e., when the response is split into pieces - each returning only some of the list of modules
-              # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-              while r.links['current']['url'] != r.links['last']['url']:  
-                     r = requests.get(r.links['next']['url'], headers=header)  
-                     if Verbose_Flag:
-                            print("result of getting courses for a paginated response: {}".format(r.text))
-                     page_response = r.json()  
-                     for p_response in page_response:  
-                            courses_found_thus_far.append(p_response)
-
-       return courses_found_thus_far
+       url = "{0}/courses".format(baseUrl)
+       return canvas_client.get_paginated_list(url)
 
 def list_assignments(course_id):
-    assignments_found_thus_far=[]
     # Use the Canvas API to get the list of assignments for the course
     #GET /api/v1/courses/:course_id/assignments
-
-    url = "{0}/courses/{1}/assignments".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignments: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            assignments_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of assignments
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting assignments for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    assignments_found_thus_far.append(p_response)
-
-    return assignments_found_thus_far
+    return canvas_client.list_assignments(course_id)
 
 def create_assignment(course_id, name, max_points, grading_type, description):
     # Use the Canvas API to create an assignment
@@ -517,7 +433,7 @@ def create_assignment(course_id, name, max_points, grading_type, description):
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -561,7 +477,7 @@ def create_assignment_with_submission(course_id, name, max_points, grading_type,
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -588,11 +504,11 @@ def create_assignment_with_textual_submission(course_id, name, max_points, gradi
              'assignment[points_possible]': max_points,
              'assignment[grading_type]': grading_type,
              'assignment[description]': description,
-             'assignment[group_category_id]': assignment_group_id,
+             'assignment[assignment_group_id]': assignment_group_id,
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -640,7 +556,7 @@ def create_assignment_with_submission_with_peerreview(course_id, name, max_point
              'assignment[automatic_peer_reviews]': 'false'	# manually assign the peer reviewer(s)
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -666,47 +582,19 @@ def create_module_assignment_item(course_id, module_id, assignment_id, item_name
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
         modules_response=r.json()
-        module_id=modules_response["id"]
-        return module_id
-    return  module_id
+        return modules_response["id"]
+    return None
 
 def list_modules(course_id):
-    modules_found_thus_far=[]
     # Use the Canvas API to get the list of modules for the course
     #GET /api/v1/courses/:course_id/modules
-
-    url = "{0}/courses/{1}/modules".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting modules: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            modules_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting modules for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    modules_found_thus_far.append(p_response)
-
-    return modules_found_thus_far
+    return canvas_client.list_modules(course_id)
 
 def create_module(course_id, module_name, requires_module_id):
     module_id=None              # will contain the module's ID if it exists
@@ -722,7 +610,7 @@ def create_module(course_id, module_name, requires_module_id):
     else:
         payload = {'module[name]': module_name
         }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -743,7 +631,7 @@ def create_gatekeeper_module(course_id, module_name):
                'module[position]': 1,
                'module[require_sequential_progress]': True
     }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -754,39 +642,17 @@ def create_gatekeeper_module(course_id, module_name):
     return  module_id
 
 def check_for_module(course_id,  module_name):
-    modules_found_thus_far=[]
     module_id=None              # will contain the moudle's ID if it exists
     # Use the Canvas API to get the list of modules for the course
     #GET /api/v1/courses/:course_id/modules
 
     url = "{0}/courses/{1}/modules".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
 
     # this will do a partial match against the module_name
     # This reducing the number of responses returned
 
-    payload = {'search_term': module_name} 
-    r = requests.get(url, headers = header, data = payload)
-    if Verbose_Flag:
-        print("result of getting modules: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            modules_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of modules
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting modules for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    modules_found_thus_far.append(p_response)
+    extra_parameters={'search_term': module_name}
+    modules_found_thus_far=canvas_client.get_paginated_list(url, extra_parameters)
 
     name_to_match="{}".format(module_name)
     if Verbose_Flag:
@@ -807,29 +673,16 @@ def check_for_module(course_id,  module_name):
     return module_id
 
 
-def create_basic_modules(course_id):
-    module_id=check_for_module(course_id, "Gatekeeper module 1")
-    if not module_id:
-        module_id=create_gatekeeper_module(course_id, "Gatekeeper module 1")
-        if Verbose_Flag:
-            print("create_basic_modules: Gatekeeper module 1 module_id={}".format(module_id))
-
+def basic_modules_state():
     name="Gatekeeper 1 access control"
     description="This assignment is simply for access control. When the teacher sets the assignment for a student to have 1 point then the student will have access to the pages protected by the module where this assignment is."
-    assignment_id=create_assignment(course_id, name, 1, 'points', description)
-    if Verbose_Flag:
-        print("create_basic_modules:assignment_id={}".format(assignment_id))
 
-    item_name="Gatekeeper 1 access control"
-    create_module_assignment_item(course_id, module_id, assignment_id, item_name, 1)
+    return [{'kind': 'module', 'name': "Gatekeeper module 1", 'gatekeeper': True},
+            assignment_entry(name, 'none', 1, 'points', description),
+            module_item_entry("Gatekeeper module 1", 'Assignment', name, name, 1),
+            {'kind': 'module', 'name': "Gatekeeper protected module 1", 'requires': "Gatekeeper module 1"}]
 
-    access_controlled_module=check_for_module(course_id,  "Gatekeeper protected module 1")
-    if not access_controlled_module:
-        access_controlled_module=create_module(course_id, "Gatekeeper protected module 1", module_id)
-        if Verbose_Flag:
-            print("create_basic_modules: Gatekeeper protected module 1 module_id={}".format(access_controlled_module))
-
-    return access_controlled_module
+survey_quiz_title='Information om exjobbsprojekt/Information for degree project'
 
 def create_survey_quiz(course_id):
     # Use the Canvas API to create a quiz
@@ -841,7 +694,7 @@ def create_survey_quiz(course_id):
         print("url: {}".format(url))
 
     description='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Please answer the following questions about your propose degree project.</p></div><div id="fragment-2"><p lang="sv">Var snäll och svara på följande frågor om ditt förslag på exjobb.</p></div></div>'
-    payload={'quiz[title]': 'Information om exjobbsprojekt/Information for degree project',
+    payload={'quiz[title]': survey_quiz_title,
              'quiz[description]': description,
              'quiz[quiz_type]': 'survey',
              'quiz[hide_results]': '',
@@ -851,7 +704,7 @@ def create_survey_quiz(course_id):
              'quiz[published]': True
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -888,7 +741,7 @@ def create_quiz_question_group(course_id, quiz_id, question_group_name):
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     print("result of post creating question group: {}".format(r.text))
     print("r.status_code={}".format(r.status_code))
@@ -930,7 +783,7 @@ def create_question_boolean(course_id, quiz_id, index, name, question_text, answ
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -961,7 +814,7 @@ def create_question_multiple_choice(course_id, quiz_id, index, name, question_te
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -993,7 +846,7 @@ def create_question_multiple_choice_with_points(course_id, quiz_id, index, name,
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1023,7 +876,7 @@ def create_question_essay(course_id, quiz_id, index, name, question_text):
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1051,7 +904,7 @@ def create_question_short_answer_question(course_id, quiz_id, index, name, quest
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1085,7 +938,7 @@ def create_question_multiple_dropdowns(course_id, quiz_id, index, name, question
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1119,7 +972,7 @@ def create_question_multiple_dropdowns_with_points(course_id, quiz_id, index, na
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1134,7 +987,7 @@ def create_module_quiz_item(course_id, module_id, quiz_id, item_name, points):
     #POST /api/v1/courses/:course_id/modules/:module_id/items
     url = "{0}/courses/{1}/modules/{2}/items".format(baseUrl, course_id, module_id)
     if Verbose_Flag:
-        print("creating module assignment item for course_id={0} module_id={1} assignment_id={1}".format(course_id, module_id, assignment_id))
+        print("creating module quiz item for course_id={0} module_id={1} quiz_id={2}".format(course_id, module_id, quiz_id))
     payload = {'module_item[title]': item_name,
                'module_item[type]': 'Quiz',
                'module_item[content_id]': quiz_id,
@@ -1143,55 +996,49 @@ def create_module_quiz_item(course_id, module_id, quiz_id, item_name, points):
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
         modules_response=r.json()
-        module_id=modules_response["id"]
-        return module_id
-    return  module_id
+        return modules_response["id"]
+    return None
 
-def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners):
+def survey_state(cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, examiners, all_course_examiners):
     index=1
-    survey=create_survey_quiz(course_id)
-
-    # add the quiz to the appropriate module page
-    module_id=check_for_module(course_id,  'Gatekeeper protected module 1')
-    if Verbose_Flag:
-        print("found module to place the quiz in is module_id: {}".format(module_id))
-    q_module_id=create_module_quiz_item(course_id, module_id, survey, 'Information om exjobbsprojekt/Information for degree project', 0)
-    if Verbose_Flag:
-        print("placed the quiz into module as module item id: {}".format(q_module_id))
+    survey=survey_quiz_title
+    # the quiz is placed in the access controlled module
+    entries=[{'kind': 'quiz', 'name': survey, 'quiz_type': 'survey'},
+             module_item_entry('Gatekeeper protected module 1', 'Quiz', survey, survey_quiz_title, 0)]
 
     graded_or_ungraded='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Do you wish an A-F grade, rather than the default P/F (i.e. Pass/Fail) grade for your degree project?</p><p>True: Grade A-F</p><p>False: Pass/Fail (standard)</p></div><div id="fragment-2"><p lang="sv">Vill du ha ett betygsatt exjobb (A-F), i stället för ett vanligt med bara P/F (Pass/Fail)?</p><p>Sant: Betygsatt exjobb (A-F)</p><p>Falskt: Pass/Fail (standard)</p></div>'
 
-    create_question_boolean(course_id, survey, index,
-                            'Graded or ungraded', graded_or_ungraded,
-                            [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}])
+    entries.append(quiz_question_entry(survey, index, 'true_false_question',
+                                       'Graded or ungraded', graded_or_ungraded,
+                                       [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}]))
     index += 1
 
     diva='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Do you give KTH permission to make the full text of your final report available via DiVA?</p><p lang="en"><strong>True</strong>: I accept publication via DiVA</p><p lang="en"><strong>False</strong>: I do not accept publication via DiVA</p><p lang="en"><strong>Note that in all cases the report is public and KTH must provide a copy to anyone on request.</strong></p></div><div id="fragment-2"><p lang="sv">Ger du KTH tillstånd att publicera hela din slutliga exjobbsrapport elektroniskt i databasen DiVA?</p><p lang="sv"><strong>Sant:</strong> Jag godkänner publicering via DiVA</p><p lang="sv"><strong>Falskt:</strong> Jag godkänner inte publicering via DiVA</p><p lang="sv"><strong>Observera att din slutliga exjobbsrapport alltid är offentlig, och att KTH alltid måste tillhandahålla en kopia om någon begär det.</strong></p></div>'
-    create_question_boolean(course_id, survey, index, 'Publishing in DiVA', diva, [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}])
+    entries.append(quiz_question_entry(survey, index, 'true_false_question', 'Publishing in DiVA', diva, [{'answer_comments': '', 'answer_weight': 100, 'answer_text': 'True/Sant'}, {'answer_comments': '', 'answer_weight': 0, 'answer_text': 'False/Falskt'}]))
     index += 1
 
 
     course_code='''<p>Kurskod/Course code: Pass/Fail grading (standard): [PF] or Graded A-F/Betygsatt exjobb (A-F): [AF]</p>'''
     course_code_answers=course_code_alternatives(PF_courses, AF_courses)
     course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Kurskod/Course code', course_code_description+course_code, course_code_answers)
+    entries.append(quiz_question_entry(survey, index, 'multiple_dropdowns_question', 'Kurskod/Course code', course_code_description+course_code, course_code_answers))
     index += 1
         
 
     prelim_title='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Tentative title</p></div><div id="fragment-2"><p lang="sv">Preliminär titel</p></div>'
-    create_question_essay(course_id, survey, index, 'Preliminär titel/Tentative title', prelim_title)
+    entries.append(quiz_question_entry(survey, index, 'essay_question', 'Preliminär titel/Tentative title', prelim_title))
     index += 1
 
 
     # The following was added to provide some information that could be used to identify an appropriate examiner
     prelim_description='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Brief description of the proposed project</p></div><div id="fragment-2"><p lang="sv">Kort beskrivning av det föreslagna projektet</p></div>'
-    create_question_essay(course_id, survey, index, 'Project Description/Projekt beskrivning', prelim_description)
+    entries.append(quiz_question_entry(survey, index, 'essay_question', 'Project Description/Projekt beskrivning', prelim_description))
     index += 1
 
     # examiner
@@ -1199,7 +1046,7 @@ def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_course
 
     course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
     examiner_answers=potential_examiners_answer(examiners)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Examinator/Examiner', examiner_question, examiner_answers)
+    entries.append(quiz_question_entry(survey, index, 'multiple_dropdowns_question', 'Examinator/Examiner', examiner_question, examiner_answers))
     index += 1
 
     # examiner version 2
@@ -1213,7 +1060,7 @@ def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_course
     course_code_description=course_code_descriptions(PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish)
 
     #examiner_answers=potential_examiners_answer(examiners)
-    create_question_multiple_dropdowns(course_id, survey, index, 'Examinator/Examiner (version 2)', examiner_question2, examiner_answers2)
+    entries.append(quiz_question_entry(survey, index, 'multiple_dropdowns_question', 'Examinator/Examiner (version 2)', examiner_question2, examiner_answers2))
     index += 1
 
 
@@ -1266,27 +1113,29 @@ def create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_course
                         {'weight': 100, 'text': '30', 'blank_id': 'day'},
                         {'weight': 100, 'text': '31', 'blank_id': 'day'}]
 
-    create_question_multiple_dropdowns(course_id, survey, index, 'Startdatum/Planned start', start_date, start_date_answers)
+    entries.append(quiz_question_entry(survey, index, 'multiple_dropdowns_question', 'Startdatum/Planned start', start_date, start_date_answers))
     index += 1
 
     company='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">At a company, indicate name:</p></div><div id="fragment-2"><p lang="sv">På företag, ange vilket</p></div>'
-    create_question_essay(course_id, survey, index, 'På företag, ange vilket/At a company, indicate name', company)
+    entries.append(quiz_question_entry(survey, index, 'essay_question', 'På företag, ange vilket/At a company, indicate name', company))
     index += 1
 
     country='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1"><p lang="en">Outside Sweden, indic. Country (Enter two character country code)</p></div><div id="fragment-2"><p lang="sv">Utomlands, ange land (Ange landskod med två tecken)</p></div>'
-    create_question_short_answer_question(course_id, survey, index, 'Utomlands, ange land/Outside Sweden, indic. Country', country)
+    entries.append(quiz_question_entry(survey, index, 'short_answer_question', 'Utomlands, ange land/Outside Sweden, indic. Country', country))
     index += 1
 
     university='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">At another university</p></div><div id="fragment-2"><p lang="sv">P&aring; annan h&ouml;gskola</p></div></div>'
-    create_question_essay(course_id, survey, index, 'På annan högskola/At another university', university)
+    entries.append(quiz_question_entry(survey, index, 'essay_question', 'På annan högskola/At another university', university))
     index += 1
 
     contact='<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">P&aring; svenska</a></li></ul><div id="fragment-1"><p lang="en">Enter the name and contact details of your contact at a company, other university, etc.</p></div><div id="fragment-2"><p lang="sv">Ange namn, e-postadress och annan kontaktinformation f&ouml;r din kontaktperson vid f&ouml;retaget, det andra universitetet, eller motsvarande.</p></div></div>'
-    create_question_essay(course_id, survey, index, 'Kontaktperson/Contact person', contact)
+    entries.append(quiz_question_entry(survey, index, 'essay_question', 'Kontaktperson/Contact person', contact))
     index += 1
 
+    return entries
 
-def insert_column_name(course_id, column_name):
+
+def insert_column_name(course_id, column_name, position=None):
     global Verbose_Flag
 
     # Use the Canvas API to Create a custom gradebook column
@@ -1303,59 +1152,30 @@ def insert_column_name(course_id, column_name):
     if Verbose_Flag:
        print("url: {}".format(url))
     payload={'column[title]': column_name}
-    r = requests.post(url, headers = header, data=payload)
+    if position:
+        payload['column[position]']=position
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post creating custom column: {}".format(r.text))
     if r.status_code == requests.codes.ok:
         page_response=r.json()
         print("inserted column: {}".format(column_name))
-        return True
+        return page_response
     return False
 
 def list_custom_columns(course_id):
-    columns_found_thus_far=[]
     # Use the Canvas API to get the list of custom column for this course
     #GET /api/v1/courses/:course_id/custom_gradebook_columns
+    return canvas_client.list_custom_columns(course_id)
 
-    url = "{0}/courses/{1}/custom_gradebook_columns".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting custom_gradebook_columns: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            columns_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links['current']['url'] != r.links['last']['url']:  
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                columns_found_thus_far.append(p_response)
-
-    return columns_found_thus_far
-
-def create_custom_columns(course_id, cycle_number):
-    existing_columns=list_custom_columns(course_id)
-    print("existing_columns={}".format(existing_columns))
-
+def custom_columns_state(cycle_number):
     column_names=['Group', 'Course_code', 'Planned_start_date', 'Tentative_title', 'Prelim_description', 'Examiner', 'Supervisor', 'KTH_unit', 'Place', 'Contact', 'Student_approves_fulltext', 'TRITA', 'DiVA_URN', 'GA_Approval', 'Ladok_Final_grade_entered']
 
     if cycle_number == '2':
         column_names.remove('Group') # as 2nd cycle degree projects can only be done by individual students
 
-    for c in existing_columns:  # no need to insert existing columns
-        column_names.remove(c['title'])
-
-    for c in column_names:
-        insert_column_name(course_id, c)
+    # the positions keep the columns in this order, even though they are created concurrently
+    return [{'kind': 'custom_column', 'name': c, 'position': index+1} for index, c in enumerate(column_names)]
 
 def lookup_column_number(column_name, list_of_exiting_columns):
     for column in list_of_exiting_columns:
@@ -1383,7 +1203,7 @@ def put_custom_column_entries(course_id, column_number, user_id, data_to_store):
         print("url: " + url)
         
     payload={'column_data[content]': data_to_store}
-    r = requests.put(url, headers = header, data=payload)
+    r = canvas_client.put(url, data=payload)
 
     if Verbose_Flag:
         print("result of putting data into custom_gradebook_column: {}".format(r.text))
@@ -1397,71 +1217,49 @@ def put_custom_column_entries(course_id, column_number, user_id, data_to_store):
     return entries_found_thus_far
 
 def sections_in_course(course_id):
-    sections_found_thus_far=[]
     # Use the Canvas API to get the list of sections for this course
     #GET /api/v1/courses/:course_id/section
+    return canvas_client.sections_in_course(course_id)
+
+def create_section(course_id, section_name):
+    # Use the Canvas API to create a section for this course
+    #POST /api/v1/courses/:course_id/sections
 
     url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    #course_section[name]
+    payload={'course_section[name]': section_name}
+    r = canvas_client.post(url, data=payload)
+
     if Verbose_Flag:
-        print("result of getting sections: {}".format(r.text))
+        print("result of creating section: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            sections_found_thus_far.append(p_response)
-
-        # the following is needed when the reponse has been paginated
-        # i.e., when the response is split into pieces - each returning only some of the list of modules
-        # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-        while r.links['current']['url'] != r.links['last']['url']:  
-            r = requests.get(r.links['next']['url'], headers=header)  
-            page_response = r.json()  
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
-
-    return sections_found_thus_far
+        return r.json()
+    return None
 
 def create_sections_in_course(course_id, section_names):
     sections_found_thus_far=[]
 
-    # Use the Canvas API to create sections for this course
-    #POST /api/v1/courses/:course_id/sections
-
-    url = "{0}/courses/{1}/sections".format(baseUrl,course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
     for section_name in section_names:
-        #course_section[name]
-        payload={'course_section[name]': section_name}
-        r = requests.post(url, headers = header, data=payload)
-
-        if Verbose_Flag:
-            print("result of creating section: {}".format(r.text))
-
-        if r.status_code == requests.codes.ok:
-            page_response=r.json()
-
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
+        section=create_section(course_id, section_name)
+        if section:
+            sections_found_thus_far.append(section)
 
     return sections_found_thus_far
 
-def create_sections_for_examiners_and_programs(course_id, examiners, programs):
-    if Verbose_Flag:
-        print("create_sections_for_examiners_and_programs({0}, {1}, {2}".format(course_id, examiners, programs))
-    create_sections_in_course(course_id, sorted(examiners))
+def sections_state(examiners, programs):
+    section_names=sorted(examiners)
 
-    program_names=[]
     for s in programs:
-        program_names.append("Program: {0}-{1}".format(s, programs[s]['title_en'] ))
+        section_names.append("Program: {0}-{1}".format(s, programs[s]['title_en'] ))
+
+    # a section for student awaiting the assignment of an examiner
+    section_names.append("Awaiting Assignment of Examiner")
 
-    create_sections_in_course(course_id, program_names)
+    return [{'kind': 'section', 'name': name} for name in section_names]
 
 def create_course_page(course_id, page_title, page_contents):
     #Create page WikiPagesApiController#create
@@ -1478,15 +1276,14 @@ def create_course_page(course_id, page_title, page_contents):
                  'published': 'true'
                  }
     }
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     if Verbose_Flag:
         print("result of creating a page: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-    return page_response
+        return r.json()
+    return None
 
 def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
     # Use the Canvas API to create a module item in the course and module
@@ -1503,18 +1300,17 @@ def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
                }
     }
 
-    r = requests.post(url, headers = header, json = payload)
+    r = canvas_client.post(url, json = payload)
     if Verbose_Flag:
         print("result of creating module page item: {}".format(r.text))
 
     if r.status_code == requests.codes.ok:
         modules_response=r.json()
-        module_id=modules_response["id"]
-        return module_id
-    return  module_id
+        return modules_response["id"]
+    return None
 
 
-def create_basic_pages(course_id, cycle_number, existing_modules):
+def basic_pages_state(cycle_number):
     basic_pages={
         'Introduction': ['Welcome to Degree Project Course, second Cycle /Välkommen',
                          'Grants from KTH Opportunities Fund / Bidrag från KTH Opportunities Fund',
@@ -1882,37 +1678,24 @@ Om du har fått Fail på ditt examensarbete av någon orsak, t ex något problem
         '''
     }
 
-    for m in existing_modules:
-        if m['name'] == 'Gatekeeper protected module 1':
-            id_of_protected_module=m['id']
-
+    entries=[]
     for bp in basic_pages:
         if bp == 'Introduction':
-            module_id=check_for_module(course_id,  bp)
-            if not module_id:
-                module_id=create_module(course_id, bp, id_of_protected_module)
+            entries.append({'kind': 'module', 'name': bp, 'requires': 'Gatekeeper protected module 1'})
             pages_in_module=basic_pages[bp]
-            print("pages_in_module={}".format(pages_in_module))
+            if Verbose_Flag:
+                print("pages_in_module={}".format(pages_in_module))
 
             for p in pages_in_module:
-                if Verbose_Flag:
-                    print("p={}".format(p))
-                page_title=p
                 page_content=pages_content.get(p, [])
-                if Verbose_Flag:
-                    print("page_content={}".format(page_content))
-                if page_content:                 
-                    cp=create_course_page(course_id, page_title, page_content)
-                    if Verbose_Flag:
-                        print("cp={}".format(cp))
-                        print("page title={}".format(cp['title']))
-                        print("page url={}".format(cp['url']))
-                        print("page id={}".format(cp['page_id']))
-                    create_module_page_item(course_id, module_id, cp['page_id'], cp['title'], cp['url'])
+                if page_content:
+                    entries.append({'kind': 'page', 'name': p, 'body': page_content})
+                    entries.append(module_item_entry(bp, 'Page', p, p, None))
         else:
-            create_module(course_id, bp, None)
+            entries.append({'kind': 'module', 'name': bp})
+    return entries
 
-def create_basic_assignments(course_id):
+def basic_assignments_state():
     list_of_assignments={
         'Projekt Plan/Project plan':
         '''<div class="enhanceable_content tabs"><ul><li lang="en"><a href="#fragment-en">English</a></li><li lang="sv"><a href="#fragment-sv">På svenska</a></li></ul>
@@ -2142,44 +1925,22 @@ def create_basic_assignments(course_id):
 
 
 
+    entries=[]
     for a in list_of_assignments:
         description=list_of_assignments[a]
-        create_assignment_with_submission(course_id, a, '1.0', 'pass_fail', description)
+        entries.append(assignment_entry(a, 'online_upload', '1.0', 'pass_fail', description))
 
+    # as the entries are keyed by name, these replace the above entries for the same assignments
     for a in list_of_assignments_with_peer_reviews:
         description=list_of_assignments[a]
-        create_assignment_with_submission_with_peerreview(course_id, a, '1.0', 'pass_fail', description)
+        entries.append(assignment_entry(a, 'online_upload', '1.0', 'pass_fail', description, peer_reviews=True))
+
+    return entries
 
 def list_assignment_groups(course_id):
     # GET /api/v1/courses/:course_id/assignment_groups
-    assignment_groups_found_thus_far=[]
-
     url = "{0}/courses/{1}/assignment_groups".format(baseUrl, course_id)
-    if Verbose_Flag:
-        print("url: {}".format(url))
-
-    r = requests.get(url, headers = header)
-    if Verbose_Flag:
-        print("result of getting assignment groups: {}".format(r.text))
-
-    if r.status_code == requests.codes.ok:
-        page_response=r.json()
-
-        for p_response in page_response:  
-            assignment_groups_found_thus_far.append(p_response)
-
-            # the following is needed when the reponse has been paginated
-            # i.e., when the response is split into pieces - each returning only some of the list of assignments
-            # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
-            while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
-                if Verbose_Flag:
-                    print("result of getting assignment groups for a paginated response: {}".format(r.text))
-                page_response = r.json()  
-                for p_response in page_response:  
-                    assignment_groups_found_thus_far.append(p_response)
-
-    return assignment_groups_found_thus_far
+    return canvas_client.get_paginated_list(url)
 
 def create_assignment_group(course_id, name, position, group_weight, rules):
     # Use the Canvas API to create an assignment
@@ -2193,7 +1954,7 @@ def create_assignment_group(course_id, name, position, group_weight, rules):
              'group_weight': group_weight,
              'rules': rules,
     }
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment group: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -2205,23 +1966,9 @@ def create_assignment_group(course_id, name, position, group_weight, rules):
 
 
 
-def create_active_listening_assignments(course_id):
-    target_active_group=False
+def active_listening_state():
     target_active_group_name='Active lister group'
-
-    # check existing assignment groups
-    existing_assignment_groups=list_assignment_groups(course_id)
-
-    # create an assignment group if necessary
-    for ag in existing_assignment_groups:
-        if target_active_group_name == ag['name']:
-            target_active_group=ag['id']
-            break
-    if not target_active_group:
-        position=1
-        group_weight=0.0
-        rules=''
-        target_active_group=create_assignment_group(course_id, target_active_group_name, position, group_weight, rules)
+    entries=[{'kind': 'assignment_group', 'name': target_active_group_name, 'position': 1, 'group_weight': 0.0, 'rules': ''}]
     # create the two assignments for recording active listener participation
     assignment_name='aktiva deltagande/active listener'
     assignment_description='''
@@ -2240,7 +1987,10 @@ def create_active_listening_assignments(course_id):
 </div>'''
     for i in range(2):
         name="{1}:{0}".format(assignment_name, i+1)
-        create_assignment_with_textual_submission(course_id, name, '0.50', 'pass_fail', assignment_description, target_active_group)
+        entries.append(assignment_entry(name, 'online_text_entry', '0.50', 'pass_fail', assignment_description, group=target_active_group_name))
+    return entries
+
+assessment_quiz_title='Värdering av måluppfyllnad/Assessment of the achievement of objectives'
 
 def create_assessment_quiz(course_id, assignment_group_id):
     # Use the Canvas API to create a quiz
@@ -2270,7 +2020,7 @@ Masterexamen</p>
 <a href="https://intra.kth.se/regelverk/utbildning-forskning/grundutbildning/examensarbete/bilaga-a-bedomningsgrunder-och-kriterier-for-examensarbete-1.31698">https://intra.kth.se/regelverk/utbildning-forskning/grundutbildning/examensarbete/bilaga-a-bedomningsgrunder-och-kriterier-for-examensarbete-1.31698</a>
 </p>
 <p lang="sv">Värdering av måluppfyllnad görs i tabellen genom att beskriva hur målen har uppnåtts och ange vari examensarbetsrapporten de olika målen återfinns. Värderingen skall göras individuellt.</p></div></div>'''
-    payload={'quiz[title]': 'Värdering av måluppfyllnad/Assessment of the achievement of objectives',
+    payload={'quiz[title]': assessment_quiz_title,
              'quiz[description]': description,
              'quiz[quiz_type]': 'assignment', # this means it will be graded
              'quiz[hide_results]': '',
@@ -2281,7 +2031,7 @@ Masterexamen</p>
              'quiz[assignment_group_id]': assignment_group_id
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -2291,7 +2041,7 @@ Masterexamen</p>
         return page_response['id']
     return False
 
-def create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, English_text, Swedish_text):
+def assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, English_text, Swedish_text):
     base_string='<div class="enhanceable_content tabs"><ul>'
     if cycle_number == '2':
         lang_alternatives='<li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1">'
@@ -2309,13 +2059,13 @@ def create_assessment(course_id, assessment_quiz, index, cycle_number, objective
                                              {'text': 'VHQ/MHK', 'comments': '', 'comments_html': '', 'weight': 100.0, 'blank_id': 'Assessment'},
                                              {'text': 'IQ/BK', 'comments': '', 'comments_html': '', 'weight': 0.0, 'blank_id': 'Assessment'}]
 
-    create_question_multiple_choice_with_points(course_id, assessment_quiz, index, assessment_name, 
-                                                base_string+lang_alternatives+div_string,
-                                                assessment_answers, 1)
+    return quiz_question_entry(assessment_quiz, index, 'multiple_choice_question', assessment_name,
+                               base_string+lang_alternatives+div_string,
+                               assessment_answers, 1)
 
 
 
-def create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish):
+def substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish):
     base_string='<div class="enhanceable_content tabs"><ul>'
     if cycle_number == '2':
         lang_alternatives='<li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1">'
@@ -2326,9 +2076,9 @@ def create_substantiate_assessment(course_id, assessment_quiz, index, cycle_numb
 
     div_string='<h3><span  lang="en">' + objective_name_English + ': Substantiate Assessment</span></h3><p lang="en">Describe your self-assessment of the objective. Substantiate your statements with arguments.</p></div><div id="fragment-2"><h3><span  lang="sv">'+objective_name_Swedish+': Motivera bedömning</span></h3><p lang="sv">Här fyller studenten i sin självvärdering av målet. Argumentera.</p></div>'
 
-    create_question_essay(course_id, assessment_quiz, index, assessment_name, base_string+lang_alternatives+div_string) 
+    return quiz_question_entry(assessment_quiz, index, 'essay_question', assessment_name, base_string+lang_alternatives+div_string)
 
-def create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish):
+def assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish):
     base_string='<div class="enhanceable_content tabs"><ul>'
     if cycle_number == '2':
         lang_alternatives='<li lang="en"><a href="#fragment-1">English</a></li><li lang="sv"><a href="#fragment-2">På svenska</a></li></ul><div id="fragment-1">'
@@ -2340,35 +2090,19 @@ def create_assessment_reference(course_id, assessment_quiz, index, cycle_number,
 
     div_string='<h3><span  lang="en">' + objective_name_English + ': References</span></h3><p lang="en">Refer to the section and the page number in the degree project where the objective is addressed.</p></div><div id="fragment-2"><h3><span  lang="sv">'+objective_name_Swedish+': Hänvisning</span></h3><p lang="sv">Hänvisning till sektion och sidor i examensarbetet.</p></div>'
 
-    create_question_essay(course_id, assessment_quiz, index, assessment_name, base_string+lang_alternatives+div_string) 
+    return quiz_question_entry(assessment_quiz, index, 'essay_question', assessment_name, base_string+lang_alternatives+div_string)
 
 
-def create_assessments(course_id, cycle_number):
-    target_active_group=False
+def assessments_state(cycle_number):
+    # the quiz goes into the existing assignment group 'Assignments' (if there is no such group, the quiz is not created)
     target_active_group_name='Assignments'
 
-    # check existing assignment groups
-    existing_assignment_groups=list_assignment_groups(course_id)
-
-    # create an assignment group if necessary
-    for ag in existing_assignment_groups:
-        if target_active_group_name == ag['name']:
-            target_active_group=ag['id']
-            break
-    if not target_active_group:
-        print("Error - there is no Assignments group named {}".format(target_active_group_name))
-        sys.exit()
-
     index=1
-    assessment_quiz=create_assessment_quiz(course_id, target_active_group)
+    assessment_quiz=assessment_quiz_title
 
-    # add the quiz to the appropriate module page
-    module_id=check_for_module(course_id,  'Gatekeeper protected module 1')
-    if Verbose_Flag:
-        print("found module to place the quiz in is module_id: {}".format(module_id))
-    q_module_id=create_module_quiz_item(course_id, module_id, assessment_quiz, 'Värdering av måluppfyllnad/Assessment of the achievement of objectives', 40)
-    if Verbose_Flag:
-        print("placed the quiz into module as module item id: {}".format(q_module_id))
+    # the quiz is placed in the access controlled module
+    entries=[{'kind': 'quiz', 'name': assessment_quiz, 'quiz_type': 'assignment', 'group': target_active_group_name},
+             module_item_entry('Gatekeeper protected module 1', 'Quiz', assessment_quiz, assessment_quiz_title, 40)]
 
     # Process P1
     objective_name_English='Process - Objective P1'
@@ -2416,13 +2150,13 @@ Mycket god förmåga att med helhetssyn kritiskt, självständigt och kreativt i
 </tr>
 </tbody>
 </table>'''
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     # Process P2
@@ -2474,13 +2208,13 @@ Om anpassningar har varit nödvändiga vid genomförandet av arbetet ska ha doku
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     # Process P3
@@ -2526,13 +2260,13 @@ Om anpassningar har varit nödvändiga vid genomförandet av arbetet ska ha doku
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
 
@@ -2585,13 +2319,13 @@ Litteratursammanställning samt reflektion över arbetets koppling till tillhör
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV2'
@@ -2635,13 +2369,13 @@ Examensarbetet inklusive skrivet material använder en djup och bred metodkunska
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV3'
@@ -2686,13 +2420,13 @@ Deltar i forsknings- och utvecklingsarbete och bidrar till kunskapsutvecklingen
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV4'
@@ -2734,13 +2468,13 @@ Deltar i forsknings- och utvecklingsarbete och bidrar till kunskapsutvecklingen
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV5'
@@ -2784,13 +2518,13 @@ Redovisar och motiverar arbetet och diskuterar resultat utifrån ett perspektiv
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV6'
@@ -2836,13 +2570,13 @@ Redovisar etiska konsekvenser av utfört arbete.</td>
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     objective_name_English='Engineering-related and scientific content - Objective IV7'
@@ -2886,13 +2620,13 @@ Dessa stödinsatser har varit för omfattande för att kunna garantera att stude
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
     # Presentation
@@ -2948,15 +2682,17 @@ Den skriftliga oppositionen har dessutom givits sådana relevanta och realistisk
 </tbody>
 </table>'''
 
-    create_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish)
+    entries.append(assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish, objective_text_English, objective_text_Swedish))
     index += 1
 
-    create_substantiate_assessment(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(substantiate_assessment_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
-    create_assessment_reference(course_id, assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish)
+    entries.append(assessment_reference_entry(assessment_quiz, index, cycle_number, objective_name_English, objective_name_Swedish))
     index += 1
 
+    return entries
+
 
 def list_root_outcome_groups_for_couurse(course_id):
     # Use the Canvas API to get the root outcome group for the course
@@ -2966,7 +2702,7 @@ def list_root_outcome_groups_for_couurse(course_id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting root outcome group: {}".format(r.text))
 
@@ -2985,7 +2721,7 @@ def list_outcomes_groups(course_id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting outcome groups: {}".format(r.text))
 
@@ -2999,7 +2735,7 @@ def list_outcomes_groups(course_id):
             # i.e., when the response is split into pieces - each returning only some of the list of assignments
             # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
             while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
+                r = canvas_client.get(r.links['next']['url'])  
                 if Verbose_Flag:
                     print("result of getting outcome groups for a paginated response: {}".format(r.text))
                 page_response = r.json()  
@@ -3017,7 +2753,7 @@ def list_outcomes_subgroups(course_id, subgroup_id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting outcome subgroup: {}".format(r.text))
 
@@ -3031,7 +2767,7 @@ def list_outcomes_subgroups(course_id, subgroup_id):
             # i.e., when the response is split into pieces - each returning only some of the list of assignments
             # see "Handling Pagination" - Discussion created by tyler.clair@usu.edu on Apr 27, 2015, https://community.canvaslms.com/thread/1500
             while r.links['current']['url'] != r.links['last']['url']:  
-                r = requests.get(r.links['next']['url'], headers=header)  
+                r = canvas_client.get(r.links['next']['url'])  
                 if Verbose_Flag:
                     print("result of getting outcome subgroups for a paginated response: {}".format(r.text))
                 page_response = r.json()  
@@ -3065,7 +2801,7 @@ def create_outcomes_subgroup(course_id, group_id, name, description):
              #'vendor_guid': xxx,
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of creating outcomean  subgroup: {}".format(r.text))
 
@@ -3082,7 +2818,7 @@ def list_outcome(id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting outcome: {}".format(r.text))
 
@@ -3128,7 +2864,7 @@ def create_one_outcome(course_id, group_id, name, description, display_name, rat
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of creating an outcome: {}".format(r.text))
 
@@ -3148,7 +2884,7 @@ def list_rubrics(course_id):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = canvas_client.get(url)
     if Verbose_Flag:
         print("result of getting rubrics: {}".format(r.text))
 
@@ -3206,7 +2942,7 @@ def create_a_rubric_for_an_assignment(course_id, assignment_id, outcome_id, name
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of creating a rubric: {}".format(r.text))
 
@@ -3297,6 +3033,266 @@ def create_outcomes_and_rubrics(course_id):
     if Verbose_Flag:
         print("Pres1 outcome_result={}".format(outcome_result))
     
+#----------------------------------------------------------------------
+# The state of the course as data
+#----------------------------------------------------------------------
+# Each entry is a dict with a 'kind' and a 'name' (for a module item the title and the name of its module, for a quiz
+# question the name and the title of its quiz). The rest of the entry holds what is needed to create it.
+
+def assignment_entry(name, submission, points, grading_type, description, group=None, peer_reviews=False):
+    return {'kind': 'assignment', 'name': name, 'submission': submission, 'points': points, 'grading_type': grading_type,
+            'description': description, 'group': group, 'peer_reviews': peer_reviews}
+
+def module_item_entry(module, item_type, content, title, points):
+    return {'kind': 'module_item', 'module': module, 'type': item_type, 'content': content, 'title': title, 'points': points}
+
+def quiz_question_entry(quiz, index, question_type, name, question_text, answers=None, points=None):
+    return {'kind': 'quiz_question', 'quiz': quiz, 'position': index, 'question_type': question_type, 'name': name,
+            'question_text': question_text, 'answers': answers, 'points': points}
+
+def entry_key(e):
+    if e['kind'] == 'module_item':
+        return (e['kind'], e['module'], e['title'])
+    if e['kind'] == 'quiz_question':
+        return (e['kind'], e['quiz'], e['name'])
+    return (e['kind'], e['name'])
+
+def entry_name(key):
+    return ' / '.join(key[1:])
+
+# module items, modules, and assignments are created in order, as the order they are created in is the order they are shown in
+def entry_chain(e):
+    if e['kind'] == 'module_item':
+        return (e['kind'], e['module'])
+    if e['kind'] == 'module':
+        return (e['kind'],)
+    if e['kind'] == 'assignment':
+        return (e['kind'], e['group'])
+    return None
+
+content_kind={'Assignment': 'assignment', 'Quiz': 'quiz', 'Page': 'page'}
+
+# the keys of the entries that have to exist before this entry can be created
+# (in addition, an entry with an 'after' key waits until the previous entry in its chain has been created or has failed)
+def entry_dependencies(e):
+    dependencies=[]
+    if e['kind'] == 'module' and e.get('requires'):
+        dependencies.append(('module', e['requires']))
+    elif e['kind'] in ['assignment', 'quiz'] and e.get('group'):
+        dependencies.append(('assignment_group', e['group']))
+    elif e['kind'] == 'module_item':
+        dependencies.append(('module', e['module']))
+        dependencies.append((content_kind[e['type']], e['content']))
+    elif e['kind'] == 'quiz_question':
+        dependencies.append(('quiz', e['quiz']))
+    return dependencies
+
+# kind -> (path of the list in the course, field with the name)
+state_lists={'module':           ('modules?include[]=items', 'name'),
+             'assignment':       ('assignments', 'name'),
+             'assignment_group': ('assignment_groups', 'name'),
+             'page':             ('pages', 'title'),
+             'section':          ('sections', 'name'),
+             'custom_column':    ('custom_gradebook_columns', 'title'),
+             'quiz':             ('quizzes', 'title')}
+
+# Fetch the lists of objects of the kinds needed for the desired entries (concurrently) and return a dict of key -> object
+# If any of the lists cannot be fetched completely, None is returned, as a partial list would make existing objects
+# look missing and they would be created again.
+def current_state(course_id, desired):
+    kinds=set()
+    for e in desired:
+        for key in [entry_key(e)]+entry_dependencies(e):
+            kinds.add({'module_item': 'module', 'quiz_question': 'quiz'}.get(key[0], key[0]))
+    kinds=sorted(kinds)
+
+    urls=["{0}/courses/{1}/{2}".format(baseUrl, course_id, state_lists[kind][0]) for kind in kinds]
+    state=dict()
+    modules_without_items=[]
+    lists=canvas_client.get_paginated_lists(urls, strict=True)
+    if any(objects is None for objects in lists):
+        return None
+    for kind, objects in zip(kinds, lists):
+        name_field=state_lists[kind][1]
+        for o in objects:
+            state[(kind, o[name_field])]=o
+            if kind == 'module':
+                # Canvas leaves out the items of modules with many items
+                if 'items' in o:
+                    for item in o['items']:
+                        state[('module_item', o['name'], item['title'])]=item
+                else:
+                    modules_without_items.append(o)
+
+    if modules_without_items:
+        urls=[m['items_url'] for m in modules_without_items]
+        lists=canvas_client.get_paginated_lists(urls, strict=True)
+        if any(items is None for items in lists):
+            return None
+        for m, items in zip(modules_without_items, lists):
+            for item in items:
+                state[('module_item', m['name'], item['title'])]=item
+
+    # the questions are only needed for the quizzes that already exist
+    quizzes=sorted({e['quiz'] for e in desired if e['kind'] == 'quiz_question' and ('quiz', e['quiz']) in state})
+    if quizzes:
+        urls=["{0}/courses/{1}/quizzes/{2}/questions".format(baseUrl, course_id, state[('quiz', q)]['id']) for q in quizzes]
+        lists=canvas_client.get_paginated_lists(urls, strict=True)
+        if any(questions is None for questions in lists):
+            return None
+        for q, questions in zip(quizzes, lists):
+            for question in questions:
+                state[('quiz_question', q, question['question_name'])]=question
+
+    if Verbose_Flag:
+        print("current state has {} objects".format(len(state)))
+    return state
+
+# returns the entries that are missing from the course and the current state of the course (None, None if the state
+# could not be fetched)
+def plan(course_id, desired):
+    entries=dict()
+    for e in desired:           # a later entry replaces an earlier entry with the same key
+        entries[entry_key(e)]=dict(e)
+    desired=list(entries.values())
+
+    previous=dict()
+    for e in desired:
+        chain=entry_chain(e)
+        if chain is None:
+            continue
+        if chain in previous:
+            e['after']=previous[chain]
+        previous[chain]=entry_key(e)
+
+    state=current_state(course_id, desired)
+    if state is None:
+        return None, None
+    missing=[e for e in desired if entry_key(e) not in state]
+    return missing, state
+
+def print_plan(missing):
+    if not missing:
+        print("Nothing to create, the course is already set up")
+        return
+    print("{} things to create:".format(len(missing)))
+    for e in missing:
+        print("  {0}: {1}".format(e['kind'], entry_name(entry_key(e))))
+
+def create_quiz_question(course_id, quiz_id, e):
+    question_type=e['question_type']
+    if question_type == 'true_false_question':
+        return create_question_boolean(course_id, quiz_id, e['position'], e['name'], e['question_text'], e['answers'])
+    if question_type == 'multiple_choice_question':
+        if e['points'] is None:
+            return create_question_multiple_choice(course_id, quiz_id, e['position'], e['name'], e['question_text'], e['answers'])
+        return create_question_multiple_choice_with_points(course_id, quiz_id, e['position'], e['name'], e['question_text'], e['answers'], e['points'])
+    if question_type == 'multiple_dropdowns_question':
+        if e['points'] is None:
+            return create_question_multiple_dropdowns(course_id, quiz_id, e['position'], e['name'], e['question_text'], e['answers'])
+        return create_question_multiple_dropdowns_with_points(course_id, quiz_id, e['position'], e['name'], e['question_text'], e['answers'], e['points'])
+    if question_type == 'essay_question':
+        return create_question_essay(course_id, quiz_id, e['position'], e['name'], e['question_text'])
+    if question_type == 'short_answer_question':
+        return create_question_short_answer_question(course_id, quiz_id, e['position'], e['name'], e['question_text'])
+    print("Unknown question type {}".format(question_type))
+    return None
+
+# create what the entry describes, refs contains the existing and already created objects, returns the new object or None
+def create_entry(course_id, e, refs):
+    kind=e['kind']
+    if kind == 'module':
+        if e.get('gatekeeper'):
+            result=create_gatekeeper_module(course_id, e['name'])
+        elif e.get('requires'):
+            result=create_module(course_id, e['name'], refs[('module', e['requires'])]['id'])
+        else:
+            result=create_module(course_id, e['name'], None)
+    elif kind == 'assignment':
+        if e['submission'] == 'none':
+            result=create_assignment(course_id, e['name'], e['points'], e['grading_type'], e['description'])
+        elif e['submission'] == 'online_text_entry':
+            result=create_assignment_with_textual_submission(course_id, e['name'], e['points'], e['grading_type'], e['description'],
+                                                             refs[('assignment_group', e['group'])]['id'])
+        elif e['peer_reviews']:
+            result=create_assignment_with_submission_with_peerreview(course_id, e['name'], e['points'], e['grading_type'], e['description'])
+        else:
+            result=create_assignment_with_submission(course_id, e['name'], e['points'], e['grading_type'], e['description'])
+    elif kind == 'assignment_group':
+        result=create_assignment_group(course_id, e['name'], e['position'], e['group_weight'], e['rules'])
+    elif kind == 'quiz':
+        if e['quiz_type'] == 'survey':
+            result=create_survey_quiz(course_id)
+        else:
+            result=create_assessment_quiz(course_id, refs[('assignment_group', e['group'])]['id'])
+    elif kind == 'quiz_question':
+        result=create_quiz_question(course_id, refs[('quiz', e['quiz'])]['id'], e)
+    elif kind == 'module_item':
+        module_id=refs[('module', e['module'])]['id']
+        content=refs[(content_kind[e['type']], e['content'])]
+        if e['type'] == 'Page':
+            result=create_module_page_item(course_id, module_id, content['page_id'], e['title'], content['url'])
+        elif e['type'] == 'Quiz':
+            result=create_module_quiz_item(course_id, module_id, content['id'], e['title'], e['points'])
+        else:
+            result=create_module_assignment_item(course_id, module_id, content['id'], e['title'], e['points'])
+    elif kind == 'page':
+        result=create_course_page(course_id, e['name'], e['body'])
+    elif kind == 'section':
+        result=create_section(course_id, e['name'])
+    elif kind == 'custom_column':
+        result=insert_column_name(course_id, e['name'], e['position'])
+    else:
+        print("Unknown kind of entry {}".format(kind))
+        result=None
+
+    if not result:
+        return None
+    if isinstance(result, dict):
+        return result
+    return {'id': result}
+
+# Create the missing entries, in waves: each wave creates (concurrently) all of the entries whose dependencies exist.
+# Returns the entries that could not be created.
+def apply_plan(course_id, missing, state):
+    refs=dict(state)
+    pending={entry_key(e): e for e in missing}
+    failed=[]
+    while pending:
+        ready=[]
+        blocked=False
+        for key, e in list(pending.items()):
+            unmet=[d for d in entry_dependencies(e) if d not in refs]
+            if not unmet:
+                if e.get('after') not in pending:
+                    ready.append(e)
+            elif not any(d in pending for d in unmet):
+                print("Unable to create {0} {1} as there is no {2}".format(e['kind'], entry_name(key),
+                                                                        ', '.join(["{0} {1}".format(d[0], entry_name(d)) for d in unmet])))
+                failed.append(pending.pop(key))
+                blocked=True
+        if not ready:
+            if not blocked:     # the remaining entries depend on each other
+                print("Unable to order the creation of: {}".format(', '.join([entry_name(key) for key in pending])))
+                failed.extend(pending.values())
+                break
+            continue
+
+        if Verbose_Flag:
+            print("creating {} things".format(len(ready)))
+        with ThreadPoolExecutor(max_workers=canvas_client.max_workers) as executor:
+            results=list(executor.map(lambda e: create_entry(course_id, e, refs), ready))
+
+        for e, result in zip(ready, results):
+            key=entry_key(e)
+            pending.pop(key)
+            if result:
+                refs[key]=result
+            else:
+                print("Unable to create {0} {1}".format(e['kind'], entry_name(key)))
+                failed.append(e)
+    return failed
+
 def main():
     global Verbose_Flag
 
@@ -3370,6 +3366,13 @@ def main():
     )
 
 
+    parser.add_option('-P', '--plan',
+                      dest="plan",
+                      default=False,
+                      action="store_true",
+                      help="only show what would be created"
+    )
+
     parser.add_option('-t', '--testing',
                       dest="testing",
                       default=False,
@@ -3440,13 +3443,9 @@ def main():
             relevant_courses_English=all_data['relevant_courses_English']
             relevant_courses_Swedish=all_data['relevant_courses_Swedish']
 
+    desired=[]
     if options.modules:
-        create_basic_modules(course_id)
-
-    existing_modules=list_modules(course_id)
-    if Verbose_Flag:
-        if existing_modules:
-            print("existing_modules={0}".format(existing_modules))
+        desired.extend(basic_modules_state())
 
     if options.survey or options.sections:
         if Verbose_Flag:
@@ -3467,27 +3466,35 @@ def main():
                 all_examiners.add(e)
 
     if options.survey:
-        create_survey(course_id, cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, all_examiners, all_course_examiners)
+        desired.extend(survey_state(cycle_number, school_acronym, PF_courses, AF_courses, relevant_courses_English, relevant_courses_Swedish, all_examiners, all_course_examiners))
 
     if options.sections:
-        create_sections_for_examiners_and_programs(course_id, all_examiners, programs_in_the_school_with_titles)
-        # create a section for student awaiting the assignment of an examiner
-        create_sections_in_course(course_id, ["Awaiting Assignment of Examiner"])
+        desired.extend(sections_state(all_examiners, programs_in_the_school_with_titles))
 
     if options.columns:
-        create_custom_columns(course_id, cycle_number)
-        
-    if options.pages:
-        create_basic_pages(course_id, cycle_number, existing_modules)
-        
-    if options.assignments:
-        create_basic_assignments(course_id)
-        create_active_listening_assignments(course_id)
+        desired.extend(custom_columns_state(cycle_number))
 
-        # the following creates the self-assessment quiz
-        create_assessments(course_id, cycle_number)
+    if options.pages:
+        desired.extend(basic_pages_state(cycle_number))
 
-    if options.objectives:
+    if options.assignments:
+        desired.extend(basic_assignments_state())
+        desired.extend(active_listening_state())
+
+        # the following is the self-assessment quiz
+        desired.extend(assessments_state(cycle_number))
+
+    if desired:
+        missing, state=plan(course_id, desired)
+        if state is None:
+            print("Unable to get the current state of the course, so nothing has been created")
+            sys.exit(1)
+        print_plan(missing)
+        if missing and not options.plan:
+            failed=apply_plan(course_id, missing, state)
+            print("created {0} of {1}".format(len(missing)-len(failed), len(missing)))
+
+    if options.objectives and not options.plan:
         print("Objectives to be implemented")
         create_outcomes_and_rubrics(course_id)
 
@@ -3506,5 +3513,7 @@ def main():
         result=create_a_rubric_for_an_assignment(course_id, presentation_assignment_id, outcome_id, 'Presentation outcome', 'Just a short description of the presentation outcome')
         print("result is {}".format(result))
 
+    canvas_client.report()
+
 if __name__ == "__main__": main()
 
@@ -50,8 +50,14 @@
 #
 # 2019.01.05
 #
+# 2026-10-18 the writes to Canvas go through canvas_client.py's scheduler, and the sections are created concurrently
+#
 
 import requests, time
+
+import canvas_client            # shared, pooled Canvas REST client
+import http_cache
+from concurrent.futures import ThreadPoolExecutor
 import pprint
 import optparse
 import sys
@@ -88,7 +94,7 @@ def v1_get_programmes():
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 programme: {}".format(r.text))
     #
@@ -151,7 +157,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -179,7 +185,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -197,7 +203,7 @@ def get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course info: {}".format(r.text))
     #
@@ -232,7 +238,7 @@ def get_course_rounds_info(course_code, r_info):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course round info: {}".format(r.text))
     #
@@ -251,7 +257,7 @@ def v1_get_course_info(course_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting v1 course info: {}".format(r.text))
     #
@@ -312,8 +318,11 @@ def course_examiners(courses):
     global Verbose_Flag
     # get the examiners
     courses_info=dict()
-    for c in courses:
-        c_info=v1_get_course_info(c)
+    courses=list(courses)
+    # the course information is fetched concurrently (and is then kept in the HTTP cache), only the parsing is serial
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        courses_xml=list(executor.map(v1_get_course_info, courses))
+    for c, c_info in zip(courses, courses_xml):
         xml=BeautifulSoup(c_info, "lxml")
         examiners=list()
         for examiner in xml.findAll('examiner'):
@@ -436,7 +445,7 @@ def programme_syllabi(program_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting programme_syllabi: {}".format(r.text))
     #
@@ -505,7 +514,7 @@ def target_group_for_course(course_code):
     if Verbose_Flag:
         print("url: " + url)
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting course information: {}".format(r.text))
     #
@@ -655,6 +664,7 @@ def initialize(options):
 
                      header = {'Authorization' : 'Bearer ' + access_token}
                      payload = {}
+                     canvas_client.configure(baseUrl, header, verbose=Verbose_Flag)
        except:
               print("Unable to open configuration file named {}".format(config_file))
               print("Please create a suitable configuration file, the default name is config.json")
@@ -840,7 +850,7 @@ def create_assignment(course_id, name, max_points, grading_type, description):
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -884,7 +894,7 @@ def create_assignment_with_submission(course_id, name, max_points, grading_type,
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -915,7 +925,7 @@ def create_assignment_with_textual_submission(course_id, name, max_points, gradi
              'assignment[published]': 'true' # if not published it will not be in the gradebook
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -941,7 +951,7 @@ def create_module_assignment_item(course_id, module_id, assignment_id, item_name
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -997,7 +1007,7 @@ def create_module(course_id, module_name, requires_module_id):
     else:
         payload = {'module[name]': module_name
         }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -1018,7 +1028,7 @@ def create_gatekeeper_module(course_id, module_name):
                'module[position]': 1,
                'module[require_sequential_progress]': True
     }
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -1126,7 +1136,7 @@ def create_survey_quiz(course_id):
              'quiz[published]': True
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1163,7 +1173,7 @@ def create_quiz_question_group(course_id, quiz_id, question_group_name):
 
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     print("result of post creating question group: {}".format(r.text))
     print("r.status_code={}".format(r.status_code))
@@ -1205,7 +1215,7 @@ def create_question_boolean(course_id, quiz_id, index, name, question_text, answ
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1236,7 +1246,7 @@ def create_question_multiple_choice(course_id, quiz_id, index, name, question_te
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1268,7 +1278,7 @@ def create_question_multiple_choice_with_points(course_id, quiz_id, index, name,
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1298,7 +1308,7 @@ def create_question_essay(course_id, quiz_id, index, name, question_text):
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1326,7 +1336,7 @@ def create_question_short_answer_question(course_id, quiz_id, index, name, quest
              }
     }
 
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1360,7 +1370,7 @@ def create_question_multiple_dropdowns(course_id, quiz_id, index, name, question
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1394,7 +1404,7 @@ def create_question_multiple_dropdowns_with_points(course_id, quiz_id, index, na
     }
     if Verbose_Flag:
         print("payload={}".format(payload))
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
     if Verbose_Flag:
         print("result of post making a question: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -1418,7 +1428,7 @@ def create_module_quiz_item(course_id, module_id, quiz_id, item_name, points):
 
     }
 
-    r = requests.post(url, headers = header, data = payload)
+    r = canvas_client.post(url, data = payload)
     if Verbose_Flag:
         print("result of creating module: {}".format(r.text))
 
@@ -1571,7 +1581,7 @@ def insert_column_name(course_id, column_name):
     if Verbose_Flag:
        print("url: {}".format(url))
     payload={'column[title]': column_name}
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post creating custom column: {}".format(r.text))
     if r.status_code == requests.codes.ok:
@@ -1665,19 +1675,23 @@ def create_sections_in_course(course_id, section_names):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    for section_name in section_names:
+    # the sections are created concurrently, canvas_client's scheduler decides how many are sent at once
+    def create_section(section_name):
         #course_section[name]
         payload={'course_section[name]': section_name}
-        r = requests.post(url, headers = header, data=payload)
+        r = canvas_client.post(url, data=payload)
 
         if Verbose_Flag:
             print("result of creating section: {}".format(r.text))
 
         if r.status_code == requests.codes.ok:
-            page_response=r.json()
+            return r.json()
+        print("Unable to create section {0}, status code {1}".format(section_name, r.status_code))
+        return None
 
-            for p_response in page_response:  
-                sections_found_thus_far.append(p_response)
+    for section in canvas_client.run_concurrently(create_section, section_names):
+        if section:
+            sections_found_thus_far.append(section)
 
     return sections_found_thus_far
 
@@ -1707,7 +1721,7 @@ def create_course_page(course_id, page_title, page_contents):
                  'published': 'true'
                  }
     }
-    r = requests.post(url, headers = header, json=payload)
+    r = canvas_client.post(url, json=payload)
 
     if Verbose_Flag:
         print("result of creating a page: {}".format(r.text))
@@ -1732,7 +1746,7 @@ def create_module_page_item(course_id, module_id, page_id, item_name, page_url):
                }
     }
 
-    r = requests.post(url, headers = header, json = payload)
+    r = canvas_client.post(url, json = payload)
     if Verbose_Flag:
         print("result of creating module page item: {}".format(r.text))
 
@@ -2396,7 +2410,7 @@ def create_assignment_group(course_id, name, position, group_weight, rules):
              'group_weight': group_weight,
              'rules': rules,
     }
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making an assignment group: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -2484,7 +2498,7 @@ Masterexamen</p>
              'quiz[assignment_group_id]': assignment_group_id
     }
 
-    r = requests.post(url, headers = header, data=payload)
+    r = canvas_client.post(url, data=payload)
     if Verbose_Flag:
         print("result of post making a quiz: {}".format(r.text))
         print("r.status_code={}".format(r.status_code))
@@ -3365,5 +3379,7 @@ def main():
     if options.testing:
         print("testing for course_id={}".format(course_id))
 
+    canvas_client.report()
+
 if __name__ == "__main__": main()
 
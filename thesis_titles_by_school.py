@@ -16,6 +16,9 @@
 # Example:
 #./thesis_titles_by_school.py -s EECS
 #
+# Each student's attested results are fetched only once per run and the requests to LADOK are made
+# concurrently by a pool of threads (see harvest_thesis_titles()); use -w/--workers to set the size of the pool.
+#
 #
 # 
 # 2021-07-15 G. Q. Maguire Jr.
@@ -26,6 +29,7 @@ import ladok3
 import ladok3.kth
 import pprint
 import requests, time
+import http_cache
 import json
 import argparse
 import sys
@@ -39,6 +43,8 @@ import pandas as pd
 
 from bs4 import BeautifulSoup
 
+from concurrent.futures import ThreadPoolExecutor
+
 global canvas_baseUrl	# the base URL used for access to Canvas
 global canvas_header	# the header for all HTML requests
 global canvas_payload	# place to store additionally payload when needed for options to HTML requests
@@ -158,7 +164,7 @@ def get_dept_codes(language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting department codes: {}".format(r.text))
     #
@@ -186,7 +192,7 @@ def get_dept_courses(dept_code, language_code):
     if Verbose_Flag:
         print("url: {}".format(url))
     #
-    r = requests.get(url)
+    r = http_cache.get(url)
     if Verbose_Flag:
         print("result of getting courses for a department: {}".format(r.text))
     #
@@ -411,6 +417,108 @@ def get_titles_of_all_thesis(ladok, ladok_student_id):
     return theses
 
 
+######################################################################
+# Harvesting the thesis information for all of the degree project courses
+#
+# Each student's attested results (StudentresultatPerKurs) are fetched only once per run, even if the student
+# appears in several course rounds or under several course codes, and the theses are then filtered by course code
+# locally. The fetches of the course rounds, the participants of each round, and the students' results are done by
+# a bounded pool of threads that share the LADOK session.
+######################################################################
+def completed_participants_of_round(ladok, course_round_id):
+    return [student for student in ladok.participants_JSON(course_round_id) if student['Avklarad']]
+
+def titles_of_all_thesis_or_none(ladok, ladok_student_id):
+    try:
+        return get_titles_of_all_thesis(ladok, ladok_student_id)
+    except Exception as e:
+        print("Error getting the results for student {0}: {1}".format(ladok_student_id, e))
+        return None
+
+# returns the rows of the spreadsheet for one student in a course round of course_code
+def thesis_rows_for_student(student, course_code, theses):
+    rows=list()
+    integration_id=student['Student']['Uid']
+    first_name=student['Student'].get('Fornamn')
+    last_name=student['Student'].get('Efternamn')
+    for info in theses:
+        thesis_course_code=info.get('course_code')
+        if thesis_course_code != course_code: # if this is not the degree project course code we are looking for, skip it.
+            continue
+        student_info=dict()
+        student_info['integration_id']=integration_id
+        if first_name:
+            student_info['first_name']=first_name
+        if last_name:
+            student_info['last_name']=last_name
+        date=info.get('Examinationsdatum')
+        if date:
+            student_info['date']=date
+        if thesis_course_code:
+            student_info['course_code']=thesis_course_code
+        title=info['titles'].get('Titel')
+        if title:
+            student_info['title']=title
+        alt_title=info['titles'].get('AlternativTitel')
+        if alt_title:
+            student_info['alt_title']=alt_title
+        examiner=info.get('Examiner')
+        if examiner:
+            student_info['Examiner']=examiner
+        moment=info.get('moment')
+        if moment:
+            student_info['moment']=moment
+        grade=info.get('Grade')
+        if grade:
+            student_info['Grade']=grade
+        rows.append(student_info)
+    return rows
+
+def harvest_thesis_titles(ladok, degree_project_course_codes, workers=8, limit=None):
+    degree_project_course_codes=sorted(degree_project_course_codes)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # the course rounds of each course code
+        rounds_per_code=list(executor.map(lambda c: ladok.search_course_rounds(code=c), degree_project_course_codes))
+        work=list()             # (course_code, round_id) in the order in which they were processed before
+        course_rounds_already_processed=set()
+        for course_code, course_rounds in zip(degree_project_course_codes, rounds_per_code):
+            if Verbose_Flag:
+                print("course_code={0} course_rounds={1}".format(course_code, course_rounds))
+            for course_round in course_rounds:
+                if course_round.round_id in course_rounds_already_processed:
+                    continue
+                course_rounds_already_processed.add(course_round.round_id)
+                work.append((course_code, course_round.round_id))
+        print("{0} course rounds for {1} course codes".format(len(work), len(degree_project_course_codes)))
+
+        # the students who have completed each round
+        participants=list(executor.map(lambda w: completed_participants_of_round(ladok, w[1]), work))
+        student_ids=list()
+        students_already_processed=set()
+        for students in participants:
+            for student in students:
+                student_id=student['Student']['Uid']
+                if student_id not in students_already_processed:
+                    students_already_processed.add(student_id)
+                    student_ids.append(student_id)
+        if limit:
+            student_ids=student_ids[:limit]
+        print("{0} students to look up".format(len(student_ids)))
+
+        # each student's results, fetched once
+        theses_by_student=dict(zip(student_ids, executor.map(lambda i: titles_of_all_thesis_or_none(ladok, i), student_ids)))
+
+    list_of_student_info=list()
+    for (course_code, round_id), students in zip(work, participants):
+        for student in students:
+            theses=theses_by_student.get(student['Student']['Uid'])
+            if Verbose_Flag:
+                print("student={0} theses={1}".format(student, theses))
+            if theses:
+                list_of_student_info.extend(thesis_rows_for_student(student, course_code, theses))
+    return list_of_student_info
+
+
 def get_student_courses(ladok, student_id):
     r = ladok.session.get(
         url=ladok.base_gui_proxy_url +
@@ -536,6 +644,7 @@ def main(argv):
     global Verbose_Flag
     global testing
     global course_id
+    global ladok
 
 
     argp = argparse.ArgumentParser(description="thesis_titles_by_school.py: to collect thesis titles")
@@ -557,6 +666,9 @@ def main(argv):
     argp.add_argument('-s', '--school', type=str, default='EECS',
                       help="acronyms for a school within KTH")
 
+    argp.add_argument('-w', '--workers', type=int, default=8,
+                      help="number of concurrent requests to LADOK")
+
     args = vars(argp.parse_args(argv))
     Verbose_Flag=args["verbose"]
 
@@ -601,82 +713,11 @@ def main(argv):
         ls = ladok3.kth.LadokSession(os.environ["KTH_LOGIN"], os.environ["KTH_PASSWD"]) # for the production LADOK
 
 
-    list_of_student_info=list()
-    students_already_processed=set()
-    course_rounds_already_processed=set()
-    number_found=0
-    for course_code in degree_project_course_codes:
-        print("course_code={}".format(course_code))
-        course_rounds=ls.search_course_rounds(code=course_code)
-        if Verbose_Flag:
-            print("course_rounds={}".format(course_rounds))
-
-        for course_round in course_rounds:
-            course_start = course_round.start
-            course_length = course_round.end - course_start
-
-            print("course_round.round_id={}".format(course_round.round_id))
-            if course_round.round_id in course_rounds_already_processed:
-                continue
+    # the helper functions use the global ladok
+    ladok=ls
 
-            course_rounds_already_processed.add(course_round.round_id)
-            for student in ladok.participants_JSON(course_round.round_id):
-                if student['Avklarad']: # if the student completed the course, then look for the titles
-                    if Verbose_Flag:
-                        print("student={}".format(student))
-
-                    integration_id=student['Student']['Uid']
-                    # since we later check for only the matching course_code, we need to consider the author again
-                    # if integration_id in students_already_processed: # skip students that have already been processed
-                    #     continue
-                    first_name=student['Student'].get('Fornamn')
-                    last_name=student['Student'].get('Efternamn')
-                
-                    theses=get_titles_of_all_thesis(ladok, integration_id)
-                    if Verbose_Flag:
-                        print("theses={}".format(theses))
-                    if theses:
-                        for info in theses:
-                            student_info=dict()
-                            student_info['integration_id']=integration_id
-                            if first_name:
-                                student_info['first_name']=first_name
-                            if last_name:
-                                student_info['last_name']=last_name
-                            date=info.get('Examinationsdatum')
-                            if date:
-                                student_info['date']=date
-                            thesis_course_code=info.get('course_code')
-                            if thesis_course_code != course_code: # if this is not the degree project course code we are looking for, skip it.
-                                continue
-                            if thesis_course_code:
-                                student_info['course_code']=thesis_course_code
-                                # The following code was put in to test for the case of EECS when students with other degree projects were getting included
-                                # since the get_titles_of_all_thesis() code collected _all_ degree projects of a given student and not just those of the
-                                # specific course-code we are looking for in this school.
-                                # if thesis_course_code[0] in ['M', 'S']:
-                                #     print("should not see such a course code: course_round.round_id={0}, info={1}".format(course_round.round_id, info))
-                            title=info['titles'].get('Titel')
-                            if title:
-                                student_info['title']=title
-                            alt_title=info['titles'].get('AlternativTitel')
-                            if alt_title:
-                                student_info['alt_title']=alt_title
-                            examiner=info.get('Examiner')
-                            if examiner:
-                                student_info['Examiner']=examiner
-                            moment=info.get('moment')
-                            if moment:
-                                student_info['moment']=moment
-                            grade=info.get('Grade')
-                            if grade:
-                                student_info['Grade']=grade
-                            list_of_student_info.append(student_info)
-                            number_found=number_found+1
-                    students_already_processed.add(integration_id)
-                    if args['testing'] and number_found > 10:
-                        print("list_of_student_info={}".format(list_of_student_info))
-                        break
+    list_of_student_info=harvest_thesis_titles(ladok, degree_project_course_codes, workers=args['workers'],
+                                               limit=10 if args['testing'] else None)
 
     print("Total number of items of thesis information={}".format(len(list_of_student_info)))
     users_info_df=pd.json_normalize(list_of_student_info) 
@@ -771,7 +771,7 @@ latex_to_unicode = {
 
 
 
-def replace_latex_symbols_from_dict(s, replacement_dict):
+def replace_latex_symbols_from_dict_sequentially(s, replacement_dict, trailing_space=True):
     """
     Iterates through a dictionary of LaTeX commands and their HTML
     replacements, applying them to a string.
@@ -791,13 +791,66 @@ def replace_latex_symbols_from_dict(s, replacement_dict):
         escaped_command = re.escape(command)
         
         # This pattern finds the command and one optional trailing space
-        pattern = escaped_command + r' ?'
-        
-        # Perform the substitution
-        s = re.sub(pattern, replacement, s)
+        if trailing_space:
+            pattern = escaped_command + r' ?'
+        else:
+            pattern = escaped_command
+
+        # Perform the substitution (as a function, so that a backslash in the replacement is not treated as an escape)
+        s = re.sub(pattern, lambda match: replacement, s)
         
     return s
 
+# The tables are applied with a single precompiled regular expression per table, rather than one re.sub() per entry.
+# The alternatives are in the same order as the entries of the table, so when several commands match at the same
+# place (for example '\\l' and '\\leftarrow') the entry that the sequential replacement would have used wins.
+# As all of the commands start with their only backslash, two matches can only overlap if they start at the same place.
+#
+# The single pass differs from the sequential replacement only when the result of one entry can become part of
+# a match for a later entry (e.g., '\\backslash' becomes '\\' and '\\textvisiblespace' becomes a space that a later
+# command consumes). Such entries are found when the table is compiled and strings containing them are
+# replaced sequentially, so the output is always the same as with the sequential replacement.
+compiled_symbol_tables=dict()   # (id(table), trailing_space) -> (table, compiled pattern, entries that need the sequential replacement)
+
+def compile_symbol_table(replacement_dict, trailing_space=True):
+    commands=list(replacement_dict)
+    characters_in_commands=set(''.join(commands))
+    if trailing_space:
+        characters_in_commands.add(' ')
+
+    chained_commands=[]
+    for command in commands[:-1]:
+        replacement=replacement_dict[command]
+        if not replacement or characters_in_commands.intersection(replacement):
+            chained_commands.append(command)
+
+    if any(command.find('\\', 1) > 0 or not command.startswith('\\') for command in commands):
+        pattern=None            # matches could overlap, so always use the sequential replacement
+    else:
+        pattern='(' + '|'.join(re.escape(command) for command in commands) + ')'
+        if trailing_space:
+            pattern=pattern + ' ?'
+        pattern=re.compile(pattern)
+
+    compiled_symbol_tables[(id(replacement_dict), trailing_space)]=(replacement_dict, pattern, chained_commands)
+    return compiled_symbol_tables[(id(replacement_dict), trailing_space)]
+
+def replace_latex_symbols_from_dict(s, replacement_dict, trailing_space=True):
+    """
+    Replaces the LaTeX commands that are the keys of replacement_dict by their values,
+    consuming one optional trailing space after each command (unless trailing_space is False).
+
+    The result is the same as with replace_latex_symbols_from_dict_sequentially().
+    """
+    table=compiled_symbol_tables.get((id(replacement_dict), trailing_space))
+    if table is None or table[0] is not replacement_dict:
+        table=compile_symbol_table(replacement_dict, trailing_space)
+    _, pattern, chained_commands=table
+
+    if pattern is None or any(command in s for command in chained_commands):
+        return replace_latex_symbols_from_dict_sequentially(s, replacement_dict, trailing_space)
+    return pattern.sub(lambda match: replacement_dict[match.group(1)], s)
+
 def perform_substitutions(s):
 
     #s=s.replace('\x0c', '')  # Unsure if this is necessary
@@ -913,10 +966,10 @@ def process_latex_in_blocks(s):
     # 5. Reconstitute the final string.
     return "".join(processed_blocks)
 
-def replace_math_alphabets(s):
+def math_alphabet_tables():
     """
-    Replaces LaTeX math alphabet commands like \\mathbb{C} with their
-    corresponding Unicode characters.
+    Returns a dict mapping each LaTeX math alphabet command (like \\mathbb) to its
+    table of Unicode characters.
     """
     
     # 1. Define mapping tables for each math alphabet command.
@@ -1405,21 +1458,31 @@ def replace_math_alphabets(s):
 
     }
 
-    # 3. Iterate through the commands and perform the replacements.
-    for command, char_map in math_alphabet_commands.items():
-        escaped_command = re.escape(command)
-        # Pattern finds the command and captures the single letter in braces.
-        pattern = escaped_command + r'\s*\{([A-Za-z])\}'
-        
-        def replacer(match):
-            char_to_replace = match.group(1)
-            # Look up the captured letter in the correct character map.
-            # If not found, return the original full match to be safe.
-            return char_map.get(char_to_replace, match.group(0))
+    return math_alphabet_commands
 
-        s = re.sub(pattern, replacer, s)
-        
-    return s
+# The tables are built once and all of the commands are found with a single regular expression.
+# As \\symup maps each letter to itself, \\mathbb{\\symup{A}} becomes \\mathbb{A}, which the other commands
+# then replace - so \\symup (the first of the commands) is done in its own pass before the others.
+math_alphabet_commands=math_alphabet_tables()
+math_alphabet_first_pass_commands=['\\symup']
+math_alphabet_first_pass_pattern=re.compile('(' + '|'.join(re.escape(command) for command in math_alphabet_first_pass_commands) + r')\s*\{([A-Za-z])\}')
+math_alphabet_pattern=re.compile('(' + '|'.join(re.escape(command) for command in math_alphabet_commands
+                                                if command not in math_alphabet_first_pass_commands) + r')\s*\{([A-Za-z])\}')
+
+def math_alphabet_replacer(match):
+    # Look up the captured letter in the correct character map.
+    # If not found, return the original full match to be safe.
+    return math_alphabet_commands[match.group(1)].get(match.group(2), match.group(0))
+
+def replace_math_alphabets(s):
+    """
+    Replaces LaTeX math alphabet commands like \\mathbb{C} with their
+    corresponding Unicode characters.
+    """
+    if s.find('\\') < 0:
+        return s
+    s = math_alphabet_first_pass_pattern.sub(math_alphabet_replacer, s)
+    return math_alphabet_pattern.sub(math_alphabet_replacer, s)
 
 # 1. A much more comprehensive mapping for Greek letters and common symbols.
 symbol_map = {
@@ -1453,6 +1516,10 @@ symbol_map = {
     '\\prime': "‴",   # Triple Prime (U+2034)
 }
 
+# compile the tables when the program is loaded, rather than when they are first used
+compile_symbol_table(latex_to_unicode)
+compile_symbol_table(symbol_map, trailing_space=False)
+
 # Mappings for superscripts and subscripts
 superscript_map = {
     # Digits
@@ -1579,8 +1646,7 @@ def convert_latex_math_to_unicode(s):
     s=replace_latex_symbols_from_dict(s, latex_to_unicode)
 
     # Replace simple, no-argument commands first
-    for command, unicode_char in symbol_map.items():
-        s = s.replace(command, unicode_char)
+    s=replace_latex_symbols_from_dict(s, symbol_map, trailing_space=False)
 
     # Replace superscripts
     def sup_replacer(match):
@@ -30,6 +30,7 @@
 #
 
 import requests, time
+import http_cache
 import pprint
 import optparse
 import sys
@@ -73,7 +74,7 @@ def get_user_by_kthid(kthid):
     if Verbose_Flag:
         print("url: {}".format(url))
 
-    r = requests.get(url, headers = header)
+    r = http_cache.get(url, headers = header)
     if Verbose_Flag:
         print("result of getting profile: {}".format(r.text))
 